@@ -0,0 +1,101 @@
+"""Micro-benchmark for form date parsing.
+
+Times datetime_from_form_date and parse_date_parts on each supported date
+format, both uncached (every call parses the string) and cached (the same
+few dozen dates repeated, as when curating a subject). Runs offline and
+only reports; there is no baseline to compare against.
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date, timedelta
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+from nacc_attribute_deriver.utils.date import (
+    datetime_from_form_date,
+    parse_date_parts,
+)
+
+log = logging.getLogger(__name__)
+
+FORMATS = {
+    "YYYY-MM-DD": "%Y-%m-%d",
+    "YYYY/MM/DD": "%Y/%m/%d",
+    "MM-DD-YYYY": "%m-%d-%Y",
+    "MM/DD/YYYY": "%m/%d/%Y",
+}
+
+
+def generate_dates(fmt: str, num_dates: int) -> List[str]:
+    """Generates distinct date strings in the given strftime format."""
+    start = date(2000, 1, 1)
+    return [(start + timedelta(days=i)).strftime(fmt) for i in range(num_dates)]
+
+
+def time_calls(function: Callable[[str], Any], dates: List[str], repeat: int) -> float:
+    """Returns the number of calls per second over the dates."""
+    start = perf_counter()
+    for _ in range(repeat):
+        for date_string in dates:
+            function(date_string)
+    elapsed = perf_counter() - start
+    return len(dates) * repeat / elapsed if elapsed else 0.0
+
+
+def run_benchmark(
+    num_dates: int = 50, repeat: int = 200
+) -> Dict[str, Dict[str, float]]:
+    """Times the date parsers on each format.
+
+    Args:
+        num_dates: The number of distinct dates per format, e.g. a
+            subject's visit and form dates
+        repeat: How many times each date is parsed
+    Returns:
+        Calls per second keyed by format, then by parser and mode
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for label, fmt in FORMATS.items():
+        dates = generate_dates(fmt, num_dates)
+        results[label] = {}
+        for function in (datetime_from_form_date, parse_date_parts):
+            name = function.__name__
+            results[label][f"{name} uncached"] = time_calls(
+                function.__wrapped__, dates, repeat
+            )
+
+            function.cache_clear()
+            results[label][f"{name} cached"] = time_calls(function, dates, repeat)
+
+    return results
+
+
+def report(results: Dict[str, Dict[str, float]]) -> str:
+    """Formats the results as a table of calls per second."""
+    columns = list(next(iter(results.values())))
+    lines = [f"{'format':<12}" + "".join(f"{x:>34}" for x in columns)]
+    for label, timings in results.items():
+        lines.append(f"{label:<12}" + "".join(f"{timings[x]:>34,.0f}" for x in columns))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="benchmark form date parsing")
+    parser.add_argument(
+        "--dates", type=int, default=50, help="distinct dates per format"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=200, help="times each date is parsed"
+    )
+    args = parser.parse_args(argv)
+
+    log.info("Calls per second:")
+    log.info(report(run_benchmark(args.dates, args.repeat)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
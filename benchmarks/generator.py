@@ -0,0 +1,811 @@
+"""Seeded generator for synthetic NACC subjects.
+
+Builds subjects that look enough like production data to exercise the full
+set of curation rules: multi-visit UDS V1-V4 packets whose fields follow
+config/uds_ded_matrix.csv, plus NP, MLST, MDS, MEDS, B1a, LBD/FTLD, SCAN,
+MP DICOM, NCRAD and NIAGADS files, all with dates that are consistent with
+the subject's UDS visits.
+
+Values are random but drawn from plausible domains, so the generated data is
+only meant for benchmarking and smoke testing, not for validating derived
+values. The same seed always produces the same subjects.
+"""
+
+import csv
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import cache
+from importlib import resources
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from nacc_attribute_deriver import config
+from nacc_attribute_deriver.subject_driver import CurationFile
+from nacc_attribute_deriver.utils.constants import ALL_RX_CLASSES
+from nacc_attribute_deriver.utils.scope import (
+    FormScope,
+    GeneticsScope,
+    MixedProtocolScope,
+    NCRADBiomarkerScope,
+    SCANMRIScope,
+    SCANPETScope,
+)
+
+# (first date the version was used, formver)
+UDS_VERSIONS: List[Tuple[date, str]] = [
+    (date(2005, 9, 1), "1.0"),
+    (date(2008, 2, 1), "2.0"),
+    (date(2015, 3, 1), "3.0"),
+    (date(2020, 4, 1), "3.2"),
+    (date(2024, 6, 1), "4.0"),
+]
+
+# header/identifying fields that are always set explicitly
+UDS_HEADER_FIELDS = frozenset(
+    [
+        "ptid",
+        "adcid",
+        "visitnum",
+        "packet",
+        "formver",
+        "visitdate",
+        "birthmo",
+        "birthyr",
+        "module",
+        "naccid",
+    ]
+)
+
+# raw drug IDs to pull MEDS drugs lists from
+DRUG_IDS = [f"d{i:05d}" for i in range(1, 400, 7)]
+
+NP_FIELDS = [
+    "npgross",
+    "npvasc",
+    "npamy",
+    "nparter",
+    "npavas",
+    "npbraak",
+    "npneur",
+    "npadnc",
+    "npdiff",
+    "npthal",
+    "nplewy",
+    "nplinf",
+    "npmicro",
+    "nphem",
+    "npart",
+    "npnec",
+    "nphipscl",
+    "nptdpa",
+    "nptdpb",
+    "nptdpc",
+    "nptdpd",
+    "nptdpe",
+    "npftdtau",
+    "nppick",
+    "npftdt2",
+    "npcort",
+    "npprog",
+    "npftdt5",
+    "npftdt6",
+    "npftdt7",
+    "npftdt8",
+    "npftdt9",
+    "npftdt10",
+    "npoftd",
+    "npoftd1",
+    "npoftd2",
+    "npoftd3",
+    "npoftd4",
+    "npoftd5",
+    "nppdxa",
+    "nppdxb",
+    "nppdxc",
+    "nppdxd",
+    "nppdxe",
+    "nppdxf",
+    "nppdxg",
+    "nppdxh",
+    "nppdxi",
+    "nppdxj",
+    "nppdxk",
+    "nppdxl",
+    "nppdxm",
+    "nppdxn",
+    "nppdxo",
+    "nppdxp",
+    "nppdxq",
+    "npbnka",
+    "npbnkb",
+    "npbnkc",
+    "npbnkd",
+    "npbnke",
+    "npbnkf",
+    "npbnkg",
+    "npchrom",
+    "npwbrwt",
+    "npcsfant",
+]
+
+MRI_SUMMARY_FIELDS = ["naccicv", "naccbrnv", "naccwmvl", "csfvol", "graymat"]
+
+
+@dataclass
+class SyntheticSubject:
+    """A generated subject and its files."""
+
+    naccid: str
+    files: List[CurationFile]
+
+    def count(self, scope: str) -> int:
+        """Returns the number of files for the given scope."""
+        return sum(1 for x in self.files if x.scope == scope)
+
+
+@cache
+def load_uds_matrix() -> Dict[str, List[str]]:
+    """Loads the UDS DED matrix as a mapping of version/packet key (e.g.
+    v3.0_F) to the variables collected for that version and packet."""
+    matrix: Dict[str, List[str]] = {}
+    matrix_file = resources.files(config).joinpath("uds_ded_matrix.csv")
+    with matrix_file.open("r") as fh:
+        reader = csv.DictReader(fh)
+        keys = [x for x in (reader.fieldnames or []) if x != "variable"]
+        matrix = {key: [] for key in keys}
+        for row in reader:
+            variable = row["variable"]
+            if variable.startswith("header_"):
+                continue
+            for key in keys:
+                if row[key] == "1":
+                    matrix[key].append(variable)
+
+    return matrix
+
+
+@cache
+def load_attribute_types() -> Dict[str, str]:
+    """Loads the attribute types of UDS variables from the file missingness
+    rules."""
+    types: Dict[str, str] = {}
+    rules_file = resources.files(config).joinpath("file_missingness.csv")
+    with rules_file.open("r") as fh:
+        for row in csv.DictReader(fh):
+            if row["scope"] == FormScope.UDS:
+                types[row["function"]] = row["attr_type"]
+
+    return types
+
+
+def generate_rxclass(seed: int = 0) -> Dict[str, List[str]]:
+    """Generates a stand-in RxClass mapping for A4 V4 derived variables."""
+    rng = random.Random(f"rxclass-{seed}")
+    return {
+        rxclass: sorted(
+            str(rng.randint(1000, 99999)) for _ in range(rng.randint(5, 40))
+        )
+        for rxclass in ALL_RX_CLASSES
+    }
+
+
+class SubjectGenerator:
+    """Generates synthetic subjects from a seed."""
+
+    def __init__(
+        self, seed: int = 0, max_uds_visits: int = 12, max_mp_series: int = 40
+    ) -> None:
+        """Initializer.
+
+        Args:
+            seed: The seed; the same seed produces the same subjects
+            max_uds_visits: Maximum number of UDS visits per subject
+            max_mp_series: Maximum number of DICOM series per MP session
+        """
+        self.__seed = seed
+        self.__max_uds_visits = max_uds_visits
+        self.__max_mp_series = max_mp_series
+        self.__matrix = load_uds_matrix()
+        self.__types = load_attribute_types()
+
+    def generate_many(self, num_subjects: int) -> Iterator[SyntheticSubject]:
+        """Generates the given number of subjects."""
+        for i in range(num_subjects):
+            yield self.generate(i)
+
+    def generate(self, index: int) -> SyntheticSubject:
+        """Generates the subject at the given index.
+
+        Each subject gets its own RNG derived from the seed and index, so
+        subjects can be generated independently of one another.
+        """
+        rng = random.Random(f"{self.__seed}-{index}")
+        naccid = f"NACC{index:06d}"
+        adcid = rng.randint(1, 50)
+        birth = date(rng.randint(1925, 1965), rng.randint(1, 12), 1)
+
+        visits = self.__visit_dates(rng)
+        files: List[CurationFile] = []
+
+        uds_files = [
+            self.__uds_visit(rng, naccid, adcid, birth, visits, i)
+            for i in range(len(visits))
+        ]
+        files.extend(uds_files)
+
+        for uds_file in uds_files:
+            form = uds_file.info["forms"]["json"]
+            if form["formver"] in ("1.0", "2.0", "3.0", "3.2") and rng.random() < 0.9:
+                files.append(self.__meds(rng, form))
+            if form["formver"] in ("3.0", "3.2") and rng.random() < 0.3:
+                files.append(self.__b1a(rng, form))
+            if rng.random() < 0.1:
+                files.append(self.__module_form(rng, form, FormScope.LBD.value))
+            if rng.random() < 0.1:
+                files.append(self.__module_form(rng, form, FormScope.FTLD.value))
+
+        last_visit = visits[-1]
+        deceased = rng.random() < 0.25
+        death = last_visit + timedelta(days=rng.randint(30, 1500))
+
+        for mlst_date in sorted(rng.sample(visits, k=min(len(visits), 2))):
+            files.append(self.__mlst(rng, mlst_date, None))
+        if deceased:
+            files.append(self.__mlst(rng, death + timedelta(days=30), death))
+            if rng.random() < 0.6:
+                files.append(self.__np(rng, birth, death))
+        if rng.random() < 0.05:
+            files.append(self.__mds(rng, birth, death if deceased else None))
+
+        files.extend(self.__ncrad(rng))
+        files.extend(self.__scan(rng, visits))
+        files.extend(self.__mp(rng, naccid, visits))
+
+        return SyntheticSubject(naccid=naccid, files=files)
+
+    def __visit_dates(self, rng: random.Random) -> List[date]:
+        """Generates roughly annual UDS visit dates.
+
+        About a third of subjects are still active, so their last visit is
+        in V4.
+        """
+        num_visits = rng.randint(1, self.__max_uds_visits)
+        if rng.random() < 0.35:
+            last = UDS_VERSIONS[-1][0] + timedelta(days=rng.randint(30, 450))
+            visits = [last]
+            for _ in range(num_visits - 1):
+                visits.append(visits[-1] - timedelta(days=rng.randint(330, 420)))
+            return [x for x in reversed(visits) if x >= UDS_VERSIONS[0][0]]
+
+        latest_start = date(2025, 6, 1) - timedelta(days=380 * num_visits)
+        start = date(2005, 9, 1) + timedelta(
+            days=rng.randint(0, max(0, (latest_start - date(2005, 9, 1)).days))
+        )
+
+        visits = [start]
+        for _ in range(num_visits - 1):
+            visits.append(visits[-1] + timedelta(days=rng.randint(330, 420)))
+
+        return visits
+
+    def __formver(self, visitdate: date) -> str:
+        """Returns the UDS form version in use on the given date."""
+        result = UDS_VERSIONS[0][1]
+        for start, formver in UDS_VERSIONS:
+            if visitdate >= start:
+                result = formver
+
+        return result
+
+    def __packet(
+        self, rng: random.Random, formver: str, visits: List[date], index: int
+    ) -> str:
+        """Returns the packet for the visit."""
+        if index == 0:
+            return "I"
+
+        if formver == "4.0" and self.__formver(visits[index - 1]) != "4.0":
+            return "I4"
+
+        if formver in ("3.0", "3.2") and rng.random() < 0.15:
+            return "T"
+
+        return "F"
+
+    def __value(  # noqa: C901
+        self, rng: random.Random, variable: str, attr_type: str, visitdate: date
+    ) -> Any:
+        """Generates a plausible value for a UDS variable."""
+        roll = rng.random()
+        if attr_type == "str":
+            if variable.startswith("frmdate"):
+                return str(visitdate)
+            if variable.endswith(("etpr", "etsec")):
+                # V4 family etiology codes
+                return None if roll < 0.5 else rng.choice(["00", "01", "04", "99"])
+            return "" if roll < 0.8 else f"text{rng.randint(1, 99)}"
+        if attr_type == "float":
+            return None if roll < 0.2 else round(rng.uniform(0, 60), 1)
+
+        if variable.endswith("yr"):
+            return None if roll < 0.5 else rng.randint(1990, 2020)
+        if variable.endswith("mo"):
+            return None if roll < 0.5 else rng.randint(1, 12)
+        if variable.endswith(("dy", "day")):
+            return None if roll < 0.5 else rng.randint(1, 28)
+        if "age" in variable:
+            return None if roll < 0.5 else rng.choice([rng.randint(40, 90), 888, 999])
+
+        if roll < 0.15:
+            return None
+        if roll < 0.8:
+            return 0
+        if roll < 0.95:
+            return 1
+        return rng.choice([8, 9])
+
+    @staticmethod
+    def __gate(variable: str) -> Optional[str]:
+        """Returns the gate of an importance level variable, e.g. DEP for
+        DEPIF (V3 and earlier) or MAJDEPDX for MAJDEPDIF (V4)."""
+        if variable.endswith("dif"):
+            return f"{variable.removesuffix('dif')}dx"
+        if variable.endswith("if"):
+            return variable.removesuffix("if")
+        return None
+
+    def __make_consistent(
+        self, rng: random.Random, form: Dict[str, Any], formver: str
+    ) -> None:
+        """Makes gated fields consistent with their gates, e.g. the
+        importance level XIF is only set if X is present (= 1).
+
+        Gates are yes/no in V3 and earlier and checkboxes (1 or blank)
+        in V4. Expects all variables to be in the form, including blank
+        ones.
+        """
+        levels = {
+            variable: gate
+            for variable in form
+            if (gate := self.__gate(variable)) is not None and gate in form
+        }
+        gates = set(levels.values())
+        gates.update(x for x in form if x.startswith(("mcia", "cdom")))
+
+        for gate in sorted(gates):
+            value = rng.choice([0, 0, 0, 1])
+            form[gate] = value if formver != "4.0" or value == 1 else None
+
+        for variable, gate in levels.items():
+            form[variable] = rng.choice([1, 2, 3]) if form[gate] == 1 else None
+
+    def __set_race(
+        self, rng: random.Random, form: Dict[str, Any], formver: str
+    ) -> None:
+        """Sets a single race."""
+        if formver == "4.0":
+            races = [
+                "racewhite",
+                "raceblack",
+                "raceaian",
+                "racenhpi",
+                "raceasian",
+                "racemena",
+            ]
+            for race in [*races, "raceunkn"]:
+                form.pop(race, None)
+            form[rng.choice(races)] = 1
+            return
+
+        form.update(
+            {"race": rng.choice([1, 1, 2, 3, 4, 5]), "racesec": 88, "raceter": 88}
+        )
+
+    def __uds_visit(
+        self,
+        rng: random.Random,
+        naccid: str,
+        adcid: int,
+        birth: date,
+        visits: List[date],
+        index: int,
+    ) -> CurationFile:
+        """Generates a single UDS visit following the DED matrix."""
+        visitdate = visits[index]
+        formver = self.__formver(visitdate)
+        packet = self.__packet(rng, formver, visits, index)
+        key = f"v{float(formver):.1f}_{packet}"
+        variables = self.__matrix.get(key) or self.__matrix[f"v{formver}_F"]
+
+        form: Dict[str, Any] = {}
+        for variable in variables:
+            if variable in UDS_HEADER_FIELDS:
+                continue
+            form[variable] = self.__value(
+                rng, variable, self.__types.get(variable, "int"), visitdate
+            )
+
+        # core fields drive most of the derived logic
+        form.update(
+            {
+                "module": "UDS",
+                "naccid": naccid,
+                "adcid": adcid,
+                "ptid": f"{adcid:03d}-{naccid[-4:]}",
+                "visitnum": str(index + 1),
+                "packet": packet,
+                "formver": formver,
+                "visitdate": str(visitdate),
+                "birthmo": birth.month,
+                "birthyr": birth.year,
+                "sex": rng.choice([1, 2]),
+                "educ": rng.randint(8, 20),
+                "normcog": rng.choice([0, 1]),
+                "cdrglob": rng.choice([0, 0.5, 1, 2]),
+                "anymeds": rng.choice([0, 1]),
+                "primlang": rng.choice([1, 1, 1, 2, 3, 9]),
+                "predomlan": rng.choice([1, 1, 1, 2, 3, 9]),
+                "hispanic": rng.choice([0, 0, 1]),
+                "ethispanic": rng.choice([0, 0, 1]),
+                "birthsex": rng.choice([1, 2]),
+                "lvleduc": rng.randint(0, 5),
+                "inlivwth": 1,
+            }
+        )
+        self.__set_race(rng, form, formver)
+        self.__make_consistent(rng, form, formver)
+        form = {k: v for k, v in form.items() if v is not None}
+        if formver == "4.0":
+            # V4 data is stored in Flywheel as strings
+            form = {k: str(v) if not isinstance(v, str) else v for k, v in form.items()}
+
+        return CurationFile(
+            scope=FormScope.UDS.value,
+            info={"forms": {"json": form}},
+            order_key=str(visitdate),
+        )
+
+    def __meds(self, rng: random.Random, uds_form: Dict[str, Any]) -> CurationFile:
+        """Generates the MEDS form for a UDS visit."""
+        form: Dict[str, Any] = {
+            "module": "MEDS",
+            "formver": uds_form["formver"],
+            "frmdatea4": uds_form["visitdate"],
+        }
+        drugs = rng.sample(DRUG_IDS, k=rng.randint(0, 12))
+        if uds_form["formver"] == "1.0":
+            for i, drug in enumerate(drugs[:20]):
+                form[f"pm{chr(ord('a') + i)}"] = f"drug {drug}"
+        else:
+            form["drugs_list"] = ",".join(drugs)
+
+        return CurationFile(
+            scope=FormScope.MEDS.value,
+            info={"forms": {"json": form}},
+            order_key=uds_form["visitdate"],
+            extras={"_uds_visitdate": uds_form["visitdate"]},
+        )
+
+    def __b1a(self, rng: random.Random, uds_form: Dict[str, Any]) -> CurationFile:
+        """Generates the B1a form for a UDS visit."""
+        form = {
+            "module": "B1A",
+            "formver": uds_form["formver"],
+            "visitdate": uds_form["visitdate"],
+            "bpsysl": rng.randint(90, 180),
+            "bpsysr": rng.randint(90, 180),
+            "bpdiasl": rng.randint(50, 110),
+            "bpdiasr": rng.randint(50, 110),
+            "bpdevice": rng.choice([1, 2]),
+        }
+        return CurationFile(
+            scope=FormScope.B1A.value,
+            info={"forms": {"json": form}},
+            order_key=uds_form["visitdate"],
+            extras={"_uds_visitdate": uds_form["visitdate"]},
+        )
+
+    def __module_form(
+        self, rng: random.Random, uds_form: Dict[str, Any], scope: str
+    ) -> CurationFile:
+        """Generates a LBD or FTLD module form for a UDS visit."""
+        form: Dict[str, Any] = {
+            "module": scope.upper(),
+            "formver": uds_form["formver"],
+            "visitdate": uds_form["visitdate"],
+        }
+        if scope == FormScope.LBD:
+            for field in ["lbpsyage", "lbsagerm", "lbsagesm", "lbsagegt"]:
+                form[field] = rng.choice([777, rng.randint(40, 90)])
+
+        return CurationFile(
+            scope=scope,
+            info={"forms": {"json": form}},
+            order_key=uds_form["visitdate"],
+        )
+
+    def __mlst(
+        self, rng: random.Random, mlst_date: date, death: Optional[date]
+    ) -> CurationFile:
+        """Generates a milestone form, optionally reporting a death."""
+        form: Dict[str, Any] = {
+            "module": "MLST",
+            "formver": "3.0",
+            "visitdate": str(mlst_date),
+        }
+        if death is not None:
+            form.update(
+                {
+                    "deceased": 1,
+                    "deathyr": death.year,
+                    "deathmo": death.month,
+                    "deathdy": death.day,
+                }
+            )
+        elif rng.random() < 0.3:
+            form.update(
+                {
+                    "renurse": 1,
+                    "nurseyr": mlst_date.year,
+                    "nursemo": mlst_date.month,
+                    "nursedy": 99,
+                }
+            )
+
+        return CurationFile(
+            scope=FormScope.MLST.value,
+            info={"forms": {"json": form}},
+            order_key=str(mlst_date),
+        )
+
+    def __np(self, rng: random.Random, birth: date, death: date) -> CurationFile:
+        """Generates a neuropathology form."""
+        formver = rng.choice([9, 10, 11])
+        form: Dict[str, Any] = {
+            "module": "NP",
+            "formver": formver,
+            "visitdate": str(death + timedelta(days=rng.randint(30, 200))),
+            "npdage": death.year - birth.year,
+            "npdodyr": str(death.year),
+            "npdodmo": str(death.month),
+            "npdoddy": str(death.day),
+        }
+        for field in NP_FIELDS:
+            if rng.random() < 0.8:
+                form[field] = rng.choice([0, 1, 2, 3, 8, 9])
+
+        # required by the legacy (V9 and earlier) gross findings logic
+        form["npavas"] = rng.randint(1, 4)
+
+        return CurationFile(
+            scope=FormScope.NP.value,
+            info={"forms": {"json": form}},
+            order_key=form["visitdate"],
+        )
+
+    def __mds(
+        self, rng: random.Random, birth: date, death: Optional[date]
+    ) -> CurationFile:
+        """Generates a minimal data set form."""
+        form: Dict[str, Any] = {
+            "module": "MDS",
+            "formver": "1.0",
+            "visitdate": str(date(2010, 1, 1) + timedelta(days=rng.randint(0, 3000))),
+            "birthyr": birth.year,
+            "birthmo": birth.month,
+            "vitalst": 2 if death else 1,
+        }
+        if death:
+            form.update({"deathyr": death.year, "deathmo": death.month, "deathday": 99})
+
+        return CurationFile(
+            scope=FormScope.MDS.value,
+            info={"forms": {"json": form}},
+            order_key=form["visitdate"],
+        )
+
+    def __ncrad(self, rng: random.Random) -> List[CurationFile]:
+        """Generates the NCRAD and NIAGADS genetics files."""
+        files: List[CurationFile] = []
+        alleles = ["E2", "E3", "E3", "E3", "E4", "E4"]
+
+        if rng.random() < 0.5:
+            files.append(
+                CurationFile(
+                    scope=GeneticsScope.APOE.value,
+                    info={
+                        "raw": {"a1": rng.choice(alleles), "a2": rng.choice(alleles)}
+                    },
+                )
+            )
+        if rng.random() < 0.4:
+            files.append(
+                CurationFile(
+                    scope=GeneticsScope.NCRAD_BIOSAMPLES.value,
+                    info={"raw": {"sample_id": f"S{rng.randint(1, 99999)}"}},
+                )
+            )
+        if rng.random() < 0.2:
+            scope = rng.choice(list(NCRADBiomarkerScope)).value
+            created = date(2023, 1, 1) + timedelta(days=rng.randint(0, 900))
+            files.append(
+                CurationFile(
+                    scope=scope,
+                    info={"provenance": {"created_date": f"{created}T00:00:00+00:00"}},
+                )
+            )
+        if rng.random() < 0.4:
+            files.append(
+                CurationFile(
+                    scope=GeneticsScope.NIAGADS_AVAILABILITY.value,
+                    info={
+                        "raw": {
+                            "niagads_gwas": rng.choice(["0", "NG00001"]),
+                            "niagads_exomechip": rng.choice(["0", "NG00002"]),
+                            "niagads_wgs": "0",
+                            "niagads_wes": "0",
+                            "adgc_gwas": rng.choice([0, 1]),
+                            "adgc_exomechip": rng.choice([0, 1]),
+                            "gwas_round": rng.choice(["", "1", "2"]),
+                            "exome_round": "",
+                        }
+                    },
+                )
+            )
+
+        return files
+
+    def __scan(self, rng: random.Random, visits: List[date]) -> List[CurationFile]:
+        """Generates SCAN MRI and PET rows near UDS visits."""
+        files: List[CurationFile] = []
+        if visits[-1] < date(2021, 1, 1) or rng.random() < 0.6:
+            return files
+
+        for visit in rng.sample(visits, k=min(len(visits), 3)):
+            scandate = visit + timedelta(days=rng.randint(-60, 60))
+            if rng.random() < 0.7:
+                files.append(
+                    CurationFile(
+                        scope=SCANMRIScope.MRI_QC.value,
+                        info={
+                            "raw": {
+                                "study_date": str(scandate),
+                                "series_type": rng.choice(["T1", "T2", "FLAIR"]),
+                            }
+                        },
+                        order_key=str(scandate),
+                    )
+                )
+                files.append(
+                    CurationFile(
+                        scope=SCANMRIScope.MRI_SBM.value,
+                        info={
+                            "raw": {
+                                "scandt": str(scandate),
+                                "cerebrumtcv": round(rng.uniform(800, 1200), 2),
+                                "wmh": rng.choice(["", round(rng.uniform(0, 30), 2)]),
+                            }
+                        },
+                        order_key=str(scandate),
+                    )
+                )
+            else:
+                tracer = rng.choice([2, 3, 4, 5, 6, 7])
+                files.append(
+                    CurationFile(
+                        scope=SCANPETScope.PET_QC.value,
+                        info={
+                            "raw": {"scan_date": str(scandate), "radiotracer": tracer}
+                        },
+                        order_key=str(scandate),
+                    )
+                )
+                if tracer in (2, 3, 4, 5):
+                    files.append(
+                        CurationFile(
+                            scope=SCANPETScope.AMYLOID_PET_GAAIN.value,
+                            info={
+                                "raw": {
+                                    "scandate": str(scandate),
+                                    "tracer": tracer,
+                                    "amyloid_status": rng.choice([0, 1]),
+                                    "centiloids": round(rng.uniform(-20, 120), 2),
+                                    "gaain_summary_suvr": round(rng.uniform(0.8, 2), 3),
+                                }
+                            },
+                            order_key=str(scandate),
+                        )
+                    )
+                    files.append(
+                        CurationFile(
+                            scope=SCANPETScope.AMYLOID_PET_NPDKA.value,
+                            info={
+                                "raw": {
+                                    "scandate": str(scandate),
+                                    "npdka_summary_suvr": round(rng.uniform(0.8, 2), 3),
+                                }
+                            },
+                            order_key=str(scandate),
+                        )
+                    )
+                else:
+                    files.append(
+                        CurationFile(
+                            scope=SCANPETScope.TAU_PET_NPDKA.value,
+                            info={
+                                "raw": {
+                                    "scandate": str(scandate),
+                                    "meta_temporal_suvr": round(rng.uniform(0.8, 3), 3),
+                                }
+                            },
+                            order_key=str(scandate),
+                        )
+                    )
+                    if rng.random() < 0.3:
+                        files.append(
+                            CurationFile(
+                                scope=SCANPETScope.FDG_PET_NPDKA.value,
+                                info={
+                                    "raw": {
+                                        "scandate": str(scandate),
+                                        "fdg_metaroi_suvr": round(
+                                            rng.uniform(0.8, 2), 3
+                                        ),
+                                    }
+                                },
+                                order_key=str(scandate),
+                            )
+                        )
+
+        return files
+
+    def __mp(
+        self, rng: random.Random, naccid: str, visits: List[date]
+    ) -> List[CurationFile]:
+        """Generates MP MRI/PET DICOM sessions and MRI summaries near UDS
+        visits."""
+        files: List[CurationFile] = []
+        if rng.random() < 0.7:
+            return files
+
+        for visit in rng.sample(visits, k=min(len(visits), 2)):
+            session = visit + timedelta(days=rng.randint(-30, 30))
+            study_date = session.strftime("%Y%m%d")
+            scope = rng.choice(
+                [MixedProtocolScope.MRI_DICOM.value, MixedProtocolScope.PET_DICOM.value]
+            )
+            for series in range(rng.randint(1, self.__max_mp_series)):
+                filename = f"{naccid}_{study_date}_{scope}_{series:03d}.dicom.zip"
+                files.append(
+                    CurationFile(
+                        scope=scope,
+                        info={
+                            "header": {
+                                "dicom": {
+                                    "StudyDate": study_date,
+                                    "SeriesNumber": series,
+                                }
+                            }
+                        },
+                        order_key=f"{session}-{series:03d}",
+                        extras={"_filename": filename},
+                    )
+                )
+
+            if scope == MixedProtocolScope.MRI_DICOM and rng.random() < 0.5:
+                raw: Dict[str, Any] = {
+                    "mriyr": session.year,
+                    "mrimo": session.month,
+                    "mridy": session.day,
+                }
+                for field in MRI_SUMMARY_FIELDS:
+                    raw[field] = round(rng.uniform(1, 1500), 4)
+                files.append(
+                    CurationFile(
+                        scope=MixedProtocolScope.MRI_SUMMARY.value,
+                        info={"raw": raw},
+                        order_key=str(session),
+                    )
+                )
+
+        return files
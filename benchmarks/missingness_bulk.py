@@ -0,0 +1,130 @@
+"""Benchmark for regenerating UDS file-level missingness with the
+UDSMissingnessDriver.
+
+Generates subjects, then times curating the missingness of their UDS visits
+one file at a time, as the gear does, against curating them in columns.
+Runs offline and only reports; there is no baseline to compare against.
+"""
+
+import argparse
+import copy
+import logging
+import sys
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from benchmarks.generator import SubjectGenerator, generate_rxclass
+from nacc_attribute_deriver.attribute_deriver import MissingnessDeriver
+from nacc_attribute_deriver.missingness_driver import UDSMissingnessDriver
+from nacc_attribute_deriver.subject_driver import CurationFile, SubjectDriver
+from nacc_attribute_deriver.symbol_table import OverlaySymbolTable
+from nacc_attribute_deriver.utils.scope import FormScope
+
+log = logging.getLogger(__name__)
+
+
+def curate_files(
+    driver: SubjectDriver,
+    deriver: MissingnessDeriver,
+    subjects: Dict[str, Dict[str, Any]],
+    visits: Dict[str, List[CurationFile]],
+) -> int:
+    """Curates the missingness of each UDS visit as a file; returns the
+    number of failed subjects."""
+    errors = 0
+    for subject, files in visits.items():
+        prev_record = None
+        for file in files:
+            table = OverlaySymbolTable(
+                driver.build_table(subjects[subject], file, prev_record)
+            )
+            try:
+                deriver.curate(table, FormScope.UDS.value)
+            except Exception:
+                table.discard()
+                errors += 1
+                break
+
+            table.commit()
+            prev_record = file.info
+
+    return errors
+
+
+def run_benchmark(
+    num_subjects: int = 200, seed: int = 0, compact_forms: bool = False
+) -> Dict[str, float]:
+    """Curates the missingness of generated subjects' UDS visits per file
+    and in columns.
+
+    Args:
+        num_subjects: The number of subjects to generate
+        seed: The generator seed
+        compact_forms: Whether the columnar driver compacts the forms
+    Returns:
+        The number of visits and errors, and the seconds each path took
+    """
+    driver = SubjectDriver(rxclass=generate_rxclass())
+    subjects: Dict[str, Dict[str, Any]] = {}
+    visits: Dict[str, List[CurationFile]] = {}
+    for subject in SubjectGenerator(seed=seed).generate_many(num_subjects):
+        subjects[subject.naccid] = driver.curate_subject(subject.files)
+        visits[subject.naccid] = [
+            x
+            for x in SubjectDriver.schedule(subject.files)
+            if x.scope == FormScope.UDS.value
+        ]
+
+    deriver = MissingnessDeriver("file")
+    file_visits = copy.deepcopy(visits)
+    start = perf_counter()
+    file_errors = curate_files(driver, deriver, subjects, file_visits)
+    file_time = perf_counter() - start
+
+    start = perf_counter()
+    result = UDSMissingnessDriver(deriver, compact_forms=compact_forms).curate(
+        visits, subjects
+    )
+    columnar_time = perf_counter() - start
+
+    return {
+        "visits": sum(len(x) for x in visits.values()),
+        "file_errors": file_errors,
+        "columnar_errors": len(result.errors),
+        "file_seconds": file_time,
+        "columnar_seconds": columnar_time,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(
+        description="benchmark columnar UDS missingness curation"
+    )
+    parser.add_argument("--subjects", type=int, default=200, help="subjects")
+    parser.add_argument("--seed", type=int, default=0, help="generator seed")
+    parser.add_argument(
+        "--compact-forms",
+        action="store_true",
+        help="store the forms as FormRecords when curating in columns",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.subjects, args.seed, args.compact_forms)
+    log.info(
+        "%d visits (%d/%d errors): per file in %.2fs (%.0f visits/s), "
+        "columnar in %.2fs (%.0f visits/s), %.1fx",
+        results["visits"],
+        results["file_errors"],
+        results["columnar_errors"],
+        results["file_seconds"],
+        results["visits"] / results["file_seconds"],
+        results["columnar_seconds"],
+        results["visits"] / results["columnar_seconds"],
+        results["file_seconds"] / results["columnar_seconds"],
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Micro-benchmark for the NP form-wide evaluator.
+
+Times NACCBRNN and NACCVASC on generated NP forms of each form version,
+including reading the form's fields into its NPRecord. Runs offline and
+only reports; there is no baseline to compare against.
+"""
+
+import argparse
+import logging
+import random
+import sys
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from nacc_attribute_deriver.attributes.derived.modules.np import (
+    np_form_wide_evaluator as evaluator,
+)
+from nacc_attribute_deriver.attributes.derived.modules.np.np_mapper import (
+    NPMapper,
+)
+from nacc_attribute_deriver.attributes.namespace.namespace import (
+    FormNamespace,
+)
+from nacc_attribute_deriver.symbol_table import SymbolTable
+
+log = logging.getLogger(__name__)
+
+FORMVERS = [1, 7, 8, 9, 10, 11]
+
+FIELDS = sorted(
+    set(evaluator.NACCBRNN_V11)
+    | set(evaluator.NACCBRNN_V19)
+    | set(evaluator.NACCVASC_V789)
+    | set(evaluator.NACCVASC_V1011)
+    | {"npgross"}
+)
+
+
+def generate_forms(formver: int, num_forms: int, seed: int = 0) -> List[SymbolTable]:
+    """Generates tables of NP forms with random values for every variable
+    the evaluator reads, some of them blank."""
+    rng = random.Random(seed)
+    values: List[Optional[int]] = [None, *range(10)]
+    tables = []
+    for _ in range(num_forms):
+        form: Dict[str, Any] = {x: rng.choice(values) for x in FIELDS}
+        form.update(formver=formver, module="NP", visitdate="2025-01-10")
+        tables.append(SymbolTable({"file": {"info": {"forms": {"json": form}}}}))
+
+    return tables
+
+
+def time_forms(tables: List[SymbolTable], formver: int) -> float:
+    """Returns the number of forms evaluated per second."""
+    start = perf_counter()
+    for table in tables:
+        np = FormNamespace(table=table, required=frozenset(["formver"]))
+        form_evaluator = evaluator.NPFormWideEvaluator(
+            np, NPMapper(np, formver), formver
+        )
+        form_evaluator.determine_naccbrnn()
+        form_evaluator.determine_naccvasc()
+    elapsed = perf_counter() - start
+    return len(tables) / elapsed if elapsed else 0.0
+
+
+def run_benchmark(num_forms: int = 2000) -> Dict[int, float]:
+    """Times the evaluator on each form version.
+
+    Args:
+        num_forms: The number of forms per form version
+    Returns:
+        Forms per second keyed by form version
+    """
+    return {
+        formver: time_forms(generate_forms(formver, num_forms), formver)
+        for formver in FORMVERS
+    }
+
+
+def report(results: Dict[int, float]) -> str:
+    """Formats the results as a table of forms per second."""
+    lines = [f"{'formver':<10}{'forms/s':>12}"]
+    for formver, forms_per_second in results.items():
+        lines.append(f"{formver:<10}{forms_per_second:>12,.0f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="benchmark the NP evaluator")
+    parser.add_argument(
+        "--forms", type=int, default=2000, help="forms per form version"
+    )
+    args = parser.parse_args(argv)
+
+    log.info("NACCBRNN and NACCVASC, forms per second:")
+    log.info(report(run_benchmark(args.forms)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,528 @@
+"""Runs the curation benchmark on synthetic subjects.
+
+Generates a seeded set of synthetic subjects, curates each one end-to-end
+with the SubjectDriver, and reports per-subject and per-scope throughput.
+Runs entirely offline.
+
+If a baseline file is given, the throughput is compared against it and the
+script exits with a non-zero status if any of the compared throughputs
+dropped by more than the tolerance. Baselines are machine-specific, so they
+should be regenerated (--update-baseline) on the machine the benchmark is
+compared on.
+
+With --write-back, the runner also measures the metadata payload the gear
+would push back after each file: the full file.info.derived,
+file.info.resolved, and subject.info trees versus only the changes the
+table tracked during curation.
+
+With --memory, the subjects are also curated under tracemalloc, reporting
+the peak memory per subject, scope, and rule, and the size of each
+subject.info subtree. These are compared against a separate baseline since
+tracemalloc slows down curation.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from benchmarks.generator import SubjectGenerator, generate_rxclass
+from nacc_attribute_deriver.attribute_deriver import (
+    AttributeDeriver,
+    MissingnessDeriver,
+)
+from nacc_attribute_deriver.subject_driver import SubjectDriver
+from nacc_attribute_deriver.symbol_table import SymbolTable
+from nacc_attribute_deriver.utils.profiler import RuleProfiler
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_MEMORY_BASELINE = Path(__file__).parent / "baseline_memory.json"
+
+# scopes that took less time than this (in seconds) in the baseline are too
+# noisy to compare
+MIN_SCOPE_TIME = 0.05
+
+# likewise for scope and rule peaks below this many bytes
+MIN_PEAK_MEMORY = 64 * 1024
+
+# metadata the gear pushes back after curating each file
+WRITE_BACK_PATHS = ("file.info.derived", "file.info.resolved", "subject.info")
+
+
+class WriteBackCounter:
+    """Counts the write-back payload of each curated table, in bytes of
+    JSON."""
+
+    def __init__(self) -> None:
+        self.tables = 0
+        self.full_bytes = 0
+        self.delta_bytes = 0
+
+    def __call__(self, scope: str, table: SymbolTable) -> None:
+        self.tables += 1
+        for path in WRITE_BACK_PATHS:
+            value = table.get(path)
+            if value is not None:
+                self.full_bytes += len(json.dumps(value, default=str))
+                self.delta_bytes += len(json.dumps(table.patch(path), default=str))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tables": self.tables,
+            "full_bytes": self.full_bytes,
+            "delta_bytes": self.delta_bytes,
+        }
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of the values.
+
+    Args:
+        values: The values, need not be sorted
+        fraction: The percentile as a fraction, e.g. 0.95
+    Returns:
+        The percentile, or 0 if there are no values
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def scope_results(profiler: RuleProfiler) -> Dict[str, Dict[str, Any]]:
+    """Returns the per-scope throughput recorded by the profiler."""
+    return {
+        scope: {
+            "files": profile.files,
+            "total_time": profile.total_time,
+            "files_per_second": (
+                profile.files / profile.total_time if profile.total_time else 0.0
+            ),
+        }
+        for scope, profile in sorted(profiler.scopes.items())
+    }
+
+
+def memory_results(profiler: RuleProfiler, top_n: int = 20) -> Dict[str, Any]:
+    """Returns the memory statistics recorded by the profiler."""
+    return {
+        "subject_peak": {
+            "mean": profiler.subject_memory.mean_size,
+            "max": profiler.subject_memory.max_size,
+        },
+        "scopes": {
+            scope: profile.peak_memory
+            for scope, profile in sorted(profiler.scopes.items())
+        },
+        "top_rules": [
+            {
+                "scope": scope,
+                "function": function,
+                "peak_memory": profile.peak_memory,
+                "net_memory": profile.net_memory,
+            }
+            for scope, function, profile in profiler.top_rules(top_n, "peak_memory")
+        ],
+        "subtrees": {
+            path: {"mean": profile.mean_size, "max": profile.max_size}
+            for path, profile in sorted(profiler.subtrees.items())
+        },
+    }
+
+
+def run_benchmark(
+    num_subjects: int,
+    seed: int = 0,
+    missingness: bool = False,
+    memory: bool = False,
+    write_back: bool = False,
+    mp_sessions: bool = False,
+) -> Dict[str, Any]:
+    """Generates and curates the subjects, timing each one.
+
+    Subjects are generated up front so generation is not included in the
+    timings.
+
+    Args:
+        num_subjects: The number of subjects to curate
+        seed: The generator seed
+        missingness: Whether to also run file-level missingness
+        memory: Whether to also profile memory with tracemalloc
+        write_back: Whether to also measure the write-back payload
+        mp_sessions: Whether to curate MP acquisitions once per session
+    Returns:
+        The benchmark results
+    """
+    generator = SubjectGenerator(seed=seed)
+    subjects = list(generator.generate_many(num_subjects))
+
+    profiler = RuleProfiler(track_memory=memory)
+    missingness_profiler = RuleProfiler(track_memory=memory)
+    counter = WriteBackCounter() if write_back else None
+    driver = SubjectDriver(
+        deriver=AttributeDeriver(profiler=profiler),
+        missingness_deriver=(
+            MissingnessDeriver("file", profiler=missingness_profiler)
+            if missingness
+            else None
+        ),
+        rxclass=generate_rxclass(seed),
+        on_curated=counter,
+        mp_sessions=mp_sessions,
+    )
+
+    subject_times: List[float] = []
+    num_files = 0
+    for subject in subjects:
+        start = perf_counter()
+        driver.curate_subject(subject.files)
+        subject_times.append(perf_counter() - start)
+        num_files += len(subject.files)
+
+    total_time = sum(subject_times)
+    results: Dict[str, Any] = {
+        "config": {
+            "subjects": num_subjects,
+            "seed": seed,
+            "missingness": missingness,
+            "memory": memory,
+            "write_back": write_back,
+            "mp_sessions": mp_sessions,
+        },
+        "files": num_files,
+        "total_time": total_time,
+        "subjects_per_second": num_subjects / total_time if total_time else 0.0,
+        "files_per_second": num_files / total_time if total_time else 0.0,
+        "subject_time": {
+            "mean": statistics.fmean(subject_times) if subject_times else 0.0,
+            "median": statistics.median(subject_times) if subject_times else 0.0,
+            "p95": percentile(subject_times, 0.95),
+            "max": max(subject_times, default=0.0),
+        },
+        "scopes": scope_results(profiler),
+    }
+    if missingness:
+        results["missingness_scopes"] = scope_results(missingness_profiler)
+
+    results["top_rules"] = [
+        {
+            "scope": scope,
+            "function": function,
+            "calls": profile.calls,
+            "total_time": profile.total_time,
+        }
+        for scope, function, profile in profiler.top_rules(20)
+    ]
+    if counter is not None:
+        results["write_back"] = counter.to_dict()
+    if memory:
+        tracemalloc.stop()
+        results["memory"] = memory_results(profiler)
+        if missingness:
+            results["memory"]["missingness_scopes"] = memory_results(
+                missingness_profiler
+            )["scopes"]
+    return results
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Compares the results against the baseline.
+
+    Compares the overall subject and file throughput, and the throughput of
+    every scope in the baseline that ran for at least MIN_SCOPE_TIME.
+
+    Args:
+        results: The benchmark results
+        baseline: The baseline results
+        tolerance: Allowed relative drop in throughput, e.g. 0.2 for 20%
+    Returns:
+        Descriptions of every regression found; empty if none
+    """
+    if results["config"] != baseline.get("config"):
+        return [
+            f"Benchmark config {results['config']} does not match baseline "
+            + f"config {baseline.get('config')}"
+        ]
+
+    # (name, current throughput, baseline throughput)
+    checks = [
+        (key, results[key], baseline[key])
+        for key in ("subjects_per_second", "files_per_second")
+    ]
+    for key, prefix in (("scopes", ""), ("missingness_scopes", "missingness ")):
+        for scope, scope_baseline in baseline.get(key, {}).items():
+            scope_result = results.get(key, {}).get(scope)
+            if (
+                scope_result is not None
+                and scope_baseline["total_time"] >= MIN_SCOPE_TIME
+            ):
+                checks.append(
+                    (
+                        f"{prefix}{scope} files_per_second",
+                        scope_result["files_per_second"],
+                        scope_baseline["files_per_second"],
+                    )
+                )
+
+    regressions = [
+        f"{name}: {current:.2f} < baseline {expected:.2f} (tolerance {tolerance:.0%})"
+        for name, current, expected in checks
+        if current < expected * (1 - tolerance)
+    ]
+    if "write_back" in results and "write_back" in baseline:
+        current = results["write_back"]["delta_bytes"]
+        expected = baseline["write_back"]["delta_bytes"]
+        if current > expected * (1 + tolerance):
+            regressions.append(
+                f"write-back delta: {current / 1024:.1f} KiB > baseline "
+                + f"{expected / 1024:.1f} KiB (tolerance {tolerance:.0%})"
+            )
+    if "memory" in results and "memory" in baseline:
+        regressions.extend(
+            compare_memory(results["memory"], baseline["memory"], tolerance)
+        )
+
+    return regressions
+
+
+def compare_memory(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Compares the memory results against the baseline.
+
+    Compares the peak memory per subject, the peak memory of every scope
+    in the baseline of at least MIN_PEAK_MEMORY, and the mean size of
+    every subject.info subtree.
+
+    Args:
+        results: The memory results
+        baseline: The baseline memory results
+        tolerance: Allowed relative increase, e.g. 0.2 for 20%
+    Returns:
+        Descriptions of every regression found; empty if none
+    """
+    # (name, current bytes, baseline bytes)
+    checks = [
+        (f"subject peak {key}", results["subject_peak"][key], expected)
+        for key, expected in baseline["subject_peak"].items()
+    ]
+    for key, prefix in (("scopes", ""), ("missingness_scopes", "missingness ")):
+        for scope, expected in baseline.get(key, {}).items():
+            current = results.get(key, {}).get(scope)
+            if current is not None and expected >= MIN_PEAK_MEMORY:
+                checks.append((f"{prefix}{scope} peak", current, expected))
+
+    for path, expected in baseline["subtrees"].items():
+        current = results["subtrees"].get(path)
+        if current is not None:
+            checks.append(
+                (f"subject.info.{path} mean size", current["mean"], expected["mean"])
+            )
+
+    return [
+        f"{name}: {current / 1024:.1f} KiB > baseline {expected / 1024:.1f} KiB "
+        + f"(tolerance {tolerance:.0%})"
+        for name, current, expected in checks
+        if current > expected * (1 + tolerance)
+    ]
+
+
+def report(results: Dict[str, Any]) -> str:
+    """Returns a plain-text summary of the results."""
+    subject_time = results["subject_time"]
+    lines = [
+        f"Subjects: {results['config']['subjects']} "
+        + f"(seed {results['config']['seed']}, "
+        + f"missingness {results['config']['missingness']})",
+        f"Files: {results['files']}",
+        f"Total time (s): {results['total_time']:.3f}",
+        f"Subjects/s: {results['subjects_per_second']:.2f}",
+        f"Files/s: {results['files_per_second']:.2f}",
+        "Per-subject time (ms): "
+        + f"mean {subject_time['mean'] * 1000:.2f}, "
+        + f"median {subject_time['median'] * 1000:.2f}, "
+        + f"p95 {subject_time['p95'] * 1000:.2f}, "
+        + f"max {subject_time['max'] * 1000:.2f}",
+    ]
+
+    for key, title in (("scopes", "Scopes"), ("missingness_scopes", "Missingness")):
+        if key not in results:
+            continue
+        lines.extend(["", f"{title}:"])
+        lines.append(f"  {'scope':<28} {'files':>8} {'total (s)':>11} {'files/s':>10}")
+        for scope, value in sorted(
+            results[key].items(), key=lambda x: x[1]["total_time"], reverse=True
+        ):
+            lines.append(
+                f"  {scope:<28} {value['files']:>8} {value['total_time']:>11.4f} "
+                + f"{value['files_per_second']:>10.1f}"
+            )
+
+    if "write_back" in results:
+        write_back = results["write_back"]
+        ratio = (
+            write_back["delta_bytes"] / write_back["full_bytes"]
+            if write_back["full_bytes"]
+            else 0.0
+        )
+        lines.extend(
+            [
+                "",
+                f"Write-back payload over {write_back['tables']} tables (KiB): "
+                + f"full {write_back['full_bytes'] / 1024:.1f}, "
+                + f"delta {write_back['delta_bytes'] / 1024:.1f} ({ratio:.1%})",
+            ]
+        )
+    if "memory" in results:
+        lines.extend(["", *memory_report(results["memory"])])
+
+    return "\n".join(lines)
+
+
+def memory_report(results: Dict[str, Any]) -> List[str]:
+    """Returns the lines of the memory section of the summary."""
+    subject_peak = results["subject_peak"]
+    lines = [
+        "Peak memory per subject (KiB): "
+        + f"mean {subject_peak['mean'] / 1024:.1f}, "
+        + f"max {subject_peak['max'] / 1024:.1f}",
+    ]
+    for key, title in (
+        ("scopes", "Peak memory per scope"),
+        ("missingness_scopes", "Peak memory per missingness scope"),
+    ):
+        if key not in results:
+            continue
+        lines.extend(["", f"{title}:", f"  {'scope':<28} {'peak (KiB)':>11}"])
+        for scope, peak in sorted(
+            results[key].items(), key=lambda x: x[1], reverse=True
+        ):
+            lines.append(f"  {scope:<28} {peak / 1024:>11.1f}")
+
+    lines.extend(["", "Top rules by peak memory:"])
+    lines.append(
+        f"  {'scope':<20} {'function':<40} {'peak (KiB)':>11} {'net (KiB)':>11}"
+    )
+    for rule in results["top_rules"]:
+        lines.append(
+            f"  {rule['scope']:<20} {rule['function']:<40} "
+            + f"{rule['peak_memory'] / 1024:>11.1f} {rule['net_memory'] / 1024:>11.1f}"
+        )
+
+    lines.extend(["", "subject.info subtree sizes (KiB):"])
+    lines.append(f"  {'subtree':<48} {'mean':>10} {'max':>10}")
+    for path, size in results["subtrees"].items():
+        lines.append(
+            f"  {path:<48} {size['mean'] / 1024:>10.1f} {size['max'] / 1024:>10.1f}"
+        )
+
+    return lines
+
+
+def parse_arguments(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="benchmark curation on synthetic subjects"
+    )
+    parser.add_argument(
+        "--subjects", "-n", type=int, default=50, help="number of subjects"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="generator seed")
+    parser.add_argument(
+        "--missingness",
+        action="store_true",
+        help="also run file-level missingness on each file",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="also profile memory with tracemalloc",
+    )
+    parser.add_argument(
+        "--write-back",
+        action="store_true",
+        help="also measure the full versus delta write-back payload",
+    )
+    parser.add_argument(
+        "--mp-sessions",
+        action="store_true",
+        help="curate MP acquisitions once per session instead of per file",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="baseline results to compare against; defaults to "
+        + "baseline.json, or baseline_memory.json with --memory",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative drop in throughput before failing",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write the results to the baseline file instead of comparing",
+    )
+    parser.add_argument("--output", "-o", help="path to save the results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments(argv)
+
+    results = run_benchmark(
+        args.subjects,
+        seed=args.seed,
+        missingness=args.missingness,
+        memory=args.memory,
+        write_back=args.write_back,
+        mp_sessions=args.mp_sessions,
+    )
+    log.info(report(results))
+
+    if args.baseline is None:
+        args.baseline = DEFAULT_MEMORY_BASELINE if args.memory else DEFAULT_BASELINE
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        with args.baseline.open("w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+        log.info("Wrote baseline to %s", args.baseline)
+        return 0
+
+    if not args.baseline.exists():
+        log.info("No baseline at %s, skipping comparison", args.baseline)
+        return 0
+
+    with args.baseline.open("r", encoding="utf-8") as fh:
+        baseline = json.load(fh)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        log.error("Performance regressions against %s:", args.baseline)
+        for regression in regressions:
+            log.error("  %s", regression)
+        return 1
+
+    log.info("No regressions against %s", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Benchmark for curating SCAN CSVs in bulk with the SCANDriver.
+
+Generates the seven SCAN CSVs in memory, then times reading them and
+curating every subject's rows. Runs offline and only reports; there is no
+baseline to compare against.
+"""
+
+import argparse
+import csv
+import io
+import logging
+import random
+import sys
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from nacc_attribute_deriver.scan_driver import SCANDriver, read_scan_csv
+from nacc_attribute_deriver.utils.scope import SCANMRIScope, SCANPETScope
+
+log = logging.getLogger(__name__)
+
+COLUMNS: Dict[str, List[str]] = {
+    SCANMRIScope.MRI_QC: ["NACCID", "STUDY_DATE", "SERIES_TYPE"],
+    SCANMRIScope.MRI_SBM: ["NACCID", "SCANDT", "CEREBRUMTCV", "WMH"],
+    SCANPETScope.PET_QC: ["NACCID", "SCAN_DATE", "RADIOTRACER"],
+    SCANPETScope.AMYLOID_PET_GAAIN: [
+        "NACCID",
+        "SCANDATE",
+        "TRACER",
+        "AMYLOID_STATUS",
+        "CENTILOIDS",
+        "GAAIN_SUMMARY_SUVR",
+    ],
+    SCANPETScope.AMYLOID_PET_NPDKA: ["NACCID", "SCANDATE", "NPDKA_SUMMARY_SUVR"],
+    SCANPETScope.FDG_PET_NPDKA: ["NACCID", "SCANDATE", "FDG_METAROI_SUVR"],
+    SCANPETScope.TAU_PET_NPDKA: ["NACCID", "SCANDATE", "META_TEMPORAL_SUVR"],
+}
+
+
+def generate_csvs(num_rows: int, seed: int = 0) -> Dict[str, str]:
+    """Generates about num_rows rows across the SCAN CSVs, with about ten
+    rows per subject."""
+    rng = random.Random(seed)
+    rows: Dict[str, List[List[str]]] = {x: [] for x in COLUMNS}
+    total = 0
+    subject = 0
+    while total < num_rows:
+        naccid = f"NACC{subject:06d}"
+        subject += 1
+        for _ in range(rng.randint(1, 3)):
+            scandate = f"{rng.randint(2018, 2025)}-{rng.randint(1, 12):02d}-15"
+            suvr = str(round(rng.uniform(0.8, 2), 3))
+            rows[SCANMRIScope.MRI_QC].append(
+                [naccid, scandate, rng.choice(["T1", "T2", "FLAIR"])]
+            )
+            rows[SCANMRIScope.MRI_SBM].append(
+                [naccid, scandate, str(round(rng.uniform(800, 1200), 2)), ""]
+            )
+            tracer = rng.choice([2, 3, 4, 5, 6, 7])
+            rows[SCANPETScope.PET_QC].append([naccid, scandate, str(tracer)])
+            total += 3
+            if tracer < 6:
+                rows[SCANPETScope.AMYLOID_PET_GAAIN].append(
+                    [
+                        naccid,
+                        scandate,
+                        str(tracer),
+                        rng.choice(["0", "1"]),
+                        str(round(rng.uniform(-20, 120), 2)),
+                        suvr,
+                    ]
+                )
+                rows[SCANPETScope.AMYLOID_PET_NPDKA].append([naccid, scandate, suvr])
+            else:
+                rows[SCANPETScope.TAU_PET_NPDKA].append([naccid, scandate, suvr])
+                rows[SCANPETScope.FDG_PET_NPDKA].append([naccid, scandate, suvr])
+            total += 2
+
+    result = {}
+    for scope, scope_rows in rows.items():
+        stream = io.StringIO()
+        writer = csv.writer(stream)
+        writer.writerow(COLUMNS[scope])
+        writer.writerows(scope_rows)
+        result[scope] = stream.getvalue()
+
+    return result
+
+
+def run_benchmark(num_rows: int = 100000, columnar: bool = False) -> Dict[str, float]:
+    """Reads and curates generated SCAN CSVs.
+
+    Args:
+        num_rows: About how many rows to generate across the CSVs
+        columnar: Whether to derive the SCAN PET variables in columns
+    Returns:
+        The number of rows and subjects, and the seconds taken to read and
+        to curate them
+    """
+    csvs = generate_csvs(num_rows)
+
+    start = perf_counter()
+    sources = [read_scan_csv(io.StringIO(text), scope) for scope, text in csvs.items()]
+    read_time = perf_counter() - start
+
+    start = perf_counter()
+    result = SCANDriver(columnar=columnar).curate(sources)
+    curate_time = perf_counter() - start
+
+    return {
+        "rows": result.num_rows,
+        "subjects": len(result.subjects),
+        "errors": len(result.errors),
+        "read_seconds": read_time,
+        "curate_seconds": curate_time,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="benchmark bulk SCAN curation")
+    parser.add_argument(
+        "--rows", type=int, default=100000, help="rows across the SCAN CSVs"
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="derive the SCAN PET variables in columns (requires numpy)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.rows, args.columnar)
+    log.info(
+        "%d rows (%d subjects, %d errors): read in %.2fs, curated in %.2fs "
+        "(%.0f rows/s)",
+        results["rows"],
+        results["subjects"],
+        results["errors"],
+        results["read_seconds"],
+        results["curate_seconds"],
+        results["rows"] / results["curate_seconds"],
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
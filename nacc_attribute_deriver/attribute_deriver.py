@@ -9,38 +9,53 @@ import csv
 import datetime
 from abc import ABC, abstractmethod
 from importlib import resources
-from typing import Any, Dict, List, Optional, Tuple, Type
+from time import perf_counter
+from typing import Any, Collection, Dict, List, Optional, Tuple, Type
 
 from pydantic import ValidationError
 
 from . import config
 from .attributes.collection.attribute_collection import AttributeCollectionRegistry
+from .attributes.collection.missingness_pattern import (
+    MissingnessPattern,
+    MissingnessPatternProgram,
+)
+from .schema.operation import AssignedValue
 from .schema.rule_types import DateTaggedValue
 from .schema.schema import (
     AttributeAssignment,
     CurationRule,
     MissingnessFileModel,
+    MissingnessPatternFileModel,
     RuleFileModel,
 )
 from .symbol_table import SymbolTable
 from .utils.constants import CURATION_TYPE
 from .utils.errors import AttributeDeriverError, OperationError
+from .utils.profiler import RuleProfiler
 from .utils.scope import FormScope, ScopeLiterals
 
 
 class BaseAttributeDeriver(ABC):
-    def __init__(self, rules_filename: str, curation_type: str):
+    def __init__(
+        self,
+        rules_filename: str,
+        curation_type: str,
+        profiler: Optional[RuleProfiler] = None,
+    ):
         """Initializer.
 
         Args:
             rules_file: Path to raw CSV containing the list of
                 rules to execute.
+            profiler: Optional profiler to record per-rule statistics with
         """
         if curation_type not in CURATION_TYPE:
             raise AttributeDeriverError(f"Unknown derive type: {curation_type}")
 
         self._rules_filename = rules_filename
         self._curation_type = curation_type
+        self._profiler = profiler
 
         self._rule_map = self._load_rules()
         # collect all attributes beforehand so they're easily hashable
@@ -93,6 +108,16 @@ class BaseAttributeDeriver(ABC):
 
         return rule_map
 
+    @property
+    def profiler(self) -> Optional[RuleProfiler]:
+        """Returns the attached profiler, if any."""
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler: Optional[RuleProfiler]) -> None:
+        """Attaches (or detaches, if None) a profiler."""
+        self._profiler = profiler
+
     @abstractmethod
     def get_curated_value(
         self, table: SymbolTable, rule: CurationRule, scope: str
@@ -100,7 +125,12 @@ class BaseAttributeDeriver(ABC):
         """Get the curated value and date, if applicable."""
         pass
 
-    def curate(self, table: SymbolTable, scope: ScopeLiterals) -> None:
+    def curate(
+        self,
+        table: SymbolTable,
+        scope: ScopeLiterals,
+        skip: Collection[str] = (),
+    ) -> None:
         """Curate the symbol table with the rules of this deriver.
 
         Assumes has all the FW metadata required to curate with the schema rules.
@@ -109,32 +139,136 @@ class BaseAttributeDeriver(ABC):
         Args:
             table: symbol table with subject and file data to curate
             scope: The curation scope
+            skip: Names of the scope's rules to not derive for this table
         """
         # derive the variables, if no rules for this scope, return
         rules = self._rule_map.get(scope)
+        if rules and skip:
+            rules = [x for x in rules if x.name not in skip]
         if not rules:
             return
 
+        # memoized state (see SymbolTable.memoize) only lives for this pass
+        table.start_caching()
+        try:
+            if self._profiler is not None:
+                self.__curate_profiled(table, scope, rules, self._profiler)
+                return
+
+            for rule in rules:
+                self.__apply_rule(table, rule, scope)
+        finally:
+            table.stop_caching()
+
+    def __curate_profiled(
+        self,
+        table: SymbolTable,
+        scope: ScopeLiterals,
+        rules: List[CurationRule],
+        profiler: RuleProfiler,
+    ) -> None:
+        """Curate the symbol table while recording per-rule statistics."""
+        memory = profiler.memory
+        if memory is not None:
+            memory.begin()
+
+        scope_start = perf_counter()
         for rule in rules:
-            raw_value, date = self.get_curated_value(table, rule, scope)
-            if raw_value is None:
-                continue
+            if memory is not None:
+                memory.begin()
+
+            start = perf_counter()
+            try:
+                raw_value = self.__apply_rule(table, rule, scope)
+            except Exception:
+                end = perf_counter()
+                peak, net = memory.end() if memory is not None else (0, 0)
+                profiler.record_rule(
+                    scope,
+                    rule.function,
+                    end - start,
+                    failed=True,
+                    peak_memory=peak,
+                    net_memory=net,
+                )
+                scope_peak = memory.end()[0] if memory is not None else 0
+                profiler.record_scope(
+                    scope, end - scope_start, failed=True, peak_memory=scope_peak
+                )
+                raise
+
+            end = perf_counter()
+            peak, net = memory.end() if memory is not None else (0, 0)
+            profiler.record_rule(
+                scope,
+                rule.function,
+                end - start,
+                raw_value,
+                peak_memory=peak,
+                net_memory=net,
+            )
+
+        end = perf_counter()
+        scope_peak = memory.end()[0] if memory is not None else 0
+        profiler.record_scope(scope, end - scope_start, peak_memory=scope_peak)
+
+    def __apply_rule(
+        self, table: SymbolTable, rule: CurationRule, scope: ScopeLiterals
+    ) -> Any:
+        """Derive the value for a single rule and evaluate its assignments.
+
+        Returns:
+            The raw derived value
+        """
+        raw_value, date = self.get_curated_value(table, rule, scope)
+        self.assign(table, rule, raw_value, date)
+        return raw_value
+
+    def assign(
+        self,
+        table: SymbolTable,
+        rule: CurationRule,
+        raw_value: Any,
+        date: Optional[datetime.date],
+    ) -> None:
+        """Evaluates the rule's assignments of a derived value.
+
+        Args:
+            table: The symbol table to assign to
+            rule: The rule the value was derived for
+            raw_value: The derived value; nothing is assigned if None
+            date: The value's date, required for dated assignments
+        """
+        if raw_value is None:
+            return
 
+        if isinstance(raw_value, DateTaggedValue):
+            # already dated, so every assignment evaluates it as is
             for assignment in rule.assignments:
-                value = raw_value
-                operation = assignment.operation
-                if assignment.dated:
-                    if not date:
-                        raise OperationError(
-                            f"Cannot compute date for dated operation on rule {rule}"
-                        )
-
-                    if not isinstance(value, DateTaggedValue):
-                        value = DateTaggedValue(value=value, date=date)
-
-                operation.evaluate(
-                    table=table, value=value, attribute=assignment.attribute
+                if assignment.dated and not date:
+                    raise OperationError(
+                        f"Cannot compute date for dated operation on rule {rule}"
+                    )
+
+                assignment.operation.evaluate(
+                    table=table, value=raw_value, attribute=assignment.attribute
                 )
+            return
+
+        # the assignments share the dated and serialized forms of the value
+        value = AssignedValue(raw_value, date)
+        for assignment in rule.assignments:
+            if assignment.dated and not date:
+                raise OperationError(
+                    f"Cannot compute date for dated operation on rule {rule}"
+                )
+
+            assignment.operation.assign(
+                table=table,
+                value=value,
+                attribute=assignment.attribute,
+                dated=assignment.dated,
+            )
 
     def get_curation_rules(self, scope: ScopeLiterals) -> Optional[List[CurationRule]]:
         """Grabs all curation rules associated with the given scope.
@@ -148,8 +282,8 @@ class BaseAttributeDeriver(ABC):
 
 
 class AttributeDeriver(BaseAttributeDeriver):
-    def __init__(self) -> None:
-        super().__init__("curation_rules.csv", "create")
+    def __init__(self, profiler: Optional[RuleProfiler] = None) -> None:
+        super().__init__("curation_rules.csv", "create", profiler=profiler)
 
     def get_curated_value(
         self, table: SymbolTable, rule: CurationRule, scope: str
@@ -173,18 +307,23 @@ class AttributeDeriver(BaseAttributeDeriver):
 
 
 class MissingnessDeriver(BaseAttributeDeriver):
-    def __init__(self, missingness_level: str) -> None:
+    def __init__(
+        self, missingness_level: str, profiler: Optional[RuleProfiler] = None
+    ) -> None:
         # For missingness, need to split out by level
         if missingness_level not in ["file", "subject", "test"]:
             raise AttributeDeriverError(
                 f"Unknown missingness level: {missingness_level}"
             )
 
-        super().__init__(f"{missingness_level}_missingness.csv", "missingness")
+        super().__init__(
+            f"{missingness_level}_missingness.csv", "missingness", profiler=profiler
+        )
         # the way we deal with/use these two could probably be improved,
         # really brute forcing stuff for now
         self.__attribute_types = self.__get_attribute_types()
         self.__applicable_attributes = self.__load_uds_matrix()
+        self.__patterns = self.__load_patterns()
 
     def __get_attribute_types(self) -> Dict[str, Type]:
         """Get attribute types for each attribute, e.g.,
@@ -240,25 +379,132 @@ class MissingnessDeriver(BaseAttributeDeriver):
 
         return matrix
 
+    def __load_patterns(self) -> Dict[str, MissingnessPatternProgram]:
+        """Load the missingness patterns of this level's rules and compile
+        them by scope.
+
+        Fields with a hand-written missingness function cannot also have a
+        pattern.
+        """
+        patterns: Dict[str, List[MissingnessPattern]] = {}
+        patterns_file = resources.files(config).joinpath("missingness_patterns.csv")
+        with patterns_file.open("r") as fh:
+            reader = csv.DictReader(fh)
+            if not reader.fieldnames:
+                raise AttributeDeriverError(
+                    "No CSV headers found in missingness patterns file"
+                )
+
+            for row in reader:
+                try:
+                    model = MissingnessPatternFileModel.model_validate(row)
+                except ValidationError as error:
+                    raise AttributeDeriverError(
+                        f"error loading missingness pattern row: {error}"
+                    ) from error
+
+                rules = self._rule_map.get(model.scope, [])
+                if not any(x.name == model.field for x in rules):
+                    continue
+
+                function = f"{self._curation_type}_{model.field}"
+                if function in self._instance_collections:
+                    raise AttributeDeriverError(
+                        f"Missingness pattern defined for {model.field}, "
+                        + "which has a missingness function"
+                    )
+
+                patterns.setdefault(model.scope, []).append(
+                    MissingnessPattern.create(
+                        model, self.__attribute_types[model.field]
+                    )
+                )
+
+        return {scope: MissingnessPatternProgram(x) for scope, x in patterns.items()}
+
+    def __evaluate_pattern(
+        self,
+        table: SymbolTable,
+        rule: CurationRule,
+        scope: str,
+        program: MissingnessPatternProgram,
+    ) -> Any:
+        """Evaluates the rule's missingness pattern.
+
+        All patterns of the scope are evaluated at once over the scope's
+        generic missingness collection, and shared by the pattern rules of
+        the pass; patterns only read the form and previous record, which
+        missingness rules do not write.
+        """
+        method = self._instance_collections.get(f"{self._curation_type}_{scope}")
+        if not method:
+            raise AttributeDeriverError(
+                f"Unknown attribute function for scope {scope}: "
+                + f"{self._curation_type}_{scope}"
+            )
+
+        try:
+            results = table.memoize(
+                f"missingness_patterns_{scope}",
+                lambda: program.evaluate(method.attribute_class(table)),
+            )
+        except Exception as e:
+            raise AttributeDeriverError(
+                f"Failed to derive rule {rule.function}: {e}"
+            ) from e
+
+        value = results[rule.name]
+        if isinstance(value, Exception):
+            raise AttributeDeriverError(
+                f"Failed to derive rule {rule.function}: {value}"
+            ) from value
+
+        return value
+
+    @staticmethod
+    def get_uds_version(formver: Any, packet: Any) -> Optional[str]:
+        """Returns the UDS DED matrix key of a form version and packet, e.g.
+        v3.0_I, or None if either is not set."""
+        if formver and packet:
+            return f"v{float(formver):.1f}_{packet.upper()}"
+
+        return None
+
+    def is_applicable(self, field: str, version: Optional[str]) -> bool:
+        """Returns whether the UDS field is applicable to the UDS DED matrix
+        key; all fields are if there is no key."""
+        if version is None:
+            return True
+
+        return bool(self.__applicable_attributes.get(version, {}).get(field))
+
+    def get_attribute_type(self, field: str) -> Type:
+        """Returns the type of the missingness field."""
+        return self.__attribute_types[field]
+
+    def get_patterns(self, scope: str) -> Optional[MissingnessPatternProgram]:
+        """Returns the compiled missingness patterns of the scope, if any."""
+        return self.__patterns.get(scope)
+
     def get_curated_value(
         self, table: SymbolTable, rule: CurationRule, scope: str
     ) -> Tuple[Any, Optional[datetime.date]]:
         """Get the curated value and date, if applicable.
 
-        For missingness variables, if a missingness function is not
-        defined for it, use the generic scope missingness definition.
+        For missingness variables, if neither a missingness function nor
+        a missingness pattern is defined for it, use the generic scope
+        missingness definition.
         """
         applicable = True
 
         # if UDS, determine if the field/rule is applicable to the current
         # version/packet combo. default to True
         if scope == FormScope.UDS:
-            formver = table.get("file.info.forms.json.formver")
-            packet = table.get("file.info.forms.json.packet")
-            if formver and packet:
-                key = f"v{float(formver):.1f}_{packet.upper()}"
-                if not self.__applicable_attributes.get(key, {}).get(rule.name):
-                    applicable = False
+            version = self.get_uds_version(
+                table.get("file.info.forms.json.formver"),
+                table.get("file.info.forms.json.packet"),
+            )
+            applicable = self.is_applicable(rule.name, version)
 
         # if applicable, try to see if this attribute has a specific
         # rule function attached to it, and call that
@@ -271,6 +517,11 @@ class MissingnessDeriver(BaseAttributeDeriver):
                     f"Failed to derive rule {rule.function}: {e}"
                 ) from e
 
+        # or a missingness pattern
+        program = self.__patterns.get(scope)
+        if applicable and program is not None and rule.name in program:
+            return self.__evaluate_pattern(table, rule, scope, program), None
+
         # otherwise, use generic scope missingness function
         # header is a special subscope shared across forms
         if rule.name.startswith("header_"):
@@ -25,6 +25,7 @@ from nacc_attribute_deriver.utils.constants import (
     MISSINGNESS_VALUES,
 )
 from nacc_attribute_deriver.utils.date import (
+    DateIndex,
     date_from_form_date,
     find_closest_date,
     standardize_date,
@@ -144,21 +145,25 @@ class FormMissingnessCollection(AttributeCollection):
 
         value = self.__form.get_value(attribute, attr_type)
         if value is None or (attr_type == str and value in INVALID_TEXT):  # noqa: E721
-            if default is not None:
-                return default
+            return self.missingness_value(attr_type, default)
 
-            if attr_type == int:  # noqa: E721
-                return INFORMED_MISSINGNESS  # type: ignore
-            if attr_type == str:  # noqa: E721
-                return INFORMED_BLANK  # type: ignore
-            if attr_type == float:  # noqa: E721
-                return float(INFORMED_MISSINGNESS)  # type: ignore
+        return value
 
-            raise AttributeDeriverError(
-                f"Unknown missingness attribute type: {attr_type}"
-            )
+    @staticmethod
+    def missingness_value(attr_type: Type[T], default: Optional[T] = None) -> T:
+        """Returns the value a missing field of the type is set to: the
+        default if provided, otherwise -4 / -4.4 / blank."""
+        if default is not None:
+            return default
 
-        return value
+        if attr_type == int:  # noqa: E721
+            return INFORMED_MISSINGNESS  # type: ignore
+        if attr_type == str:  # noqa: E721
+            return INFORMED_BLANK  # type: ignore
+        if attr_type == float:  # noqa: E721
+            return float(INFORMED_MISSINGNESS)  # type: ignore
+
+        raise AttributeDeriverError(f"Unknown missingness attribute type: {attr_type}")
 
     def handle_prev_visit(
         self,
@@ -217,6 +222,7 @@ class UDSCorrelatedFormMissingnessCollection(FormMissingnessCollection):
 
         self.__date_attribute = date_attribute
         self.__working = WorkingNamespace(table=table)
+        self.__table = table
 
     def find_closest_uds_visit(self) -> Tuple[str, int]:
         """Find the closest UDS visit to this form. By calling this, the caller
@@ -239,6 +245,14 @@ class UDSCorrelatedFormMissingnessCollection(FormMissingnessCollection):
         if not uds_visitdates:
             raise AttributeDeriverError("No UDS visits found to correlate")
 
+        # missingness does not write the visitdates, so all lookups of the
+        # pass share one index
+        date_index = self.__table.memoize(
+            "uds_visitdates_index", lambda: DateIndex(uds_visitdates)
+        )
+
         # index + 1 is effectively NACCVNUM
-        uds_visit, index = find_closest_date(uds_visitdates, visitdate)
+        uds_visit, index = find_closest_date(
+            uds_visitdates, visitdate, index=date_index
+        )
         return str(uds_visit), index + 1
@@ -0,0 +1,369 @@
+"""Compiles missingness patterns into one evaluation per form.
+
+Many missingness rules follow one of a few patterns (gated write-ins,
+NORMCOG gates, pulling from the previous visit, etc.) that only differ in
+their fields, gates, and values. Instead of a hand-written method each,
+these are defined as rows in `config/missingness_patterns.csv`. The
+patterns of a scope are compiled into a MissingnessPatternProgram, which
+reads every field and gate its patterns need in one batched read of the
+form, then evaluates all of them in one loop. Fields with irregular logic
+keep their hand-written `_missingness_` methods.
+"""
+
+from abc import abstractmethod
+from types import FunctionType, MappingProxyType
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from nacc_attribute_deriver.attributes.collection.missingness_collection import (
+    FormMissingnessCollection,
+)
+from nacc_attribute_deriver.attributes.namespace.namespace import (
+    AttributeGroup,
+    BaseNamespace,
+)
+from nacc_attribute_deriver.schema.schema import MissingnessPatternFileModel
+from nacc_attribute_deriver.utils.constants import (
+    INFORMED_BLANK,
+    INFORMED_MISSINGNESS,
+    MISSINGNESS_VALUES,
+)
+from nacc_attribute_deriver.utils.errors import AttributeDeriverError
+
+
+class MissingnessPatternRegistry(type):
+    patterns: ClassVar[Dict[str, type]] = {}
+
+    def __init__(
+        cls, name: str, bases: Tuple[type], attrs: Dict[str, str | FunctionType]
+    ):
+        """Registers the class in the registry when the class has this class as
+        a metaclass."""
+        if (
+            cls.LABEL is not None  # type: ignore
+            and cls.LABEL not in MissingnessPatternRegistry.patterns  # type: ignore
+        ):
+            MissingnessPatternRegistry.patterns[cls.LABEL] = cls  # type: ignore
+
+
+class MissingnessPattern(object, metaclass=MissingnessPatternRegistry):
+    """A missingness pattern for a single field.
+
+    - `field` is the field the missingness value is for
+    - `attr_type` is the field's type
+    - `gate` is the (int) gate variable, if any
+    - `values` are the gate values the pattern checks
+    - `default` is the value a missing field is set to, if not the generic
+      missingness value
+    - `prev_code` is the value that pulls the field from the previous visit
+    """
+
+    LABEL: Optional[str] = None
+
+    def __init__(
+        self,
+        field: str,
+        attr_type: Type,
+        gate: Optional[str] = None,
+        values: Optional[List[int]] = None,
+        default: Optional[Any] = None,
+        prev_code: Optional[Any] = None,
+    ) -> None:
+        self.field = field
+        self.attr_type = attr_type
+        self.gate = gate
+        self.values = values if values is not None else []
+        self.default = default
+        self.prev_code = prev_code
+        self.validate()
+
+    @classmethod
+    def create(
+        cls, model: MissingnessPatternFileModel, attr_type: Type
+    ) -> "MissingnessPattern":
+        """Creates the pattern of a pattern definition.
+
+        Args:
+            model: The pattern definition
+            attr_type: The field's type
+        """
+        pattern = MissingnessPatternRegistry.patterns.get(model.pattern)
+        if pattern is None:
+            raise AttributeDeriverError(
+                f"Unrecognized missingness pattern: {model.pattern}"
+            )
+
+        try:
+            return pattern(
+                field=model.field,
+                attr_type=attr_type,
+                gate=model.gate,
+                values=model.values,
+                default=attr_type(model.default) if model.default else None,
+                prev_code=attr_type(model.prev_code) if model.prev_code else None,
+            )
+        except ValueError as e:
+            raise AttributeDeriverError(
+                f"Invalid {model.pattern} pattern for {model.field}: {e}"
+            ) from e
+
+    @property
+    def read_type(self) -> Type:
+        """Returns the type the field is read as."""
+        return self.attr_type
+
+    def validate(self) -> None:
+        """Checks the pattern has what it needs.
+
+        Raises:
+            AttributeDeriverError if it does not
+        """
+        return
+
+    def missingness(self, value: Any) -> Any:
+        """Generic missingness: returns the value, or the missingness value
+        if it is missing."""
+        if value is None:
+            return FormMissingnessCollection.missingness_value(
+                self.attr_type, self.default
+            )
+
+        return value
+
+    @abstractmethod
+    def evaluate(
+        self,
+        collection: FormMissingnessCollection,
+        value: Any,
+        gate_value: Optional[int],
+    ) -> Any:
+        """Evaluates the pattern.
+
+        Args:
+            collection: The form's missingness collection
+            value: The field's value, read as `read_type`
+            gate_value: The gate's value, if the pattern has a gate
+        Returns:
+            The missingness value of the field
+        """
+        pass
+
+
+class GatedPattern(MissingnessPattern):
+    """Base class for patterns with a gate."""
+
+    def validate(self) -> None:
+        if not self.gate or not self.values:
+            raise AttributeDeriverError(
+                f"{self.LABEL} pattern for {self.field} needs a gate and values"
+            )
+
+
+class GatedWriteinPattern(GatedPattern):
+    """If GATE is in VALUES, FIELD is blank; else generic missingness.
+
+    See UDSMissingness.handle_gated_writein.
+    """
+
+    LABEL = "gated_writein"
+
+    @property
+    def read_type(self) -> Type:
+        return str
+
+    def evaluate(
+        self,
+        collection: FormMissingnessCollection,
+        value: Any,
+        gate_value: Optional[int],
+    ) -> Any:
+        if gate_value in self.values:
+            return INFORMED_BLANK
+
+        return self.missingness(value)
+
+
+class ForbiddenGatedWriteinPattern(GatedPattern):
+    """If GATE is NOT the value, FIELD is blank; else generic missingness.
+
+    See UDSMissingness.handle_forbidden_gated_writein.
+    """
+
+    LABEL = "forbidden_gated_writein"
+
+    @property
+    def read_type(self) -> Type:
+        return str
+
+    def validate(self) -> None:
+        super().validate()
+        if len(self.values) != 1:
+            raise AttributeDeriverError(
+                f"{self.LABEL} pattern for {self.field} needs exactly one value"
+            )
+
+    def evaluate(
+        self,
+        collection: FormMissingnessCollection,
+        value: Any,
+        gate_value: Optional[int],
+    ) -> Any:
+        if gate_value != self.values[0]:
+            return INFORMED_BLANK
+
+        return self.missingness(value)
+
+
+class NormcogGatePattern(MissingnessPattern):
+    """If FIELD is blank: if NORMCOG (or GATE, if given) is 1, FIELD is 8,
+    and if it is 0, FIELD is 0; otherwise -4.
+
+    See UDSFormD1Missingness.handle_normcog_gate.
+    """
+
+    LABEL = "normcog_gate"
+
+    def validate(self) -> None:
+        if self.gate is None:
+            self.gate = "normcog"
+        if self.attr_type is not int:
+            raise AttributeDeriverError(
+                f"{self.LABEL} pattern for {self.field} must be an int"
+            )
+
+    def evaluate(
+        self,
+        collection: FormMissingnessCollection,
+        value: Any,
+        gate_value: Optional[int],
+    ) -> Any:
+        if value is not None:
+            return value
+        if gate_value == 1:
+            return 8
+        if gate_value == 0:
+            return 0
+
+        return INFORMED_MISSINGNESS
+
+
+class PrevVisitPattern(MissingnessPattern):
+    """If FIELD is PREV_CODE (or missing, if there is no code), FIELD is the
+    previous visit's value, if set; else generic missingness.
+
+    See FormMissingnessCollection.handle_prev_visit.
+    """
+
+    LABEL = "prev_visit"
+
+    def evaluate(
+        self,
+        collection: FormMissingnessCollection,
+        value: Any,
+        gate_value: Optional[int],
+    ) -> Any:
+        if value == self.prev_code:
+            prev_value = collection.prev_record.get_resolved_value(
+                self.field, self.attr_type, default=self.default
+            )
+            if prev_value is not None and prev_value not in MISSINGNESS_VALUES:
+                return prev_value
+
+        return self.missingness(value)
+
+
+class MissingnessPatternProgram:
+    """The compiled missingness patterns of a scope."""
+
+    def __init__(self, patterns: Iterable[MissingnessPattern]) -> None:
+        """Initializer.
+
+        Args:
+            patterns: The patterns; fields should not repeat
+        """
+        self.__patterns: Dict[str, MissingnessPattern] = {}
+        fields: Dict[Type, List[str]] = {}
+        gates: Dict[str, None] = {}
+        for pattern in patterns:
+            if pattern.field in self.__patterns:
+                raise AttributeDeriverError(
+                    f"Multiple missingness patterns defined for {pattern.field}"
+                )
+
+            self.__patterns[pattern.field] = pattern
+            fields.setdefault(pattern.read_type, []).append(pattern.field)
+            if pattern.gate is not None:
+                gates[pattern.gate] = None
+
+        self.__groups = [AttributeGroup(x, y) for y, x in fields.items()]
+        self.__groups.append(AttributeGroup(gates, int))
+
+    @property
+    def patterns(self) -> Mapping[str, MissingnessPattern]:
+        """The pattern of each field."""
+        return MappingProxyType(self.__patterns)
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.__patterns
+
+    def __len__(self) -> int:
+        return len(self.__patterns)
+
+    @staticmethod
+    def __read(form: BaseNamespace, group: AttributeGroup) -> Dict[str, Any]:
+        """Reads the group in one batch; if any value fails to cast, reads
+        them one at a time instead, keeping the error of each failed value so
+        only its fields fail."""
+        try:
+            return form.get_group_mapping(group)
+        except Exception:
+            result: Dict[str, Any] = {}
+            for attribute in group.attributes:
+                try:
+                    result[attribute] = form.get_value(attribute, group.attr_type)
+                except Exception as e:
+                    result[attribute] = e
+
+            return result
+
+    def evaluate(self, collection: FormMissingnessCollection) -> Dict[str, Any]:
+        """Evaluates all of the patterns over the form.
+
+        Args:
+            collection: The form's missingness collection
+        Returns:
+            The missingness value of each field, or the exception its pattern
+            failed with
+        """
+        form = collection.form
+        values: Dict[Tuple[str, Type], Any] = {}
+        for group in self.__groups:
+            for attribute, value in self.__read(form, group).items():
+                values[(attribute, group.attr_type)] = value
+
+        result: Dict[str, Any] = {}
+        for field, pattern in self.__patterns.items():
+            value = values[(field, pattern.read_type)]
+            gate_value = (
+                values[(pattern.gate, int)] if pattern.gate is not None else None
+            )
+            for read in (value, gate_value):
+                if isinstance(read, Exception):
+                    result[field] = read
+                    break
+            else:
+                try:
+                    result[field] = pattern.evaluate(collection, value, gate_value)
+                except Exception as e:
+                    result[field] = e
+
+        return result
@@ -10,9 +10,10 @@ the scan date.
 
 In short, it's pretty inefficient, because we only really
 need to know about the session and not loop over each image
-in the series. There are probably better ways to go about this,
-but for now, this is the quick and dirty way that fits into
-the current framework.
+in the series. To avoid this, a whole session can be curated
+at once by setting _filename to the list of the session's
+filenames (see SubjectDriver's mp_sessions mode), which
+produces the same subject-level values as curating each file.
 """
 
 from datetime import date
@@ -30,6 +31,7 @@ from nacc_attribute_deriver.attributes.namespace.namespace import (
 )
 from nacc_attribute_deriver.symbol_table import SymbolTable
 from nacc_attribute_deriver.utils.date import (
+    DateIndex,
     calculate_age,
     date_from_form_date,
     find_closest_date,
@@ -43,6 +45,7 @@ class MPAttributeCollection(AttributeCollection):
         self.__mp = MixedProtocolNamespace(table=table)
         self.__working = WorkingNamespace(table=table)
         self.__subject = SubjectDerivedNamespace(table=table)
+        self.__table = table
 
     @property
     def mp(self) -> MixedProtocolNamespace:
@@ -83,9 +86,15 @@ class MPAttributeCollection(AttributeCollection):
         if not uds_visitsdates:
             return 8888
 
+        # only the uds scope writes the visitdates, so all lookups of the
+        # pass share one index
+        index = self.__table.memoize(
+            "uds_visitdates_index", lambda: DateIndex(uds_visitsdates)
+        )
+
         # something should be found, else error thrown
         closest, _ = find_closest_date(
-            uds_visitsdates, str(self.__mp.study_date), as_date=True
+            uds_visitsdates, str(self.__mp.study_date), as_date=True, index=index
         )
 
         return (self.__mp.study_date - closest).days  # type: ignore
@@ -97,19 +106,40 @@ class MPAttributeCollection(AttributeCollection):
         this was the name of the aggregate zip file in S3. However, in FW,
         each image is attached as a separate file to the session. So instead
         we are aggregating each curated dicom as a comma-deliminated list.
+        When a whole session is curated at once, all of its filenames are
+        appended together.
 
         Args:
             attribute: The attribute name to grab current longitudinal
                 date from
         """
-        # grab attribute if it already exists and append filename to it
-        filenames = self.__subject.get_corresponding_longitudinal_value(
-            str(self.__mp.study_date), attribute, str
-        )
-        if filenames is not None:
-            return f"{filenames.strip()},{self.__mp.filename}"
+        # grab attribute if it already exists and append filenames to it
+        filenames = ",".join(self.__mp.filenames)
+        existing = self.__get_session_filenames(attribute)
+        if existing is not None:
+            return f"{existing.strip()},{filenames}"
+
+        return filenames
 
-        return self.__mp.filename
+    def __get_session_filenames(self, attribute: str) -> Optional[str]:
+        """Returns the existing filenames for the session's study date.
+
+        Records written by curation store their dates as ISO strings, so
+        the record is looked up by its raw date and only that record is
+        cast, instead of casting and sorting the whole longitudinal list.
+        Falls back to the full lookup if no record matches that way.
+        """
+        study_date = str(self.__mp.study_date)
+        records = self.__subject.get_value(f"longitudinal.{attribute}", list)
+        for record in reversed(records or []):
+            if isinstance(record, dict) and record.get("date") == study_date:
+                return self.__subject.cast_to_dated_tagged_value(
+                    attribute, record, str
+                ).value
+
+        return self.__subject.get_corresponding_longitudinal_value(
+            study_date, attribute, str
+        )
 
     def get_num_sessions(self, sessions_field: str) -> int:
         """Get total number of sessions.
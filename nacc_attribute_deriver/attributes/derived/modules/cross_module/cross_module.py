@@ -38,8 +38,12 @@ class CrossModuleAttributeCollection(AttributeCollection):
         self.__subject_derived = SubjectDerivedNamespace(table=table)
         self.__working = WorkingNamespace(table=table)
 
-        # participant handler to keep track of the participant's statuses
-        self.__participant = ParticipantStatusHandler(self.__working)
+        # participant handler to keep track of the participant's statuses;
+        # cross_module rules only write derived variables, so all rules of
+        # the pass share one handler over the same working namespace
+        self.__participant = table.memoize(
+            "participant_status", lambda: ParticipantStatusHandler(self.__working)
+        )
 
         # if the center is inactive, will override variables like
         # NACCACTV and NACCNOVS; assume True by default
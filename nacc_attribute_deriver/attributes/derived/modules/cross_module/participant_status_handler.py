@@ -10,7 +10,7 @@ completed the UDS visit and then decided to discontinue at the visit).
 """
 
 from datetime import date
-from typing import Any, Optional
+from typing import Any, Callable, Dict, Optional
 
 from nacc_attribute_deriver.attributes.namespace.namespace import (
     WorkingNamespace,
@@ -33,8 +33,18 @@ TODAY_DATE = date.today()
 
 
 class ParticipantStatusHandler:
+    """Determines the participant's statuses from the working namespace.
+
+    The statuses are read once on creation and the answers are memoized,
+    so the handler assumes the working namespace does not change while it
+    is in use; the cross_module pass shares one handler between all its
+    rules (see `CrossModuleAttributeCollection`).
+    """
+
     def __init__(self, working: WorkingNamespace) -> None:
         """Initializer."""
+        self.__answers: Dict[str, Any] = {}
+
         # possible statuses. if none of these are set, the participant
         # is presumed active
         self.__deceased = DeceasedStatus.create_from_working_namespace(working)
@@ -100,17 +110,32 @@ class ParticipantStatusHandler:
         # otherwise, the status is the latest and valid, return
         return status
 
+    def __memoized(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Returns the memoized answer for name, computing it on first use."""
+        if name not in self.__answers:
+            self.__answers[name] = compute()
+
+        return self.__answers[name]
+
     def deceased(self) -> Optional[DeceasedStatus]:
         """Return if the participant is deceased."""
-        return self.__determine_status_override(self.__deceased)
+        return self.__memoized(
+            "deceased", lambda: self.__determine_status_override(self.__deceased)
+        )
 
     def discontinued(self) -> Optional[DiscontinuedStatus]:
         """Return if the participant is discontinued."""
-        return self.__determine_status_override(self.__discontinued)
+        return self.__memoized(
+            "discontinued",
+            lambda: self.__determine_status_override(self.__discontinued),
+        )
 
     def minimum_contact(self) -> Optional[MinimumContactStatus]:
         """Return if the participant is minimum contact."""
-        return self.__determine_status_override(self.__minimum_contact)
+        return self.__memoized(
+            "minimum_contact",
+            lambda: self.__determine_status_override(self.__minimum_contact),
+        )
 
     def initial_visit_only(self) -> Optional[InitialVisitOnlyStatus]:
         """Return if the participant is initial visit only.
@@ -5,12 +5,10 @@ data. Must correspond to an UDS visit. This is mainly used to inform UDS
 A4 NACC derived variables.
 """
 
-import csv
 import datetime
-from importlib import resources
-from typing import Dict, List
+from functools import cache
+from typing import List
 
-from nacc_attribute_deriver import config
 from nacc_attribute_deriver.attributes.collection.attribute_collection import (
     AttributeCollection,
 )
@@ -23,14 +21,24 @@ from nacc_attribute_deriver.utils.errors import (
     AttributeDeriverError,
     InvalidFieldError,
 )
+from nacc_attribute_deriver.utils.lookup_table import (
+    LookupTable,
+    load_lookup_table,
+)
 
 # hardcoded replacement mappings
 REPLACEMENT_DRUGS = {"s10008": "d04523", "s10136": "d04523"}
 
 
-def load_v1_drugs() -> Dict[str, str | None]:
-    """Load the V1 drugs list. Done globally so it's only done once per
-    execution.
+def normalize_drug(value: str) -> str:
+    """Normalizes a raw drug name or drug ID."""
+    return value.strip().lower()
+
+
+@cache
+def load_v1_drugs() -> LookupTable:
+    """Load the V1 drugs list, mapping raw drug names to drug IDs. Loaded on
+    first use, and only once per execution.
 
     In UDS V1 all the drugs were written in. Uses drug_ids_v1.csv, which
     was manually generated by comparing the raw values with expected QAF
@@ -38,22 +46,9 @@ def load_v1_drugs() -> Dict[str, str | None]:
     really just designed to produce the same drugs list as the legacy
     system.
     """
-    drugs_file_v1 = resources.files(config).joinpath("drug_ids_v1.csv")
-    drugs: Dict[str, str | None] = {}
-
-    with drugs_file_v1.open("r") as fh:
-        reader = csv.DictReader(fh)
-        # map raw drug names to drug IDs
-        for row in reader:
-            raw_drug = row["raw_drug"].strip().lower()
-            drug_id = row["drug_id"].strip().lower()
-            drugs[raw_drug] = drug_id
-
-    return drugs
-
-
-# load this globally so it's only done once per execution
-DRUGS_V1 = load_v1_drugs()
+    return load_lookup_table(
+        "drug_ids_v1.csv", "raw_drug", "drug_id", normalize=normalize_drug
+    )
 
 
 class MEDSFormAttributeCollection(AttributeCollection):
@@ -130,7 +125,7 @@ class MEDSFormAttributeCollection(AttributeCollection):
                     continue
 
                 drug_name = drug_name.strip().lower()
-                drug_id = DRUGS_V1.get(drug_name, "xxxxxx")
+                drug_id = load_v1_drugs().get(drug_name, "xxxxxx")
                 drugs_list.append(drug_id if drug_id is not None else drug_name)
 
         return sorted(drugs_list)
@@ -19,6 +19,7 @@ from nacc_attribute_deriver.utils.errors import (
 
 from .np_form_wide_evaluator import NPFormWideEvaluator
 from .np_mapper import NPMapper
+from .np_record import NPRecord
 
 
 class NPFormAttributeCollection(AttributeCollection):
@@ -48,8 +49,13 @@ class NPFormAttributeCollection(AttributeCollection):
         if self.formver != raw_formver:
             raise AttributeDeriverError(f"Unexpected formver for NP: {raw_formver}")
 
-        self.mapper = NPMapper(self.__np, self.formver)
-        self.form_evaluator = NPFormWideEvaluator(self.__np, self.mapper, self.formver)
+        # the form is read-only during the NP pass, so all of its rules share
+        # one record of the form
+        record = table.memoize("np_record", lambda: NPRecord(self.__np))
+        self.mapper = NPMapper(self.__np, self.formver, record)
+        self.form_evaluator = NPFormWideEvaluator(
+            self.__np, self.mapper, self.formver, record
+        )
 
     def get_date(self) -> Optional[date]:
         return self.__np.get_date()
@@ -1,541 +1,263 @@
 """Class to handle NACCBRNN and NACCVASC due to their complexity of involving
 almost the entire form.
 
-The SAS code currently checks every single variable individually.
-This could probably be refactored some, but for now follow SAS.
+The SAS code checks every single variable individually. Here the per-version
+definitions are tables of the values each variable is checked against, which
+are evaluated as predicates over the form's NPRecord.
 
 NOTE: These seeemed to have been redefined multiple times, and it seems
 like the QAF value may be set to older iterations of this implementation.
 Will need to determine what behavior we want.
 """
 
-from typing import Optional
+from typing import Dict, FrozenSet, Optional, Tuple
 
 from nacc_attribute_deriver.attributes.namespace.namespace import (
     FormNamespace,
 )
 
 from .np_mapper import NPMapper
+from .np_record import NPRecord
+
+# maps each variable to the values it is checked against in each column of
+# the definition, in SAS order
+Definition = Dict[str, Tuple[Tuple[int, ...], ...]]
+
+# (variable, values) pairs a predicate checks, in SAS order
+Criteria = Tuple[Tuple[str, FrozenSet[int]], ...]
+
+# NACCBRNN
+#
+# Columns are the values for which a variable is (1) normal, (2) indicates
+# pathology, and (3) is unknown. No pathology is present (1) if every
+# variable is normal, else unknown (9) if no variable indicates pathology but
+# any is unknown, else (0).
+
+NACCBRNN_V10: Definition = {
+    "npbraak": ((0, 1, 2), (3, 4, 5, 6, 7), (8, 9)),
+    "npneur": ((0,), (1, 2, 3), (8, 9)),
+    "npdiff": ((0,), (1, 2, 3), (8, 9)),
+    "npthal": ((0,), (1, 2, 3, 4, 5), (8, 9)),
+    "npamy": ((0, 1), (2, 3), (8, 9)),
+    "npinf": ((0,), (1,), (8, 9)),
+    "nphemo": ((0,), (1,), (8, 9)),
+    "npold": ((0,), (1,), (8, 9)),
+    "npoldd": ((0,), (1,), ()),
+    "nparter": ((0, 1), (2, 3), (8, 9)),
+    "npwmr": ((0, 1), (2, 3), (8, 9)),
+    "nppath": ((0,), (1,), (8, 9)),
+    "nplbod": ((0,), (1, 2, 3, 4, 5), (8, 9)),
+    "npnloss": ((0, 1), (2, 3), (8, 9)),
+    "nphipscl": ((0,), (1, 2, 3), (8, 9)),
+    "nptdpa": ((0,), (1,), (8, 9)),
+    "nptdpb": ((0,), (1,), (8, 9)),
+    "nptdpc": ((0,), (1,), (8, 9)),
+    "nptdpd": ((0,), (1,), (8, 9)),
+    "nptdpe": ((0,), (1,), (8, 9)),
+    "npftdtau": ((0,), (1,), (8, 9)),
+    "npftdtdp": ((0,), (1,), (8, 9)),
+    "npalsmnd": ((0,), (1, 2, 3, 4, 5), (8, 9)),
+    "npoftd": ((0,), (1,), (8, 9)),
+    "nppdxa": ((0,), (1,), (8, 9)),
+    "nppdxb": ((0,), (1,), (8, 9)),
+    "nppdxc": ((0,), (1,), (8, 9)),
+    "nppdxd": ((0,), (1,), (8, 9)),
+    "nppdxe": ((0,), (1,), (8, 9)),
+    "nppdxf": ((0,), (1,), (8, 9)),
+    "nppdxg": ((0,), (1,), (8, 9)),
+    "nppdxh": ((0,), (1,), (8, 9)),
+    "nppdxi": ((0,), (1,), (8, 9)),
+    "nppdxj": ((0,), (1,), (8, 9)),
+    "nppdxk": ((0,), (1,), (8, 9)),
+    "nppdxl": ((0,), (1,), (8, 9)),
+    "nppdxm": ((0,), (1,), (8, 9)),
+    "nppdxn": ((0,), (1,), (8, 9)),
+    "nppdxr": ((0,), (1,), (8, 9)),
+    "nppdxs": ((0,), (1,), (8, 9)),
+    "nppdxt": ((0,), (1,), (8, 9)),
+}
+
+NACCBRNN_V11 = {**NACCBRNN_V10, "npartag": ((0,), (1,), (8, 9))}
+
+NACCBRNN_V19: Definition = {
+    "npbraak": ((1, 2, 7), (3, 4, 5, 6), (8, 9)),
+    "npneur": ((4,), (1, 2, 3), (5, 9)),
+    "npdiff": ((4,), (1, 2, 3), (5, 9)),
+    "nplinf": ((2,), (1,), (3, 9)),
+    "npmicro": ((2,), (1,), (3, 9)),
+    "nplac": ((2,), (1,), (3, 9)),
+    "nphem": ((2,), (1,), (3, 9)),
+    "npart": ((2,), (1,), (3, 9)),
+    "npnec": ((2,), (1,), (3, 9)),
+    "npscl": ((2,), (1,), (3, 9)),
+    "npavas": ((1, 2), (3, 4), (5, 9)),
+    "nparter": ((1, 2), (3, 4), (5, 9)),
+    "npamy": ((1, 2), (3, 4), (5, 9)),
+    "npoang": ((2,), (1,), (3, 9)),
+    "npvoth": ((2,), (1,), (3, 9)),
+    "nplewy": ((5,), (1, 2, 3, 4), (6, 9)),
+    "nppick": ((2,), (1,), (3, 9)),
+    "npcort": ((2,), (1,), (3, 9)),
+    "npprog": ((2,), (1,), (3, 9)),
+    "npfront": ((2,), (1,), (3, 9)),
+    "nptau": ((2,), (1,), (3, 9)),
+    "npftd": ((3,), (1, 2), (4, 9)),
+    "npftdno": ((2,), (1,), (3, 9)),
+    "npftdspc": ((2,), (1,), (3, 9)),
+    "npcj": ((2,), (1,), (3, 9)),
+    "npprion": ((2,), (1,), (3, 9)),
+    "npmajor": ((2,), (1,), (3, 9)),
+}
+
+# NACCVASC
+#
+# Columns are the values for which a variable indicates cerebrovascular
+# disease is (1) present and (2) absent. Disease is present (1) if any
+# variable says so, else absent (0) if every variable says so, else unknown.
+
+NACCVASC_V1011: Definition = {
+    "npinf": ((1,), (0,)),
+    "nphemo": ((1,), (0,)),
+    "npold": ((1,), (0,)),
+    "npoldd": ((1,), (0,)),
+    "nparter": ((1, 2, 3), (0,)),
+    "npwmr": ((1, 2, 3), (0,)),
+    "nppath": ((1,), (0,)),
+    "npavas": ((1, 2, 3), (0,)),
+    "npamy": ((1, 2, 3), (0,)),
+}
+
+# also used for V1, which falls back to the gross findings when unknown
+NACCVASC_V789: Definition = {
+    "nplinf": ((1,), (2,)),
+    "npmicro": ((1,), (2,)),
+    "nplac": ((1,), (2,)),
+    "nphem": ((1,), (2,)),
+    "npart": ((1,), (2,)),
+    "npnec": ((1,), (2,)),
+    "npscl": ((1,), (2,)),
+    "npavas": ((2, 3, 4), (1,)),
+    "nparter": ((2, 3, 4), (1,)),
+    "npamy": ((2, 3, 4), (1,)),
+    "npoang": ((1,), (2,)),
+    "npvoth": ((1,), (2,)),
+}
+
+
+def criteria(definition: Definition, index: int) -> Criteria:
+    """Builds the criteria from one column of a definition table; variables
+    without values in that column are not checked."""
+    return tuple(
+        (field, frozenset(values[index]))
+        for field, values in definition.items()
+        if values[index]
+    )
+
+
+class NACCBRNNDefinition:
+    """A version of the NACCBRNN definition, as criteria."""
+
+    __slots__ = ("normal", "pathology", "unknown")
+
+    def __init__(self, definition: Definition) -> None:
+        self.normal = criteria(definition, 0)
+        self.pathology = criteria(definition, 1)
+        self.unknown = criteria(definition, 2)
+
+
+class NACCVASCDefinition:
+    """A version of the NACCVASC definition, as criteria."""
+
+    __slots__ = ("absent", "present")
+
+    def __init__(self, definition: Definition) -> None:
+        self.present = criteria(definition, 0)
+        self.absent = criteria(definition, 1)
+
+
+NACCBRNN_DEFINITIONS = {
+    11: NACCBRNNDefinition(NACCBRNN_V11),
+    10: NACCBRNNDefinition(NACCBRNN_V10),
+}
+NACCBRNN_V19_DEFINITION = NACCBRNNDefinition(NACCBRNN_V19)
+
+NACCVASC_DEFINITIONS = {
+    11: NACCVASCDefinition(NACCVASC_V1011),
+    10: NACCVASCDefinition(NACCVASC_V1011),
+    9: NACCVASCDefinition(NACCVASC_V789),
+    8: NACCVASCDefinition(NACCVASC_V789),
+    7: NACCVASCDefinition(NACCVASC_V789),
+    1: NACCVASCDefinition(NACCVASC_V789),
+}
 
 
 class NPFormWideEvaluator:
-    def __init__(self, np: FormNamespace, mapper: NPMapper, formver: int) -> None:
-        """Initializer; assumes np is correct form."""
+    def __init__(
+        self,
+        np: FormNamespace,
+        mapper: NPMapper,
+        formver: int,
+        record: Optional[NPRecord] = None,
+    ) -> None:
+        """Initializer; assumes np is correct form.
+
+        Args:
+            np: The NP form namespace
+            mapper: The NP mapper
+            formver: The NP form version
+            record: The form's record, if already created
+        """
         self.np = np
         self.mapper = mapper
         self.formver = formver
+        self.record = record if record is not None else NPRecord(np)
 
     def get(self, attr: str) -> Optional[int]:
         """Get attribute."""
-        return self.np.get_value(attr, int)
+        return self.record.get(attr)
+
+    def all_match(self, criteria: Criteria) -> bool:
+        """Returns whether every variable has one of its values."""
+        get = self.record.get
+        return all(get(field) in values for field, values in criteria)
 
-    """
-    NACCBRNN
-    """
+    def any_match(self, criteria: Criteria) -> bool:
+        """Returns whether any variable has one of its values."""
+        get = self.record.get
+        return any(get(field) in values for field, values in criteria)
 
     def determine_naccbrnn(self) -> int:
         """Determine NACCBRNN.
 
         Depends on form version.
         """
-        if self.formver == 11:
-            return self._naccbrnn_v11()
-        if self.formver == 10:
-            return self._naccbrnn_v10()
-
-        return self._naccbrnn_v19()
-
-    def _naccbrnn_v11(self) -> int:
-        """Runs the NACCBRNN v11 definition."""
-        if (
-            self.get("npbraak") in [0, 1, 2]
-            and self.get("npneur") == 0
-            and self.get("npdiff") == 0
-            and self.get("npthal") == 0
-            and self.get("npamy") in [0, 1]
-            and self.get("npinf") == 0
-            and self.get("nphemo") == 0
-            and self.get("npold") == 0
-            and self.get("npoldd") == 0
-            and self.get("nparter") in [0, 1]
-            and self.get("npwmr") in [0, 1]
-            and self.get("nppath") == 0
-            and self.get("nplbod") == 0
-            and self.get("npnloss") in [0, 1]
-            and self.get("nphipscl") == 0
-            and self.get("nptdpa") == 0
-            and self.get("nptdpb") == 0
-            and self.get("nptdpc") == 0
-            and self.get("nptdpd") == 0
-            and self.get("nptdpe") == 0
-            and self.get("npftdtau") == 0
-            and self.get("npftdtdp") == 0
-            and self.get("npalsmnd") == 0
-            and self.get("npoftd") == 0
-            and self.get("nppdxa") == 0
-            and self.get("nppdxb") == 0
-            and self.get("nppdxc") == 0
-            and self.get("nppdxd") == 0
-            and self.get("nppdxe") == 0
-            and self.get("nppdxf") == 0
-            and self.get("nppdxg") == 0
-            and self.get("nppdxh") == 0
-            and self.get("nppdxi") == 0
-            and self.get("nppdxj") == 0
-            and self.get("nppdxk") == 0
-            and self.get("nppdxl") == 0
-            and self.get("nppdxm") == 0
-            and self.get("nppdxn") == 0
-            and self.get("nppdxr") == 0
-            and self.get("nppdxs") == 0
-            and self.get("nppdxt") == 0
-            and self.get("npartag") == 0
-        ):
-            return 1
-
-        pathnpv11 = (
-            self.get("npbraak") in [3, 4, 5, 6, 7]
-            or self.get("npneur") in [1, 2, 3]
-            or self.get("npdiff") in [1, 2, 3]
-            or self.get("npthal") in [1, 2, 3, 4, 5]
-            or self.get("npamy") in [2, 3]
-            or self.get("npinf") == 1
-            or self.get("nphemo") == 1
-            or self.get("npold") == 1
-            or self.get("npoldd") == 1
-            or self.get("nparter") in [2, 3]
-            or self.get("npwmr") in [2, 3]
-            or self.get("nppath") == 1
-            or self.get("nplbod") in [1, 2, 3, 4, 5]
-            or self.get("npnloss") in [2, 3]
-            or self.get("nphipscl") in [1, 2, 3]
-            or self.get("nptdpa") == 1
-            or self.get("nptdpb") == 1
-            or self.get("nptdpc") == 1
-            or self.get("nptdpd") == 1
-            or self.get("nptdpe") == 1
-            or self.get("npftdtau") == 1
-            or self.get("npftdtdp") == 1
-            or self.get("npalsmnd") in [1, 2, 3, 4, 5]
-            or self.get("npoftd") == 1
-            or self.get("nppdxa") == 1
-            or self.get("nppdxb") == 1
-            or self.get("nppdxc") == 1
-            or self.get("nppdxd") == 1
-            or self.get("nppdxe") == 1
-            or self.get("nppdxf") == 1
-            or self.get("nppdxg") == 1
-            or self.get("nppdxh") == 1
-            or self.get("nppdxi") == 1
-            or self.get("nppdxj") == 1
-            or self.get("nppdxk") == 1
-            or self.get("nppdxl") == 1
-            or self.get("nppdxm") == 1
-            or self.get("nppdxn") == 1
-            or self.get("nppdxr") == 1
-            or self.get("nppdxs") == 1
-            or self.get("nppdxt") == 1
-            or self.get("npartag") == 1
-        )
-
-        if not pathnpv11 and (
-            self.get("npbraak") in [8, 9]
-            or self.get("npneur") in [8, 9]
-            or self.get("npdiff") in [8, 9]
-            or self.get("npthal") in [8, 9]
-            or self.get("npamy") in [8, 9]
-            or self.get("npinf") in [8, 9]
-            or self.get("nphemo") in [8, 9]
-            or self.get("npold") in [8, 9]
-            or self.get("nparter") in [8, 9]
-            or self.get("npwmr") in [8, 9]
-            or self.get("nppath") in [8, 9]
-            or self.get("nplbod") in [8, 9]
-            or self.get("npnloss") in [8, 9]
-            or self.get("nphipscl") in [8, 9]
-            or self.get("nptdpa") in [8, 9]
-            or self.get("nptdpb") in [8, 9]
-            or self.get("nptdpc") in [8, 9]
-            or self.get("nptdpd") in [8, 9]
-            or self.get("nptdpe") in [8, 9]
-            or self.get("npftdtau") in [8, 9]
-            or self.get("npftdtdp") in [8, 9]
-            or self.get("npalsmnd") in [8, 9]
-            or self.get("npoftd") in [8, 9]
-            or self.get("nppdxa") in [8, 9]
-            or self.get("nppdxb") in [8, 9]
-            or self.get("nppdxc") in [8, 9]
-            or self.get("nppdxd") in [8, 9]
-            or self.get("nppdxe") in [8, 9]
-            or self.get("nppdxf") in [8, 9]
-            or self.get("nppdxg") in [8, 9]
-            or self.get("nppdxh") in [8, 9]
-            or self.get("nppdxi") in [8, 9]
-            or self.get("nppdxj") in [8, 9]
-            or self.get("nppdxk") in [8, 9]
-            or self.get("nppdxl") in [8, 9]
-            or self.get("nppdxm") in [8, 9]
-            or self.get("nppdxn") in [8, 9]
-            or self.get("nppdxr") in [8, 9]
-            or self.get("nppdxs") in [8, 9]
-            or self.get("nppdxt") in [8, 9]
-            or self.get("npartag") in [8, 9]
-        ):
-            return 9
-
-        return 0
-
-    def _naccbrnn_v10(self) -> int:
-        """Runs the NACCBRNN v10 definition."""
-        if (
-            self.get("npbraak") in [0, 1, 2]
-            and self.get("npneur") == 0
-            and self.get("npdiff") == 0
-            and self.get("npthal") == 0
-            and self.get("npamy") in [0, 1]
-            and self.get("npinf") == 0
-            and self.get("nphemo") == 0
-            and self.get("npold") == 0
-            and self.get("npoldd") == 0
-            and self.get("nparter") in [0, 1]
-            and self.get("npwmr") in [0, 1]
-            and self.get("nppath") == 0
-            and self.get("nplbod") == 0
-            and self.get("npnloss") in [0, 1]
-            and self.get("nphipscl") == 0
-            and self.get("nptdpa") == 0
-            and self.get("nptdpb") == 0
-            and self.get("nptdpc") == 0
-            and self.get("nptdpd") == 0
-            and self.get("nptdpe") == 0
-            and self.get("npftdtau") == 0
-            and self.get("npftdtdp") == 0
-            and self.get("npalsmnd") == 0
-            and self.get("npoftd") == 0
-            and self.get("nppdxa") == 0
-            and self.get("nppdxb") == 0
-            and self.get("nppdxc") == 0
-            and self.get("nppdxd") == 0
-            and self.get("nppdxe") == 0
-            and self.get("nppdxf") == 0
-            and self.get("nppdxg") == 0
-            and self.get("nppdxh") == 0
-            and self.get("nppdxi") == 0
-            and self.get("nppdxj") == 0
-            and self.get("nppdxk") == 0
-            and self.get("nppdxl") == 0
-            and self.get("nppdxm") == 0
-            and self.get("nppdxn") == 0
-            and self.get("nppdxr") == 0
-            and self.get("nppdxs") == 0
-            and self.get("nppdxt") == 0
-        ):
-            return 1
-
-        pathnpv10 = (
-            self.get("npbraak") in [3, 4, 5, 6, 7]
-            or self.get("npneur") in [1, 2, 3]
-            or self.get("npdiff") in [1, 2, 3]
-            or self.get("npthal") in [1, 2, 3, 4, 5]
-            or self.get("npamy") in [2, 3]
-            or self.get("npinf") == 1
-            or self.get("nphemo") == 1
-            or self.get("npold") == 1
-            or self.get("npoldd") == 1
-            or self.get("nparter") in [2, 3]
-            or self.get("npwmr") in [2, 3]
-            or self.get("nppath") == 1
-            or self.get("nplbod") in [1, 2, 3, 4, 5]
-            or self.get("npnloss") in [2, 3]
-            or self.get("nphipscl") in [1, 2, 3]
-            or self.get("nptdpa") == 1
-            or self.get("nptdpb") == 1
-            or self.get("nptdpc") == 1
-            or self.get("nptdpd") == 1
-            or self.get("nptdpe") == 1
-            or self.get("npftdtau") == 1
-            or self.get("npftdtdp") == 1
-            or self.get("npalsmnd") in [1, 2, 3, 4, 5]
-            or self.get("npoftd") == 1
-            or self.get("nppdxa") == 1
-            or self.get("nppdxb") == 1
-            or self.get("nppdxc") == 1
-            or self.get("nppdxd") == 1
-            or self.get("nppdxe") == 1
-            or self.get("nppdxf") == 1
-            or self.get("nppdxg") == 1
-            or self.get("nppdxh") == 1
-            or self.get("nppdxi") == 1
-            or self.get("nppdxj") == 1
-            or self.get("nppdxk") == 1
-            or self.get("nppdxl") == 1
-            or self.get("nppdxm") == 1
-            or self.get("nppdxn") == 1
-            or self.get("nppdxr") == 1
-            or self.get("nppdxs") == 1
-            or self.get("nppdxt") == 1
-        )
-
-        if not pathnpv10 and (
-            self.get("npbraak") in [8, 9]
-            or self.get("npneur") in [8, 9]
-            or self.get("npdiff") in [8, 9]
-            or self.get("npthal") in [8, 9]
-            or self.get("npamy") in [8, 9]
-            or self.get("npinf") in [8, 9]
-            or self.get("nphemo") in [8, 9]
-            or self.get("npold") in [8, 9]
-            or self.get("nparter") in [8, 9]
-            or self.get("npwmr") in [8, 9]
-            or self.get("nppath") in [8, 9]
-            or self.get("nplbod") in [8, 9]
-            or self.get("npnloss") in [8, 9]
-            or self.get("nphipscl") in [8, 9]
-            or self.get("nptdpa") in [8, 9]
-            or self.get("nptdpb") in [8, 9]
-            or self.get("nptdpc") in [8, 9]
-            or self.get("nptdpd") in [8, 9]
-            or self.get("nptdpe") in [8, 9]
-            or self.get("npftdtau") in [8, 9]
-            or self.get("npftdtdp") in [8, 9]
-            or self.get("npalsmnd") in [8, 9]
-            or self.get("npoftd") in [8, 9]
-            or self.get("nppdxa") in [8, 9]
-            or self.get("nppdxb") in [8, 9]
-            or self.get("nppdxc") in [8, 9]
-            or self.get("nppdxd") in [8, 9]
-            or self.get("nppdxe") in [8, 9]
-            or self.get("nppdxf") in [8, 9]
-            or self.get("nppdxg") in [8, 9]
-            or self.get("nppdxh") in [8, 9]
-            or self.get("nppdxi") in [8, 9]
-            or self.get("nppdxj") in [8, 9]
-            or self.get("nppdxk") in [8, 9]
-            or self.get("nppdxl") in [8, 9]
-            or self.get("nppdxm") in [8, 9]
-            or self.get("nppdxn") in [8, 9]
-            or self.get("nppdxr") in [8, 9]
-            or self.get("nppdxs") in [8, 9]
-            or self.get("nppdxt") in [8, 9]
-        ):
-            return 9
-
-        return 0
-
-    def _naccbrnn_v19(self):
-        """Runs the NACCBRNN v1 - v9 definition."""
-        if (
-            self.get("npbraak") in [1, 2, 7]
-            and self.get("npneur") == 4
-            and self.get("npdiff") == 4
-            and self.get("nplinf") == 2
-            and self.get("npmicro") == 2
-            and self.get("nplac") == 2
-            and self.get("nphem") == 2
-            and self.get("npart") == 2
-            and self.get("npnec") == 2
-            and self.get("npscl") == 2
-            and self.get("npavas") in [1, 2]
-            and self.get("nparter") in [1, 2]
-            and self.get("npamy") in [1, 2]
-            and self.get("npoang") == 2
-            and self.get("npvoth") == 2
-            and self.get("nplewy") == 5
-            and self.get("nppick") == 2
-            and self.get("npcort") == 2
-            and self.get("npprog") == 2
-            and self.get("npfront") == 2
-            and self.get("nptau") == 2
-            and self.get("npftd") == 3
-            and self.get("npftdno") == 2
-            and self.get("npftdspc") == 2
-            and self.get("npcj") == 2
-            and self.get("npprion") == 2
-            and self.get("npmajor") == 2
-        ):
+        definition = NACCBRNN_DEFINITIONS.get(self.formver, NACCBRNN_V19_DEFINITION)
+        if self.all_match(definition.normal):
             return 1
 
-        # pathnpv9
-        pathnpv9 = (
-            self.get("npbraak") in [3, 4, 5, 6]
-            or self.get("npneur") in [1, 2, 3]
-            or self.get("npdiff") in [1, 2, 3]
-            or self.get("nplinf") == 1
-            or self.get("npmicro") == 1
-            or self.get("nplac") == 1
-            or self.get("nphem") == 1
-            or self.get("npart") == 1
-            or self.get("npnec") == 1
-            or self.get("npscl") == 1
-            or self.get("npavas") in [3, 4]
-            or self.get("nparter") in [3, 4]
-            or self.get("npamy") in [3, 4]
-            or self.get("npoang") == 1
-            or self.get("npvoth") == 1
-            or self.get("nplewy") in [1, 2, 3, 4]
-            or self.get("nppick") == 1
-            or self.get("npcort") == 1
-            or self.get("npprog") == 1
-            or self.get("npfront") == 1
-            or self.get("nptau") == 1
-            or self.get("npftd") in [1, 2]
-            or self.get("npftdno") == 1
-            or self.get("npftdspc") == 1
-            or self.get("npcj") == 1
-            or self.get("npprion") == 1
-            or self.get("npmajor") == 1
-        )
-
-        if not pathnpv9 and (
-            self.get("npbraak") in [8, 9]
-            or self.get("npneur") in [5, 9]
-            or self.get("npdiff") in [5, 9]
-            or self.get("nplinf") in [3, 9]
-            or self.get("npmicro") in [3, 9]
-            or self.get("nplac") in [3, 9]
-            or self.get("nphem") in [3, 9]
-            or self.get("npart") in [3, 9]
-            or self.get("npnec") in [3, 9]
-            or self.get("npscl") in [3, 9]
-            or self.get("npavas") in [5, 9]
-            or self.get("nparter") in [5, 9]
-            or self.get("npamy") in [5, 9]
-            or self.get("npoang") in [3, 9]
-            or self.get("npvoth") in [3, 9]
-            or self.get("nplewy") in [6, 9]
-            or self.get("nppick") in [3, 9]
-            or self.get("npcort") in [3, 9]
-            or self.get("npprog") in [3, 9]
-            or self.get("npfront") in [3, 9]
-            or self.get("nptau") in [3, 9]
-            or self.get("npftd") in [4, 9]
-            or self.get("npftdno") in [3, 9]
-            or self.get("npftdspc") in [3, 9]
-            or self.get("npcj") in [3, 9]
-            or self.get("npprion") in [3, 9]
-            or self.get("npmajor") in [3, 9]
+        if not self.any_match(definition.pathology) and self.any_match(
+            definition.unknown
         ):
             return 9
 
         return 0
 
-    """
-    NACCVASC
-    """
-
     def determine_naccvasc(self) -> int:
         """Determine NACCVASC.
 
         Depends on form version.
         """
-        if self.formver in [10, 11]:
-            return self._naccvasc_v1011()
-        if self.formver in [7, 8, 9]:
-            return self._naccvasc_v789()
-        if self.formver in [1]:
-            return self._naccvasc_v1()
-
-        return 9
+        definition = NACCVASC_DEFINITIONS.get(self.formver)
+        if definition is None:
+            return 9
 
-    def _naccvasc_v1011(self) -> int:
-        """Runs the NACCVASC v10 - v11 definition."""
-        if (
-            self.get("npinf") == 1
-            or self.get("nphemo") == 1
-            or self.get("npold") == 1
-            or self.get("npoldd") == 1
-            or self.get("nparter") in [1, 2, 3]
-            or self.get("npwmr") in [1, 2, 3]
-            or self.get("nppath") == 1
-            or self.get("npavas") in [1, 2, 3]
-            or self.get("npamy") in [1, 2, 3]
-        ):
+        if self.any_match(definition.present):
             return 1
-
-        if (
-            self.get("npinf") == 0
-            and self.get("nphemo") == 0
-            and self.get("npold") == 0
-            and self.get("npoldd") == 0
-            and self.get("nparter") == 0
-            and self.get("npwmr") == 0
-            and self.get("nppath") == 0
-            and self.get("npavas") == 0
-            and self.get("npamy") == 0
-        ):
+        if self.all_match(definition.absent):
             return 0
 
-        return 9
-
-    def _naccvasc_v789(self) -> int:
-        """Runs the NACCVASC v7 - v9 definition."""
-        if (
-            self.get("nplinf") == 1
-            or self.get("npmicro") == 1
-            or self.get("nplac") == 1
-            or self.get("nphem") == 1
-            or self.get("npart") == 1
-            or self.get("npnec") == 1
-            or self.get("npscl") == 1
-            or self.get("npavas") in (2, 3, 4)
-            or self.get("nparter") in (2, 3, 4)
-            or self.get("npamy") in (2, 3, 4)
-            or self.get("npoang") == 1
-            or self.get("npvoth") == 1
-        ):
-            return 1
-
-        if (
-            self.get("nplinf") == 2
-            and self.get("npmicro") == 2
-            and self.get("nplac") == 2
-            and self.get("nphem") == 2
-            and self.get("npart") == 2
-            and self.get("npnec") == 2
-            and self.get("npscl") == 2
-            and self.get("npavas") == 1
-            and self.get("nparter") == 1
-            and self.get("npamy") == 1
-            and self.get("npoang") == 2
-            and self.get("npvoth") == 2
-        ):
-            return 0
+        if self.formver == 1:
+            naccvasc = self.mapper.map_gross(None)
+            return naccvasc if naccvasc is not None else 9
 
         return 9
-
-    def _naccvasc_v1(self) -> int:
-        """Runs the NACCVASC v1 definition."""
-        if (
-            self.get("nplinf") == 1
-            or self.get("npmicro") == 1
-            or self.get("nplac") == 1
-            or self.get("nphem") == 1
-            or self.get("npart") == 1
-            or self.get("npnec") == 1
-            or self.get("npscl") == 1
-            or self.get("npavas") in [2, 3, 4]
-            or self.get("nparter") in [2, 3, 4]
-            or self.get("npamy") in [2, 3, 4]
-            or self.get("npoang") == 1
-            or self.get("npvoth") == 1
-        ):
-            return 1
-
-        if (
-            self.get("nplinf") == 2
-            and self.get("npmicro") == 2
-            and self.get("nplac") == 2
-            and self.get("nphem") == 2
-            and self.get("npart") == 2
-            and self.get("npnec") == 2
-            and self.get("npscl") == 2
-            and self.get("npavas") == 1
-            and self.get("nparter") == 1
-            and self.get("npamy") == 1
-            and self.get("npoang") == 2
-            and self.get("npvoth") == 2
-        ):
-            return 0
-
-        naccvasc = self.mapper.map_gross(None)
-        return naccvasc if naccvasc is not None else 9
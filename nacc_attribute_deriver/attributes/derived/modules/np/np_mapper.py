@@ -10,17 +10,28 @@ from nacc_attribute_deriver.utils.constants import (
 )
 from nacc_attribute_deriver.utils.errors import AttributeDeriverError
 
+from .np_record import NPRecord
+
 
 class NPMapper:
     """Class to define static mapping functions."""
 
-    def __init__(self, np: FormNamespace, formver: int):
-        """Initializer; assumes np is correct form."""
-        self.__np = np
+    def __init__(
+        self, np: FormNamespace, formver: int, record: Optional[NPRecord] = None
+    ):
+        """Initializer; assumes np is correct form.
+
+        Args:
+            np: The NP form namespace
+            formver: The NP form version
+            record: The form's record, if already created; the mappings read
+                the gross findings (npgross, npvasc, nplewy) from it
+        """
+        self.__record = record if record is not None else NPRecord(np)
         self.formver = formver
 
     def map_gross(self, new: int | None) -> Optional[int]:
-        npgross = self.__np.get_value("npgross", int)
+        npgross = self.__record.get("npgross")
         if npgross == 2:
             return 0
         if npgross == 9:
@@ -47,8 +58,8 @@ class NPMapper:
         return 9
 
     def map_vasc(self, new: int | None) -> Optional[int]:
-        npgross = self.__np.get_value("npgross", int)
-        npvasc = self.__np.get_value("npvasc", int)
+        npgross = self.__record.get("npgross")
+        npvasc = self.__record.get("npvasc")
         if npgross == 2 or npvasc == 2:
             return 0
         if npgross == 9 or npvasc == 9:
@@ -59,8 +70,8 @@ class NPMapper:
         return new
 
     def map_nec(self, new: int | None) -> Optional[int]:
-        npgross = self.__np.get_value("npgross", int)
-        npvasc = self.__np.get_value("npvasc", int)
+        npgross = self.__record.get("npgross")
+        npvasc = self.__record.get("npvasc")
         if npgross == 1:
             if npvasc == 2:
                 return 0
@@ -85,7 +96,7 @@ class NPMapper:
         return 9
 
     def map_lewy(self) -> int:
-        nplewy = self.__np.get_value("nplewy", int)
+        nplewy = self.__record.get("nplewy")
         if nplewy == 6:
             return 8
         if nplewy == 5:
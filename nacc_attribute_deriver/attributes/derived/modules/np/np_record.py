@@ -0,0 +1,39 @@
+"""Compact record of an NP form's integer fields.
+
+The NP derivations (NACCBRNN, NACCVASC, and the NPMapper mappings) read
+most of the form, often the same fields over and over. The record reads
+each field through the namespace once, the first time it is needed, and
+keeps the cast value, so every later read is a dictionary lookup.
+"""
+
+from typing import Dict, Optional
+
+from nacc_attribute_deriver.attributes.namespace.namespace import (
+    FormNamespace,
+)
+
+
+class NPRecord:
+    """Integer values of an NP form, read once per field.
+
+    Fields are only read when first needed, so a field that does not cast
+    raises the same error at the same point as reading it directly from
+    the namespace would. The record assumes the form does not change while
+    it is in use.
+    """
+
+    __slots__ = ("__np", "__values")
+
+    def __init__(self, np: FormNamespace) -> None:
+        """Initializer; assumes np is correct form."""
+        self.__np = np
+        self.__values: Dict[str, Optional[int]] = {}
+
+    def get(self, field: str) -> Optional[int]:
+        """Returns the field's value as an int, or None if not set."""
+        try:
+            return self.__values[field]
+        except KeyError:
+            value = self.__np.get_value(field, int)
+            self.__values[field] = value
+            return value
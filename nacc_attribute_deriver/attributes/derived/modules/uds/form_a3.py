@@ -22,6 +22,7 @@ from .helpers.a3_family_handler import (
     A3FamilyHandlerV2,
     A3FamilyHandlerV3,
     A3FamilyHandlerV4,
+    FamilyStatusRecord,
 )
 
 
@@ -33,8 +34,11 @@ class UDSFormA3Attribute(UDSAttributeCollection):
         self.__subject_derived = SubjectDerivedNamespace(table=table)
         self.__working = WorkingNamespace(table=table)
 
-        family_handler_class = self.__determine_family_handler()
-        self.__family = family_handler_class(table=table)
+        # the family statuses only depend on the form and the previous
+        # visit's working values, so all A3 rules of a visit share one record
+        self.__family = table.memoize(
+            "a3_family_record", lambda: self.__make_family_record(table)
+        )
 
     @property
     def submitted(self) -> bool:
@@ -91,6 +95,11 @@ class UDSFormA3Attribute(UDSAttributeCollection):
         # in all other cases, just carry forward the previous values
         return A3FamilyHandlerPrevVisit
 
+    def __make_family_record(self, table: SymbolTable) -> FamilyStatusRecord:
+        """Determine the family statuses as of this visit."""
+        family_handler_class = self.__determine_family_handler()
+        return family_handler_class(table=table).record
+
     def __handle_naccfamily(self, derived_var: str, result: int) -> int:
         """Handles NACCFAM, NACCMOM, and NACCDAD."""
         known_value = self.__subject_derived.get_cross_sectional_value(derived_var, int)
@@ -113,35 +122,35 @@ class UDSFormA3Attribute(UDSAttributeCollection):
         """Creates NACCDAD - Indicator of father with cognitive
         impariment.
         """
-        return self.__handle_naccfamily("naccdad", self.__family.record.dad_status)
+        return self.__handle_naccfamily("naccdad", self.__family.dad_status)
 
     def _create_naccmom(self) -> int:
         """Creates NACCMOM - Indicator of mother with cognitive
         impairment.
         """
-        return self.__handle_naccfamily("naccmom", self.__family.record.mom_status)
+        return self.__handle_naccfamily("naccmom", self.__family.mom_status)
 
     def _create_naccfam(self) -> int:
         """Creates NACCFAM - Indicator of first-degree family
         member with cognitive impariment.
         """
-        return self.__handle_naccfamily("naccfam", self.__family.record.family_status())
+        return self.__handle_naccfamily("naccfam", self.__family.family_status())
 
     def _create_cognitive_status_mom(self) -> int:
         """Keep track of mom's cognitive status."""
-        return self.__family.record.mom_status
+        return self.__family.mom_status
 
     def _create_cognitive_status_dad(self) -> int:
         """Keep track of dad's cognitive status."""
-        return self.__family.record.dad_status
+        return self.__family.dad_status
 
     def _create_cognitive_status_sib(self) -> int:
         """Keep track of sibling's cognitive status."""
-        return self.__family.record.sib_status
+        return self.__family.sib_status
 
     def _create_cognitive_status_kid(self) -> int:
         """Keep track of kid's cognitive status."""
-        return self.__family.record.kid_status
+        return self.__family.kid_status
 
     ###########
     # V3 ONLY #
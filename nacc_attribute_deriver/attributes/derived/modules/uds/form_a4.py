@@ -8,7 +8,7 @@ NOTE: Derived variable are only supposed to reflect the last 2 weeks, so
     for that visit, the derived variable is -4/None).
 """
 
-from typing import List
+from typing import FrozenSet, List, Optional
 
 from nacc_attribute_deriver.attributes.collection.uds_collection import (
     UDSAttributeCollection,
@@ -31,6 +31,7 @@ class UDSFormA4Attribute(UDSAttributeCollection):
         self.__working = WorkingNamespace(table=table)
         self.__rxclass = RxClassNamespace(table=table)
         self.__meds = self.__load_drugs_list()
+        self.__meds_rxclasses: Optional[FrozenSet[str]] = None
 
     @property
     def submitted(self) -> bool:
@@ -96,11 +97,10 @@ class UDSFormA4Attribute(UDSAttributeCollection):
         if not self.__meds:
             return 0
 
-        members = []
-        for rxclass in rxclasses:
-            members.extend(self.__rxclass.get_members(rxclass))
+        if self.__meds_rxclasses is None:
+            self.__meds_rxclasses = self.__rxclass.index.classes_of(self.__meds)
 
-        return 1 if any(x in members for x in self.__meds) else 0
+        return 0 if self.__meds_rxclasses.isdisjoint(rxclasses) else 1
 
     def _create_naccamd(self) -> int:
         """Creates NACCAMD - Total number of medications reported at
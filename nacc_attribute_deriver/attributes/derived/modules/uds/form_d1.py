@@ -15,6 +15,7 @@ from nacc_attribute_deriver.attributes.namespace.namespace import (
     SubjectDerivedNamespace,
     WorkingNamespace,
 )
+from nacc_attribute_deriver.attributes.namespace.uds_namespace import MCI_V3_GROUP
 from nacc_attribute_deriver.symbol_table import SymbolTable
 
 
@@ -44,9 +45,7 @@ class UDSFormDxAttribute(UDSAttributeCollection):
             return 1 if mci == 1 else 0
 
         # all of these fields can be null, 0, or 1
-        mci_vars = self.uds.group_attributes(
-            ["mciamem", "mciaplus", "mcinon1", "mcinon2"], int
-        )
+        mci_vars = self.uds.get_group(MCI_V3_GROUP)
 
         return 1 if any(x == 1 for x in mci_vars) else 0
 
@@ -5,6 +5,7 @@ In V3 and earlier, was part of D1: Clinician Diagnosis.
 
 from typing import List, Optional
 
+from nacc_attribute_deriver.attributes.namespace.namespace import AttributeGroup
 from nacc_attribute_deriver.utils.constants import (
     INFORMED_MISSINGNESS,
 )
@@ -14,6 +15,11 @@ from .form_d1 import UDSFormDxAttribute
 
 
 class UDSFormD1aAttribute(UDSFormDxAttribute):
+    # V4 non-memory cognitive domains
+    CDOM_REGIONS = AttributeGroup(
+        ["cdomlang", "cdomattn", "cdomexec", "cdomvisu", "cdomaprax"], int
+    )
+
     def _create_naccmcim(self) -> int:
         """Creates NACCMCIM - MCI domain affected - memory.
 
@@ -385,9 +391,7 @@ class UDSFormD1aAttribute(UDSFormDxAttribute):
         # V4
         if self.generate_mci() == 1:
             cdommem = self.uds.get_value("cdommem", int)
-            cdom_regions = self.uds.group_attributes(
-                ["cdomlang", "cdomattn", "cdomexec", "cdomvisu", "cdomaprax"], int
-            )
+            cdom_regions = self.uds.get_group(self.CDOM_REGIONS)
 
             if cdommem == 1:
                 if all(x is None for x in cdom_regions):
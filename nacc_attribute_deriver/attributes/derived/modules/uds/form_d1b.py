@@ -6,6 +6,7 @@ In V3 and earlier, was part of D1: Clinician Diagnosis.
 
 from typing import List, Optional
 
+from nacc_attribute_deriver.attributes.namespace.namespace import AttributeGroup
 from nacc_attribute_deriver.utils.constants import (
     INFORMED_MISSINGNESS,
 )
@@ -25,6 +26,28 @@ class ContributionStatus:
 
 
 class UDSFormD1bAttribute(UDSFormDxAttribute):
+    # V4 etiologies that can be marked as primary
+    D1B_ETIOLOGIES = AttributeGroup(
+        [
+            "alzdisif",
+            "lbdif",
+            "msaif",
+            "pspif",
+            "cortif",
+            "ftldmoif",
+            "ftldnoif",
+            "cvdif",
+            "downsif",
+            "huntif",
+            "prionif",
+            "othcogif",
+            "cteif",
+            "caaif",
+            "lateif",
+        ],
+        int,
+    )
+
     def get_contr_status(self, fields: List[str]) -> Optional[int]:
         """Gets the overall contributing status based on the given list.
         Assumes all fields have values null or 1, 2, or 3 (primary,
@@ -211,26 +234,7 @@ class UDSFormD1bAttribute(UDSFormDxAttribute):
 
     def has_primary_d1b(self) -> bool:
         """Check if primary in D1b."""
-        all_attributes = self.uds.group_attributes(
-            [
-                "alzdisif",
-                "lbdif",
-                "msaif",
-                "pspif",
-                "cortif",
-                "ftldmoif",
-                "ftldnoif",
-                "cvdif",
-                "downsif",
-                "huntif",
-                "prionif",
-                "othcogif",
-                "cteif",
-                "caaif",
-                "lateif",
-            ],
-            int,
-        )
+        all_attributes = self.uds.get_group(self.D1B_ETIOLOGIES)
 
         return not all(x == 0 or x is None for x in all_attributes)
 
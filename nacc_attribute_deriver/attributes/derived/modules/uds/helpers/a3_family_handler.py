@@ -4,9 +4,7 @@ Note every form version has distinct logic.
 """
 
 from abc import ABC, abstractmethod
-from typing import ClassVar, List, Literal, Optional
-
-from pydantic import BaseModel, ValidationInfo, field_validator
+from typing import ClassVar, List, Literal, Optional, Tuple
 
 from nacc_attribute_deriver.attributes.namespace.keyed_namespace import (
     PreviousRecordNamespace,
@@ -26,8 +24,10 @@ from nacc_attribute_deriver.utils.errors import AttributeDeriverError
 PARENTS = Literal["mom", "dad"]
 SIBKIDS = Literal["sib", "kid"]
 
+VALID_STATUSES = frozenset([0, 1, 9, INFORMED_MISSINGNESS])
+
 
-class FamilyStatusRecord(BaseModel):
+class FamilyStatusRecord:
     """Keep a record of the family status at each visit. Will be used to update
     the working variable.
 
@@ -37,27 +37,46 @@ class FamilyStatusRecord(BaseModel):
         9: Unknown (default)
     """
 
-    mom_status: int
-    dad_status: int
-    sib_status: int
-    kid_status: int
+    __slots__ = ("dad_status", "kid_status", "mom_status", "sib_status")
 
-    @field_validator(
-        "mom_status", "dad_status", "sib_status", "kid_status", mode="after"
-    )
-    @classmethod
-    def status_valid(cls, value: int, info: ValidationInfo) -> int:
+    def __init__(
+        self, *, mom_status: int, dad_status: int, sib_status: int, kid_status: int
+    ) -> None:
+        self.mom_status = self.status_valid("mom_status", mom_status)
+        self.dad_status = self.status_valid("dad_status", dad_status)
+        self.sib_status = self.status_valid("sib_status", sib_status)
+        self.kid_status = self.status_valid("kid_status", kid_status)
+
+    @staticmethod
+    def status_valid(field_name: str, value: int) -> int:
         """Ensure the status being set is valid."""
-        if value not in [0, 1, 9, INFORMED_MISSINGNESS]:
+        if value not in VALID_STATUSES:
             raise ValueError(
-                f"Unrecognized family member status for {info.field_name}: {value}"
+                f"Unrecognized family member status for {field_name}: {value}"
             )
 
         return value
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FamilyStatusRecord):
+            return NotImplemented
+
+        return self.statuses() == other.statuses()
+
+    def __repr__(self) -> str:
+        return (
+            f"FamilyStatusRecord(mom_status={self.mom_status}, "
+            f"dad_status={self.dad_status}, sib_status={self.sib_status}, "
+            f"kid_status={self.kid_status})"
+        )
+
+    def statuses(self) -> Tuple[int, int, int, int]:
+        """Return the mom, dad, sib, and kid statuses."""
+        return (self.mom_status, self.dad_status, self.sib_status, self.kid_status)
+
     def family_status(self) -> int:
         """Return the status of the family."""
-        statuses = [self.mom_status, self.dad_status, self.sib_status, self.kid_status]
+        statuses = self.statuses()
 
         if any(x == 1 for x in statuses):
             return 1
@@ -7,6 +7,7 @@ lot of core functionality, so extract base class for them to use.
 from typing import Optional
 
 from nacc_attribute_deriver.attributes.collection.uds_collection import UDSMissingness
+from nacc_attribute_deriver.attributes.namespace.uds_namespace import MCI_V3_GROUP
 from nacc_attribute_deriver.symbol_table import SymbolTable
 from nacc_attribute_deriver.utils.constants import INFORMED_MISSINGNESS
 
@@ -29,9 +30,7 @@ class UDSFormD1Missingness(UDSMissingness):
             return 1 if mci == 1 else 0
 
         # all of these fields can be null, 0, or 1
-        mci_vars = self.uds.group_attributes(
-            ["mciamem", "mciaplus", "mcinon1", "mcinon2"], int
-        )
+        mci_vars = self.uds.get_group(MCI_V3_GROUP)
 
         return 1 if any(x == 1 for x in mci_vars) else 0
 
@@ -1,10 +1,7 @@
 """Class to handle A4-specific missingness values."""
 
-import csv
-from importlib import resources
-from typing import Dict
+from functools import cache
 
-from nacc_attribute_deriver import config
 from nacc_attribute_deriver.attributes.collection.uds_collection import UDSMissingness
 from nacc_attribute_deriver.attributes.namespace.namespace import (
     WorkingNamespace,
@@ -12,26 +9,21 @@ from nacc_attribute_deriver.attributes.namespace.namespace import (
 from nacc_attribute_deriver.symbol_table import SymbolTable
 from nacc_attribute_deriver.utils.constants import INFORMED_BLANK, INFORMED_MISSINGNESS
 from nacc_attribute_deriver.utils.errors import AttributeDeriverError
+from nacc_attribute_deriver.utils.lookup_table import (
+    LookupTable,
+    load_lookup_table,
+)
 
 
-def load_udsmeds() -> Dict[str, str]:
-    """Load UDSMEDS table to map drug ID to drug name."""
-    udsmeds_file = resources.files(config).joinpath("UDSMEDS.csv")
-    udsmeds: Dict[str, str] = {}
-
-    with udsmeds_file.open("r") as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            # there unfortunately can be multiple names for the same
-            # drug id; for now we set it to the latest one
-            drug_id = row["DRUG_ID"]
-            udsmeds[drug_id] = row["DRUG_NAME_UCASE"]
-
-    return udsmeds
-
+@cache
+def load_udsmeds() -> LookupTable:
+    """Load UDSMEDS table to map drug ID to drug name. Loaded on first use,
+    and only once per execution.
 
-# load this globally so it's only done once per execution
-UDSMEDS = load_udsmeds()
+    There unfortunately can be multiple names for the same drug id; for
+    now we set it to the latest one.
+    """
+    return load_lookup_table("UDSMEDS.csv", "DRUG_ID", "DRUG_NAME_UCASE")
 
 
 class UDSFormA4Missingness(UDSMissingness):
@@ -260,7 +252,7 @@ class UDSFormA4Missingness(UDSMissingness):
                 drug_id = self.__drugs[index]
 
                 # if drug ID doesn't map to a name, set to "*Not Codable*"
-                result = UDSMEDS.get(drug_id, "*Not Codable*")
+                result = load_udsmeds().get(drug_id, "*Not Codable*")
                 if not result:
                     raise AttributeDeriverError(f"No drug for index {index}")
 
@@ -822,49 +822,8 @@ class UDSFormA5D2Missingness(UDSMissingness):
 
         return self.generic_missingness("pdothryr", int)
 
-    ###################
-    # OTHER - WRITEIN #
-    ###################
-
-    def _missingness_impotherx(self) -> str:
-        """Handles missingness for IMPOTHERX."""
-        return self.handle_gated_writein("impother", "impotherx", [0])
-
-    def _missingness_cancotherx(self) -> str:
-        """Handles missingness for CANCOTHERX."""
-        return self.handle_gated_writein("cancother", "cancotherx", [0])
-
-    def _missingness_canctrothx(self) -> str:
-        """Handles missingness for CANCTROTHX."""
-        return self.handle_gated_writein("canctroth", "canctrothx", [0])
-
-    def _missingness_othcondx(self) -> str:
-        """Handles missingness for OTHCONDX."""
-        return self.handle_gated_writein("othercond", "othcondx", [0, 9])
-
-    def _missingness_othanxdisx(self) -> str:
-        """Handles missingness for OTHANXDISX."""
-        return self.handle_gated_writein("othanxdis", "othanxdisx", [0, 9])
-
-    def _missingness_nomensothx(self) -> str:
-        """Handles missingness for NOMENSOTHX."""
-        return self.handle_gated_writein("nomensoth", "nomensothx", [0])
-
-    def _missingness_cvothrx(self) -> str:
-        """Handles missingness for CVOTHRX."""
-        return self.handle_gated_writein("cvothr", "cvothrx", [0, 9])
-
-    def _missingness_arthtypx(self) -> str:
-        """Handles missingness for ARTHTYPX."""
-        return self.handle_gated_writein("arthrothr", "arthtypx", [0])
-
-    def _missingness_othsleex(self) -> str:
-        """Handles missingness for OTHSLEEX."""
-        return self.handle_gated_writein("othsleep", "othsleex", [0, 9])
-
-    def _missingness_psycdisx(self) -> str:
-        """Handles missingness for PSYCDISX."""
-        return self.handle_gated_writein("psycdis", "psycdisx", [0, 9])
+    # OTHER write-ins are gated write-ins, defined in
+    # config/missingness_patterns.csv
 
     ############################
     # Legacy D2-only variables #
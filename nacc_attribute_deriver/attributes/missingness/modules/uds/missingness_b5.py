@@ -7,10 +7,6 @@ from nacc_attribute_deriver.utils.constants import (
 
 
 class UDSFormB5Missingness(UDSMissingness):
-    def _missingness_npiqinfx(self) -> str:
-        """Handle missingness for NPIQINFX."""
-        return self.handle_forbidden_gated_writein("npiqinf", 3, "npiqinfx")
-
     ###############
     # XSEV values #
     ###############
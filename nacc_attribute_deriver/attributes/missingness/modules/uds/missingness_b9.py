@@ -7,7 +7,10 @@ in particular is extremely odd.
 from typing import List, Optional
 
 from nacc_attribute_deriver.attributes.collection.uds_collection import UDSMissingness
-from nacc_attribute_deriver.attributes.namespace.namespace import WorkingNamespace
+from nacc_attribute_deriver.attributes.namespace.namespace import (
+    AttributeGroup,
+    WorkingNamespace,
+)
 from nacc_attribute_deriver.symbol_table import SymbolTable
 from nacc_attribute_deriver.utils.constants import (
     INFORMED_MISSINGNESS,
@@ -16,6 +19,21 @@ from nacc_attribute_deriver.utils.constants import (
 
 
 class UDSFormB9Missingness(UDSMissingness):
+    # cognitive domains checked by the cognitive decline cascade
+    COGNITIVE_DOMAINS = AttributeGroup(
+        [
+            "cogmem",
+            "cogori",
+            "cogjudg",
+            "coglang",
+            "cogvis",
+            "cogattn",
+            "cogfluc",
+            "cogothr",
+        ],
+        int,
+    )
+
     def __init__(self, table: SymbolTable) -> None:
         super().__init__(table=table)
 
@@ -618,14 +636,6 @@ class UDSFormB9Missingness(UDSMissingness):
         prev_code = 0 if self.__formverb9 == 3 else None
         return self.handle_prev_visit("cogfpred", int, prev_code=prev_code)
 
-    def _missingness_befrst(self) -> int:
-        """Handles missingness for BEFRST."""
-        return self.handle_prev_visit("befrst", int)
-
-    def _missingness_cogfrst(self) -> int:
-        """Handles missingness for COGFRST."""
-        return self.handle_prev_visit("cogfrst", int)
-
     def _missingness_decclin(self) -> int:
         """Handles missingness for DECCLIN."""
         if self.__formverb9 == 1:
@@ -677,19 +687,7 @@ class UDSFormB9Missingness(UDSMissingness):
 
                 return 999
 
-        cog_attr = self.uds.group_attributes(
-            [
-                "cogmem",
-                "cogori",
-                "cogjudg",
-                "coglang",
-                "cogvis",
-                "cogattn",
-                "cogfluc",
-                "cogothr",
-            ],
-            int,
-        )
+        cog_attr = self.uds.get_group(self.COGNITIVE_DOMAINS)
         if any(x != 1 for x in cog_attr):
             return 888
 
@@ -180,18 +180,6 @@ class UDSFormC1C2Missingness(UDSMissingness):
 
         return self.handle_forbidden_gated_writein("npsylan", 3, "npsylanx")
 
-    def _missingness_mocalanx(self) -> str:
-        """Handles missingness for MOCALANX."""
-        return self.handle_forbidden_gated_writein("mocalan", 3, "mocalanx")
-
-    def _missingness_respothx(self) -> str:
-        """Handles missingness for RESPOTHX."""
-        return self.handle_forbidden_gated_writein("respoth", 1, "respothx")
-
-    def _missingness_mmselanx(self) -> str:
-        """Handles missingness for MMSELANX."""
-        return self.handle_forbidden_gated_writein("mmselan", 3, "mmselanx")
-
     #######################################################
     # REYXREC gated variables - cascades across variables #
     # Relies on both VERBALTEST and an earlier variable   #
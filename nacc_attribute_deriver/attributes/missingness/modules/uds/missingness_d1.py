@@ -14,38 +14,7 @@ from .helpers.d1_base import UDSFormD1Missingness
 class UDSFormD1LegacyMissingness(UDSFormD1Missingness):
     """For variables not applicable to or didn't change in V4."""
 
-    ###########################
-    # NORMCOG-gated variables #
-    ###########################
-
-    def _missingness_dysill(self) -> int:
-        """Handles missingness for DYSILL."""
-        return self.handle_normcog_gate("dysill")
-
-    def _missingness_probad(self) -> int:
-        """Handles missingness for PROBAD."""
-        return self.handle_normcog_gate("probad")
-
-    def _missingness_ftd(self) -> int:
-        """Handles missingness for FTD."""
-        return self.handle_normcog_gate("ftd")
-
-    def _missingness_ppaph(self) -> int:
-        """Handles missingness for PPAPH."""
-        return self.handle_normcog_gate("ppaph")
-
-    def _missingness_vasc(self) -> int:
-        """Handles missingness for VASC."""
-        return self.handle_normcog_gate("vasc")
-
-    def _missingness_stroke(self) -> int:
-        """Handles missingness for STROKE."""
-        return self.handle_normcog_gate("stroke")
-
-    def _missingness_demun(self) -> int:
-        """Handles missingness for DEMUN."""
-        result = self.handle_normcog_gate("demun")
-        return result
+    # NORMCOG-gated variables are defined in config/missingness_patterns.csv
 
     ########################################
     # Cognitive impairment-gated variables #
@@ -34,85 +34,8 @@ class UDSFormD1aMissingness(UDSFormD1Missingness):
 
         return self.generic_missingness("predomsyn", int)
 
-    def _missingness_majdepdx(self) -> int:
-        """Handles missingness for MAJDEPDX."""
-        return self.handle_normcog_gate("majdepdx")
-
-    def _missingness_othdepdx(self) -> int:
-        """Handles missingness for OTHDEPDX."""
-        return self.handle_normcog_gate("othdepdx")
-
-    def _missingness_ndevdis(self) -> int:
-        """Handles missingness for NDEVDIS."""
-        return self.handle_normcog_gate("ndevdis")
-
-    def _missingness_tbidx(self) -> int:
-        """Handles missingness for TBIDX."""
-        return self.handle_normcog_gate("tbidx")
-
-    def _missingness_postc19(self) -> int:
-        """Handles missingness for POSTC19."""
-        return self.handle_normcog_gate("postc19")
-
-    def _missingness_apneadx(self) -> int:
-        """Handles missingness for APNEADX."""
-        return self.handle_normcog_gate("apneadx")
-
-    def _missingness_othcogill(self) -> int:
-        """Handles missingness for OTHCOGILL."""
-        return self.handle_normcog_gate("othcogill")
-
-    def _missingness_hyceph(self) -> int:
-        """Handles missingness for HYCEPH."""
-        return self.handle_normcog_gate("hyceph")
-
-    def _missingness_epilep(self) -> int:
-        """Handles missingness for EPILEP."""
-        return self.handle_normcog_gate("epilep")
-
-    def _missingness_neop(self) -> int:
-        """Handles missingness for NEOP."""
-        return self.handle_normcog_gate("neop")
-
-    def _missingness_hiv(self) -> int:
-        """Handles missingness for HIV."""
-        return self.handle_normcog_gate("hiv")
-
-    def _missingness_bipoldx(self) -> int:
-        """Handles missingness for BIPOLDX."""
-        return self.handle_normcog_gate("bipoldx")
-
-    def _missingness_schizop(self) -> int:
-        """Handles missingness for SCHIZOP."""
-        return self.handle_normcog_gate("schizop")
-
-    def _missingness_anxiet(self) -> int:
-        """Handles missingness for ANXIET."""
-        return self.handle_normcog_gate("anxiet")
-
-    def _missingness_delir(self) -> int:
-        """Handles missingness for DELIR."""
-        return self.handle_normcog_gate("delir")
-
-    def _missingness_ptsddx(self) -> int:
-        """Handles missingness for PTSDDX."""
-        return self.handle_normcog_gate("ptsddx")
-
-    def _missingness_othpsy(self) -> int:
-        """Handles missingness for OTHPSY."""
-        return self.handle_normcog_gate("othpsy")
-
-    def _missingness_alcdem(self) -> int:
-        """Handles missingness for ALCDEM."""
-        return self.handle_normcog_gate("alcdem")
-
-    def _missingness_impsub(self) -> int:
-        """Handles missingness for IMPSUB."""
-        return self.handle_normcog_gate("impsub")
-
-    def _missingness_meds(self) -> int:
-        """Handles missingness for MEDS."""
-        return self.handle_normcog_gate("meds")
+    # the other NORMCOG-gated variables are defined in
+    # config/missingness_patterns.csv
 
     def _missingness_cogoth(self) -> int:
         """Handles missingness for COGOTH."""
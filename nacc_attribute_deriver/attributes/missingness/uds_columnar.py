@@ -0,0 +1,386 @@
+"""Columnar evaluation of UDS file-level missingness, for regenerating the
+missingness of many visits at once (see UDSMissingnessDriver).
+
+Instead of instantiating a collection per rule and visit, the visits are
+loaded into one column per form variable, with each subject's visits
+ordered by visit date, and the generic and pattern-based missingness (see
+missingness_pattern) of each variable is evaluated over the whole column
+with NumPy. This includes the previous-visit patterns, whose values carry
+forward from the latest earlier visit of the subject that did not ask to
+pull it. Each value is the same as the row-wise collections would derive;
+rows with values that do not cast are marked as invalid so they can be
+curated row-wise instead.
+
+NumPy is optional; see utils/columnar.
+"""
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from nacc_attribute_deriver.attributes.collection.missingness_collection import (
+    FormMissingnessCollection,
+)
+from nacc_attribute_deriver.attributes.collection.missingness_pattern import (
+    MissingnessPattern,
+)
+from nacc_attribute_deriver.utils.columnar import np, require_columnar
+from nacc_attribute_deriver.utils.constants import (
+    INFORMED_BLANK,
+    INFORMED_MISSINGNESS,
+    INVALID_TEXT,
+    MISSINGNESS_VALUES,
+)
+from nacc_attribute_deriver.utils.date import standardize_date
+from nacc_attribute_deriver.utils.errors import AttributeDeriverError
+
+
+class FormColumn:
+    """A column of form values cast to a type the way BaseNamespace.get_value
+    casts them.
+
+    - `values` holds the cast values, None where missing or invalid
+    - `missing` marks values that are None or invalid text
+    - `invalid` marks values that do not cast to the type
+    - `numbers` holds numeric values as floats, NaN where missing, invalid,
+      or not numeric; gates are compared against these
+    """
+
+    __slots__ = ("invalid", "missing", "numbers", "values")
+
+    def __init__(self, raw: Sequence[Any], attr_type: Type) -> None:
+        size = len(raw)
+        values = np.full(size, None, dtype=object)
+        missing = np.zeros(size, dtype=bool)
+        invalid = np.zeros(size, dtype=bool)
+        numbers = np.full(size, np.nan)
+        numeric = attr_type in (int, float)
+        for i, value in enumerate(raw):
+            if isinstance(value, str):
+                value = value.strip()
+                if value in INVALID_TEXT:
+                    value = None
+
+            if value is None:
+                missing[i] = True
+                continue
+
+            try:
+                value = attr_type(value)
+            except Exception:
+                invalid[i] = True
+                continue
+
+            values[i] = value
+            if numeric:
+                try:
+                    numbers[i] = value
+                except OverflowError:
+                    continue
+
+        self.values = values
+        self.missing = missing
+        self.invalid = invalid
+        self.numbers = numbers
+
+    def isin(self, codes: Sequence[int]) -> Any:
+        """Returns the mask of values that are one of the codes."""
+        return np.isin(self.numbers, codes)
+
+
+class MissingnessColumn:
+    """The missingness values of a field for a column of rows.
+
+    - `values` holds the value of each row
+    - `invalid` marks rows that read a value that does not cast, whose
+      values are meaningless
+    """
+
+    __slots__ = ("invalid", "values")
+
+    def __init__(self, values: Any, invalid: Any) -> None:
+        self.values = values
+        self.invalid = invalid
+
+
+class UDSMissingnessColumnarEvaluator:
+    """Evaluates the generic and pattern-based missingness of UDS fields over
+    columns of visits."""
+
+    def __init__(self, forms: Sequence[Mapping[str, Any]], first: Sequence[bool]):
+        """Initializer.
+
+        Args:
+            forms: The `file.info.forms.json` of each visit, with each
+                subject's visits consecutive and in visit order
+            first: Whether each visit is the first of its subject
+        """
+        require_columnar("missingness")
+
+        self.__forms = forms
+        self.__first = np.asarray(first, dtype=bool)
+        self.__columns: Dict[Tuple[str, Type], FormColumn] = {}
+
+    def __len__(self) -> int:
+        return len(self.__forms)
+
+    @staticmethod
+    def supports(pattern: MissingnessPattern) -> bool:
+        """Returns whether the pattern can be evaluated in columns."""
+        evaluator = PATTERN_EVALUATORS.get(pattern.LABEL)  # type: ignore
+        if evaluator is None:
+            return False
+
+        # a blank previous value falls back to the previous raw value or the
+        # default, which is not carried in columns
+        return not (
+            evaluator is prev_visit
+            and pattern.attr_type is str
+            and pattern.default is not None
+        )
+
+    def column(self, field: str, attr_type: Type) -> FormColumn:
+        """Returns the field's values cast to the type."""
+        column = self.__columns.get((field, attr_type))
+        if column is None:
+            column = self.__columns[(field, attr_type)] = FormColumn(
+                [x.get(field) for x in self.__forms], attr_type
+            )
+
+        return column
+
+    def generic(self, field: str, attr_type: Type) -> MissingnessColumn:
+        """Evaluates generic UDS missingness, the same as
+        GenericUDSMissingness._missingness_uds."""
+        column = self.column(field, attr_type)
+        if field.startswith("frmdate") and attr_type is str:
+            return frmdates(column)
+
+        return MissingnessColumn(missingness(column, attr_type), column.invalid)
+
+    def pattern(
+        self, pattern: MissingnessPattern, applicable: Optional[Any] = None
+    ) -> MissingnessColumn:
+        """Evaluates a missingness pattern.
+
+        Args:
+            pattern: The pattern
+            applicable: Marks the rows the pattern applies to, if not all;
+                the values of the other rows are meaningless, but they do
+                not carry previous-visit values
+        """
+        if not self.supports(pattern):
+            raise AttributeDeriverError(
+                f"Cannot evaluate {pattern.LABEL} pattern for {pattern.field} "
+                + "in columns"
+            )
+
+        column = self.column(pattern.field, pattern.read_type)
+        invalid = column.invalid
+        gate = None
+        if pattern.gate is not None:
+            gate = self.column(pattern.gate, int)
+            invalid = invalid | gate.invalid
+
+        if applicable is None:
+            applicable = np.ones(len(self), dtype=bool)
+
+        values = PATTERN_EVALUATORS[pattern.LABEL](  # type: ignore
+            self, pattern, column, gate, applicable
+        )
+        return MissingnessColumn(values, invalid)
+
+    def evaluate(
+        self,
+        fields: Sequence[Tuple[str, Type, Optional[MissingnessPattern]]],
+        groups: Sequence[int],
+        patterned: Sequence[Sequence[bool]],
+        generic: Sequence[Sequence[bool]],
+    ) -> Tuple[List[List[Any]], List[bool]]:
+        """Evaluates the missingness of the fields, where each group of rows
+        (e.g. a form version and packet) applies either the field's pattern,
+        generic missingness, or neither.
+
+        Args:
+            fields: The fields with their types and patterns, if any
+            groups: The group of each row
+            patterned: For each group, whether each field applies its pattern
+            generic: For each group, whether each field applies generic
+                missingness
+        Returns:
+            The values of each field, None for rows that apply neither, and
+            whether each row read a value that does not cast
+        """
+        size = len(self)
+        codes = np.asarray(groups, dtype=int)
+        by_pattern = np.asarray(patterned, dtype=bool).reshape(-1, len(fields))
+        by_generic = np.asarray(generic, dtype=bool).reshape(-1, len(fields))
+        invalid = np.zeros(size, dtype=bool)
+
+        values: List[List[Any]] = []
+        for j, (field, attr_type, pattern) in enumerate(fields):
+            result = np.full(size, None, dtype=object)
+            rows = by_generic[codes, j]
+            if rows.any():
+                evaluated = self.generic(field, attr_type)
+                result[rows] = evaluated.values[rows]
+                invalid |= rows & evaluated.invalid
+
+            rows = by_pattern[codes, j]
+            if pattern is not None and rows.any():
+                evaluated = self.pattern(pattern, rows)
+                result[rows] = evaluated.values[rows]
+                invalid |= rows & evaluated.invalid
+
+            values.append(result.tolist())
+
+        return values, invalid.tolist()
+
+    def previous(self, carry: Any) -> Any:
+        """Finds the rows that carry values forward to the rows that ask for
+        the previous visit's value.
+
+        Args:
+            carry: Marks the rows that carry the value of the latest earlier
+                row of the subject that does not carry
+        Returns:
+            For each row, the index of the latest earlier (or same) row of
+            the subject that does not carry, or -1 if there is none
+        """
+        indices = np.arange(len(carry))
+        anchors = np.maximum.accumulate(np.where(carry, -1, indices))
+        starts = np.maximum.accumulate(np.where(self.__first, indices, -1))
+        return np.where(anchors >= starts, anchors, -1)
+
+
+def missingness(column: FormColumn, attr_type: Type, default: Any = None) -> Any:
+    """Returns the column's values, with the missingness value of the type
+    (or the default) where missing."""
+    return np.where(
+        column.missing,
+        FormMissingnessCollection.missingness_value(attr_type, default),
+        column.values,
+    )
+
+
+def frmdates(column: FormColumn) -> MissingnessColumn:
+    """Standardizes a column of FRMDATEX values, blank where not a date."""
+    values = np.full(len(column.values), INFORMED_BLANK, dtype=object)
+    invalid = column.invalid.copy()
+    for i, value in enumerate(column.values.tolist()):
+        try:
+            result = standardize_date(value)
+        except AttributeDeriverError:
+            continue
+        except Exception:
+            invalid[i] = True
+            continue
+
+        if result:
+            values[i] = result
+
+    return MissingnessColumn(values, invalid)
+
+
+def resolved(values: Any) -> Any:
+    """Returns the mask of missingness values that are set for the next
+    visit, i.e. are not a missingness code."""
+    return np.array([x not in MISSINGNESS_VALUES for x in values.tolist()], dtype=bool)
+
+
+def gated_writein(
+    evaluator: UDSMissingnessColumnarEvaluator,
+    pattern: MissingnessPattern,
+    column: FormColumn,
+    gate: Optional[FormColumn],
+    applicable: Any,
+) -> Any:
+    return np.where(
+        gate.isin(pattern.values),  # type: ignore
+        INFORMED_BLANK,
+        missingness(column, pattern.attr_type, pattern.default),
+    )
+
+
+def forbidden_gated_writein(
+    evaluator: UDSMissingnessColumnarEvaluator,
+    pattern: MissingnessPattern,
+    column: FormColumn,
+    gate: Optional[FormColumn],
+    applicable: Any,
+) -> Any:
+    return np.where(
+        gate.numbers != pattern.values[0],  # type: ignore
+        INFORMED_BLANK,
+        missingness(column, pattern.attr_type, pattern.default),
+    )
+
+
+def normcog_gate(
+    evaluator: UDSMissingnessColumnarEvaluator,
+    pattern: MissingnessPattern,
+    column: FormColumn,
+    gate: Optional[FormColumn],
+    applicable: Any,
+) -> Any:
+    gated = np.full(len(column.values), INFORMED_MISSINGNESS, dtype=object)
+    gated[gate.numbers == 1] = 8  # type: ignore
+    gated[gate.numbers == 0] = 0  # type: ignore
+    return np.where(column.missing, gated, column.values)
+
+
+def prev_visit(
+    evaluator: UDSMissingnessColumnarEvaluator,
+    pattern: MissingnessPattern,
+    column: FormColumn,
+    gate: Optional[FormColumn],
+    applicable: Any,
+) -> Any:
+    """A row whose value is the previous-visit code takes the value of the
+    previous visit, if set. That value is itself either the row's own
+    (generic) value or carried from the visit before it, so each carrying
+    row takes the value of the latest earlier row of the subject that does
+    not carry, if that value is set."""
+    generic = missingness(column, pattern.attr_type, pattern.default)
+    if pattern.prev_code is None:
+        carry = column.missing & applicable
+    else:
+        carry = ~column.missing & (column.values == pattern.prev_code) & applicable
+
+    anchors = evaluator.previous(carry)
+    carried = carry & (anchors >= 0)
+    values = generic.copy()
+    if carried.any():
+        previous = generic[anchors[carried]]
+        values[carried] = np.where(resolved(previous), previous, generic[carried])
+
+    return values
+
+
+# the columnar equivalent of each missingness pattern, by label
+PATTERN_EVALUATORS: Dict[
+    str,
+    Callable[
+        [
+            UDSMissingnessColumnarEvaluator,
+            MissingnessPattern,
+            FormColumn,
+            Optional[FormColumn],
+            Any,
+        ],
+        Any,
+    ],
+] = {
+    "gated_writein": gated_writein,
+    "forbidden_gated_writein": forbidden_gated_writein,
+    "normcog_gate": normcog_gate,
+    "prev_visit": prev_visit,
+}
@@ -5,7 +5,7 @@ Assumes NACC-derived variables are already set
 
 import datetime
 from types import MappingProxyType
-from typing import List, Mapping, Optional
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
 
 from nacc_attribute_deriver.attributes.collection.attribute_collection import (
     AttributeCollection,
@@ -19,6 +19,69 @@ from nacc_attribute_deriver.attributes.namespace.uds_namespace import (
 from nacc_attribute_deriver.symbol_table import SymbolTable
 
 
+class DiagnosisSnapshot:
+    """The diagnosis values of a visit, read once from the UDS form, falling
+    back to the derived variables where the form has no value.
+
+    The mapped values are memoized by mapping and expected value, so the
+    snapshot assumes neither namespace changes while it is in use; the
+    cognitive rules of a pass share one snapshot (see
+    `CognitiveAttributeCollection`).
+    """
+
+    def __init__(
+        self, uds: UDSNamespace, derived: DerivedNamespace, attributes: Iterable[str]
+    ) -> None:
+        """Initializer.
+
+        Args:
+            uds: The UDS namespace
+            derived: The derived namespace
+            attributes: The attributes to read up front
+        """
+        self.__uds = uds
+        self.__derived = derived
+        self.__values: Dict[str, Optional[int]] = {}
+        self.__mapped: Dict[
+            Tuple[int, int], Tuple[Mapping[str, str], FrozenSet[str]]
+        ] = {}
+        self.__read(attributes)
+
+    def __read(self, attributes: Iterable[str]) -> None:
+        """Reads the attributes not read yet."""
+        unread = [x for x in attributes if x not in self.__values]
+        if not unread:
+            return
+
+        values = self.__uds.map_attributes(unread, int)
+        missing = [x for x, value in values.items() if not value]
+        if missing:
+            values.update(self.__derived.map_attributes(missing, int))
+
+        self.__values.update(values)
+
+    def map_attributes(
+        self, mapping: Mapping[str, str], expected_value: int
+    ) -> FrozenSet[str]:
+        """Returns the string values of the attributes in the mapping whose
+        value matches the expected value."""
+        key = (id(mapping), expected_value)
+        cached = self.__mapped.get(key)
+        if cached is not None and cached[0] is mapping:
+            return cached[1]
+
+        self.__read(mapping.keys())
+        result = frozenset(
+            label
+            for attribute, label in mapping.items()
+            if self.__values[attribute] == expected_value
+        )
+
+        # keep the mapping so its id is not reused while cached
+        self.__mapped[key] = (mapping, result)
+        return result
+
+
 class CognitiveAttributeCollection(AttributeCollection):
     """Class to collect cognitive attributes."""
 
@@ -46,6 +109,18 @@ class CognitiveAttributeCollection(AttributeCollection):
             ),
         )
 
+        # the contributing diagnosis and dementia rules only read the form
+        # and derived variables curated before them, so all cognitive rules
+        # of the pass share one snapshot of both mappings
+        self.__diagnoses = table.memoize(
+            "cognitive_diagnoses",
+            lambda: DiagnosisSnapshot(
+                self.__uds,
+                self.__derived,
+                [*self.DIAGNOSIS_MAPPINGS, *self.DEMENTIA_MAPPINGS],
+            ),
+        )
+
     def get_date(self) -> Optional[datetime.date]:
         return self.__uds.get_date()
 
@@ -108,32 +183,6 @@ class CognitiveAttributeCollection(AttributeCollection):
         }
     )
 
-    def __filter_attributes(
-        self, attributes: List[str], expected_value: int
-    ) -> List[str]:
-        """Returns a list of the attributes that have the expected value.
-
-        Args:
-          attributes: the list of attributes to filter
-          expected_value: the value to test against in filtering
-        Returns:
-          the list of attributes whose value matches the expected_value. can be empty
-        """
-        attribute_list: List[str] = []
-        for attribute in attributes:
-            value = self.__uds.get_value(attribute, int)
-            if not value:
-                value = self.__derived.get_value(attribute, int)
-            if not value:
-                continue
-
-            if value != expected_value:
-                continue
-
-            attribute_list.append(attribute)
-
-        return sorted(attribute_list)
-
     def map_attributes(
         self, mapping: Mapping[str, str], expected_value: int
     ) -> List[str]:
@@ -147,10 +196,7 @@ class CognitiveAttributeCollection(AttributeCollection):
           the list of string values from the attribute mapping for attributes
           with the expected value
         """
-        attributes = self.__filter_attributes(
-            attributes=list(mapping.keys()), expected_value=expected_value
-        )
-        return list({mapping[attribute] for attribute in attributes})
+        return list(self.__diagnoses.map_attributes(mapping, expected_value))
 
     def _create_contributing_diagnosis(self) -> List[str]:
         """Mapped from all possible contributing diagnosis."""
@@ -40,15 +40,23 @@ class SCANMRIQCAttributeCollection(AttributeCollection):
 
     def __init__(self, table: SymbolTable):
         self.__mri_qc = SCANMRINamespace(table, scope=SCANMRIScope.MRI_QC)
-        self.__working = WorkingNamespace(
-            table=table, required=frozenset(["cross-sectional.scan-mri-dates"])
-        )
 
     def _create_scan_mri_scan_types(self) -> Optional[str]:
         """SCAN MRI scan types available Access series_type (scan_mridashboard
         file)"""
         return self.__mri_qc.get_value("series_type", str)
 
+
+class SCANMRISessionsAttributeCollection(AttributeCollection):
+    """Class to collect the SCAN MRI session counts (scan_mridashboard.csv),
+    which count the session dates collected in the subject's working
+    variables."""
+
+    def __init__(self, table: SymbolTable):
+        self.__working = WorkingNamespace(
+            table=table, required=frozenset(["cross-sectional.scan-mri-dates"])
+        )
+
     def _create_scan_mri_session_count(self) -> int:
         """Number of SCAN MRI session available.
 
@@ -129,9 +137,6 @@ class SCANPETQCAttributeCollection(AttributeCollection):
 
     def __init__(self, table: SymbolTable):
         self.__pet_qc = SCANPETNamespace(table, scope=SCANPETScope.PET_QC)
-        self.__working = WorkingNamespace(
-            table=table, required=frozenset(["cross-sectional.scan-pet-dates"])
-        )
 
     def _create_scan_pet_scan_types(self) -> Optional[str]:
         """SCAN PET types available Access radiotracer (scan_petdashboard) and
@@ -154,6 +159,17 @@ class SCANPETQCAttributeCollection(AttributeCollection):
 
         return None
 
+
+class SCANPETSessionsAttributeCollection(AttributeCollection):
+    """Class to collect the SCAN PET session counts (scan_petdashboard.csv),
+    which count the session dates collected in the subject's working
+    variables."""
+
+    def __init__(self, table: SymbolTable):
+        self.__working = WorkingNamespace(
+            table=table, required=frozenset(["cross-sectional.scan-pet-dates"])
+        )
+
     def _create_scan_pet_session_count(self) -> int:
         """Number of SCAN PET sessions available.
 
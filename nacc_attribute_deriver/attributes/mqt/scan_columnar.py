@@ -0,0 +1,289 @@
+"""Columnar evaluation of the SCAN PET MQT variables, for bulk SCAN
+curation (see SCANDriver).
+
+Instead of instantiating a collection per row, the PET QC, Amyloid GAAIN,
+and NPDKA variables are derived for whole columns of rows at once with
+NumPy, using the same TRACER_MAPPING/TRACER_SCAN_TYPE_MAPPING tables as
+SCANPETNamespace. Each value is the same as the row-wise collection would
+derive, and rows the row-wise collection would fail on (missing required
+fields, values that do not cast) are reported as failed instead.
+
+NumPy is optional; see utils/columnar.
+"""
+
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from nacc_attribute_deriver.attributes.namespace.scan_namespace import (
+    SCAN_REQUIRED_FIELDS,
+    SCANPETNamespace,
+)
+from nacc_attribute_deriver.utils.columnar import np, require_columnar
+from nacc_attribute_deriver.utils.constants import INVALID_TEXT
+from nacc_attribute_deriver.utils.scope import SCANPETScope
+
+from .scan import PETAnalysisTypes
+
+
+class FloatColumn:
+    """A column of raw values cast to float the way BaseNamespace.get_value
+    casts them.
+
+    - `values` holds the floats, NaN where missing
+    - `missing` marks values that are None or invalid text
+    - `invalid` marks values that do not cast to float
+    """
+
+    __slots__ = ("invalid", "missing", "values")
+
+    def __init__(self, raw: Sequence[Any]) -> None:
+        size = len(raw)
+        values = np.full(size, np.nan)
+        missing = np.zeros(size, dtype=bool)
+        invalid = np.zeros(size, dtype=bool)
+        for i, value in enumerate(raw):
+            if isinstance(value, str):
+                value = value.strip()
+                if value in INVALID_TEXT:
+                    value = None
+
+            if value is None:
+                missing[i] = True
+                continue
+
+            try:
+                values[i] = float(value)
+            except (TypeError, ValueError):
+                invalid[i] = True
+
+        self.values = values
+        self.missing = missing
+        self.invalid = invalid
+
+    def present(self) -> Any:
+        """Returns the mask of values that are present and valid."""
+        return ~(self.missing | self.invalid)
+
+    def truthy(self) -> Any:
+        """Returns the mask of values that are present and truthy."""
+        return self.present() & (self.values != 0)
+
+    def to_list(self, mask: Any) -> List[Optional[float]]:
+        """Returns the values where the mask is set, else None."""
+        return [
+            x if keep else None
+            for x, keep in zip(self.values.tolist(), mask.tolist(), strict=True)
+        ]
+
+
+def lookup_table(mapping: Mapping[int, str]) -> Any:
+    """Returns the mapping as an object array indexed by code, with None for
+    unmapped codes."""
+    table = np.full(max(mapping) + 1, None, dtype=object)
+    for code, name in mapping.items():
+        table[code] = name
+    return table
+
+
+def map_codes(column: FloatColumn, table: Any) -> Any:
+    """Maps a column of codes (truncated to int) through a lookup table.
+
+    Returns:
+        Object array of the mapped names, None where missing or unmapped
+    """
+    result = np.full(len(column.values), None, dtype=object)
+    codes = np.trunc(np.where(column.present(), column.values, -1))
+    mapped = (codes >= 0) & (codes < len(table))
+    result[mapped] = table[codes[mapped].astype(int)]
+    return result
+
+
+def where(mask: Any, values: Sequence[Any]) -> List[Any]:
+    """Returns the values where the mask is set, else None."""
+    return [x if keep else None for x, keep in zip(values, mask.tolist(), strict=True)]
+
+
+class ColumnarResult:
+    """The values derived for a column of rows.
+
+    - `values` maps each rule function (e.g. create_scan_pet_centiloid)
+      to its value for each row
+    - `errors` is the error of each row, or None if it derived; the values
+      of failed rows are meaningless
+    """
+
+    __slots__ = ("errors", "values")
+
+    def __init__(self, values: Dict[str, List[Any]], errors: List[Optional[str]]):
+        self.values = values
+        self.errors = errors
+
+
+class SCANPETColumnarEvaluator:
+    """Derives the SCAN PET variables of a scope over columns of rows."""
+
+    TRACER_NAMES = lookup_table(SCANPETNamespace.TRACER_MAPPING) if np else None
+    TRACER_SCAN_TYPES = (
+        lookup_table(SCANPETNamespace.TRACER_SCAN_TYPE_MAPPING) if np else None
+    )
+
+    def __init__(self, scope: str, columns: Mapping[str, Sequence[Any]]) -> None:
+        """Initializer.
+
+        Args:
+            scope: The SCAN PET scope of the rows
+            columns: The rows' raw values by (lowercase) column name; all
+                columns must have the same length
+        """
+        require_columnar("SCAN")
+
+        self.__scope = scope
+        self.__columns = columns
+        self.__size = len(next(iter(columns.values()), []))
+        self.__floats: Dict[str, FloatColumn] = {}
+        self.__failed: Dict[int, str] = {}
+        self.__check_required()
+
+    @classmethod
+    def functions(cls, scope: str) -> Tuple[str, ...]:
+        """Returns the rule functions the evaluator derives for the scope."""
+        return tuple(SCOPE_FUNCTIONS.get(scope, {}))
+
+    def __column(self, field: str) -> Sequence[Any]:
+        return self.__columns.get(field, [None] * self.__size)
+
+    def __check_required(self) -> None:
+        """Fails the rows missing any of the scope's required fields."""
+        for field in SCAN_REQUIRED_FIELDS[self.__scope]:
+            for i, value in enumerate(self.__column(field)):
+                text = value.strip() if isinstance(value, str) else value
+                if text is None or text in INVALID_TEXT:
+                    self.__failed.setdefault(
+                        i, f"missing required attributes: file.info.raw.{field}"
+                    )
+
+    def floats(self, field: str) -> FloatColumn:
+        """Returns the field's values as floats, failing rows where they do
+        not cast."""
+        column = self.__floats.get(field)
+        if column is None:
+            column = self.__floats[field] = FloatColumn(self.__column(field))
+            for i in np.flatnonzero(column.invalid).tolist():
+                self.__failed.setdefault(
+                    i, f"could not convert file.info.raw.{field} to float"
+                )
+
+        return column
+
+    def codes(self, field: str, table: Any) -> Any:
+        """Returns the names of the field's tracer codes, failing rows where
+        the code is not a finite number."""
+        column = self.floats(field)
+        for i in np.flatnonzero(column.present() & ~np.isfinite(column.values)):
+            self.__failed.setdefault(
+                int(i), f"file.info.raw.{field} is not a tracer code"
+            )
+
+        return map_codes(column, table)
+
+    def tracers(self, field: str) -> Any:
+        return self.codes(field, self.TRACER_NAMES)
+
+    def scan_types(self, field: str) -> Any:
+        return self.codes(field, self.TRACER_SCAN_TYPES)
+
+    def evaluate(self) -> ColumnarResult:
+        """Derives the scope's variables for every row."""
+        values = {
+            name: function(self)
+            for name, function in SCOPE_FUNCTIONS.get(self.__scope, {}).items()
+        }
+        errors: List[Optional[str]] = [None] * self.__size
+        for i, error in self.__failed.items():
+            errors[i] = error
+
+        return ColumnarResult(values, errors)
+
+
+def pet_qc_scan_types(evaluator: SCANPETColumnarEvaluator) -> List[Any]:
+    return evaluator.scan_types("radiotracer").tolist()
+
+
+def pet_qc_tracers(scan_type: str) -> Callable[[SCANPETColumnarEvaluator], List[Any]]:
+    def tracers(evaluator: SCANPETColumnarEvaluator) -> List[Any]:
+        scan_types = evaluator.scan_types("radiotracer")
+        return where(scan_types == scan_type, evaluator.tracers("radiotracer"))
+
+    return tracers
+
+
+def gaain_centiloid(evaluator: SCANPETColumnarEvaluator) -> List[Any]:
+    centiloids = evaluator.floats("centiloids")
+    return centiloids.to_list(centiloids.present())
+
+
+def gaain_tracer_centiloid(
+    tracer: str,
+) -> Callable[[SCANPETColumnarEvaluator], List[Any]]:
+    def centiloid(evaluator: SCANPETColumnarEvaluator) -> List[Any]:
+        centiloids = evaluator.floats("centiloids")
+        tracers = evaluator.tracers("tracer")
+        return centiloids.to_list(centiloids.present() & (tracers == tracer))
+
+    return centiloid
+
+
+def gaain_positivity(evaluator: SCANPETColumnarEvaluator) -> List[Any]:
+    return (evaluator.floats("amyloid_status").values == 1).tolist()
+
+
+def gaain_analysis_type(evaluator: SCANPETColumnarEvaluator) -> List[Any]:
+    centiloids = evaluator.floats("centiloids")
+    suvrs = evaluator.floats("gaain_summary_suvr")
+    mask = centiloids.truthy() & suvrs.truthy()
+    return where(mask, [PETAnalysisTypes.AMYLOID_GAAIN] * len(mask))
+
+
+def npdka_analysis_type(
+    field: str, analysis_type: str
+) -> Callable[[SCANPETColumnarEvaluator], List[Any]]:
+    def analysis(evaluator: SCANPETColumnarEvaluator) -> List[Any]:
+        mask = evaluator.floats(field).truthy()
+        return where(mask, [analysis_type] * len(mask))
+
+    return analysis
+
+
+# the columnar equivalent of each rule function, by scope
+SCOPE_FUNCTIONS: Dict[
+    str, Dict[str, Callable[[SCANPETColumnarEvaluator], List[Any]]]
+] = {
+    SCANPETScope.PET_QC: {
+        "create_scan_pet_scan_types": pet_qc_scan_types,
+        "create_scan_pet_amyloid_tracers": pet_qc_tracers("amyloid"),
+        "create_scan_pet_tau_tracers": pet_qc_tracers("tau"),
+    },
+    SCANPETScope.AMYLOID_PET_GAAIN: {
+        "create_scan_pet_centiloid": gaain_centiloid,
+        "create_scan_pet_centiloid_pib": gaain_tracer_centiloid("pib"),
+        "create_scan_pet_centiloid_florbetapir": gaain_tracer_centiloid("florbetapir"),
+        "create_scan_pet_centiloid_florbetaben": gaain_tracer_centiloid("florbetaben"),
+        "create_scan_pet_centiloid_nav4694": gaain_tracer_centiloid("nav4694"),
+        "create_scan_pet_amyloid_positivity_indicator": gaain_positivity,
+        "create_scan_pet_amyloid_gaain_analysis_type": gaain_analysis_type,
+    },
+    SCANPETScope.AMYLOID_PET_NPDKA: {
+        "create_scan_pet_amyloid_npdka_analysis_type": npdka_analysis_type(
+            "npdka_summary_suvr", PETAnalysisTypes.AMYLOID_NPDKA
+        ),
+    },
+    SCANPETScope.FDG_PET_NPDKA: {
+        "create_scan_pet_fdg_npdka_analysis_type": npdka_analysis_type(
+            "fdg_metaroi_suvr", PETAnalysisTypes.FDG_NPDKA
+        ),
+    },
+    SCANPETScope.TAU_PET_NPDKA: {
+        "create_scan_pet_tau_npdka_analysis_type": npdka_analysis_type(
+            "meta_temporal_suvr", PETAnalysisTypes.TAU_NPDKA
+        ),
+    },
+}
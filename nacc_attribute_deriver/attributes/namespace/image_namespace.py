@@ -1,7 +1,7 @@
 """MP imaging namespace."""
 
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 
 from nacc_attribute_deriver.attributes.namespace.namespace import BaseNamespace
 from nacc_attribute_deriver.symbol_table import SymbolTable
@@ -31,18 +31,28 @@ class MixedProtocolNamespace(BaseNamespace):
         self.__study_date = datetime.strptime(study_date, "%Y%m%d").date()
 
         # For imaging we need to know the corresponding filename. Assumed
-        # to be listed under file.info.filename
-        self.__filename = table.get("_filename", None)
-        if not self.__filename:
+        # to be listed under _filename; when curating a whole session at
+        # once, this is instead the list of the session's filenames
+        filenames = table.get("_filename", None)
+        if isinstance(filenames, str):
+            filenames = [filenames]
+
+        self.__filenames: List[str] = [
+            x.strip() for x in filenames or [] if x and x.strip()
+        ]
+        if not self.__filenames:
             raise AttributeDeriverError(
                 "No filename found for image (expected to be under " + "_filename)"
             )
-        self.__filename = self.__filename.strip()
 
     @property
     def study_date(self) -> date:
         return self.__study_date
 
+    @property
+    def filenames(self) -> List[str]:
+        return self.__filenames
+
     @property
     def filename(self) -> str:
-        return self.__filename
+        return ",".join(self.__filenames)
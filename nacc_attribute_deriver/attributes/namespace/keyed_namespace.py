@@ -9,6 +9,7 @@ from nacc_attribute_deriver.attributes.namespace.namespace import (
     WorkingNamespace,
 )
 from nacc_attribute_deriver.symbol_table import SymbolTable
+from nacc_attribute_deriver.utils.rxclass import RxClassIndex, get_rxclass_index
 
 
 class PreviousRecordNamespace(BaseNamespace):
@@ -108,6 +109,9 @@ class RxClassNamespace(BaseNamespace):
             ...
         }
     }
+
+    The mapping is the same for every file of a project, so membership
+    checks should go through `index`, which is built once per mapping.
     """
 
     def __init__(
@@ -124,6 +128,12 @@ class RxClassNamespace(BaseNamespace):
             required=required,
             date_attribute=date_attribute,
         )
+        self.__rxclasses = table.get(attribute_prefix.rstrip("."))
+
+    @property
+    def index(self) -> RxClassIndex:
+        """The cached index of the RxClass mapping."""
+        return get_rxclass_index(self.__rxclasses)
 
     def get_members(self, rxclass: str) -> List[str]:
         """Get members for associated RxClass.
@@ -5,9 +5,12 @@ import logging
 from typing import (
     Any,
     Dict,
+    Generic,
     Iterable,
     List,
+    Mapping,
     Optional,
+    Tuple,
     Type,
     TypeVar,
 )
@@ -26,6 +29,38 @@ log = logging.getLogger(__name__)
 T = TypeVar("T")
 
 
+class AttributeGroup(Generic[T]):
+    """A group of attributes of the same type that are read together, e.g.
+    the fields of a gating check.
+
+    Groups are meant to be declared once at class level and read with
+    `BaseNamespace.get_group` or `BaseNamespace.get_group_mapping`.
+    """
+
+    __slots__ = ("__attr_type", "__attributes")
+
+    def __init__(self, attributes: Iterable[str], attr_type: Type[T]) -> None:
+        """Initializer.
+
+        Args:
+            attributes: The attributes of the group, in order
+            attr_type: Expected type of all attributes in the group
+        """
+        self.__attributes = tuple(attributes)
+        self.__attr_type = attr_type
+
+    @property
+    def attributes(self) -> Tuple[str, ...]:
+        return self.__attributes
+
+    @property
+    def attr_type(self) -> Type[T]:
+        return self.__attr_type
+
+    def __len__(self) -> int:
+        return len(self.__attributes)
+
+
 class BaseNamespace:
     """Abstract base class for wrapping a symbol table to enable accessing
     attribute values by name, without the full prefix."""
@@ -123,6 +158,11 @@ class BaseNamespace:
           the value for the attribute in the table
         """
         value = self.__table.get(self.__symbol(attribute), default)  # type: ignore
+        return self.__cast(attribute, value, attr_type)
+
+    def __cast(self, attribute: str, value: Any, attr_type: Type[T]) -> Optional[T]:
+        """Casts the attribute's value to the type, treating empty/invalid
+        strings as None."""
         if value is None:
             return value
 
@@ -141,6 +181,25 @@ class BaseNamespace:
                 f"{self.__symbol(attribute)} must be of type {attr_type}"
             ) from e
 
+    def __read(self, attributes: Iterable[str], attr_type: Type[T]) -> List[T | None]:
+        """Reads the attributes with one lookup of the namespace's dict.
+
+        Attributes nested under the prefix (i.e. containing the table's
+        separator) are read with `get_value` instead.
+        """
+        anchor = self.__table.get(self.__prefix[:-1])
+        if not isinstance(anchor, Mapping):
+            anchor = {}
+
+        separator = self.__table.separator
+        cast = self.__cast
+        return [
+            self.get_value(x, attr_type)
+            if separator in x
+            else cast(x, anchor.get(x), attr_type)
+            for x in attributes
+        ]
+
     def get_required(self, attribute: str, attr_type: Type[T]) -> T:
         """Get required value with given type. Throws an error if the attribute
         is missing, None, or the empty string, or cannot be casted to the
@@ -179,7 +238,7 @@ class BaseNamespace:
             attributes: List of attributes to grab
             attr_type: Expected attribute type for all attributes in list
         """
-        return [self.get_value(x, attr_type) for x in attributes]
+        return self.__read(attributes, attr_type)
 
     def map_attributes(
         self, attributes: List[str], attr_type: Type[T]
@@ -191,7 +250,24 @@ class BaseNamespace:
             attributes: List of attributes to grab
             attr_type: Expected attribute type for all attributes in list
         """
-        return {x: self.get_value(x, attr_type) for x in attributes}
+        return dict(zip(attributes, self.__read(attributes, attr_type), strict=True))
+
+    def get_group(self, group: AttributeGroup[T]) -> Tuple[T | None, ...]:
+        """Returns the values of the group's attributes, in order, read with
+        one lookup of the namespace's dict.
+
+        Args:
+            group: The attribute group
+        """
+        return tuple(self.__read(group.attributes, group.attr_type))
+
+    def get_group_mapping(self, group: AttributeGroup[T]) -> Dict[str, T | None]:
+        """Returns the values of the group's attributes, by attribute.
+
+        Args:
+            group: The attribute group
+        """
+        return self.map_attributes(list(group.attributes), group.attr_type)
 
 
 class FormNamespace(BaseNamespace):
@@ -3,6 +3,7 @@
 from datetime import date, datetime
 
 from nacc_attribute_deriver.attributes.namespace.namespace import (
+    AttributeGroup,
     FormNamespace,
     WorkingNamespace,
 )
@@ -12,6 +13,9 @@ from nacc_attribute_deriver.utils.errors import (
     InvalidFieldError,
 )
 
+# V3 and earlier MCI variables, any of which can be null, 0, or 1
+MCI_V3_GROUP = AttributeGroup(["mciamem", "mciaplus", "mcinon1", "mcinon2"], int)
+
 
 class UDSNamespace(FormNamespace):
     def __init__(
@@ -0,0 +1,443 @@
+"""Defines the BulkDriver class.
+
+Some data comes as whole tables with one row per file the gear would
+curate, e.g. the SCAN CSVs or the NIAGADS availability and NCRAD APOE
+tables. Curating these row by row builds a symbol table and runs a curate
+call per row. The BulkDriver instead keeps each table's rows as tuples
+grouped by subject (SubjectRows), then curates each subject's rows over a
+single table, swapping in one row at a time as the table's `file.info.raw`
+and instantiating each collection once per row rather than once per rule.
+Rows are curated in the same order the SubjectDriver would (scope order,
+then the table's order column, if any).
+
+Changes to each subject are tracked, so the result also has a JSON patch of
+each subject's `subject.info` (see SymbolTable.patch) that can be pushed
+back instead of the whole metadata.
+"""
+
+import csv
+import datetime
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from .attribute_deriver import AttributeDeriver
+from .attributes.collection.attribute_collection import AttributeCollectionRegistry
+from .schema.schema import CurationRule
+from .subject_driver import DEFERRED_RULES, SCOPE_PRIORITY
+from .symbol_table import SymbolTable
+from .utils.errors import AttributeDeriverError
+
+# the rules of a scope, grouped by the collection that derives them
+Plan = List[Tuple[type, List[Tuple[CurationRule, Callable[[Any], Any]]]]]
+
+# the rules of a row with their derived values and dates, or the error the
+# row failed with
+Derivation = Union[
+    List[Tuple[CurationRule, Any, Optional[datetime.date]]], AttributeDeriverError
+]
+
+
+class SubjectRows:
+    """The rows of a table, grouped by subject.
+
+    Each row is kept as a tuple of its values, with the (lowercased)
+    column names shared by all rows.
+    """
+
+    __slots__ = (
+        "__by_subject",
+        "__columns",
+        "__order_index",
+        "__provenance",
+        "__scope",
+    )
+
+    def __init__(
+        self,
+        scope: str,
+        columns: Iterable[str],
+        order_column: Optional[str] = None,
+        provenance: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Initializer.
+
+        Args:
+            scope: The curation scope of the table's rows
+            columns: The table's column names
+            order_column: Optional column to order each subject's rows by,
+                e.g. a scan date; otherwise rows keep the table's order
+            provenance: Optional provenance of the table, set as each row's
+                `file.info.provenance`
+        """
+        if scope not in SCOPE_PRIORITY:
+            raise AttributeDeriverError(f"Unknown file scope: {scope}")
+
+        self.__scope = scope
+        self.__columns = tuple(x.strip().lower() for x in columns)
+        self.__order_index = (
+            self.__columns.index(order_column)
+            if order_column is not None and order_column in self.__columns
+            else -1
+        )
+        self.__provenance = provenance
+        self.__by_subject: Dict[str, List[Tuple[str, ...]]] = {}
+
+    @property
+    def scope(self) -> str:
+        return self.__scope
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self.__columns
+
+    @property
+    def provenance(self) -> Optional[Dict[str, Any]]:
+        return self.__provenance
+
+    def __len__(self) -> int:
+        return sum(len(x) for x in self.__by_subject.values())
+
+    def add(self, subject: str, values: Iterable[str]) -> None:
+        """Adds a row of the subject."""
+        self.__by_subject.setdefault(subject, []).append(tuple(values))
+
+    def subjects(self) -> Iterable[str]:
+        """Returns the subjects with rows."""
+        return self.__by_subject.keys()
+
+    def records(self, subject: str) -> Iterator[Dict[str, str]]:
+        """Returns the subject's rows as records of column to value, ordered
+        by the order column if any (rows without a value first)."""
+        rows = self.__by_subject.get(subject, [])
+        if self.__order_index >= 0:
+            index = self.__order_index
+            rows = sorted(rows, key=lambda x: x[index] if index < len(x) else "")
+
+        columns = self.__columns
+        return (dict(zip(columns, x, strict=False)) for x in rows)
+
+
+def read_subject_csv(
+    stream: TextIO,
+    scope: str,
+    subject_column: str = "naccid",
+    order_column: Optional[str] = None,
+    provenance: Optional[Dict[str, Any]] = None,
+) -> SubjectRows:
+    """Reads a CSV of rows to curate in bulk.
+
+    Args:
+        stream: The CSV
+        scope: The curation scope of the CSV's rows
+        subject_column: The (case-insensitive) column identifying the
+            subject of each row
+        order_column: Optional column to order each subject's rows by
+        provenance: Optional provenance of the CSV
+    Returns:
+        The rows, grouped by subject
+    """
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if not header:
+        raise AttributeDeriverError(f"No CSV headers found for {scope}")
+
+    rows = SubjectRows(scope, header, order_column, provenance)
+    try:
+        subject_index = rows.columns.index(subject_column.lower())
+    except ValueError as e:
+        raise AttributeDeriverError(
+            f"Missing subject column {subject_column} for {scope}"
+        ) from e
+
+    for values in reader:
+        if not values:
+            continue
+
+        subject = values[subject_index].strip()
+        if subject:
+            rows.add(subject, values)
+
+    return rows
+
+
+@dataclass
+class RowError:
+    """A row that failed to curate; the row's values are not applied to the
+    subject."""
+
+    subject: str
+    scope: str
+    record: Dict[str, str]
+    error: Exception
+
+
+@dataclass
+class RowDerived:
+    """The `file.info.derived` values curating a row assigned, which the gear
+    would have written to the row's file."""
+
+    subject: str
+    scope: str
+    record: Dict[str, str]
+    derived: Dict[str, Any]
+
+
+@dataclass
+class BulkCurationResult:
+    """The result of curating tables in bulk.
+
+    - `subjects` is each subject's curated metadata
+    - `patches` is the patch of each subject's `subject.info`, relative
+      to it, with only the paths curation changed
+    - `files` are the file-level values of the rows that assigned any
+    - `errors` are the rows that failed to curate
+    - `num_rows` is the number of rows curated, including failed rows
+    """
+
+    subjects: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    patches: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    files: List[RowDerived] = field(default_factory=list)
+    errors: List[RowError] = field(default_factory=list)
+    num_rows: int = 0
+
+
+class BulkDriver:
+    """Curates tables of rows for all of their subjects at once.
+
+    Rows of a scope are derived before any of their values are assigned,
+    with each collection instantiated once per row. This relies on the
+    scope's collections only reading the row (and what earlier scopes
+    assigned), not what the scope's other rules assign. The scope's
+    DEFERRED_RULES are derived once per subject instead, after its rows, on
+    its last row that curated.
+    """
+
+    def __init__(
+        self, scopes: Iterable[str], deriver: Optional[AttributeDeriver] = None
+    ) -> None:
+        """Initializer.
+
+        Args:
+            scopes: The scopes the driver curates
+            deriver: The deriver to curate with; creates one if not provided
+        """
+        self._deriver = deriver if deriver is not None else AttributeDeriver()
+        self._plans: Dict[str, Plan] = {}
+        self._deferred_plans: Dict[str, Plan] = {}
+        for scope in scopes:
+            deferred = DEFERRED_RULES.get(scope, frozenset())
+            rules = self._deriver.get_curation_rules(scope) or []  # type: ignore
+            self._plans[scope] = self.__plan(
+                scope, [x for x in rules if x.name not in deferred]
+            )
+            self._deferred_plans[scope] = self.__plan(
+                scope, [x for x in rules if x.name in deferred]
+            )
+
+    @property
+    def deriver(self) -> AttributeDeriver:
+        return self._deriver
+
+    @staticmethod
+    def __plan(scope: str, rules: Iterable[CurationRule]) -> Plan:
+        """Groups the scope's rules by the collection that derives them,
+        keeping the collections in the order of their first rule."""
+        methods = AttributeCollectionRegistry.get_attribute_methods()
+        plan: Dict[type, List[Tuple[CurationRule, Callable[[Any], Any]]]] = {}
+        for rule in rules:
+            method = methods.get(rule.function)
+            if method is None:
+                raise AttributeDeriverError(
+                    f"Unknown attribute function for scope {scope}: {rule.function}"
+                )
+
+            plan.setdefault(method.attribute_class, []).append((rule, method.function))
+
+        return list(plan.items())
+
+    def curate(
+        self,
+        sources: Iterable[SubjectRows],
+        subjects: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> BulkCurationResult:
+        """Curates the rows of the tables.
+
+        Args:
+            sources: The rows of each table; scopes should not repeat
+            subjects: Existing metadata of the subjects, if any, by subject;
+                this is updated in place
+        Returns:
+            The curated subjects (only those with rows), their patches,
+            and failed rows
+        """
+        ordered = sorted(sources, key=lambda x: SCOPE_PRIORITY[x.scope])
+        for rows in ordered:
+            if rows.scope not in self._plans:
+                raise AttributeDeriverError(
+                    f"Scope {rows.scope} cannot be curated by {type(self).__name__}"
+                )
+
+        subject_ids = dict.fromkeys(x for rows in ordered for x in rows.subjects())
+        precomputed = self.precompute(ordered)
+
+        result = BulkCurationResult()
+        existing = subjects if subjects is not None else {}
+        for subject in subject_ids:
+            subject_info = existing.setdefault(subject, {})
+            self.curate_subject(subject, subject_info, ordered, result, precomputed)
+            result.subjects[subject] = subject_info
+
+        return result
+
+    def precompute(
+        self, sources: List[SubjectRows]
+    ) -> Dict[str, Dict[str, List[Derivation]]]:
+        """Derives the rows of some of the tables ahead of time, e.g. for all
+        subjects at once.
+
+        Returns:
+            The derivation of each row of each subject, in the order of the
+            subject's records, by scope; none by default
+        """
+        return {}
+
+    def curate_subject(
+        self,
+        subject: str,
+        subject_info: Dict[str, Any],
+        sources: List[SubjectRows],
+        result: BulkCurationResult,
+        precomputed: Optional[Dict[str, Dict[str, List[Derivation]]]] = None,
+    ) -> None:
+        """Curates one subject's rows of each table, in order.
+
+        Args:
+            subject: The subject
+            subject_info: The subject's metadata; updated in place
+            sources: The rows of each table, in scope order
+            result: The result to record rows, patches, and errors on
+            precomputed: The derivations of each row of the subject, by
+                scope, for scopes derived ahead of time
+        """
+        table = SymbolTable()
+        table["subject.info"] = subject_info
+        table.start_tracking()
+        for rows in sources:
+            scope = rows.scope
+            plan = self._plans[scope]
+            derivations = (
+                precomputed.get(scope, {}).get(subject) if precomputed else None
+            )
+            last_record: Optional[Dict[str, str]] = None
+            for i, record in enumerate(rows.records(subject)):
+                result.num_rows += 1
+                self.__set_row(table, rows, record)
+
+                derived: Derivation
+                if derivations is not None:
+                    derived = derivations[i]
+                else:
+                    try:
+                        derived = self.derive(table, scope, plan)
+                    except AttributeDeriverError as error:
+                        derived = error
+
+                if isinstance(derived, AttributeDeriverError):
+                    result.errors.append(
+                        RowError(
+                            subject=subject, scope=scope, record=record, error=derived
+                        )
+                    )
+                    continue
+
+                for rule, value, date in derived:
+                    self._deriver.assign(table, rule, value, date)
+
+                last_record = record
+                file_derived = table.get("file.info.derived")
+                if file_derived:
+                    result.files.append(
+                        RowDerived(
+                            subject=subject,
+                            scope=scope,
+                            record=record,
+                            derived=file_derived,
+                        )
+                    )
+
+            if last_record is not None and self._deferred_plans[scope]:
+                self.__curate_deferred(table, subject, rows, last_record, result)
+
+        result.patches[subject] = table.patch("subject.info")
+
+    def __curate_deferred(
+        self,
+        table: SymbolTable,
+        subject: str,
+        rows: SubjectRows,
+        record: Dict[str, str],
+        result: BulkCurationResult,
+    ) -> None:
+        """Derives the scope's DEFERRED_RULES on the subject's last row that
+        curated, which gives the values they would have after the row."""
+        self.__set_row(table, rows, record)
+        try:
+            derived = self.derive(table, rows.scope, self._deferred_plans[rows.scope])
+        except AttributeDeriverError as error:
+            result.errors.append(
+                RowError(subject=subject, scope=rows.scope, record=record, error=error)
+            )
+            return
+
+        for rule, value, date in derived:
+            self._deriver.assign(table, rule, value, date)
+
+    @staticmethod
+    def __set_row(
+        table: SymbolTable, rows: SubjectRows, record: Dict[str, str]
+    ) -> None:
+        """Sets the row as the table's file."""
+        table["file.info"] = {"raw": record}
+        if rows.provenance is not None:
+            table["file.info.provenance"] = rows.provenance
+
+    @staticmethod
+    def derive(
+        table: SymbolTable, scope: str, plan: Plan
+    ) -> List[Tuple[CurationRule, Any, Optional[datetime.date]]]:
+        """Derives the values of the row in the table.
+
+        Each collection is instantiated once for all of its rules, and all
+        values are derived before any are assigned, so a row that fails
+        changes nothing.
+
+        Returns:
+            The rules with their derived values and dates
+        Raises:
+            AttributeDeriverError if any value cannot be derived
+        """
+        derived = []
+        for collection_type, functions in plan:
+            rule = functions[0][0]
+            try:
+                instance = collection_type(table)
+                date = instance.get_date()
+                for rule, function in functions:
+                    derived.append((rule, function(instance), date))
+            except Exception as e:
+                raise AttributeDeriverError(
+                    f"Failed to derive rule {rule.function} for scope {scope}: {e}"
+                ) from e
+
+        return derived
@@ -0,0 +1,62 @@
+"""Defines the GeneticsDriver class.
+
+The NIAGADS availability, NCRAD APOE and biosample, and NCRAD biomarker
+data each come as one table with a row per subject (or per sample), which
+the gear splits into a file per row and curates one at a time. These are
+refreshed for every participant at once, so the GeneticsDriver curates the
+whole tables with the BulkDriver instead, and returns each subject's
+`subject.info` patch (mostly `derived.cross-sectional` updates) along with
+the `file.info.derived` values of each row.
+"""
+
+from typing import Any, Dict, List, Optional, TextIO
+
+from .attribute_deriver import AttributeDeriver
+from .bulk_driver import BulkDriver, SubjectRows, read_subject_csv
+from .subject_driver import SCOPE_ORDER
+from .utils.errors import AttributeDeriverError
+from .utils.scope import GeneticsScope, NCRADBiomarkerScope
+
+# the scopes curated from genetics and biomarker tables, in curation order
+GENETICS_SCOPES: List[str] = [
+    scope
+    for scope in SCOPE_ORDER
+    if scope in set(GeneticsScope) | set(NCRADBiomarkerScope)
+]
+
+
+def read_genetics_csv(
+    stream: TextIO,
+    scope: str,
+    subject_column: str = "naccid",
+    provenance: Optional[Dict[str, Any]] = None,
+) -> SubjectRows:
+    """Reads a genetics or biomarker CSV.
+
+    Args:
+        stream: The CSV
+        scope: The genetics or biomarker scope of the CSV
+        subject_column: The (case-insensitive) column identifying the
+            subject of each row
+        provenance: The provenance of the CSV; biomarker scopes need its
+            `created_date`
+    Returns:
+        The rows, grouped by subject and in the CSV's order
+    """
+    if scope not in GENETICS_SCOPES:
+        raise AttributeDeriverError(f"Not a genetics scope: {scope}")
+
+    return read_subject_csv(stream, scope, subject_column, provenance=provenance)
+
+
+class GeneticsDriver(BulkDriver):
+    """Curates genetics and biomarker tables for all of their subjects at
+    once."""
+
+    def __init__(self, deriver: Optional[AttributeDeriver] = None) -> None:
+        """Initializer.
+
+        Args:
+            deriver: The deriver to curate with; creates one if not provided
+        """
+        super().__init__(GENETICS_SCOPES, deriver)
@@ -0,0 +1,482 @@
+"""Defines the UDSMissingnessDriver class.
+
+Regenerating the QAF re-runs file-level missingness on every UDS visit of
+the project, one symbol table at a time, with a collection instantiated
+for each of the ~1200 UDS rules of every visit. Most of these rules are
+either not applicable to the visit's form version and packet or have no
+missingness function, so they only apply generic missingness.
+
+The UDSMissingnessDriver instead curates the UDS visits of many subjects
+at once. It loads a batch of visits into columns, one per form variable,
+with each subject's visits ordered the way the SubjectDriver would order
+them, and evaluates the generic and pattern-based missingness of every
+variable over whole columns (see uds_columnar), including pulling values
+from the previous visit. The rules with a missingness function are still
+derived row by row, in visit order so each visit sees its previous visit's
+resolved values, but with each collection instantiated once per visit
+rather than once per rule. Visits the columns cannot handle (e.g. values
+that do not cast) are curated with the MissingnessDeriver as usual, so the
+resolved values, and errors, are the same as curating each visit on its
+own.
+"""
+
+import datetime
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .attribute_deriver import MissingnessDeriver
+from .attributes.collection.attribute_collection import AttributeCollectionRegistry
+from .attributes.collection.missingness_pattern import MissingnessPattern
+from .attributes.missingness.uds_columnar import UDSMissingnessColumnarEvaluator
+from .schema.operation import UpdateOperation
+from .schema.rule_types import DateTaggedValue
+from .schema.schema import CurationRule
+from .subject_driver import CurationFile, SubjectDriver
+from .symbol_table import OverlaySymbolTable, SymbolTable
+from .utils.columnar import columnar_available
+from .utils.constants import INFORMED_BLANK
+from .utils.errors import AttributeDeriverError
+from .utils.form_record import FormRecord, compact_form
+from .utils.scope import FormScope
+
+# location prefix of the values the columns can assign directly
+RESOLVED_PREFIX = "file.info.resolved."
+
+# the rules of a visit derived row by row, grouped by the collection that
+# derives them, and the rules derived with the deriver
+RowPlan = Tuple[
+    List[Tuple[type, List[Tuple[CurationRule, Callable[[Any], Any]]]]],
+    List[CurationRule],
+]
+
+
+@dataclass
+class VisitError:
+    """A visit that failed to curate; nothing is assigned to it, and the
+    subject's later visits are not curated."""
+
+    subject: str
+    file: CurationFile
+    error: Exception
+
+
+@dataclass
+class MissingnessCurationResult:
+    """The result of curating missingness in bulk.
+
+    - `errors` are the visits that failed to curate
+    - `num_visits` is the number of visits curated, including failed visits
+    - `num_columnar` is the number of those curated with the columns
+    """
+
+    errors: List[VisitError] = field(default_factory=list)
+    num_visits: int = 0
+    num_columnar: int = 0
+
+
+@dataclass
+class ColumnRule:
+    """A rule the columns can evaluate.
+
+    - `rule` is the rule
+    - `key` is the key of the rule's `file.info.resolved` location
+    - `pattern` is the rule's missingness pattern, if any
+    """
+
+    rule: CurationRule
+    key: str
+    pattern: Optional[MissingnessPattern] = None
+
+
+class UDSMissingnessDriver:
+    """Curates the file-level missingness of many UDS visits at once."""
+
+    def __init__(
+        self,
+        deriver: Optional[MissingnessDeriver] = None,
+        batch_size: int = 10000,
+        compact_forms: bool = False,
+    ) -> None:
+        """Initializer.
+
+        Args:
+            deriver: The file-level deriver to curate with; creates one if
+                not provided
+            batch_size: About how many visits to load into columns at once;
+                a subject's visits are never split across batches
+            compact_forms: Whether to replace each visit's form with a
+                compact FormRecord while its batch is curated, which lowers
+                the batch's memory; the forms are restored to dicts before
+                the batch is done
+        """
+        if not columnar_available():
+            raise AttributeDeriverError("Columnar missingness curation requires numpy")
+
+        self.__deriver = deriver if deriver is not None else MissingnessDeriver("file")
+        self.__batch_size = batch_size
+        self.__compact_forms = compact_forms
+
+        scope = FormScope.UDS.value
+        methods = AttributeCollectionRegistry.get_attribute_methods()
+        generic = methods.get(f"missingness_{scope}")
+        if generic is None:
+            raise AttributeDeriverError(f"No generic missingness for scope {scope}")
+
+        self.__generic = generic.attribute_class
+        self.__methods = methods
+        self.__rules = self.__deriver.get_curation_rules(scope) or []
+        self.__columns = self.__plan_columns()
+
+        # the row and column plans of each DED matrix key
+        self.__plans: Dict[Optional[str], Tuple[RowPlan, List[bool], List[bool]]] = {}
+
+    @property
+    def deriver(self) -> MissingnessDeriver:
+        return self.__deriver
+
+    def __plan_columns(self) -> Dict[str, ColumnRule]:
+        """Finds the rules the columns can evaluate when they apply generic
+        or pattern missingness: those that only update a resolved value."""
+        program = self.__deriver.get_patterns(FormScope.UDS.value)
+        patterns = program.patterns if program is not None else {}
+        columns: Dict[str, ColumnRule] = {}
+        for rule in self.__rules:
+            if len(rule.assignments) != 1 or rule.name.startswith("header_"):
+                continue
+
+            assignment = rule.assignments[0]
+            if (
+                assignment.dated
+                or not isinstance(assignment.operation, UpdateOperation)
+                or not assignment.attribute.startswith(RESOLVED_PREFIX)
+            ):
+                continue
+
+            pattern = patterns.get(rule.name)
+            columns[rule.name] = ColumnRule(
+                rule=rule,
+                key=assignment.attribute.removeprefix(RESOLVED_PREFIX),
+                pattern=(
+                    pattern
+                    if pattern is not None
+                    and UDSMissingnessColumnarEvaluator.supports(pattern)
+                    else None
+                ),
+            )
+
+        return columns
+
+    def __plan(self, version: Optional[str]) -> Tuple[RowPlan, List[bool], List[bool]]:
+        """Splits the rules for visits of a DED matrix key into those derived
+        row by row and those evaluated in columns, the same way
+        MissingnessDeriver.get_curated_value picks how to derive them.
+
+        Returns:
+            The row plan, and for each column rule, whether it applies its
+            pattern and whether it applies generic missingness
+        """
+        plan = self.__plans.get(version)
+        if plan is not None:
+            return plan
+
+        program = self.__deriver.get_patterns(FormScope.UDS.value)
+        collections: Dict[type, List[Tuple[CurationRule, Callable[[Any], Any]]]] = {}
+        derived: List[CurationRule] = []
+        patterned: Dict[str, bool] = {}
+        generic: Dict[str, bool] = {}
+        for rule in self.__rules:
+            applicable = self.__deriver.is_applicable(rule.name, version)
+            method = self.__methods.get(rule.function)
+            column = self.__columns.get(rule.name)
+            if applicable and method is not None:
+                collections.setdefault(method.attribute_class, []).append(
+                    (rule, method.function)
+                )
+            elif applicable and program is not None and rule.name in program:
+                if column is not None and column.pattern is not None:
+                    patterned[rule.name] = True
+                else:
+                    derived.append(rule)
+            elif column is not None:
+                generic[rule.name] = True
+            else:
+                derived.append(rule)
+
+        plan = self.__plans[version] = (
+            (list(collections.items()), derived),
+            [patterned.get(x, False) for x in self.__columns],
+            [generic.get(x, False) for x in self.__columns],
+        )
+        return plan
+
+    def curate(
+        self,
+        visits: Mapping[str, Iterable[CurationFile]],
+        subjects: Optional[Mapping[str, Dict[str, Any]]] = None,
+    ) -> MissingnessCurationResult:
+        """Curates the missingness of the subjects' UDS visits.
+
+        Each visit's `file.info.resolved` is updated in place, as curating
+        it with the MissingnessDeriver would.
+
+        Args:
+            visits: The files of each subject; files of other scopes are
+                ignored
+            subjects: The subjects' metadata, if any, by subject; this is
+                only read
+        Returns:
+            The failed visits and counts
+        """
+        result = MissingnessCurationResult()
+        batch: List[Tuple[str, List[CurationFile]]] = []
+        size = 0
+        for subject, files in visits.items():
+            uds = [
+                x
+                for x in SubjectDriver.schedule(files)
+                if x.scope == FormScope.UDS.value
+            ]
+            if not uds:
+                continue
+
+            batch.append((subject, uds))
+            size += len(uds)
+            if size >= self.__batch_size:
+                self.__curate_batch(batch, subjects or {}, result)
+                batch = []
+                size = 0
+
+        if batch:
+            self.__curate_batch(batch, subjects or {}, result)
+
+        return result
+
+    def __curate_batch(
+        self,
+        batch: List[Tuple[str, List[CurationFile]]],
+        subjects: Mapping[str, Dict[str, Any]],
+        result: MissingnessCurationResult,
+    ) -> None:
+        """Curates a batch of subjects, with their forms compacted while it
+        is curated if enabled."""
+        files = [x for _, uds in batch for x in uds]
+        if not self.__compact_forms:
+            self.__curate_files(batch, files, subjects, result)
+            return
+
+        for file in files:
+            self.__compact(file)
+        try:
+            self.__curate_files(batch, files, subjects, result)
+        finally:
+            for file in files:
+                self.__restore(file)
+
+    def __curate_files(
+        self,
+        batch: List[Tuple[str, List[CurationFile]]],
+        files: List[CurationFile],
+        subjects: Mapping[str, Dict[str, Any]],
+        result: MissingnessCurationResult,
+    ) -> None:
+        """Evaluates the columns of the batch's visits (its files, in order),
+        then curates each subject's visits in order."""
+        forms = [self.__form(x) for x in files]
+        first = [i == 0 for _, uds in batch for i in range(len(uds))]
+
+        # group the visits by DED matrix key; visits without a valid key are
+        # curated row-wise
+        groups: Dict[Optional[str], int] = {}
+        codes: List[int] = []
+        fallback = [False] * len(files)
+        for i, form in enumerate(forms):
+            try:
+                version = self.__deriver.get_uds_version(
+                    form.get("formver"), form.get("packet")
+                )
+            except Exception:
+                version = None
+                fallback[i] = True
+
+            codes.append(groups.setdefault(version, len(groups)))
+
+        plans = [self.__plan(x) for x in groups]
+        fields = [
+            (x.rule.name, self.__deriver.get_attribute_type(x.rule.name), x.pattern)
+            for x in self.__columns.values()
+        ]
+        values, invalid = UDSMissingnessColumnarEvaluator(forms, first).evaluate(
+            fields, codes, [x[1] for x in plans], [x[2] for x in plans]
+        )
+
+        offset = 0
+        for subject, uds in batch:
+            subject_info = subjects.get(subject, {})
+            prev_record: Optional[Dict[str, Any]] = None
+            for i, file in enumerate(uds, start=offset):
+                result.num_visits += 1
+                try:
+                    if fallback[i] or invalid[i]:
+                        self.__curate_file(subject_info, file, prev_record)
+                    elif self.__curate_row(
+                        subject_info, file, prev_record, plans[codes[i]], values, i
+                    ):
+                        result.num_columnar += 1
+                except Exception as error:
+                    result.errors.append(
+                        VisitError(subject=subject, file=file, error=error)
+                    )
+                    break
+
+                prev_record = file.info
+
+            offset += len(uds)
+
+    @staticmethod
+    def __compact(file: CurationFile) -> None:
+        """Replaces the file's form with a FormRecord, if it has one."""
+        forms = file.info.get("forms")
+        if isinstance(forms, dict) and isinstance(forms.get("json"), dict):
+            forms["json"] = compact_form(forms["json"])
+
+    @staticmethod
+    def __restore(file: CurationFile) -> None:
+        """Replaces the file's FormRecord, if it has one, with a dict."""
+        forms = file.info.get("forms")
+        if isinstance(forms, dict) and isinstance(forms.get("json"), FormRecord):
+            forms["json"] = forms["json"].to_dict()
+
+    @staticmethod
+    def __form(file: CurationFile) -> Mapping[str, Any]:
+        """Returns the file's form values, or an empty form if it has none."""
+        forms = file.info.get("forms")
+        form = forms.get("json") if isinstance(forms, dict) else None
+        return form if isinstance(form, Mapping) else {}
+
+    def __table(
+        self,
+        subject_info: Dict[str, Any],
+        file: CurationFile,
+        prev_record: Optional[Dict[str, Any]],
+    ) -> SymbolTable:
+        """Builds the visit's table, as the SubjectDriver would."""
+        table = SymbolTable()
+        table["file.info"] = file.info
+        table["subject.info"] = subject_info
+        if prev_record is not None:
+            table["_prev_record.info"] = prev_record
+
+        for key, value in file.extras.items():
+            table[key] = value
+
+        return table
+
+    def __curate_file(
+        self,
+        subject_info: Dict[str, Any],
+        file: CurationFile,
+        prev_record: Optional[Dict[str, Any]],
+    ) -> None:
+        """Curates the visit with the MissingnessDeriver, committing only if it
+        curates without errors."""
+        table = OverlaySymbolTable(self.__table(subject_info, file, prev_record))
+        try:
+            self.__deriver.curate(table, FormScope.UDS.value)
+        except Exception:
+            table.discard()
+            raise
+
+        table.commit()
+
+    def __derive(
+        self, table: SymbolTable, plan: RowPlan
+    ) -> List[Tuple[CurationRule, Any, Optional[datetime.date]]]:
+        """Derives the visit's row-wise rules, instantiating each collection
+        once.
+
+        Returns:
+            The rule, value, and date of each rule
+        """
+        collections, rules = plan
+        derived: List[Tuple[CurationRule, Any, Optional[datetime.date]]] = []
+        table.start_caching()
+        try:
+            # the generic collection checks the visit is a valid UDS form
+            self.__generic(table).get_date()
+            for collection_type, functions in collections:
+                instance = collection_type(table)
+                date = instance.get_date()
+                for rule, function in functions:
+                    derived.append((rule, function(instance), date))
+
+            for rule in rules:
+                value, date = self.__deriver.get_curated_value(
+                    table, rule, FormScope.UDS.value
+                )
+                derived.append((rule, value, date))
+        finally:
+            table.stop_caching()
+
+        return derived
+
+    def __curate_row(
+        self,
+        subject_info: Dict[str, Any],
+        file: CurationFile,
+        prev_record: Optional[Dict[str, Any]],
+        plan: Tuple[RowPlan, List[bool], List[bool]],
+        values: List[List[Any]],
+        index: int,
+    ) -> bool:
+        """Derives the visit's row-wise rules, then assigns them along with its
+        column values.
+
+        If any row-wise rule fails, the visit is curated with the
+        MissingnessDeriver instead, which fails the same way.
+
+        Returns:
+            Whether the visit was curated with its column values
+        """
+        table = self.__table(subject_info, file, prev_record)
+        row_plan, patterned, generic = plan
+        try:
+            derived = self.__derive(table, row_plan)
+        except Exception:
+            self.__curate_file(subject_info, file, prev_record)
+            return False
+
+        resolved = file.info.get("resolved")
+        if resolved is not None and not isinstance(resolved, dict):
+            self.__curate_file(subject_info, file, prev_record)
+            return False
+
+        # assign the resolved values directly, as UpdateOperation would
+        updates: List[Tuple[str, Any]] = [
+            (column.key, column_values[index])
+            for column, column_values, in_pattern, in_generic in zip(
+                self.__columns.values(), values, patterned, generic, strict=True
+            )
+            if in_pattern or in_generic
+        ]
+        assignments = []
+        for rule, value, date in derived:
+            column = self.__columns.get(rule.name)
+            if column is not None and not isinstance(
+                value, (datetime.date, DateTaggedValue)
+            ):
+                updates.append((column.key, value))
+            else:
+                assignments.append((rule, value, date))
+
+        for key, value in updates:
+            if value is None:
+                continue
+
+            if resolved is None:
+                resolved = file.info["resolved"] = {}
+            resolved[key] = None if value == INFORMED_BLANK else value
+
+        for rule, value, date in assignments:
+            self.__deriver.assign(table, rule, value, date)
+
+        return True
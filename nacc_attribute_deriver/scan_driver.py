@@ -0,0 +1,140 @@
+"""Defines the SCANDriver class.
+
+SCAN data comes from seven CSVs (see SCAN_FILES), one row per scan. The
+gear curates each row as its own file, building a symbol table per row.
+The SCANDriver instead curates whole CSVs at once with the BulkDriver: it
+streams each CSV, keeps its rows as tuples grouped by subject, then
+curates each subject's rows over a single table, in the same order the
+SubjectDriver would (scope order, then scan date), so the resulting
+subject metadata is the same.
+"""
+
+from typing import Dict, List, Optional, TextIO
+
+from .attribute_deriver import AttributeDeriver
+from .attributes.mqt.scan_columnar import SCANPETColumnarEvaluator
+from .bulk_driver import BulkDriver, Derivation, SubjectRows, read_subject_csv
+from .utils.columnar import columnar_available
+from .utils.errors import AttributeDeriverError
+from .utils.scope import SCANMRIScope, SCANPETScope
+
+# CSV each SCAN scope is curated from
+SCAN_FILES: Dict[str, str] = {
+    SCANMRIScope.MRI_QC: "scan_mridashboard.csv",
+    SCANMRIScope.MRI_SBM: "ucdmrisbm.csv",
+    SCANPETScope.PET_QC: "scan_petdashboard.csv",
+    SCANPETScope.AMYLOID_PET_GAAIN: "v_ucberkeley_amyloid_mrifree_gaain.csv",
+    SCANPETScope.AMYLOID_PET_NPDKA: "v_ucberkeley_amyloid_mrifree_npdka.csv",
+    SCANPETScope.FDG_PET_NPDKA: "v_ucberkeley_fdg_metaroi_npdka.csv",
+    SCANPETScope.TAU_PET_NPDKA: "v_ucberkeley_tau_mrifree_npdka.csv",
+}
+
+# column with the scan date of each SCAN scope, which orders the rows
+SCAN_DATE_COLUMNS: Dict[str, str] = {
+    SCANMRIScope.MRI_QC: "study_date",
+    SCANMRIScope.MRI_SBM: "scandt",
+    SCANPETScope.PET_QC: "scan_date",
+    SCANPETScope.AMYLOID_PET_GAAIN: "scandate",
+    SCANPETScope.AMYLOID_PET_NPDKA: "scandate",
+    SCANPETScope.FDG_PET_NPDKA: "scandate",
+    SCANPETScope.TAU_PET_NPDKA: "scandate",
+}
+
+
+def read_scan_csv(
+    stream: TextIO, scope: str, subject_column: str = "naccid"
+) -> SubjectRows:
+    """Reads a SCAN CSV.
+
+    Args:
+        stream: The CSV
+        scope: The SCAN scope of the CSV
+        subject_column: The (case-insensitive) column identifying the
+            subject of each row
+    Returns:
+        The rows, grouped by subject and ordered by scan date
+    """
+    if scope not in SCAN_DATE_COLUMNS:
+        raise AttributeDeriverError(f"Not a SCAN scope: {scope}")
+
+    return read_subject_csv(
+        stream, scope, subject_column, order_column=SCAN_DATE_COLUMNS[scope]
+    )
+
+
+class SCANDriver(BulkDriver):
+    """Curates SCAN CSVs for all of their subjects at once."""
+
+    def __init__(
+        self,
+        deriver: Optional[AttributeDeriver] = None,
+        columnar: bool = False,
+    ) -> None:
+        """Initializer.
+
+        Args:
+            deriver: The deriver to curate with; creates one if not provided
+            columnar: Whether to derive the SCAN PET variables for all rows
+                of a CSV at once with NumPy (see scan_columnar), which must
+                be installed
+        """
+        if columnar and not columnar_available():
+            raise AttributeDeriverError("Columnar SCAN curation requires numpy")
+
+        super().__init__(SCAN_DATE_COLUMNS, deriver)
+
+        # scopes whose rules all have a columnar equivalent
+        self.__columnar = (
+            {
+                scope
+                for scope, plan in self._plans.items()
+                if plan
+                and {rule.function for _, rules in plan for rule, _ in rules}.issubset(
+                    SCANPETColumnarEvaluator.functions(scope)
+                )
+            }
+            if columnar
+            else set()
+        )
+
+    def precompute(
+        self, sources: List[SubjectRows]
+    ) -> Dict[str, Dict[str, List[Derivation]]]:
+        """Derives the rows of the scopes derived in columns."""
+        return {
+            rows.scope: self.__derive_columns(rows)
+            for rows in sources
+            if rows.scope in self.__columnar
+        }
+
+    def __derive_columns(self, rows: SubjectRows) -> Dict[str, List[Derivation]]:
+        """Derives the values of all rows of a CSV at once.
+
+        Returns:
+            The derivation of each row of each subject, in the order of the
+            subject's records
+        """
+        scope = rows.scope
+        records = [
+            (subject, record)
+            for subject in rows.subjects()
+            for record in rows.records(subject)
+        ]
+        columns = {x: [y.get(x) for _, y in records] for x in rows.columns}
+        evaluated = SCANPETColumnarEvaluator(scope, columns).evaluate()
+
+        rules = [rule for _, functions in self._plans[scope] for rule, _ in functions]
+        values = [evaluated.values[rule.function] for rule in rules]
+        result: Dict[str, List[Derivation]] = {}
+        for i, (subject, _) in enumerate(records):
+            error = evaluated.errors[i]
+            result.setdefault(subject, []).append(
+                AttributeDeriverError(f"Failed to derive scope {scope}: {error}")
+                if error is not None
+                else [
+                    (rule, column[i], None)
+                    for rule, column in zip(rules, values, strict=True)
+                ]
+            )
+
+        return result
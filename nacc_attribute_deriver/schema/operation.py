@@ -4,6 +4,7 @@ Uses a metaclass to keep track of operation types.
 """
 
 import contextlib
+import copy
 import datetime
 from abc import abstractmethod
 from itertools import groupby
@@ -13,6 +14,7 @@ from typing import (
     ClassVar,
     Dict,
     List,
+    Optional,
     Tuple,
     TypeAlias,
 )
@@ -43,6 +45,62 @@ class OperationRegistry(type):
             OperationRegistry.operations[cls.LABEL] = cls  # type: ignore
 
 
+class AssignedValue:
+    """A derived value being assigned to all of its rule's targets.
+
+    Builds the value's DateTaggedValue and its serialized form at most once,
+    however many of the rule's assignments use them. Operations must not
+    modify either, since the other assignments share them.
+    """
+
+    __slots__ = ("__date", "__dated", "__dumped", "__raw")
+
+    def __init__(self, raw: Any, date: Optional[datetime.date]) -> None:
+        """Initializer.
+
+        Args:
+            raw: The derived value; must not be None or a DateTaggedValue
+            date: The value's date, if any
+        """
+        self.__raw = raw
+        self.__date = date
+        self.__dated: Optional[DateTaggedValue[Any]] = None
+        self.__dumped: Optional[Dict[str, Any]] = None
+
+    @property
+    def raw(self) -> Any:
+        return self.__raw
+
+    @property
+    def date(self) -> Optional[datetime.date]:
+        return self.__date
+
+    def dated(self) -> DateTaggedValue[Any]:
+        """Returns the value tagged with its date."""
+        if self.__dated is None:
+            self.__dated = DateTaggedValue(value=self.__raw, date=self.__date)
+
+        return self.__dated
+
+    def dumped(self) -> Dict[str, Any]:
+        """Returns a new copy of the serialized date-tagged value, with
+        informed blanks as None, as dated update and date operations write
+        it.
+
+        List and dict values are deep-copied, so each target gets its own.
+        """
+        if self.__dumped is None:
+            self.__dumped = self.dated().model_dump()
+            if self.__raw == INFORMED_BLANK:
+                self.__dumped["value"] = None
+
+        dumped = dict(self.__dumped)
+        if isinstance(dumped["value"], (list, dict)):
+            dumped["value"] = copy.deepcopy(dumped["value"])
+
+        return dumped
+
+
 class Operation(object, metaclass=OperationRegistry):
     LABEL: str | None = None
 
@@ -78,6 +136,33 @@ class Operation(object, metaclass=OperationRegistry):
         """
         pass
 
+    def assign(
+        self,
+        *,
+        table: SymbolTable,
+        value: AssignedValue,
+        attribute: str,
+        dated: bool,
+    ) -> None:
+        """Evaluates the operation for one of a rule's assignments of a
+        value.
+
+        By default, evaluates the raw or date-tagged value. Operations that
+        modify the value they evaluate override this to use its shared
+        forms instead.
+
+        Args:
+            table: Table to read/write from
+            value: The value assigned to the rule's targets
+            attribute: Target location to write to
+            dated: Whether to assign the date-tagged value
+        """
+        self.evaluate(
+            table=table,
+            value=value.dated() if dated else value.raw,
+            attribute=attribute,
+        )
+
 
 class UpdateOperation(Operation):
     LABEL = "update"
@@ -112,6 +197,20 @@ class UpdateOperation(Operation):
 
         table[attribute] = value
 
+    def assign(
+        self,
+        *,
+        table: SymbolTable,
+        value: AssignedValue,
+        attribute: str,
+        dated: bool,
+    ) -> None:
+        if dated:
+            table[attribute] = value.dumped()
+            return
+
+        self.evaluate(table=table, value=value.raw, attribute=attribute)
+
 
 class ListOperation(Operation):
     LABEL = "list"
@@ -137,6 +236,9 @@ class ListOperation(Operation):
                 + f"attribute: {attribute}"
             )
 
+        # work on a copy so the table can detect whether the list changed
+        cur_list = list(cur_list)
+
         # try converting any dicts to DateTaggedValues so list can be sorted
         for i, item in enumerate(cur_list):
             if isinstance(item, dict):
@@ -275,15 +377,41 @@ class DateOperation(Operation):
         elif value.value == INFORMED_BLANK:
             value.value = None
 
+        if self.__replaces(table=table, date=value.date, attribute=attribute):
+            table[attribute] = value.model_dump()
+
+    def assign(
+        self,
+        *,
+        table: SymbolTable,
+        value: AssignedValue,
+        attribute: str,
+        dated: bool,
+    ) -> None:
+        if not dated:
+            # fails for the missing date
+            self.evaluate(table=table, value=value.raw, attribute=attribute)
+            return
+
+        if self.__replaces(
+            table=table,
+            date=value.date,  # type: ignore
+            attribute=attribute,
+        ):
+            table[attribute] = value.dumped()
+
+    def __replaces(
+        self, *, table: SymbolTable, date: datetime.date, attribute: str
+    ) -> bool:
+        """Returns whether a value of the date replaces the location's
+        value."""
         if self.LABEL not in ["initial", "latest"]:
             raise OperationError(
                 f"Unknown date operation {self.LABEL} for attribute {attribute}"
             )
 
         dest_date = date_from_form_date(table.get(f"{attribute}.date"))
-
-        if not dest_date or self.compare(value.date, dest_date):
-            table[attribute] = value.model_dump()
+        return not dest_date or self.compare(date, dest_date)
 
 
 class InitialOperation(DateOperation):
@@ -100,3 +100,43 @@ class MissingnessFileModel(RuleFileModel):
             return str
 
         raise ValidationError(f"Unsupported attribute type: {value}")
+
+
+class MissingnessPatternFileModel(BaseModel):
+    """Model for loading serialized missingness pattern definitions.
+
+    Fields whose missingness follows a common pattern (e.g. a gated
+    write-in) are defined as rows instead of hand-written methods:
+
+    - `scope` and `field` identify the missingness rule
+    - `pattern` is the label of the pattern (see MissingnessPattern)
+    - `gate` is the gate variable, if the pattern has one
+    - `values` are the gate values the pattern checks, separated by `;`
+    - `default` is the value a missing field is set to, if not the
+      generic missingness value
+    - `prev_code` is the value that pulls the field from the previous
+      visit; blank means a missing value does
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+    scope: ScopeLiterals
+    field: str
+    pattern: str
+    gate: Optional[str] = None
+    values: List[int] = []
+    default: Optional[str] = None
+    prev_code: Optional[str] = None
+
+    @field_validator("gate", "default", "prev_code", mode="before")
+    def blank_to_none(cls, value: Optional[str]) -> Optional[str]:
+        return value if value else None
+
+    @field_validator("values", mode="before")
+    def split_values(cls, value: Optional[str | List[int]]) -> List[int]:
+        if not value:
+            return []
+        if isinstance(value, list):
+            return value
+
+        return [int(x) for x in value.split(";")]
@@ -0,0 +1,405 @@
+"""Defines the SubjectDriver class.
+
+In production, the Attribute Curation gear owns scheduling: it pulls each
+file's and subject's metadata from Flywheel, orders the subject's files by
+scope, calls the deriver on each one, and pushes the results back. The
+SubjectDriver mirrors that workflow entirely in memory so a subject can be
+curated end-to-end locally, e.g. for benchmarks and profiling.
+"""
+
+import copy
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .attribute_deriver import AttributeDeriver, MissingnessDeriver
+from .symbol_table import OverlaySymbolTable, SymbolTable
+from .utils.scope import (
+    FormScope,
+    GeneticsScope,
+    MixedProtocolScope,
+    NCRADBiomarkerScope,
+    SCANMRIScope,
+    SCANPETScope,
+)
+
+# Order in which scopes are curated for a subject. Scopes that other scopes
+# read working variables from come first (e.g. MEDS and B1a before UDS, UDS
+# before the forms/images that are correlated to the closest UDS visit).
+# cross_module is not listed since it is run once per subject at the end; see
+# SUBJECT_SCOPES.
+SCOPE_ORDER: List[str] = [
+    GeneticsScope.HISTORIC_APOE,
+    GeneticsScope.APOE,
+    GeneticsScope.NCRAD_BIOSAMPLES,
+    NCRADBiomarkerScope.PTAU217,
+    NCRADBiomarkerScope.N2PB,
+    NCRADBiomarkerScope.ABETA40,
+    NCRADBiomarkerScope.ABETA42,
+    GeneticsScope.NIAGADS_AVAILABILITY,
+    FormScope.MDS,
+    FormScope.MLST,
+    FormScope.NP,
+    FormScope.BDS,
+    FormScope.CSF,
+    FormScope.FTLD,
+    FormScope.LBD,
+    FormScope.MEDS,
+    FormScope.B1A,
+    FormScope.UDS,
+    FormScope.CLS,
+    FormScope.COVID,
+    SCANMRIScope.MRI_QC,
+    SCANMRIScope.MRI_SBM,
+    SCANPETScope.PET_QC,
+    SCANPETScope.AMYLOID_PET_GAAIN,
+    SCANPETScope.AMYLOID_PET_NPDKA,
+    SCANPETScope.FDG_PET_NPDKA,
+    SCANPETScope.TAU_PET_NPDKA,
+    MixedProtocolScope.MRI_DICOM,
+    MixedProtocolScope.MRI_NIFTI,
+    MixedProtocolScope.PET_DICOM,
+    MixedProtocolScope.MRI_SUMMARY,
+]
+SCOPE_PRIORITY: Dict[str, int] = {scope: i for i, scope in enumerate(SCOPE_ORDER)}
+
+# Scopes run once per subject on the subject's global data, in order, after
+# all of the subject's files are curated
+SUBJECT_SCOPES: List[str] = [FormScope.CROSS_MODULE.value]
+
+# Rules (by name) that only count the subject's working variables, which
+# only grow over the subject's files, and assign the count with max, so their
+# value after the subject's last file of the scope is the value they end up
+# with. The drivers only derive them for that file, rather than recomputing
+# them for every file as the gear does.
+DEFERRED_RULES: Dict[str, FrozenSet[str]] = {
+    FormScope.UDS: frozenset(["years_of_uds"]),
+    SCANMRIScope.MRI_QC: frozenset(["scan_mri_session_count", "scan_mri_year_count"]),
+    SCANPETScope.PET_QC: frozenset(["scan_pet_session_count", "scan_pet_year_count"]),
+}
+
+# MP scopes whose derived variables only depend on the session (StudyDate),
+# so all acquisitions of a session can be curated at once
+SESSION_SCOPES = frozenset(
+    [
+        MixedProtocolScope.MRI_DICOM,
+        MixedProtocolScope.MRI_NIFTI,
+        MixedProtocolScope.PET_DICOM,
+    ]
+)
+
+
+@dataclass
+class CurationFile:
+    """A single file to curate for a subject.
+
+    - `scope` is the curation scope of the file
+    - `info` is the file's metadata, e.g. what the gear stores under
+      `file.info` (forms, raw, header, etc.)
+    - `order_key` orders files within the scope, usually a date
+    - `extras` are special top-level keys the gear adds to the table for
+      this file, e.g. `_filename` or `_uds_visitdate`
+    """
+
+    scope: str
+    info: Dict[str, Any]
+    order_key: str = ""
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+
+class SubjectDriver:
+    """Curates all files of a subject in scope order."""
+
+    def __init__(
+        self,
+        deriver: Optional[AttributeDeriver] = None,
+        missingness_deriver: Optional[MissingnessDeriver] = None,
+        rxclass: Optional[Dict[str, List[str]]] = None,
+        on_curated: Optional[Callable[[str, SymbolTable], None]] = None,
+        mp_sessions: bool = False,
+    ) -> None:
+        """Initializer.
+
+        Args:
+            deriver: The deriver to curate with; creates one if not provided
+            missingness_deriver: Optional file-level missingness deriver
+                to run on each file after it is curated
+            rxclass: Optional RxClass mapping to store under _rxclass
+            on_curated: Optional callback called with the scope and table
+                after each file (and the cross-module pass) is curated,
+                e.g. to write back the table's changes
+            mp_sessions: Whether to curate MP acquisitions once per session
+                instead of once per file; see `group_sessions`
+        """
+        self.__deriver = deriver if deriver is not None else AttributeDeriver()
+        self.__missingness_deriver = missingness_deriver
+        self.__rxclass = rxclass
+        self.__on_curated = on_curated
+        self.__mp_sessions = mp_sessions
+
+    @property
+    def deriver(self) -> AttributeDeriver:
+        return self.__deriver
+
+    @staticmethod
+    def schedule(files: Iterable[CurationFile]) -> List[CurationFile]:
+        """Orders the files by scope, then by order key within the scope.
+
+        Files with scopes the driver does not know about are dropped.
+        """
+        return sorted(
+            (x for x in files if x.scope in SCOPE_PRIORITY),
+            key=lambda x: (SCOPE_PRIORITY[x.scope], x.order_key),
+        )
+
+    @staticmethod
+    def group_sessions(files: Iterable[CurationFile]) -> List[List[CurationFile]]:
+        """Groups scheduled files into the batches they are curated in.
+
+        MP acquisitions of the same scope and StudyDate form one batch,
+        placed at the session's first file; every other file is a batch of
+        its own. Acquisitions without a StudyDate are not grouped, so they
+        fail the same way they do when curated on their own.
+        """
+        batches: List[List[CurationFile]] = []
+        sessions: Dict[Tuple[str, str], List[CurationFile]] = {}
+        for file in files:
+            study_date = (
+                file.info.get("header", {}).get("dicom", {}).get("StudyDate")
+                if file.scope in SESSION_SCOPES
+                else None
+            )
+            if not study_date:
+                batches.append([file])
+                continue
+
+            session = sessions.get((file.scope, study_date))
+            if session is None:
+                session = sessions[(file.scope, study_date)] = []
+                batches.append(session)
+            session.append(file)
+
+        return batches
+
+    def build_table(
+        self,
+        subject_info: Dict[str, Any],
+        file: CurationFile,
+        prev_record: Optional[Dict[str, Any]] = None,
+    ) -> SymbolTable:
+        """Builds the symbol table for a single file.
+
+        subject.info is shared by reference, so writes to it are visible
+        to the subject and later files.
+        """
+        table = SymbolTable()
+        table["file.info"] = file.info
+        table["subject.info"] = subject_info
+
+        if prev_record is not None:
+            table["_prev_record.info"] = prev_record
+        if self.__rxclass is not None:
+            table["_rxclass"] = self.__rxclass
+
+        for key, value in file.extras.items():
+            table[key] = value
+
+        return table
+
+    def curate_file(
+        self,
+        subject_info: Dict[str, Any],
+        file: CurationFile,
+        prev_record: Optional[Dict[str, Any]] = None,
+        skip: FrozenSet[str] = frozenset(),
+    ) -> SymbolTable:
+        """Curates a single file, then applies file-level missingness if
+        configured.
+
+        Curation writes to an overlay over the file's table, which is only
+        committed (to the file's and subject's metadata) if the file curates
+        without errors. The overlay tracks changes, so its `patch` reports
+        only what curation wrote.
+
+        Args:
+            subject_info: The subject's metadata
+            file: The file to curate
+            prev_record: The subject's previous UDS file, if any
+            skip: Names of the scope's rules to not derive for the file,
+                e.g. its DEFERRED_RULES if not the scope's last file
+        Returns:
+            The curated (and committed) table
+        """
+        table = OverlaySymbolTable(self.build_table(subject_info, file, prev_record))
+        table.start_tracking()
+        try:
+            self.__deriver.curate(table, file.scope, skip)  # type: ignore
+
+            if self.__missingness_deriver is not None:
+                self.__missingness_deriver.curate(table, file.scope)  # type: ignore
+        except Exception:
+            table.discard()
+            raise
+
+        table.commit()
+        return table
+
+    def curate_session(
+        self,
+        subject_info: Dict[str, Any],
+        files: List[CurationFile],
+        skip: FrozenSet[str] = frozenset(),
+    ) -> SymbolTable:
+        """Curates all acquisitions of an MP session at once.
+
+        The session is curated as its first file, with `_filename` set to
+        the list of all the session's filenames, which gives the same
+        subject-level values as curating each file in turn. The derived
+        values are then deep-copied to the session's other files, so the
+        file locator variables (e.g. NACCMRFI) of every file hold the whole
+        session's list rather than the list up to that file.
+
+        Returns:
+            The curated (and committed) table
+        """
+        first = files[0]
+        session = CurationFile(
+            scope=first.scope,
+            info=first.info,
+            order_key=first.order_key,
+            extras={
+                **first.extras,
+                "_filename": [x.extras.get("_filename") for x in files],
+            },
+        )
+        table = self.curate_file(subject_info, session, skip=skip)
+
+        derived = first.info.get("derived", {})
+        for file in files[1:]:
+            file.info.setdefault("derived", {}).update(copy.deepcopy(derived))
+
+        return table
+
+    def curate_subject_scope(
+        self, subject_info: Dict[str, Any], scope: str
+    ) -> SymbolTable:
+        """Runs a subject-level scope (see SUBJECT_SCOPES) on the subject's
+        global data.
+
+        Returns:
+            The curated table
+        """
+        base = SymbolTable()
+        base["subject.info"] = subject_info
+        table = OverlaySymbolTable(base)
+        table.start_tracking()
+        try:
+            self.__deriver.curate(table, scope)  # type: ignore
+        except Exception:
+            table.discard()
+            raise
+
+        table.commit()
+        return table
+
+    def curate_cross_module(self, subject_info: Dict[str, Any]) -> SymbolTable:
+        """Runs the cross_module scope on the subject's global data.
+
+        Returns:
+            The curated table
+        """
+        return self.curate_subject_scope(subject_info, FormScope.CROSS_MODULE.value)
+
+    def curate_subject(
+        self,
+        files: Iterable[CurationFile],
+        subject_info: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Curates all files of a subject.
+
+        If the deriver has a profiler, the subject is recorded on it, along
+        with its peak memory and subject.info subtree sizes if the profiler
+        tracks memory.
+
+        Args:
+            files: The subject's files
+            subject_info: The subject's existing metadata, if any; this is
+                updated in place
+        Returns:
+            The curated subject metadata
+        """
+        subject_info = subject_info if subject_info is not None else {}
+        profiler = self.__deriver.profiler
+        memory = profiler.memory if profiler is not None else None
+        if memory is None:
+            self.__curate_files(files, subject_info)
+            if profiler is not None:
+                profiler.record_subject()
+            return subject_info
+
+        memory.begin()
+        try:
+            self.__curate_files(files, subject_info)
+        finally:
+            peak_memory = memory.end()[0]
+
+        profiler.record_subject(  # type: ignore
+            peak_memory=peak_memory, subject_info=subject_info
+        )
+        return subject_info
+
+    def __curate_files(
+        self, files: Iterable[CurationFile], subject_info: Dict[str, Any]
+    ) -> None:
+        """Curates the files in scope order, then the subject-level scopes.
+
+        The DEFERRED_RULES of a scope are only derived for the scope's last
+        file (or session).
+        """
+        prev_uds: Optional[Dict[str, Any]] = None
+        uds_files: List[CurationFile] = []
+
+        scheduled = self.schedule(files)
+        batches = (
+            self.group_sessions(scheduled)
+            if self.__mp_sessions
+            else [[x] for x in scheduled]
+        )
+        last_batch = {batch[0].scope: i for i, batch in enumerate(batches)}
+        for i, batch in enumerate(batches):
+            file = batch[0]
+            skip = (
+                DEFERRED_RULES.get(file.scope, frozenset())
+                if i != last_batch[file.scope]
+                else frozenset()
+            )
+            if len(batch) > 1:
+                table = self.curate_session(subject_info, batch, skip)
+            else:
+                prev_record = prev_uds if file.scope == FormScope.UDS else None
+                table = self.curate_file(subject_info, file, prev_record, skip)
+            if self.__on_curated is not None:
+                self.__on_curated(file.scope, table)
+
+            if file.scope == FormScope.UDS:
+                prev_uds = file.info
+                uds_files.append(file)
+
+        for scope in SUBJECT_SCOPES:
+            table = self.curate_subject_scope(subject_info, scope)
+            if self.__on_curated is not None:
+                self.__on_curated(scope, table)
+
+        self.back_propagate(subject_info, uds_files)
+
+    @staticmethod
+    def back_propagate(
+        subject_info: Dict[str, Any], uds_files: Iterable[CurationFile]
+    ) -> None:
+        """Copies the final subject cross-sectional values into each UDS
+        file's derived metadata."""
+        cross_sectional = subject_info.get("derived", {}).get("cross-sectional")
+        if not cross_sectional:
+            return
+
+        for file in uds_files:
+            file.info.setdefault("derived", {}).update(cross_sectional)
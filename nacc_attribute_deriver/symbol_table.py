@@ -1,9 +1,42 @@
-from collections import deque
-from typing import Any, Dict, Iterator, MutableMapping, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+# marks a path that did not exist before it was written
+_MISSING = object()
 
 
 class SymbolTable(MutableMapping[str, Any]):
-    """Implements a dictionary like object for using metadata paths as keys."""
+    """Implements a dictionary like object for using metadata paths as keys.
+
+    The table can optionally track changes: once `start_tracking` is
+    called, every write (set or pop) records the path and the value it
+    replaced, so the paths whose values actually changed can be reported
+    with `dirty_paths` or as a JSON-Patch-like list with `patch`. Changes
+    are detected by comparing against the replaced values, so values read
+    from the table must not be modified in place before being written back.
+
+    Reads also descend into read-only Mappings, e.g. a form stored as a
+    FormRecord, but writes can only be made under dicts; writing under a
+    read-only Mapping raises a TypeError.
+
+    The table can also memoize objects derived from it, e.g. state shared by
+    all rules of a curation pass, with `memoize`. This only caches between
+    `start_caching` and `stop_caching`, which the deriver calls around each
+    pass; otherwise the factory is called every time.
+    """
 
     def __init__(
         self,
@@ -13,6 +46,13 @@ class SymbolTable(MutableMapping[str, Any]):
         self.__table: Dict[str, Any] = {}
         self.__separator = separator
 
+        # original value of each path written while tracking, or None if
+        # not tracking
+        self.__originals: Optional[Dict[str, Any]] = None
+
+        # objects memoized with memoize, or None if not caching
+        self.__cache: Optional[Dict[str, Any]] = None
+
         # interpret metadata paths
         if symbol_dict:
             for key, value in symbol_dict.items():
@@ -20,34 +60,50 @@ class SymbolTable(MutableMapping[str, Any]):
 
     def __setitem__(self, key: str, value: Any) -> None:
         table = self.__table
-        key_list = deque(key.split(self.__separator))
-        while key_list:
-            sub_key = key_list.popleft()
+        key_list = key.split(self.__separator)
+        last = len(key_list) - 1
+        track = self.__originals is not None
+        for i, sub_key in enumerate(key_list):
             obj = table.get(sub_key, None)
-            if obj is None:
-                if not key_list:
-                    table[sub_key] = value
-                    return
-
-                table[sub_key] = {}
-                table = table[sub_key]
-                continue
-
-            if not key_list:
+            if i == last:
+                if track:
+                    self.__record(key, obj if sub_key in table else _MISSING)
                 table[sub_key] = value
                 return
 
-            if not isinstance(obj, dict):
+            if obj is None:
+                if track:
+                    # the write creates this subtree, so record it as a whole
+                    self.__record(
+                        self.__separator.join(key_list[: i + 1]),
+                        None if sub_key in table else _MISSING,
+                    )
+                    track = False
+                obj = {}
+                table[sub_key] = obj
+            elif not isinstance(obj, dict):
+                if isinstance(obj, Mapping):
+                    path = self.__separator.join(key_list[: i + 1])
+                    raise TypeError(
+                        f"Cannot write {key}: {path} is a read-only mapping"
+                    )
                 raise KeyError("Key %s maps to atomic value", key)
 
             table = obj
 
+    def __record(self, path: str, original: Any) -> None:
+        """Records the original value of a path on its first write."""
+        if path not in self.__originals:  # type: ignore
+            self.__originals[path] = original  # type: ignore
+
     def __getitem__(self, key: str) -> Optional[Any]:
         value = self.__table
         key_list = key.split(self.__separator)
         while key_list:
             sub_key = key_list.pop(0)
-            if not isinstance(value, dict):
+            # checking dict first is a fast path; isinstance against the
+            # Mapping ABC is several times slower
+            if not isinstance(value, dict) and not isinstance(value, Mapping):
                 raise KeyError("Key %s maps to atomic value", key)
 
             if sub_key not in value:
@@ -65,7 +121,8 @@ class SymbolTable(MutableMapping[str, Any]):
         key_list = key.split(self.__separator)
         while key_list:
             sub_key = key_list.pop(0)
-            if not isinstance(value, dict):
+            # dict first is a fast path, as in __getitem__
+            if not isinstance(value, dict) and not isinstance(value, Mapping):
                 raise KeyError()
 
             if sub_key in value:
@@ -96,6 +153,10 @@ class SymbolTable(MutableMapping[str, Any]):
     def to_dict(self) -> MutableMapping[str, Any]:
         return self.__table
 
+    @property
+    def separator(self) -> str:
+        return self.__separator
+
     def pop(self, key: str, default: Any = None) -> Any:
         """Implement the pop method."""
         # we know it's there, need to manually pop
@@ -110,6 +171,283 @@ class SymbolTable(MutableMapping[str, Any]):
 
         last_key = key_parts[-1]
         if isinstance(table, dict) and last_key in table:
+            if self.__originals is not None:
+                self.__record(key, table[last_key])
             return table.pop(last_key)
 
         return default
+
+    @property
+    def tracking(self) -> bool:
+        """Returns whether changes are being tracked."""
+        return self.__originals is not None
+
+    def start_tracking(self) -> None:
+        """Starts tracking changes, discarding any previously tracked."""
+        self.__originals = {}
+
+    def stop_tracking(self) -> None:
+        """Stops tracking changes and discards the tracked changes."""
+        self.__originals = None
+
+    @property
+    def caching(self) -> bool:
+        """Returns whether memoized objects are cached."""
+        return self.__cache is not None
+
+    def start_caching(self) -> None:
+        """Starts caching memoized objects, discarding any previously
+        cached."""
+        self.__cache = {}
+
+    def stop_caching(self) -> None:
+        """Stops caching and discards the memoized objects."""
+        self.__cache = None
+
+    def memoize(self, key: str, factory: Callable[[], T]) -> T:
+        """Returns the object memoized under the key, creating it with the
+        factory if it is not cached yet.
+
+        The caller is responsible for the object staying valid while it is
+        cached, e.g. by only memoizing state derived from values the current
+        pass does not write.
+
+        Args:
+            key: The cache key
+            factory: Creates the object
+        Returns:
+            The memoized object, or a new one if not caching
+        """
+        if self.__cache is None:
+            return factory()
+
+        if key not in self.__cache:
+            self.__cache[key] = factory()
+
+        return self.__cache[key]
+
+    def dirty_paths(self, prefix: Optional[str] = None) -> List[str]:
+        """Returns the minimal set of paths whose values changed since
+        tracking started.
+
+        Paths that were written with an equal value are not included, nor
+        are paths whose ancestor is already included.
+
+        Args:
+            prefix: If specified, only paths under this path are returned
+        Returns:
+            The changed paths, sorted
+        """
+        if not self.__originals:
+            return []
+
+        changed = set()
+        for path, original in self.__originals.items():
+            if self.__get_or_missing(path) is original:
+                # same object (or both missing), so any changes within it
+                # are recorded on the descendant paths
+                continue
+            if self.__get_or_missing(path) != original:
+                changed.add(path)
+
+        result = []
+        for path in sorted(changed):
+            parts = path.split(self.__separator)
+            if any(
+                self.__separator.join(parts[:i]) in changed
+                for i in range(1, len(parts))
+            ):
+                continue
+            if prefix is None or self.__is_within(path, prefix):
+                result.append(path)
+            elif self.__is_within(prefix, path):
+                # an ancestor of the prefix changed, so all of it did
+                return [prefix]
+
+        return result
+
+    def patch(self, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Returns the changes since tracking started as a JSON-Patch-like
+        list of add, replace, and remove operations.
+
+        Only the paths returned by `dirty_paths` are included, with their
+        current values. Lists that were only appended to are reported as
+        adds of the new elements to the end of the list ("/-").
+
+        Args:
+            prefix: If specified, only changes under this path are
+                returned, with pointers relative to it, e.g. "subject.info"
+                so the patch can be applied to the subject's info directly
+        Returns:
+            List of operations, each with an op, a JSON pointer path, and
+            a value (except for remove)
+        """
+        result: List[Dict[str, Any]] = []
+        for path in self.dirty_paths(prefix):
+            parts = path.split(self.__separator)
+            if prefix is not None:
+                parts = parts[len(prefix.split(self.__separator)) :]
+
+            pointer = "".join(
+                "/" + x.replace("~", "~0").replace("/", "~1") for x in parts
+            )
+
+            current = self.__get_or_missing(path)
+            original = self.__original(path)
+            if current is _MISSING:
+                result.append({"op": "remove", "path": pointer})
+            elif original is _MISSING:
+                result.append({"op": "add", "path": pointer, "value": current})
+            elif (
+                isinstance(original, list)
+                and isinstance(current, list)
+                and len(current) > len(original)
+                and current[: len(original)] == original
+            ):
+                # only appended to, so just add the new elements
+                result.extend(
+                    {"op": "add", "path": f"{pointer}/-", "value": x}
+                    for x in current[len(original) :]
+                )
+            else:
+                result.append({"op": "replace", "path": pointer, "value": current})
+
+        return result
+
+    def __original(self, path: str) -> Any:
+        """Returns the original value of a dirty path, which may be an
+        ancestor of the recorded path if the ancestor itself changed.
+
+        Returns:
+            The original value, _MISSING if the path (or its ancestor) did
+            not exist, or None if an ancestor was replaced
+        """
+        originals: Dict[str, Any] = self.__originals  # type: ignore
+        if path in originals:
+            return originals[path]
+
+        parts = path.split(self.__separator)
+        for i in range(len(parts) - 1, 0, -1):
+            ancestor = self.__separator.join(parts[:i])
+            if ancestor in originals:
+                return _MISSING if originals[ancestor] is _MISSING else None
+
+        return None
+
+    def __get_or_missing(self, path: str) -> Any:
+        """Returns the value at the path, or _MISSING if there is none."""
+        try:
+            return self[path]
+        except KeyError:
+            return _MISSING
+
+    def __is_within(self, path: str, prefix: str) -> bool:
+        """Returns whether the path is the prefix or under it."""
+        return path == prefix or path.startswith(prefix + self.__separator)
+
+
+class OverlaySymbolTable(SymbolTable):
+    """A copy-on-write view over a base SymbolTable.
+
+    Reads fall through to the base, while writes land in a per-table layer:
+    the dicts along a written path are shallow-copied on the first write
+    into them, so the base is never modified until `commit` replays the
+    writes onto it. `discard` throws the writes away instead, e.g. when
+    curating the file failed.
+
+    Dicts written as values are shallow-copied into the layer, since they
+    may come from the base (e.g. `table["c"] = table["a.b"]`), so writes
+    under them never modify the dict that was written.
+    """
+
+    def __init__(self, base: SymbolTable) -> None:
+        super().__init__(separator=base.separator)
+        self.__base = base
+        self.__writes: List[Tuple[str, Any]] = []
+        # dicts the layer may modify, keyed by id; holds a reference so ids
+        # are not reused while the layer is alive
+        self.__owned: Dict[int, MutableMapping[str, Any]] = {}
+        # parent paths already copied, to skip walking them again
+        self.__copied: Set[str] = set()
+        self.__reset_layer()
+
+    @property
+    def base(self) -> SymbolTable:
+        """Returns the base table."""
+        return self.__base
+
+    @property
+    def modified(self) -> bool:
+        """Returns whether there are uncommitted writes."""
+        return bool(self.__writes)
+
+    def __reset_layer(self) -> None:
+        """Resets the layer to a shallow copy of the base's root."""
+        root = self.to_dict()
+        root.clear()
+        root.update(self.__base.to_dict())
+        self.__owned = {id(root): root}
+        self.__copied = set()
+        self.__writes = []
+
+    def __copy_path(self, key: str) -> None:
+        """Shallow-copies the dicts along the path to the key that are not
+        yet owned by the layer."""
+        parent = key.rpartition(self.separator)[0]
+        if parent in self.__copied:
+            return
+
+        table = self.to_dict()
+        for sub_key in parent.split(self.separator) if parent else []:
+            obj = table.get(sub_key)
+            if not isinstance(obj, dict):
+                return
+
+            if id(obj) not in self.__owned:
+                obj = dict(obj)
+                table[sub_key] = obj
+                self.__owned[id(obj)] = obj
+            table = obj
+
+        self.__copied.add(parent)
+
+    def __forget_copied(self, key: str) -> None:
+        """Forgets the copied parent paths under the key, e.g. when a dict
+        replaces it."""
+        below = f"{key}{self.separator}"
+        self.__copied = {
+            x for x in self.__copied if x != key and not x.startswith(below)
+        }
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.__copy_path(key)
+        if isinstance(value, dict):
+            value = dict(value)
+            self.__owned[id(value)] = value
+            self.__forget_copied(key)
+
+        super().__setitem__(key, value)
+        self.__writes.append((key, value))
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Implement the pop method."""
+        if self.get(key, _MISSING) is _MISSING:
+            return default
+
+        self.__copy_path(key)
+        self.__writes.append((key, _MISSING))
+        return super().pop(key, default)
+
+    def commit(self) -> None:
+        """Replays the writes onto the base, then starts a new layer."""
+        for key, value in self.__writes:
+            if value is _MISSING:
+                self.__base.pop(key)
+            else:
+                self.__base[key] = value
+
+        self.__reset_layer()
+
+    def discard(self) -> None:
+        """Throws away the writes, then starts a new layer."""
+        self.__reset_layer()
@@ -0,0 +1,29 @@
+"""NumPy for the columnar evaluators (see scan_columnar and uds_columnar),
+which derive the values of whole columns of rows at once.
+
+NumPy is an optional dependency of the package, so it is only imported
+here; `np` is None if it is not installed.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+
+def columnar_available() -> bool:
+    """Returns whether NumPy is installed, which columnar evaluation
+    needs."""
+    return np is not None
+
+
+def require_columnar(evaluation: str) -> None:
+    """Checks NumPy is installed for the columnar evaluation.
+
+    Args:
+        evaluation: What the evaluation is, for the error
+    Raises:
+        ImportError if NumPy is not installed
+    """
+    if np is None:
+        raise ImportError(f"columnar {evaluation} evaluation requires numpy")
@@ -1,8 +1,10 @@
 """Helper methods related to dates."""
 
 import re
+from bisect import bisect_left
 from datetime import date, datetime
-from typing import List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
 from .errors import AttributeDeriverError
 
@@ -13,9 +15,30 @@ DATE_FMT_YEAR_LAST_DASH = re.compile(r"\d{2}-\d{2}-\d{4}")
 DATE_FMT_YEAR_LAST_SLASH = re.compile(r"\d{2}/\d{2}/\d{4}")
 
 
+# number of distinct date strings to keep parsed; a subject only has a few
+# dozen, but the cache is shared across subjects
+DATE_CACHE_SIZE = 4096
+
+
+def is_iso_date(date_string: str) -> bool:
+    """Returns whether the string is exactly in YYYY-MM-DD format."""
+    return (
+        len(date_string) == 10
+        and date_string[4] == "-"
+        and date_string[7] == "-"
+        and date_string[:4].isdecimal()
+        and date_string[5:7].isdecimal()
+        and date_string[8:].isdecimal()
+    )
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
 def datetime_from_form_date(date_string: Optional[str]) -> Optional[datetime]:
     """Converts date string to datetime based on format.
 
+    Results are cached by the date string; invalid strings are not cached,
+    so they raise the same error every time.
+
     Args:
       date_string: the date string
     Returns:
@@ -24,6 +47,14 @@ def datetime_from_form_date(date_string: Optional[str]) -> Optional[datetime]:
     if not date_string:
         return None
 
+    # fast path for YYYY-MM-DD; anything fromisoformat rejects (e.g. an
+    # invalid day) goes through strptime below so the error is unchanged
+    if is_iso_date(date_string):
+        try:
+            return datetime.fromisoformat(date_string)
+        except ValueError:
+            pass
+
     try:
         # YYYY-MM-DD format
         if DATE_FMT_YEAR_FIRST_DASH.match(date_string):
@@ -55,6 +86,7 @@ def date_from_form_date(date_string: Optional[str]) -> Optional[date]:
     return None
 
 
+@lru_cache(maxsize=DATE_CACHE_SIZE)
 def parse_date_parts(
     date_string: Optional[str],
 ) -> Tuple[Optional[int], Optional[int], Optional[int]]:
@@ -65,6 +97,10 @@ def parse_date_parts(
     if date_string is None:
         return None, None, None
 
+    # fast path for YYYY-MM-DD
+    if is_iso_date(date_string):
+        return int(date_string[:4]), int(date_string[5:7]), int(date_string[8:])
+
     # get dates parts in the correct order
     date_parts = None
 
@@ -164,34 +200,101 @@ def standardize_date(date_value: Optional[str | date]) -> Optional[str]:
     return str(date_value)
 
 
+class DateIndex:
+    """Sorted index over a list of date strings, e.g. a subject's UDS
+    visitdates, for O(log n) closest-date lookups.
+
+    Indices refer to positions in the original list, which does not have
+    to be sorted.
+    """
+
+    __slots__ = ("__dates", "__indices")
+
+    def __init__(self, raw_dates: Sequence[str]) -> None:
+        """Initializer.
+
+        Args:
+            raw_dates: The date strings to index
+        Raises:
+            AttributeDeriverError if any of the dates cannot be parsed
+        """
+        dates = [date_from_form_date(x) for x in raw_dates]
+        if any(x is None for x in dates):
+            raise AttributeDeriverError(
+                "Failed to convert all dates to datetime objects; cannot "
+                + "find closest date"
+            )
+
+        # keep the first index of each date, which is what a linear scan
+        # would find first
+        first_indices: Dict[date, int] = {}
+        for i, parsed in enumerate(dates):
+            first_indices.setdefault(parsed, i)  # type: ignore
+
+        self.__dates: Tuple[date, ...] = tuple(sorted(first_indices))
+        self.__indices: Tuple[int, ...] = tuple(first_indices[x] for x in self.__dates)
+
+    def __len__(self) -> int:
+        return len(self.__dates)
+
+    @property
+    def dates(self) -> Tuple[date, ...]:
+        """Returns the unique dates in sorted order."""
+        return self.__dates
+
+    def closest(self, target: date) -> Tuple[date, int]:
+        """Returns the closest date to the target and its index in the
+        original list.
+
+        Ties are broken the same way as a linear `min` over the original
+        list: the date that comes first in the original list wins.
+        """
+        if not self.__dates:
+            raise AttributeDeriverError("Dates list is empty; cannot find closet date")
+
+        position = bisect_left(self.__dates, target)
+        candidates = [i for i in (position - 1, position) if 0 <= i < len(self.__dates)]
+        best = min(
+            candidates,
+            key=lambda i: (abs(self.__dates[i] - target), self.__indices[i]),
+        )
+        return self.__dates[best], self.__indices[best]
+
+
 def find_closest_date(
-    raw_dates: List[str], raw_target_date: str, as_date: bool = False
+    raw_dates: List[str],
+    raw_target_date: str,
+    as_date: bool = False,
+    index: Optional[DateIndex] = None,
 ) -> Tuple[str | date, int]:
     """Find the value and index of the closet date in the list of dates to the
-    given target date."""
+    given target date.
+
+    Args:
+        raw_dates: The dates to search
+        raw_target_date: The date to find the closest date to
+        as_date: Whether to return the closest date as a date
+        index: The DateIndex of the dates, if already built, e.g. memoized
+            for all lookups of a curation pass
+    """
     if not raw_dates:
         raise AttributeDeriverError("Dates list is empty; cannot find closet date")
 
     # convert all to datetime objects
     target = date_from_form_date(raw_target_date)
-    dates = [date_from_form_date(x) for x in raw_dates]
-
-    if not target or any(x is None for x in dates):
+    if index is None:
+        index = DateIndex(raw_dates)
+    if not target:
         raise AttributeDeriverError(
             "Failed to convert all dates to datetime objects; cannot "
             + "find closest date"
         )
 
-    index = min(range(len(dates)), key=lambda i: abs(dates[i] - target))  # type: ignore
-    result = standardize_date(raw_dates[index])
-
-    if not result:
-        raise AttributeDeriverError(f"Failed to standardize {raw_dates[index]}")
-
+    closest, position = index.closest(target)
     if as_date:
-        return (dates[index], index)  # type: ignore
+        return (closest, position)
 
-    return (result, index)
+    return (str(closest), position)
 
 
 def make_date_from_parts(
@@ -0,0 +1,189 @@
+"""Compact read-only records for form JSON payloads.
+
+Each visit's `file.info.forms.json` is a dict with hundreds to over a
+thousand keys, so holding many visits in memory (e.g. in the
+UDSMissingnessDriver) mostly holds the same keys and dict tables over and
+over. A FormRecord instead stores a visit's values in a tuple indexed by a
+FormKeys table that all records of the same UDS form version and packet
+share. The key tables come from `config/uds_ded_matrix.csv`; any keys a form
+has that the matrix does not list for its version are kept in a small dict
+of extras. Short string values, which are mostly codes, are interned so
+visits share them too.
+
+Records are read-only Mappings, so the SymbolTable and the namespaces read
+them like the dicts they replace. Use `to_dict` to get a dict back, e.g.
+before modifying the form.
+"""
+
+import csv
+import sys
+from functools import cache
+from importlib import resources
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+from nacc_attribute_deriver import config
+
+# longest string value that is interned
+INTERN_LENGTH = 16
+
+# marks a key the record does not have
+_ABSENT = object()
+
+
+class FormKeys:
+    """A shared table of form keys and their indices."""
+
+    __slots__ = ("__index", "__keys")
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        """Initializer.
+
+        Args:
+            keys: The keys, in index order; repeated keys are dropped
+        """
+        self.__keys = tuple(dict.fromkeys(keys))
+        self.__index = {x: i for i, x in enumerate(self.__keys)}
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__keys)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (FormKeys, (self.__keys,))
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        return self.__keys
+
+    def index(self, key: str) -> int:
+        """Returns the index of the key, or -1 if not in the table."""
+        return self.__index.get(key, -1)
+
+
+class FormRecord(Mapping[str, Any]):
+    """A read-only form, stored as values indexed by a shared key table."""
+
+    __slots__ = ("__extras", "__keys", "__values")
+
+    def __init__(self, keys: FormKeys, form: Mapping[str, Any]) -> None:
+        """Initializer.
+
+        Args:
+            keys: The key table; keys of the form not in it are kept as
+                extras
+            form: The form's values
+        """
+        values = [_ABSENT] * len(keys)
+        last = -1
+        extras: Optional[Dict[str, Any]] = None
+        for key, value in form.items():
+            if type(value) is str and len(value) <= INTERN_LENGTH:
+                value = sys.intern(value)
+
+            index = keys.index(key)
+            if index < 0:
+                if extras is None:
+                    extras = {}
+                extras[key] = value
+                continue
+
+            values[index] = value
+            last = max(last, index)
+
+        self.__keys = keys
+        # values past the last key the form has are all absent
+        self.__values = tuple(values[: last + 1])
+        self.__extras = extras
+
+    @property
+    def keys_table(self) -> FormKeys:
+        """Returns the record's key table."""
+        return self.__keys
+
+    def get(self, key: str, default: Any = None) -> Any:
+        index = self.__keys.index(key)
+        if 0 <= index < len(self.__values):
+            value = self.__values[index]
+            if value is not _ABSENT:
+                return value
+        elif index < 0 and self.__extras is not None:
+            return self.__extras.get(key, default)
+
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _ABSENT)
+        if value is _ABSENT:
+            raise KeyError(key)
+
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key, _ABSENT) is not _ABSENT
+
+    def __iter__(self) -> Iterator[str]:
+        keys = self.__keys.keys
+        for index, value in enumerate(self.__values):
+            if value is not _ABSENT:
+                yield keys[index]
+
+        if self.__extras is not None:
+            yield from self.__extras
+
+    def __len__(self) -> int:
+        extras = len(self.__extras) if self.__extras is not None else 0
+        return sum(1 for x in self.__values if x is not _ABSENT) + extras
+
+    def __repr__(self) -> str:
+        return f"FormRecord({self.to_dict()!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (FormRecord, (self.__keys, self.to_dict()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the form as a dict."""
+        return dict(self.items())
+
+
+@cache
+def load_form_keys() -> Dict[Optional[str], FormKeys]:
+    """Loads the key table of each UDS DED matrix version, e.g. v3.0_I, and
+    the table of all variables under None."""
+    with resources.files(config).joinpath("uds_ded_matrix.csv").open("r") as fh:
+        reader = csv.DictReader(fh)
+        versions = [x for x in reader.fieldnames or [] if x != "variable"]
+        keys: Dict[Optional[str], list[str]] = {x: [] for x in versions}
+        keys[None] = []
+        for row in reader:
+            keys[None].append(row["variable"])
+            for version in versions:
+                if row[version]:
+                    keys[version].append(row["variable"])
+
+    return {x: FormKeys(y) for x, y in keys.items()}
+
+
+def get_form_keys(formver: Any, packet: Any) -> FormKeys:
+    """Returns the key table of the UDS form version and packet, or the
+    table of all variables if either is not set or not in the matrix."""
+    tables = load_form_keys()
+    try:
+        version = f"v{float(formver):.1f}_{str(packet).strip().upper()}"
+    except (TypeError, ValueError):
+        return tables[None]
+
+    return tables.get(version, tables[None]) if packet else tables[None]
+
+
+def compact_form(form: Mapping[str, Any]) -> FormRecord:
+    """Returns the form as a FormRecord keyed by its UDS form version and
+    packet; returns it as is if it already is one."""
+    if isinstance(form, FormRecord):
+        return form
+
+    return FormRecord(get_form_keys(form.get("formver"), form.get("packet")), form)
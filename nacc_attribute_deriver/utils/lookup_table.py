@@ -0,0 +1,106 @@
+"""Compact read-only lookup tables for the reference CSVs under config.
+
+Tables like drug_ids_v1.csv and UDSMEDS.csv have thousands of rows but are
+only needed by a few scopes, so their modules load them on first use (and
+cache them) rather than at import time.
+
+A LookupTable stores its sorted keys and their values as two strings plus
+two offset arrays, and finds keys by binary search. That is a handful of
+objects instead of a dict entry and two strings per row, so when a table is
+loaded before forking workers its pages stay shared: lookups only touch
+the refcounts of the four containers, not of thousands of row objects.
+"""
+
+import csv
+from array import array
+from importlib import resources
+from itertools import accumulate
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from nacc_attribute_deriver import config
+
+
+class LookupTable:
+    """Read-only mapping of strings to strings, sorted by key."""
+
+    __slots__ = ("__key_offsets", "__keys", "__value_offsets", "__values")
+
+    def __init__(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Initializer.
+
+        Args:
+            items: The (key, value) pairs; if a key repeats, its last value
+                is kept
+        """
+        mapping = dict(items)
+        keys = sorted(mapping)
+        values = [mapping[x] for x in keys]
+
+        self.__keys = "".join(keys)
+        self.__key_offsets = array("L", accumulate(map(len, keys), initial=0))
+        self.__values = "".join(values)
+        self.__value_offsets = array("L", accumulate(map(len, values), initial=0))
+
+    def __len__(self) -> int:
+        return len(self.__key_offsets) - 1
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.__find(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.__key(i) for i in range(len(self)))
+
+    def __key(self, index: int) -> str:
+        offsets = self.__key_offsets
+        return self.__keys[offsets[index] : offsets[index + 1]]
+
+    def __find(self, key: str) -> int:
+        """Returns the index of the key, or -1 if not found."""
+        keys, offsets = self.__keys, self.__key_offsets
+        low, high = 0, len(offsets) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if keys[offsets[middle] : offsets[middle + 1]] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < len(offsets) - 1 and keys[offsets[low] : offsets[low + 1]] == key:
+            return low
+
+        return -1
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Returns the value of the key, or the default if not found."""
+        index = self.__find(key)
+        if index < 0:
+            return default
+
+        offsets = self.__value_offsets
+        return self.__values[offsets[index] : offsets[index + 1]]
+
+
+def load_lookup_table(
+    filename: str,
+    key_column: str,
+    value_column: str,
+    normalize: Optional[Callable[[str], str]] = None,
+) -> LookupTable:
+    """Loads a lookup table from a CSV under config.
+
+    Args:
+        filename: The CSV's filename
+        key_column: The column of the keys
+        value_column: The column of the values
+        normalize: Optional function to apply to each key and value
+    Returns:
+        The lookup table
+    """
+    with resources.files(config).joinpath(filename).open("r") as fh:
+        reader = csv.DictReader(fh)
+        if normalize is None:
+            return LookupTable((row[key_column], row[value_column]) for row in reader)
+
+        return LookupTable(
+            (normalize(row[key_column]), normalize(row[value_column])) for row in reader
+        )
@@ -0,0 +1,524 @@
+"""Optional per-rule instrumentation for the attribute derivers.
+
+A RuleProfiler can be attached to an AttributeDeriver or MissingnessDeriver
+to record, for every rule function and every scope, the wall time spent,
+the number of calls, the number of calls that raised, and the types of the
+values returned. A single profiler is meant to be reused across files and
+subjects (and merged across workers) so that the results aggregate over a
+full curation run.
+
+When no profiler is attached the deriver takes its normal code path, so
+there is no cost to leaving this disabled.
+
+A profiler created with track_memory=True additionally uses tracemalloc to
+record the peak memory allocated by each rule, scope, and subject, and the
+size of each subject.info subtree after curation. tracemalloc slows down
+curation considerably, so timings from a memory profile should not be
+compared against timings without one.
+"""
+
+import json
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, List, Literal, Mapping, Optional, Tuple
+
+SortKey = Literal[
+    "total_time", "calls", "mean_time", "max_time", "errors", "peak_memory"
+]
+
+
+class MemoryTracker:
+    """Measures peak traced memory over nested regions (subject, scope,
+    rule).
+
+    tracemalloc only keeps a single peak, which has to be reset to measure
+    each rule. So every open region keeps its own running peak, and the
+    tracemalloc peak is folded into all open regions before it is reset.
+
+    Each tracker closes its own regions, so trackers (e.g. the derived and
+    missingness profilers) may interleave. If a tracker started tracing,
+    it is stopped again once no tracker has an open region.
+    """
+
+    # open regions of all trackers; the tracemalloc peak is process-wide, so
+    # it is folded into every open region before it is reset
+    __open: ClassVar[List[List[int]]] = []
+
+    # whether a tracker started tracemalloc, so it is stopped once the last
+    # open region closes
+    __started: ClassVar[bool] = False
+
+    def __init__(self) -> None:
+        # this tracker's stack of [starting traced memory, highest traced
+        # memory seen]
+        self.__regions: List[List[int]] = []
+
+    def __fold_peak(self) -> int:
+        """Folds the tracemalloc peak into all open regions.
+
+        Returns:
+            The current traced memory
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        for region in MemoryTracker.__open:
+            if peak > region[1]:
+                region[1] = peak
+
+        return current
+
+    def begin(self) -> None:
+        """Opens a region; starts tracemalloc if it is not already
+        tracing."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            MemoryTracker.__started = True
+
+        self.__fold_peak()
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        region = [current, current]
+        self.__regions.append(region)
+        MemoryTracker.__open.append(region)
+
+    def end(self) -> Tuple[int, int]:
+        """Closes the tracker's innermost region.
+
+        Returns:
+            The peak memory allocated above the region's starting level and
+            the net memory retained by the region, in bytes
+        """
+        current = self.__fold_peak()
+        region = self.__regions.pop()
+        MemoryTracker.__open[:] = [x for x in MemoryTracker.__open if x is not region]
+        if not MemoryTracker.__open and MemoryTracker.__started:
+            tracemalloc.stop()
+            MemoryTracker.__started = False
+
+        start, peak = region
+        return peak - start, current - start
+
+
+def subtree_sizes(info: Mapping[str, Any], depth: int = 2) -> Dict[str, int]:
+    """Returns the serialized JSON size of each subtree of the metadata.
+
+    JSON size is used rather than in-memory size so the results are
+    comparable across Python versions and releases.
+
+    Args:
+        info: The metadata, e.g. subject.info
+        depth: How many levels of subtrees to report, e.g. 2 reports
+            `derived` and `derived.longitudinal`
+    Returns:
+        The size in bytes of each subtree, keyed by dot-separated path
+    """
+    result: Dict[str, int] = {}
+
+    def visit(node: Mapping[str, Any], prefix: str, level: int) -> None:
+        for key, value in node.items():
+            path = f"{prefix}{key}"
+            result[path] = len(json.dumps(value, default=str))
+            if level < depth and isinstance(value, Mapping):
+                visit(value, f"{path}.", level + 1)
+
+    visit(info, "", 1)
+    return result
+
+
+@dataclass(slots=True)
+class RuleProfile:
+    """Aggregated statistics for a single rule function within a scope."""
+
+    calls: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    value_types: Dict[str, int] = field(default_factory=dict)
+    peak_memory: int = 0
+    net_memory: int = 0
+
+    @property
+    def mean_time(self) -> float:
+        """Returns the mean wall time per call, in seconds."""
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def add(
+        self,
+        elapsed: float,
+        value_type: str | None,
+        failed: bool,
+        peak_memory: int = 0,
+        net_memory: int = 0,
+    ) -> None:
+        """Adds a single call to the statistics."""
+        self.calls += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        if peak_memory > self.peak_memory:
+            self.peak_memory = peak_memory
+        self.net_memory += net_memory
+        if failed:
+            self.errors += 1
+        elif value_type is not None:
+            self.value_types[value_type] = self.value_types.get(value_type, 0) + 1
+
+    def merge(self, other: "RuleProfile") -> None:
+        """Merges the statistics of another profile into this one."""
+        self.calls += other.calls
+        self.errors += other.errors
+        self.total_time += other.total_time
+        self.max_time = max(self.max_time, other.max_time)
+        self.peak_memory = max(self.peak_memory, other.peak_memory)
+        self.net_memory += other.net_memory
+        for value_type, count in other.value_types.items():
+            self.value_types[value_type] = self.value_types.get(value_type, 0) + count
+
+    def to_dict(self, include_memory: bool = False) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_time": self.total_time,
+            "mean_time": self.mean_time,
+            "max_time": self.max_time,
+            "value_types": dict(self.value_types),
+        }
+        if include_memory:
+            result["peak_memory"] = self.peak_memory
+            result["net_memory"] = self.net_memory
+
+        return result
+
+
+@dataclass(slots=True)
+class ScopeProfile:
+    """Aggregated statistics for all curate calls on a single scope."""
+
+    files: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    peak_memory: int = 0
+
+    def merge(self, other: "ScopeProfile") -> None:
+        """Merges the statistics of another profile into this one."""
+        self.files += other.files
+        self.errors += other.errors
+        self.total_time += other.total_time
+        self.peak_memory = max(self.peak_memory, other.peak_memory)
+
+    def to_dict(self, include_memory: bool = False) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "files": self.files,
+            "errors": self.errors,
+            "total_time": self.total_time,
+        }
+        if include_memory:
+            result["peak_memory"] = self.peak_memory
+
+        return result
+
+
+@dataclass(slots=True)
+class SizeProfile:
+    """Aggregated size of a single metadata subtree across subjects."""
+
+    subjects: int = 0
+    total_size: int = 0
+    max_size: int = 0
+
+    @property
+    def mean_size(self) -> float:
+        """Returns the mean size per subject, in bytes."""
+        return self.total_size / self.subjects if self.subjects else 0.0
+
+    def add(self, size: int) -> None:
+        """Adds a single subject's size."""
+        self.subjects += 1
+        self.total_size += size
+        if size > self.max_size:
+            self.max_size = size
+
+    def merge(self, other: "SizeProfile") -> None:
+        """Merges the statistics of another profile into this one."""
+        self.subjects += other.subjects
+        self.total_size += other.total_size
+        self.max_size = max(self.max_size, other.max_size)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "subjects": self.subjects,
+            "mean_size": self.mean_size,
+            "max_size": self.max_size,
+        }
+
+
+class RuleProfiler:
+    """Collects rule and scope statistics across curate calls."""
+
+    def __init__(self, track_memory: bool = False) -> None:
+        """Initializer.
+
+        Args:
+            track_memory: Whether to also record memory statistics with
+                tracemalloc
+        """
+        self.__rules: Dict[Tuple[str, str], RuleProfile] = {}
+        self.__scopes: Dict[str, ScopeProfile] = {}
+        self.__subjects = 0
+        self.__memory = MemoryTracker() if track_memory else None
+        self.__subject_memory = SizeProfile()
+        self.__subtrees: Dict[str, SizeProfile] = {}
+
+    @property
+    def rules(self) -> Dict[Tuple[str, str], RuleProfile]:
+        """Returns the rule profiles, keyed by (scope, function)."""
+        return self.__rules
+
+    @property
+    def scopes(self) -> Dict[str, ScopeProfile]:
+        """Returns the scope profiles, keyed by scope."""
+        return self.__scopes
+
+    @property
+    def subjects(self) -> int:
+        """Returns the number of subjects recorded."""
+        return self.__subjects
+
+    @property
+    def memory(self) -> Optional[MemoryTracker]:
+        """Returns the memory tracker if tracking memory, else None."""
+        return self.__memory
+
+    @property
+    def subject_memory(self) -> SizeProfile:
+        """Returns the peak memory per subject."""
+        return self.__subject_memory
+
+    @property
+    def subtrees(self) -> Dict[str, SizeProfile]:
+        """Returns the subject.info subtree sizes, keyed by path."""
+        return self.__subtrees
+
+    def record_rule(
+        self,
+        scope: str,
+        function: str,
+        elapsed: float,
+        value: Any = None,
+        failed: bool = False,
+        peak_memory: int = 0,
+        net_memory: int = 0,
+    ) -> None:
+        """Records a single evaluation of a rule.
+
+        Args:
+            scope: The curation scope
+            function: The rule function
+            elapsed: Wall time of the evaluation, in seconds
+            value: The raw value returned by the rule function
+            failed: Whether the evaluation raised an exception
+            peak_memory: Peak memory allocated by the evaluation, in bytes
+            net_memory: Memory retained after the evaluation, in bytes
+        """
+        key = (scope, function)
+        profile = self.__rules.get(key)
+        if profile is None:
+            profile = RuleProfile()
+            self.__rules[key] = profile
+
+        profile.add(
+            elapsed,
+            None if failed else type(value).__name__,
+            failed,
+            peak_memory=peak_memory,
+            net_memory=net_memory,
+        )
+
+    def record_scope(
+        self, scope: str, elapsed: float, failed: bool = False, peak_memory: int = 0
+    ) -> None:
+        """Records a single curate call on a scope (e.g. one file).
+
+        Args:
+            scope: The curation scope
+            elapsed: Wall time of the curate call, in seconds
+            failed: Whether the curate call raised an exception
+            peak_memory: Peak memory allocated by the curate call, in bytes
+        """
+        profile = self.__scopes.get(scope)
+        if profile is None:
+            profile = ScopeProfile()
+            self.__scopes[scope] = profile
+
+        profile.files += 1
+        profile.total_time += elapsed
+        if failed:
+            profile.errors += 1
+        if peak_memory > profile.peak_memory:
+            profile.peak_memory = peak_memory
+
+    def record_subject(
+        self,
+        peak_memory: Optional[int] = None,
+        subject_info: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        """Records that a subject has finished curation.
+
+        Args:
+            peak_memory: Peak memory allocated while curating the subject,
+                in bytes, if tracked
+            subject_info: The curated subject metadata, if its subtree
+                sizes should be recorded
+        """
+        self.__subjects += 1
+        if peak_memory is not None:
+            self.__subject_memory.add(peak_memory)
+
+        if subject_info is not None:
+            for path, size in subtree_sizes(subject_info).items():
+                self.__subtrees.setdefault(path, SizeProfile()).add(size)
+
+    def merge(self, other: "RuleProfiler") -> None:
+        """Merges another profiler's statistics into this one, e.g. from
+        another worker."""
+        for key, rule_profile in other.rules.items():
+            self.__rules.setdefault(key, RuleProfile()).merge(rule_profile)
+
+        for scope, scope_profile in other.scopes.items():
+            self.__scopes.setdefault(scope, ScopeProfile()).merge(scope_profile)
+
+        for path, size_profile in other.subtrees.items():
+            self.__subtrees.setdefault(path, SizeProfile()).merge(size_profile)
+
+        self.__subjects += other.subjects
+        self.__subject_memory.merge(other.subject_memory)
+
+    def reset(self) -> None:
+        """Clears all collected statistics."""
+        self.__rules.clear()
+        self.__scopes.clear()
+        self.__subtrees.clear()
+        self.__subjects = 0
+        self.__subject_memory = SizeProfile()
+
+    def top_rules(
+        self, top_n: int | None = None, sort_by: SortKey = "total_time"
+    ) -> List[Tuple[str, str, RuleProfile]]:
+        """Returns the rules ordered by the given statistic, highest first.
+
+        Args:
+            top_n: Number of rules to return; all if not specified
+            sort_by: The statistic to sort on
+        Returns:
+            List of (scope, function, profile) tuples
+        """
+        result = sorted(
+            (
+                (scope, function, profile)
+                for (scope, function), profile in self.__rules.items()
+            ),
+            key=lambda x: getattr(x[2], sort_by),
+            reverse=True,
+        )
+        return result if top_n is None else result[:top_n]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the collected statistics as a JSON-serializable dict."""
+        include_memory = self.__memory is not None
+        rules: Dict[str, Dict[str, Any]] = {}
+        for (scope, function), profile in self.__rules.items():
+            rules.setdefault(scope, {})[function] = profile.to_dict(include_memory)
+
+        result: Dict[str, Any] = {
+            "subjects": self.__subjects,
+            "scopes": {
+                scope: profile.to_dict(include_memory)
+                for scope, profile in self.__scopes.items()
+            },
+            "rules": rules,
+        }
+        if include_memory:
+            result["subject_memory"] = self.__subject_memory.to_dict()
+        if self.__subtrees:
+            result["subtrees"] = {
+                path: profile.to_dict() for path, profile in self.__subtrees.items()
+            }
+
+        return result
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """Returns the collected statistics as a JSON string."""
+        return json.dumps(self.to_dict(), indent=indent, sort_keys=True)
+
+    def report(self, top_n: int = 20, sort_by: SortKey = "total_time") -> str:
+        """Returns a plain-text report of the scopes and top N rules.
+
+        Args:
+            top_n: Number of rules to include
+            sort_by: The statistic to sort rules on
+        Returns:
+            The report
+        """
+        lines = [f"Subjects: {self.__subjects}", "", "Scopes:"]
+        lines.append(f"  {'scope':<28} {'files':>8} {'errors':>7} {'total (s)':>11}")
+        for scope, scope_profile in sorted(
+            self.__scopes.items(), key=lambda x: x[1].total_time, reverse=True
+        ):
+            lines.append(
+                f"  {scope:<28} {scope_profile.files:>8} {scope_profile.errors:>7} "
+                + f"{scope_profile.total_time:>11.4f}"
+            )
+
+        lines.extend(["", f"Top {top_n} rules by {sort_by}:"])
+        lines.append(
+            f"  {'scope':<20} {'function':<40} {'calls':>8} {'errors':>7} "
+            + f"{'total (s)':>11} {'mean (ms)':>10} {'max (ms)':>10}  types"
+        )
+        for scope, function, profile in self.top_rules(top_n, sort_by):
+            types = ",".join(sorted(profile.value_types))
+            lines.append(
+                f"  {scope:<20} {function:<40} {profile.calls:>8} "
+                + f"{profile.errors:>7} {profile.total_time:>11.4f} "
+                + f"{profile.mean_time * 1000:>10.3f} "
+                + f"{profile.max_time * 1000:>10.3f}  {types}"
+            )
+
+        if self.__memory is not None:
+            lines.extend(["", *self.__memory_report(top_n)])
+
+        return "\n".join(lines)
+
+    def __memory_report(self, top_n: int) -> List[str]:
+        """Returns the lines of the memory section of the report."""
+        lines = [
+            "Peak memory per subject (KiB): "
+            + f"mean {self.__subject_memory.mean_size / 1024:.1f}, "
+            + f"max {self.__subject_memory.max_size / 1024:.1f}",
+            "",
+            "Peak memory per scope:",
+            f"  {'scope':<28} {'peak (KiB)':>11}",
+        ]
+        for scope, scope_profile in sorted(
+            self.__scopes.items(), key=lambda x: x[1].peak_memory, reverse=True
+        ):
+            lines.append(f"  {scope:<28} {scope_profile.peak_memory / 1024:>11.1f}")
+
+        lines.extend(["", f"Top {top_n} rules by peak_memory:"])
+        lines.append(
+            f"  {'scope':<20} {'function':<40} {'peak (KiB)':>11} {'net (KiB)':>11}"
+        )
+        for scope, function, profile in self.top_rules(top_n, "peak_memory"):
+            lines.append(
+                f"  {scope:<20} {function:<40} {profile.peak_memory / 1024:>11.1f} "
+                + f"{profile.net_memory / 1024:>11.1f}"
+            )
+
+        if self.__subtrees:
+            lines.extend(["", "subject.info subtree sizes (KiB):"])
+            lines.append(f"  {'subtree':<48} {'mean':>10} {'max':>10}")
+            for path, size_profile in sorted(self.__subtrees.items()):
+                lines.append(
+                    f"  {path:<48} {size_profile.mean_size / 1024:>10.1f} "
+                    + f"{size_profile.max_size / 1024:>10.1f}"
+                )
+
+        return lines
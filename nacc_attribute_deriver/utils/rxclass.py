@@ -0,0 +1,114 @@
+"""Indexes the RxClass mapping the caller stores under _rxclass.
+
+The caller (curator gear) passes the same mapping of RxClass IDs to RxCUI
+members for every file of a project, so the mapping is only turned into
+sets once per process: `get_rxclass_index` caches indices by the content
+hash of the mapping, and skips hashing when it is passed the same mapping
+object as last time. The mapping is treated as read-only; a mapping that
+is changed in place after being indexed keeps its old index.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Set, Tuple
+
+RXCLASS_CACHE_SIZE = 8
+
+EMPTY: FrozenSet[str] = frozenset()
+
+
+class RxClassIndex:
+    """The members of each RxClass, and the RxClasses of each RxCUI."""
+
+    __slots__ = ("__classes", "__members")
+
+    def __init__(self, rxclasses: Mapping[str, Optional[Iterable[str]]]) -> None:
+        """Initializer.
+
+        Args:
+            rxclasses: Mapping of RxClass IDs to their RxCUI members
+        """
+        self.__members: Dict[str, FrozenSet[str]] = {}
+        classes: Dict[str, Set[str]] = {}
+        for rxclass, rxcuis in rxclasses.items():
+            if not rxcuis:
+                continue
+
+            members = frozenset(x.strip() for x in rxcuis)
+            self.__members[rxclass] = members
+            for rxcui in members:
+                classes.setdefault(rxcui, set()).add(rxclass)
+
+        self.__classes = {x: frozenset(y) for x, y in classes.items()}
+
+    def members(self, rxclass: str) -> FrozenSet[str]:
+        """Returns the RxCUIs of the RxClass."""
+        return self.__members.get(rxclass, EMPTY)
+
+    def classes(self, rxcui: str) -> FrozenSet[str]:
+        """Returns the RxClasses the RxCUI is a member of."""
+        return self.__classes.get(rxcui, EMPTY)
+
+    def classes_of(self, rxcuis: Iterable[str]) -> FrozenSet[str]:
+        """Returns the RxClasses any of the RxCUIs is a member of."""
+        return EMPTY.union(*(self.classes(x) for x in rxcuis))
+
+
+def rxclass_digest(rxclasses: Mapping[str, Any]) -> str:
+    """Returns the content hash of an RxClass mapping."""
+    content = json.dumps(rxclasses, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class RxClassIndexCache:
+    """Caches RxClass indices by the content hash of their mapping."""
+
+    def __init__(self, maxsize: int = RXCLASS_CACHE_SIZE) -> None:
+        self.__maxsize = maxsize
+        self.__indices: OrderedDict[str, RxClassIndex] = OrderedDict()
+        self.__last: Optional[Tuple[Mapping[str, Any], RxClassIndex]] = None
+        self.misses = 0
+
+    def get(self, rxclasses: Mapping[str, Any]) -> RxClassIndex:
+        """Returns the index of the mapping, building it if not cached."""
+        if self.__last is not None and self.__last[0] is rxclasses:
+            return self.__last[1]
+
+        digest = rxclass_digest(rxclasses)
+        index = self.__indices.get(digest)
+        if index is None:
+            self.misses += 1
+            index = RxClassIndex(rxclasses)
+            self.__indices[digest] = index
+            if len(self.__indices) > self.__maxsize:
+                self.__indices.popitem(last=False)
+        else:
+            self.__indices.move_to_end(digest)
+
+        self.__last = (rxclasses, index)
+        return index
+
+    def clear(self) -> None:
+        self.__indices.clear()
+        self.__last = None
+        self.misses = 0
+
+
+RXCLASS_INDICES = RxClassIndexCache()
+
+EMPTY_INDEX = RxClassIndex({})
+
+
+def get_rxclass_index(rxclasses: Optional[Mapping[str, Any]]) -> RxClassIndex:
+    """Returns the cached index of the RxClass mapping.
+
+    Args:
+        rxclasses: Mapping of RxClass IDs to their RxCUI members, if any
+    Returns:
+        The index of the mapping
+    """
+    if not rxclasses:
+        return EMPTY_INDEX
+
+    return RXCLASS_INDICES.get(rxclasses)
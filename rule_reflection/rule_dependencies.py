@@ -0,0 +1,1446 @@
+"""Builds the dependency graph of the curation rules from their source.
+
+Curation order is implicit: the files of a subject are curated in scope
+order (see `SCOPE_ORDER` and `SUBJECT_SCOPES` in `subject_driver.py`), and
+within a scope the rules run in the order they first appear in the rules
+CSV. This inspects the source of each rule's `_create_*`/`_missingness_*`
+method, and of the collection, namespace, and helper code it calls, for the
+table paths the rule reads; the paths it writes are the `location`s of its
+assignments. From these it builds, for each scope, a DAG of the rules that
+must keep their relative order, and reports
+
+- the rules of each scope in levels, where the rules of a level are
+  mutually independent, so they can run in any order or in parallel once
+  the rules of the earlier levels have run
+- unsafe orderings, i.e. reads of a path that only a later rule of the same
+  scope, or only a later scope, writes, so the read sees the value from an
+  earlier file or curation instead
+
+The inspection is a conservative interpretation of the code, not of the
+data. A read whose attribute is not a literal is widened to every path
+under its namespace (or under the literal part of an f-string), and passing
+the table or a collection to code that cannot be inspected counts as
+reading every path.
+"""
+
+import argparse
+import ast
+import bisect
+import builtins
+import inspect
+import json
+import logging
+import textwrap
+from dataclasses import dataclass, field
+from enum import Enum
+from types import FunctionType, ModuleType
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from nacc_attribute_deriver.attribute_deriver import (
+    AttributeDeriver,
+    BaseAttributeDeriver,
+    MissingnessDeriver,
+)
+from nacc_attribute_deriver.attributes.collection.attribute_collection import (
+    AttributeCollectionRegistry,
+    AttributeExpression,
+)
+from nacc_attribute_deriver.attributes.collection.missingness_pattern import (
+    MissingnessPattern,
+    MissingnessPatternProgram,
+)
+from nacc_attribute_deriver.attributes.namespace.namespace import (
+    AttributeGroup,
+    BaseNamespace,
+)
+from nacc_attribute_deriver.schema.schema import CurationRule
+from nacc_attribute_deriver.subject_driver import SCOPE_ORDER, SUBJECT_SCOPES
+
+log = logging.getLogger(__name__)
+
+PACKAGE = "nacc_attribute_deriver"
+
+# a read of every path
+ANY_PATH = "*"
+
+# string methods interpreted on known strings
+STRING_METHODS = frozenset(
+    ["lower", "upper", "strip", "lstrip", "rstrip", "removeprefix", "removesuffix"]
+)
+
+# most strings an f-string is expanded to before it is read as a partial
+MAX_CHOICES = 64
+
+
+class _Table:
+    """The symbol table the rule is applied to."""
+
+    def __repr__(self) -> str:
+        return "TABLE"
+
+
+TABLE = _Table()
+
+
+@dataclass(frozen=True)
+class Instance:
+    """An instance of a collection, namespace, or helper class, identified by
+    its class and the arguments it was constructed with."""
+
+    cls: type
+    args: Tuple[Any, ...] = ()
+
+
+@dataclass(frozen=True)
+class ClassRef:
+    cls: type
+
+
+@dataclass(frozen=True)
+class ModuleRef:
+    module: ModuleType
+
+
+@dataclass(frozen=True)
+class FunctionRef:
+    function: Any
+
+
+@dataclass(frozen=True)
+class Method:
+    """A method bound to an instance, or to a class for classmethods."""
+
+    receiver: Any
+    function: Any
+    owner: type
+
+
+@dataclass(frozen=True, eq=False)
+class Object:
+    """An object of a package class found in the code's scope or passed in,
+    e.g. a configured missingness pattern."""
+
+    obj: Any
+
+
+@dataclass(frozen=True)
+class Const:
+    """A known value: a literal, or a tuple of literals."""
+
+    value: Any
+
+
+@dataclass(frozen=True)
+class Partial:
+    """A string known to start with the prefix, e.g. from an f-string."""
+
+    prefix: str
+
+
+@dataclass(frozen=True)
+class Items:
+    """A container of values that are not all literals."""
+
+    values: Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class Choice:
+    """One of several values, e.g. from an if/else."""
+
+    values: FrozenSet[Any]
+
+
+@dataclass(eq=False)
+class Local:
+    """A lambda or nested function, with the frame it was defined in."""
+
+    node: ast.AST
+    frame: "Frame"
+
+
+# any other value
+UNKNOWN = None
+
+
+def choice(values: Iterable[Any]) -> Any:
+    """Returns the choice of the values, flattening nested choices."""
+    result: Set[Any] = set()
+    for value in values:
+        if isinstance(value, Choice):
+            result.update(value.values)
+        else:
+            result.add(value)
+
+    if not result:
+        return UNKNOWN
+    if len(result) == 1:
+        return next(iter(result))
+
+    return Choice(frozenset(result))
+
+
+def alternatives(value: Any) -> Iterable[Any]:
+    """Returns the values a value may be."""
+    return value.values if isinstance(value, Choice) else (value,)
+
+
+@dataclass
+class Frame:
+    """The state of interpreting one call of a function."""
+
+    env: Dict[str, Any]
+    scope: Dict[str, Any]
+    owner: Optional[type] = None
+    reads: Set[str] = field(default_factory=set)
+    returns: List[Any] = field(default_factory=list)
+
+    def lookup(self, name: str) -> Any:
+        if name in self.env:
+            return self.env[name]
+        if name in self.scope:
+            return convert(self.scope[name])
+        if hasattr(builtins, name):
+            return convert(getattr(builtins, name))
+
+        return UNKNOWN
+
+    def mangle(self, name: str) -> str:
+        """Returns the name as private names are mangled in the owner."""
+        if self.owner is None or not name.startswith("__") or name.endswith("__"):
+            return name
+
+        return f"_{self.owner.__name__.lstrip('_')}{name}"
+
+
+def convert(obj: Any) -> Any:
+    """Returns the value of a Python object found in the code's scope."""
+    if obj is None or isinstance(obj, (str, int, float, bool, Enum)):
+        return Const(obj)
+    if isinstance(obj, AttributeGroup):
+        return Const(tuple(obj.attributes))
+    if isinstance(obj, (list, tuple, frozenset, set)):
+        if not all(isinstance(x, str) for x in obj):
+            return UNKNOWN
+        return Const(tuple(sorted(obj) if isinstance(obj, (set, frozenset)) else obj))
+    if isinstance(obj, dict):
+        return Items(tuple({convert(x) for x in obj.values()} - {UNKNOWN}))
+    if isinstance(obj, type):
+        return ClassRef(obj)
+    if isinstance(obj, ModuleType):
+        return ModuleRef(obj)
+    if in_package(type(obj)):
+        return Object(obj)
+    if callable(obj):
+        return FunctionRef(obj)
+
+    return UNKNOWN
+
+
+def in_package(obj: Any) -> bool:
+    """Indicates whether the object is defined in the deriver package."""
+    module = getattr(obj, "__module__", None) or ""
+    return module == PACKAGE or module.startswith(f"{PACKAGE}.")
+
+
+def lookup(cls: type, name: str) -> Optional[Tuple[type, Any]]:
+    """Returns the class that defines the name and the raw attribute."""
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            return klass, klass.__dict__[name]
+
+    return None
+
+
+def is_namespace(value: Any) -> bool:
+    return isinstance(value, Instance) and issubclass(value.cls, BaseNamespace)
+
+
+class RuleInspector:
+    """Statically collects the table paths read by the rules' functions.
+
+    Interprets the functions' ASTs over abstract values, following calls
+    into the collections, namespaces, and other code of the package, and
+    maps the namespace reads to paths using the namespaces' prefixes.
+    """
+
+    def __init__(self) -> None:
+        self.__bindings: Dict[Any, Dict[str, Any]] = {}
+        self.__constructed: Dict[Instance, FrozenSet[str]] = {}
+        self.__calls: Dict[Any, Tuple[FrozenSet[str], Any]] = {}
+        self.__active: Set[Any] = set()
+        self.__trees: Dict[Any, Optional[ast.AST]] = {}
+        self.__stack: List[str] = []
+
+    def rule_reads(
+        self, expression: AttributeExpression, field_name: Optional[str] = None
+    ) -> FrozenSet[str]:
+        """Returns the paths read by applying the expression, as the deriver
+        does: instantiating the collection, calling the function (with the
+        field, for generic missingness), and getting the collection's date.
+
+        Args:
+            expression: The rule's attribute expression
+            field_name: The field passed to generic missingness functions
+        Returns:
+            The paths, where a path ending in `*` covers all paths it prefixes
+        """
+        frame = Frame(env={}, scope={})
+        instance = self.__construct(frame, expression.attribute_class, [TABLE], {})
+        owner = self.__owner(expression.attribute_class, expression.function)
+        args = [instance] if field_name is None else [instance, Const(field_name)]
+        reads, _ = self.__call(expression.function, owner, args, {})
+        frame.reads.update(reads)
+        self.__call_method(frame, instance, "get_date", [], {})
+        return frozenset(frame.reads)
+
+    def pattern_reads(
+        self, expression: AttributeExpression, pattern: MissingnessPattern
+    ) -> FrozenSet[str]:
+        """Returns the paths read by evaluating the missingness pattern over
+        the scope's generic missingness collection: the field and gate, and
+        whatever the pattern reads to evaluate them.
+
+        Args:
+            expression: The scope's generic missingness expression
+            pattern: The rule's pattern
+        Returns:
+            The paths, where a path ending in `*` covers all paths it prefixes
+        """
+        frame = Frame(env={}, scope={})
+        instance = self.__construct(frame, expression.attribute_class, [TABLE], {})
+        form = self.__attribute(frame, instance, Const("form"))
+        fields = tuple(x for x in (pattern.field, pattern.gate) if x is not None)
+        self.__read(frame, form, Const(fields))
+        self.__call_method(
+            frame, convert(pattern), "evaluate", [instance, UNKNOWN, UNKNOWN], {}
+        )
+        self.__call_method(frame, instance, "get_date", [], {})
+        return frozenset(frame.reads)
+
+    @staticmethod
+    def __owner(cls: type, function: Any) -> Optional[type]:
+        found = lookup(cls, function.__name__)
+        return found[0] if found else None
+
+    def __binding(self, instance: Any) -> Dict[str, Any]:
+        return self.__bindings.setdefault(instance, {})
+
+    def __tree(self, function: Any) -> Optional[ast.AST]:
+        if function not in self.__trees:
+            try:
+                source = textwrap.dedent(inspect.getsource(function))
+                tree: Optional[ast.AST] = ast.parse(source).body[0]
+            except (OSError, TypeError, SyntaxError, IndexError):
+                tree = None
+            self.__trees[function] = tree
+
+        return self.__trees[function]
+
+    # calls
+
+    def __call(
+        self,
+        function: Any,
+        owner: Optional[type],
+        args: List[Any],
+        kwargs: Dict[str, Any],
+    ) -> Tuple[FrozenSet[str], Any]:
+        """Interprets a call of a package function; returns the paths it
+        reads and the value it returns."""
+        function = inspect.unwrap(function)
+        key = (function, tuple(args), tuple(sorted(kwargs.items(), key=str)))
+        if key in self.__calls:
+            return self.__calls[key]
+        if key in self.__active:
+            return frozenset(), UNKNOWN
+
+        tree = self.__tree(function)
+        if not isinstance(tree, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            # cannot inspect it, so it may read anything it was passed
+            frame = Frame(env={}, scope={})
+            self.__escape(frame, [*args, *kwargs.values()])
+            return frozenset(frame.reads), UNKNOWN
+
+        self.__active.add(key)
+        self.__stack.append(function.__qualname__)
+        try:
+            scope = dict(getattr(function, "__globals__", {}))
+            closure = inspect.getclosurevars(function).nonlocals
+            scope.update(closure)
+            frame = Frame(env={}, scope=scope, owner=owner)
+            frame.env.update(self.__bind(frame, tree.args, args, kwargs))
+            self.__exec(frame, tree.body)
+            result = (frozenset(frame.reads), choice(frame.returns))
+        finally:
+            self.__active.discard(key)
+            self.__stack.pop()
+
+        self.__calls[key] = result
+        return result
+
+    def __bind(
+        self,
+        frame: Frame,
+        arguments: ast.arguments,
+        args: List[Any],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Binds the call's arguments to the parameters; parameters that are
+        not passed get their defaults."""
+        env: Dict[str, Any] = {}
+        positional = [*arguments.posonlyargs, *arguments.args]
+        defaults = [None] * (len(positional) - len(arguments.defaults)) + list(
+            arguments.defaults
+        )
+        remaining = dict(kwargs)
+        for i, (param, default) in enumerate(zip(positional, defaults, strict=True)):
+            if i < len(args):
+                env[param.arg] = args[i]
+            elif param.arg in remaining:
+                env[param.arg] = remaining.pop(param.arg)
+            elif default is not None:
+                env[param.arg] = self.__eval(frame, default)
+            else:
+                env[param.arg] = UNKNOWN
+
+        for param, default in zip(
+            arguments.kwonlyargs, arguments.kw_defaults, strict=True
+        ):
+            if param.arg in remaining:
+                env[param.arg] = remaining.pop(param.arg)
+            elif default is not None:
+                env[param.arg] = self.__eval(frame, default)
+            else:
+                env[param.arg] = UNKNOWN
+
+        if arguments.vararg is not None:
+            env[arguments.vararg.arg] = Items(tuple(args[len(positional) :]))
+        if arguments.kwarg is not None:
+            env[arguments.kwarg.arg] = Items(tuple(remaining.values()))
+
+        return env
+
+    def __construct(
+        self, frame: Frame, cls: type, args: List[Any], kwargs: Dict[str, Any]
+    ) -> Instance:
+        """Interprets constructing an instance of a package class.
+
+        Initializers the package does not define in source, e.g. of
+        exceptions, models, or dataclasses, only read what they are passed.
+        """
+        instance = Instance(cls, (*args, *sorted(kwargs.items(), key=lambda x: x[0])))
+        if instance not in self.__constructed:
+            self.__constructed[instance] = frozenset()
+            found = lookup(cls, "__init__")
+            if (
+                found is not None
+                and in_package(found[0])
+                and self.__tree(found[1]) is not None
+            ):
+                reads, _ = self.__call_function(
+                    found[0], found[1], [instance, *args], kwargs
+                )
+            else:
+                inner = Frame(env={}, scope={})
+                self.__escape(inner, [*args, *kwargs.values()])
+                reads = frozenset(inner.reads)
+            self.__constructed[instance] = reads
+
+        frame.reads.update(self.__constructed[instance])
+        return instance
+
+    def __call_function(
+        self, owner: type, function: Any, args: List[Any], kwargs: Dict[str, Any]
+    ) -> Tuple[FrozenSet[str], Any]:
+        """Interprets calling a method found on the owner class, intercepting
+        the BaseNamespace primitives that read the table."""
+        if owner is BaseNamespace:
+            frame = Frame(env={}, scope={})
+            result = self.__namespace_primitive(frame, function, args, kwargs)
+            return frozenset(frame.reads), result
+
+        return self.__call(function, owner, args, kwargs)
+
+    def __namespace_primitive(
+        self, frame: Frame, function: Any, args: List[Any], kwargs: Dict[str, Any]
+    ) -> Any:
+        """Interprets a BaseNamespace method; args[0] is the namespace."""
+        name = function.__name__
+        tree = self.__tree(function)
+        assert isinstance(tree, ast.FunctionDef)
+        bound = self.__bind(frame, tree.args, args, kwargs)
+        namespace = bound.get("self")
+        binding = self.__binding(namespace)
+
+        if name == "__init__":
+            prefix = bound.get("attribute_prefix")
+            if isinstance(prefix, Const) and isinstance(prefix.value, str):
+                value = prefix.value
+                binding["prefix"] = Const(value if value.endswith(".") else f"{value}.")
+            binding["date_attribute"] = bound.get("date_attribute", UNKNOWN)
+            binding["required"] = bound.get("required", UNKNOWN)
+            self.__read(frame, namespace, bound.get("required"))
+            date_attribute = bound.get("date_attribute")
+            if date_attribute != Const(None):
+                self.__read(frame, namespace, date_attribute)
+            return UNKNOWN
+
+        if name in ("get_value", "__contains__"):
+            self.__read(frame, namespace, bound.get("attribute"))
+        elif name == "__read":
+            self.__read(frame, namespace, bound.get("attributes"))
+        elif name == "get_date":
+            date_attribute = binding.get("date_attribute", UNKNOWN)
+            if date_attribute != Const(None):
+                self.__read(frame, namespace, date_attribute)
+        else:
+            reads, result = self.__call(function, BaseNamespace, args, kwargs)
+            frame.reads.update(reads)
+            return result
+
+        return UNKNOWN
+
+    def __read(self, frame: Frame, namespace: Any, attribute: Any) -> None:
+        """Records reading the attribute(s) from the namespace or table."""
+        if namespace is TABLE:
+            prefix = ""
+        else:
+            value = self.__binding(namespace).get("prefix")
+            if not isinstance(value, Const):
+                self.__read_all(frame, f"unknown prefix of {namespace}")
+                return
+            prefix = value.value
+
+        for option in alternatives(attribute):
+            if isinstance(option, Const) and isinstance(option.value, str):
+                frame.reads.add(f"{prefix}{option.value}")
+            elif isinstance(option, Const) and isinstance(option.value, tuple):
+                frame.reads.update(f"{prefix}{x}" for x in option.value)
+            elif isinstance(option, Partial):
+                frame.reads.add(f"{prefix}{option.prefix}*")
+            elif isinstance(option, Items):
+                for value in option.values:
+                    self.__read(frame, namespace, value)
+            elif option == Const(None):
+                continue
+            else:
+                log.debug(
+                    "%s reads all of %s: unknown attribute",
+                    " > ".join(self.__stack),
+                    prefix,
+                )
+                frame.reads.add(f"{prefix}*")
+
+    def __read_all(self, frame: Frame, reason: str) -> None:
+        log.debug("%s reads all paths: %s", " > ".join(self.__stack), reason)
+        frame.reads.add(ANY_PATH)
+
+    def __escape(
+        self, frame: Frame, values: Iterable[Any], seen: Optional[Set[Any]] = None
+    ) -> None:
+        """Records the reads of values passed to code that is not inspected:
+        all paths for the table, all of a namespace's paths, whatever an
+        instance holds, and whatever callables passed read when called."""
+        seen = seen if seen is not None else set()
+        for value in values:
+            for option in alternatives(value):
+                if option in seen:
+                    continue
+                if isinstance(option, (Items, Instance)):
+                    seen.add(option)
+
+                if isinstance(option, Items):
+                    self.__escape(frame, option.values, seen)
+                elif is_namespace(option):
+                    self.__read(frame, option, UNKNOWN)
+                elif isinstance(option, Instance):
+                    self.__escape(frame, self.__binding(option).values(), seen)
+                elif option is TABLE:
+                    self.__read_all(frame, "passed the table")
+                elif isinstance(option, (Local, Method)):
+                    self.__call_value(frame, option, [], {}, escape=False)
+
+    def __call_value(  # noqa: C901
+        self,
+        frame: Frame,
+        callee: Any,
+        args: List[Any],
+        kwargs: Dict[str, Any],
+        escape: bool = True,
+    ) -> Any:
+        """Interprets calling a value."""
+        if isinstance(callee, Choice):
+            return choice(
+                self.__call_value(frame, x, args, kwargs, escape) for x in callee.values
+            )
+
+        if isinstance(callee, Method):
+            reads, result = self.__call_function(
+                callee.owner, callee.function, [callee.receiver, *args], kwargs
+            )
+            frame.reads.update(reads)
+            return result
+
+        if isinstance(callee, Local):
+            return self.__call_local(frame, callee, args, kwargs)
+
+        if isinstance(callee, ClassRef):
+            if callee.cls is AttributeGroup and args and isinstance(args[0], Const):
+                return args[0]
+            if in_package(callee.cls):
+                return self.__construct(frame, callee.cls, args, kwargs)
+            if callee.cls in (tuple, list, frozenset, set):
+                if not args:
+                    return Const(())
+                return args[0] if isinstance(args[0], Const) else UNKNOWN
+
+        if isinstance(callee, FunctionRef):
+            function = callee.function
+            if in_package(function) and isinstance(
+                inspect.unwrap(function), FunctionType
+            ):
+                reads, result = self.__call(function, None, args, kwargs)
+                frame.reads.update(reads)
+                return result
+            if function is getattr and len(args) > 1:
+                return self.__attribute(frame, args[0], args[1])
+            if function is sorted and args:
+                return args[0] if isinstance(args[0], Const) else UNKNOWN
+
+        # not inspected: builtins only read what they call back
+        values = [*args, *kwargs.values()]
+        if escape and not (
+            isinstance(callee, (FunctionRef, ClassRef))
+            and getattr(getattr(callee, "function", callee), "__module__", None)
+            == "builtins"
+        ):
+            self.__escape(frame, values)
+        else:
+            self.__escape(frame, [x for x in values if isinstance(x, (Local, Method))])
+
+        return UNKNOWN
+
+    def __call_local(
+        self, frame: Frame, local: Local, args: List[Any], kwargs: Dict[str, Any]
+    ) -> Any:
+        """Interprets calling a lambda or nested function."""
+        key = ("local", id(local.node))
+        if key in self.__active:
+            return UNKNOWN
+
+        self.__active.add(key)
+        try:
+            node = local.node
+            inner = Frame(
+                env=dict(local.frame.env),
+                scope=local.frame.scope,
+                owner=local.frame.owner,
+            )
+            assert isinstance(node, (ast.Lambda, ast.FunctionDef))
+            inner.env.update(self.__bind(inner, node.args, args, kwargs))
+            if isinstance(node, ast.Lambda):
+                result = self.__eval(inner, node.body)
+            else:
+                self.__exec(inner, node.body)
+                result = choice(inner.returns)
+        finally:
+            self.__active.discard(key)
+
+        frame.reads.update(inner.reads)
+        return result
+
+    def __call_method(  # noqa: C901
+        self,
+        frame: Frame,
+        receiver: Any,
+        name: str,
+        args: List[Any],
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        """Interprets calling the named method on the receiver."""
+        if isinstance(receiver, Choice):
+            return choice(
+                self.__call_method(frame, x, name, args, kwargs)
+                for x in receiver.values
+            )
+
+        if receiver is TABLE:
+            if name in ("get", "__getitem__", "__contains__") and args:
+                self.__read(frame, TABLE, args[0])
+            elif name == "memoize" and len(args) > 1:
+                return self.__call_value(frame, args[1], [], {})
+            elif name not in ("start_caching", "stop_caching"):
+                self.__read_all(frame, f"called table.{name}")
+            return UNKNOWN
+
+        if isinstance(receiver, Const):
+            if (
+                isinstance(receiver.value, str)
+                and name in STRING_METHODS
+                and all(isinstance(x, Const) for x in args)
+            ):
+                method = getattr(receiver.value, name)
+                return convert(method(*[x.value for x in args]))
+            if name == "union" and args and isinstance(args[0], Const):
+                values = receiver.value or ()
+                other = args[0].value
+                if isinstance(values, tuple) and isinstance(other, tuple):
+                    return Const(tuple(sorted({*values, *other})))
+            return UNKNOWN
+
+        if isinstance(receiver, Items):
+            if name in ("get", "values", "items", "pop", "__getitem__"):
+                return choice(receiver.values)
+            self.__escape(frame, [*args, *kwargs.values()])
+            return UNKNOWN
+
+        callee = self.__attribute(frame, receiver, Const(name))
+        if callee is UNKNOWN:
+            self.__escape(frame, [*args, *kwargs.values()])
+            return UNKNOWN
+
+        return self.__call_value(frame, callee, args, kwargs)
+
+    # expressions
+
+    def __attribute(self, frame: Frame, base: Any, name: Any) -> Any:  # noqa: C901
+        """Interprets reading the named attribute of the base."""
+        if not isinstance(name, Const) or not isinstance(name.value, str):
+            return UNKNOWN
+        attr = name.value
+
+        if isinstance(base, Choice):
+            return choice(self.__attribute(frame, x, name) for x in base.values)
+
+        if isinstance(base, Instance):
+            key = frame.mangle(attr) if frame.owner else attr
+            binding = self.__binding(base)
+            if key in binding:
+                return binding[key]
+            if attr == "prefix" and "prefix" in binding:
+                return binding["prefix"]
+
+            found = lookup(base.cls, key)
+            if found is None:
+                return UNKNOWN
+
+            owner, value = found
+            if isinstance(value, property) and value.fget is not None:
+                reads, result = self.__call_function(owner, value.fget, [base], {})
+                frame.reads.update(reads)
+                return result
+            if isinstance(value, staticmethod):
+                return FunctionRef(value.__func__)
+            if isinstance(value, classmethod):
+                return Method(ClassRef(base.cls), value.__func__, owner)
+            if isinstance(value, FunctionType):
+                return Method(base, value, owner)
+            return convert(value)
+
+        if isinstance(base, ClassRef):
+            found = lookup(base.cls, attr)
+            if found is None:
+                return UNKNOWN
+
+            owner, value = found
+            if isinstance(value, classmethod):
+                return Method(base, value.__func__, owner)
+            if isinstance(value, staticmethod):
+                return FunctionRef(value.__func__)
+            return convert(value)
+
+        if isinstance(base, Object):
+            key = frame.mangle(attr) if frame.owner else attr
+            found = lookup(type(base.obj), key)
+            if found is not None and isinstance(found[1], FunctionType):
+                return Method(base, found[1], found[0])
+            if found is not None and isinstance(found[1], property):
+                reads, result = self.__call_function(
+                    found[0], found[1].fget, [base], {}
+                )
+                frame.reads.update(reads)
+                return result
+            return convert(getattr(base.obj, key, None))
+
+        if isinstance(base, ModuleRef):
+            return convert(getattr(base.module, attr, None))
+
+        if isinstance(base, Const):
+            if attr == "attributes" and isinstance(base.value, tuple):
+                return base
+            if isinstance(base.value, Enum):
+                return convert(getattr(base.value, attr, None))
+
+        return UNKNOWN
+
+    def __eval(self, frame: Frame, node: Optional[ast.AST]) -> Any:  # noqa: C901
+        """Interprets an expression, recording its reads in the frame."""
+        if node is None:
+            return UNKNOWN
+
+        if isinstance(node, ast.Constant):
+            return convert(node.value)
+
+        if isinstance(node, ast.Name):
+            return frame.lookup(node.id)
+
+        if isinstance(node, ast.JoinedStr):
+            return self.__eval_fstring(frame, node)
+
+        if isinstance(node, ast.Attribute):
+            base = self.__eval(frame, node.value)
+            return self.__attribute(frame, base, Const(node.attr))
+
+        if isinstance(node, ast.Call):
+            return self.__eval_call(frame, node)
+
+        if isinstance(node, ast.Subscript):
+            base = self.__eval(frame, node.value)
+            index = self.__eval(frame, node.slice)
+            if base is TABLE:
+                self.__read(frame, TABLE, index)
+            elif isinstance(base, (Items, Choice)):
+                return choice(alternatives(choice(getattr(base, "values", ()))))
+            return UNKNOWN
+
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            values = [self.__eval(frame, x) for x in node.elts]
+            if all(isinstance(x, Const) and isinstance(x.value, str) for x in values):
+                return Const(tuple(x.value for x in values))
+            return Items(tuple(values))
+
+        if isinstance(node, ast.Dict):
+            for key in node.keys:
+                self.__eval(frame, key)
+            return Items(tuple(self.__eval(frame, x) for x in node.values))
+
+        if isinstance(node, ast.Compare):
+            left = self.__eval(frame, node.left)
+            for op, comparator in zip(node.ops, node.comparators, strict=True):
+                right = self.__eval(frame, comparator)
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    for option in alternatives(right):
+                        if option is TABLE or is_namespace(option):
+                            self.__call_method(
+                                frame, option, "__contains__", [left], {}
+                            )
+                left = right
+            return UNKNOWN
+
+        if isinstance(node, ast.BinOp):
+            left = self.__eval(frame, node.left)
+            right = self.__eval(frame, node.right)
+            if (
+                isinstance(node.op, ast.Add)
+                and isinstance(left, Const)
+                and isinstance(left.value, str)
+            ):
+                if isinstance(right, Const) and isinstance(right.value, str):
+                    return Const(left.value + right.value)
+                return Partial(left.value)
+            return UNKNOWN
+
+        if isinstance(node, ast.BoolOp):
+            return choice(self.__eval(frame, x) for x in node.values)
+
+        if isinstance(node, ast.IfExp):
+            self.__eval(frame, node.test)
+            return choice(
+                [self.__eval(frame, node.body), self.__eval(frame, node.orelse)]
+            )
+
+        if isinstance(node, ast.Lambda):
+            return Local(node, frame)
+
+        if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp)):
+            return self.__eval_comprehension(frame, node.generators, [node.elt])
+
+        if isinstance(node, ast.DictComp):
+            return self.__eval_comprehension(
+                frame, node.generators, [node.key, node.value]
+            )
+
+        if isinstance(node, ast.NamedExpr):
+            value = self.__eval(frame, node.value)
+            self.__assign(frame, node.target, value)
+            return value
+
+        if isinstance(node, ast.Starred):
+            return self.__eval(frame, node.value)
+
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.expr):
+                self.__eval(frame, child)
+
+        return UNKNOWN
+
+    def __eval_fstring(self, frame: Frame, node: ast.JoinedStr) -> Any:
+        """Interprets an f-string as the strings it may be, or as partial
+        strings from the first part that is not known."""
+        texts = [""]
+        known = True
+        for part in node.values:
+            if isinstance(part, ast.Constant):
+                if known:
+                    texts = [f"{x}{part.value}" for x in texts]
+                continue
+
+            assert isinstance(part, ast.FormattedValue)
+            value = self.__eval(frame, part.value)
+            options = list(alternatives(value))
+            if (
+                known
+                and part.format_spec is None
+                and len(texts) * len(options) <= MAX_CHOICES
+                and all(
+                    isinstance(x, Const) and isinstance(x.value, (str, int))
+                    for x in options
+                )
+            ):
+                texts = [f"{x}{y.value}" for x in texts for y in options]
+            else:
+                known = False
+
+        return choice(Const(x) if known else Partial(x) for x in texts)
+
+    def __eval_call(self, frame: Frame, node: ast.Call) -> Any:
+        args = [self.__eval(frame, x) for x in node.args]
+        kwargs = {x.arg: self.__eval(frame, x.value) for x in node.keywords if x.arg}
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                self.__escape(frame, [self.__eval(frame, keyword.value)])
+        if any(isinstance(x, ast.Starred) for x in node.args):
+            args = [UNKNOWN] * len(args)
+
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            if (
+                isinstance(func.value, ast.Call)
+                and isinstance(func.value.func, ast.Name)
+                and func.value.func.id == "super"
+            ):
+                return self.__call_super(frame, func.attr, args, kwargs)
+
+            receiver = self.__eval(frame, func.value)
+            return self.__call_method(frame, receiver, func.attr, args, kwargs)
+
+        return self.__call_value(frame, self.__eval(frame, func), args, kwargs)
+
+    def __call_super(
+        self, frame: Frame, name: str, args: List[Any], kwargs: Dict[str, Any]
+    ) -> Any:
+        """Interprets `super().name(...)` in a method of the frame's owner."""
+        instance = frame.env.get("self")
+        if frame.owner is None or not isinstance(instance, Instance):
+            return UNKNOWN
+
+        mro = instance.cls.__mro__
+        for klass in mro[mro.index(frame.owner) + 1 :]:
+            if name in klass.__dict__:
+                if klass is object:
+                    return UNKNOWN
+                reads, result = self.__call_function(
+                    klass, klass.__dict__[name], [instance, *args], kwargs
+                )
+                frame.reads.update(reads)
+                return result
+
+        return UNKNOWN
+
+    def __eval_comprehension(
+        self,
+        frame: Frame,
+        generators: List[ast.comprehension],
+        elements: List[ast.expr],
+    ) -> Any:
+        # literal comprehensions over literals give literals, e.g. lists of
+        # attribute names built with f-strings
+        if len(generators) == 1 and isinstance(generators[0].target, ast.Name):
+            generator = generators[0]
+            iterable = self.__eval(frame, generator.iter)
+            if isinstance(iterable, Const) and isinstance(iterable.value, tuple):
+                values = []
+                for item in iterable.value:
+                    inner = Frame(
+                        env={**frame.env, generator.target.id: Const(item)},
+                        scope=frame.scope,
+                        owner=frame.owner,
+                        reads=frame.reads,
+                    )
+                    for condition in generator.ifs:
+                        self.__eval(inner, condition)
+                    values.append(self.__eval(inner, elements[-1]))
+                if len(elements) == 1 and all(
+                    isinstance(x, Const) and isinstance(x.value, str) for x in values
+                ):
+                    return Const(tuple(x.value for x in values))
+                return Items(tuple(values))
+
+        inner = Frame(
+            env=dict(frame.env),
+            scope=frame.scope,
+            owner=frame.owner,
+            reads=frame.reads,
+        )
+        for generator in generators:
+            iterable = self.__eval(inner, generator.iter)
+            self.__assign(inner, generator.target, self.__element(iterable))
+            for condition in generator.ifs:
+                self.__eval(inner, condition)
+
+        values = [self.__eval(inner, x) for x in elements]
+        return Items((values[-1],))
+
+    @staticmethod
+    def __element(iterable: Any) -> Any:
+        """Returns the value of an element of the iterable."""
+        options = []
+        for option in alternatives(iterable):
+            if isinstance(option, Const) and isinstance(option.value, tuple):
+                options.extend(Const(x) for x in option.value)
+            elif isinstance(option, Items):
+                options.extend(option.values)
+            else:
+                options.append(UNKNOWN)
+
+        return choice(options)
+
+    # statements
+
+    def __assign(self, frame: Frame, target: ast.AST, value: Any) -> None:
+        if isinstance(target, ast.Name):
+            frame.env[target.id] = value
+        elif isinstance(target, ast.Attribute):
+            base = self.__eval(frame, target.value)
+            for option in alternatives(base):
+                if isinstance(option, Instance):
+                    binding = self.__binding(option)
+                    key = frame.mangle(target.attr)
+                    previous = binding.get(key, UNKNOWN)
+                    binding[key] = (
+                        value
+                        if previous in (UNKNOWN, Const(None))
+                        else choice([previous, value])
+                    )
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            for i, element in enumerate(target.elts):
+                if isinstance(value, Const) and isinstance(value.value, tuple):
+                    item = Const(value.value[i]) if i < len(value.value) else UNKNOWN
+                elif isinstance(value, Items) and len(value.values) == len(target.elts):
+                    item = value.values[i]
+                else:
+                    item = self.__element(value)
+                self.__assign(frame, element, item)
+        elif isinstance(target, ast.Starred):
+            self.__assign(frame, target.value, value)
+        else:
+            self.__eval(frame, target)
+
+    def __exec(self, frame: Frame, statements: List[ast.stmt]) -> None:  # noqa: C901
+        for node in statements:
+            if isinstance(node, ast.Return):
+                frame.returns.append(self.__eval(frame, node.value))
+            elif isinstance(node, ast.Assign):
+                value = self.__eval(frame, node.value)
+                for target in node.targets:
+                    self.__assign(frame, target, value)
+            elif isinstance(node, ast.AnnAssign):
+                if node.value is not None:
+                    self.__assign(frame, node.target, self.__eval(frame, node.value))
+            elif isinstance(node, ast.AugAssign):
+                self.__eval(frame, node.value)
+            elif isinstance(node, (ast.For, ast.AsyncFor)):
+                iterable = self.__eval(frame, node.iter)
+                self.__assign(frame, node.target, self.__element(iterable))
+                self.__exec(frame, node.body)
+                self.__exec(frame, node.orelse)
+            elif isinstance(node, (ast.While, ast.If)):
+                self.__eval(frame, node.test)
+                self.__exec(frame, node.body)
+                self.__exec(frame, node.orelse)
+            elif isinstance(node, (ast.With, ast.AsyncWith)):
+                for item in node.items:
+                    value = self.__eval(frame, item.context_expr)
+                    if item.optional_vars is not None:
+                        self.__assign(frame, item.optional_vars, value)
+                self.__exec(frame, node.body)
+            elif isinstance(node, ast.Try):
+                self.__exec(frame, node.body)
+                for handler in node.handlers:
+                    if handler.name:
+                        frame.env[handler.name] = UNKNOWN
+                    self.__exec(frame, handler.body)
+                self.__exec(frame, node.orelse)
+                self.__exec(frame, node.finalbody)
+            elif isinstance(node, ast.Match):
+                self.__eval(frame, node.subject)
+                for case in node.cases:
+                    self.__exec(frame, case.body)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                frame.env[node.name] = Local(node, frame)
+            elif isinstance(node, ast.Expr):
+                self.__eval(frame, node.value)
+            elif isinstance(node, (ast.Raise, ast.Assert, ast.Delete)):
+                for child in ast.iter_child_nodes(node):
+                    if isinstance(child, ast.expr):
+                        self.__eval(frame, child)
+
+
+def overlaps(path: str, other: str) -> bool:
+    """Indicates whether two paths may refer to the same value, i.e. they
+    are equal or one is under the other. A path ending in `*` covers all
+    paths it prefixes."""
+    if path == ANY_PATH or other == ANY_PATH:
+        return True
+
+    if path.endswith("*") or other.endswith("*"):
+        pattern, exact = (path, other) if path.endswith("*") else (other, path)
+        prefix = pattern[:-1]
+        if exact.endswith("*"):
+            return prefix.startswith(exact[:-1]) or exact[:-1].startswith(prefix)
+        return exact.startswith(prefix) or prefix.startswith(f"{exact}.")
+
+    return path == other or path.startswith(f"{other}.") or other.startswith(f"{path}.")
+
+
+class PathIndex:
+    """Indexes paths by the rules that access them, to find the rules that
+    access a path overlapping a given one without comparing every pair."""
+
+    def __init__(self) -> None:
+        self.__exact: Dict[str, Set[int]] = {}
+        self.__below: Dict[str, Set[int]] = {}
+        self.__keys: List[str] = []
+        self.__patterns: List[Tuple[str, int]] = []
+        self.__all: Set[int] = set()
+
+    def add(self, path: str, index: int) -> None:
+        self.__all.add(index)
+        if path.endswith("*"):
+            self.__patterns.append((path, index))
+            return
+
+        if path not in self.__exact:
+            bisect.insort(self.__keys, path)
+        self.__exact.setdefault(path, set()).add(index)
+        parts = path.split(".")
+        for i in range(1, len(parts)):
+            self.__below.setdefault(".".join(parts[:i]), set()).add(index)
+
+    def find(self, path: str) -> Set[int]:
+        """Returns the indices of the rules with a path overlapping the path."""
+        if path == ANY_PATH:
+            return set(self.__all)
+
+        result = {i for x, i in self.__patterns if overlaps(x, path)}
+        prefix = path.rstrip("*")
+        parts = prefix.split(".")
+        for i in range(1, len(parts)):
+            result.update(self.__exact.get(".".join(parts[:i]), ()))
+
+        if path.endswith("*"):
+            start = bisect.bisect_left(self.__keys, prefix)
+            for key in self.__keys[start:]:
+                if not key.startswith(prefix):
+                    break
+                result.update(self.__exact[key])
+        else:
+            result.update(self.__exact.get(path, ()))
+            result.update(self.__below.get(path, ()))
+
+        return result
+
+
+@dataclass(frozen=True)
+class RuleAccess:
+    """The paths a rule reads and writes."""
+
+    scope: str
+    rule: str
+    function: str
+    reads: FrozenSet[str]
+    writes: FrozenSet[str]
+
+    def reads_path(self, path: str) -> bool:
+        return any(overlaps(x, path) for x in self.reads)
+
+    def writes_path(self, path: str) -> bool:
+        return any(overlaps(x, path) for x in self.writes)
+
+
+@dataclass(frozen=True)
+class Dependency:
+    """An ordering constraint between two rules of a scope.
+
+    The kind is `read` if the later rule reads what the earlier one writes,
+    `anti` if it writes what the earlier one reads, and `output` if both
+    write the same path.
+    """
+
+    before: str
+    after: str
+    kind: str
+    path: str
+
+
+@dataclass(frozen=True)
+class OrderingIssue:
+    """A read of a path that is only written after the rule runs.
+
+    The kind is `later-rule` if a later rule of the same scope writes it,
+    and `later-scope` if no rule of the scope or an earlier scope does but
+    a later scope does.
+    """
+
+    scope: str
+    rule: str
+    path: str
+    kind: str
+    writer_scope: str
+    writer: str
+
+
+@dataclass
+class ScopeGraph:
+    """The rules of a scope, their dependencies, and their levels."""
+
+    scope: str
+    rules: List[RuleAccess]
+    dependencies: List[Dependency]
+    levels: List[List[str]]
+
+
+def find_dependency(before: RuleAccess, after: RuleAccess) -> Optional[Dependency]:
+    """Returns the reason the later rule must run after the earlier one, if
+    any."""
+    for path in sorted(before.writes):
+        if after.reads_path(path):
+            return Dependency(before.rule, after.rule, "read", path)
+    for path in sorted(after.writes):
+        if before.reads_path(path):
+            return Dependency(before.rule, after.rule, "anti", path)
+    for path in sorted(before.writes):
+        if after.writes_path(path):
+            return Dependency(before.rule, after.rule, "output", path)
+
+    return None
+
+
+def build_scope_graph(scope: str, rules: List[RuleAccess]) -> ScopeGraph:
+    """Builds the dependency graph of a scope's rules, in the order they
+    run, and groups them into levels of mutually independent rules.
+
+    A rule's level is one more than the highest level of the rules it
+    depends on, so rules of the same level have no path between them.
+    """
+    reads = PathIndex()
+    writes = PathIndex()
+    dependencies: List[Dependency] = []
+    levels: List[int] = []
+    for j, rule in enumerate(rules):
+        candidates: Set[int] = set()
+        for path in rule.reads:
+            candidates.update(writes.find(path))
+        for path in rule.writes:
+            candidates.update(reads.find(path))
+            candidates.update(writes.find(path))
+
+        level = 0
+        for i in sorted(candidates):
+            dependency = find_dependency(rules[i], rule)
+            if dependency is not None:
+                dependencies.append(dependency)
+                level = max(level, levels[i] + 1)
+        levels.append(level)
+
+        for path in rule.reads:
+            reads.add(path, j)
+        for path in rule.writes:
+            writes.add(path, j)
+
+    grouped: List[List[str]] = [[] for _ in range(max(levels, default=-1) + 1)]
+    for rule, level in zip(rules, levels, strict=True):
+        grouped[level].append(rule.rule)
+
+    return ScopeGraph(
+        scope=scope, rules=rules, dependencies=dependencies, levels=grouped
+    )
+
+
+def find_issues(graphs: List[ScopeGraph]) -> List[OrderingIssue]:
+    """Finds the reads of paths only written after the reading rule runs,
+    given the graphs in scope order.
+
+    Reads of every path, i.e. of rules that could not be fully inspected,
+    are not reported.
+    """
+    rules = [x for graph in graphs for x in graph.rules]
+    writes = PathIndex()
+    for index, rule in enumerate(rules):
+        for path in rule.writes:
+            writes.add(path, index)
+
+    issues: List[OrderingIssue] = []
+    for index, rule in enumerate(rules):
+        for path in sorted(rule.reads - {ANY_PATH}):
+            writers = sorted(writes.find(path))
+            if index in writers or not writers or writers[0] < index:
+                continue
+
+            writer = rules[writers[0]]
+            issues.append(
+                OrderingIssue(
+                    scope=rule.scope,
+                    rule=rule.rule,
+                    path=path,
+                    kind="later-rule" if writer.scope == rule.scope else "later-scope",
+                    writer_scope=writer.scope,
+                    writer=writer.rule,
+                )
+            )
+
+    return issues
+
+
+def get_rule_reads(
+    inspector: RuleInspector,
+    methods: Dict[str, AttributeExpression],
+    rule: CurationRule,
+    scope: str,
+    patterns: Optional[MissingnessPatternProgram] = None,
+) -> FrozenSet[str]:
+    """Returns the paths read by the rule, resolving its function as the
+    deriver does: the rule's own function, else its missingness pattern,
+    else the scope's generic missingness function."""
+    method = methods.get(rule.function)
+    if method is not None:
+        return inspector.rule_reads(method)
+
+    curation_type = rule.function.split("_", 1)[0]
+    if patterns is not None and rule.name in patterns:
+        method = methods.get(f"{curation_type}_{scope}")
+        if method is not None:
+            return inspector.pattern_reads(method, patterns.patterns[rule.name])
+    else:
+        generic_scope = "header" if rule.name.startswith("header_") else scope
+        method = methods.get(f"{curation_type}_{generic_scope}")
+        if method is not None:
+            return inspector.rule_reads(method, rule.name)
+
+    log.warning("No function for rule %s in scope %s", rule.name, scope)
+    return frozenset([ANY_PATH])
+
+
+def analyze_rules(
+    deriver: BaseAttributeDeriver, scopes: Optional[List[str]] = None
+) -> List[ScopeGraph]:
+    """Builds the dependency graph of the deriver's rules in each scope.
+
+    Args:
+        deriver: The deriver whose rules to analyze
+        scopes: The scopes, in curation order; defaults to SCOPE_ORDER
+            followed by SUBJECT_SCOPES
+    Returns:
+        The graph of each scope with rules, in curation order
+    """
+    methods = AttributeCollectionRegistry.get_attribute_methods()
+    inspector = RuleInspector()
+    graphs: List[ScopeGraph] = []
+    for scope in scopes if scopes is not None else [*SCOPE_ORDER, *SUBJECT_SCOPES]:
+        rules = deriver.get_curation_rules(scope)  # type: ignore
+        if not rules:
+            continue
+
+        name = str(getattr(scope, "value", scope))
+        patterns = (
+            deriver.get_patterns(name)
+            if isinstance(deriver, MissingnessDeriver)
+            else None
+        )
+        accesses: List[RuleAccess] = []
+        for rule in rules:
+            accesses.append(
+                RuleAccess(
+                    scope=name,
+                    rule=rule.name,
+                    function=rule.function,
+                    reads=get_rule_reads(inspector, methods, rule, name, patterns),
+                    writes=frozenset(x.attribute for x in rule.assignments),
+                )
+            )
+
+        graphs.append(build_scope_graph(name, accesses))
+
+    return graphs
+
+
+def create_report(graphs: List[ScopeGraph]) -> Dict[str, Any]:
+    """Returns the graphs and their ordering issues as a JSON-able dict."""
+    return {
+        "scopes": [
+            {
+                "scope": graph.scope,
+                "levels": graph.levels,
+                "rules": [
+                    {
+                        "rule": rule.rule,
+                        "reads": sorted(rule.reads),
+                        "writes": sorted(rule.writes),
+                        "after": sorted(
+                            {
+                                x.before
+                                for x in graph.dependencies
+                                if x.after == rule.rule
+                            }
+                        ),
+                    }
+                    for rule in graph.rules
+                ],
+                "dependencies": [vars(x) for x in graph.dependencies],
+            }
+            for graph in graphs
+        ],
+        "issues": [vars(x) for x in find_issues(graphs)],
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="analyze dependencies between curation rules"
+    )
+    parser.add_argument("--output", "-o", help="path to save output file")
+    parser.add_argument(
+        "--missingness",
+        choices=["file", "subject"],
+        help="analyze the missingness rules of this level instead",
+    )
+    parser.add_argument("--scope", action="append", help="scope(s) to analyze")
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    output_file = args.output if args.output else "rule-dependencies.json"
+
+    deriver = (
+        MissingnessDeriver(args.missingness) if args.missingness else AttributeDeriver()
+    )
+    graphs = analyze_rules(deriver, args.scope)
+    report = create_report(graphs)
+    for graph in graphs:
+        log.info(
+            "%s: %d rules in %d levels",
+            graph.scope,
+            len(graph.rules),
+            len(graph.levels),
+        )
+    log.info("%d ordering issues", len(report["issues"]))
+
+    with open(output_file, "w", encoding="utf-8") as out_file:
+        json.dump(report, out_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
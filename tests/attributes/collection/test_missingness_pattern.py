@@ -0,0 +1,153 @@
+"""Tests the compiled missingness patterns."""
+
+import pytest
+
+from nacc_attribute_deriver.attribute_deriver import MissingnessDeriver
+from nacc_attribute_deriver.attributes.collection.missingness_collection import (
+    FormMissingnessCollection,
+)
+from nacc_attribute_deriver.attributes.collection.missingness_pattern import (
+    MissingnessPattern,
+    MissingnessPatternProgram,
+)
+from nacc_attribute_deriver.schema.schema import MissingnessPatternFileModel
+from nacc_attribute_deriver.symbol_table import SymbolTable
+from nacc_attribute_deriver.utils.constants import (
+    INFORMED_BLANK,
+    INFORMED_MISSINGNESS,
+)
+from nacc_attribute_deriver.utils.errors import AttributeDeriverError
+
+
+def create_pattern(attr_type=int, **kwargs) -> MissingnessPattern:
+    row = {
+        "scope": "uds",
+        "gate": "",
+        "values": "",
+        "default": "",
+        "prev_code": "",
+        **kwargs,
+    }
+    return MissingnessPattern.create(
+        MissingnessPatternFileModel.model_validate(row), attr_type
+    )
+
+
+def evaluate(patterns, form, prev_form=None):
+    table = SymbolTable({"file": {"info": {"forms": {"json": form}}}})
+    if prev_form is not None:
+        table["_prev_record.info.forms.json"] = prev_form
+
+    program = MissingnessPatternProgram(patterns)
+    return program.evaluate(FormMissingnessCollection(table=table, date_attribute=None))
+
+
+class TestMissingnessPattern:
+    def test_create_errors(self):
+        """Test invalid pattern definitions are rejected."""
+        with pytest.raises(AttributeDeriverError):
+            create_pattern(field="dummy", pattern="unknown")
+        with pytest.raises(AttributeDeriverError):
+            create_pattern(str, field="dummyx", pattern="gated_writein")
+        with pytest.raises(AttributeDeriverError):
+            create_pattern(
+                str,
+                field="dummyx",
+                pattern="forbidden_gated_writein",
+                gate="dummy",
+                values="1;2",
+            )
+        with pytest.raises(AttributeDeriverError):
+            create_pattern(str, field="dummy", pattern="normcog_gate")
+        with pytest.raises(AttributeDeriverError):
+            create_pattern(field="dummy", pattern="prev_visit", prev_code="abc")
+
+    def test_gated_writein(self):
+        """Test gated write-ins."""
+        patterns = [
+            create_pattern(
+                str, field="dummyx", pattern="gated_writein", gate="dummy", values="0;9"
+            )
+        ]
+        assert evaluate(patterns, {"dummy": 9}) == {"dummyx": INFORMED_BLANK}
+        assert evaluate(patterns, {"dummy": 1}) == {"dummyx": INFORMED_BLANK}
+        assert evaluate(patterns, {"dummy": 1, "dummyx": "text"}) == {"dummyx": "text"}
+
+    def test_forbidden_gated_writein(self):
+        """Test forbidden gated write-ins."""
+        patterns = [
+            create_pattern(
+                str,
+                field="dummyx",
+                pattern="forbidden_gated_writein",
+                gate="dummy",
+                values="1",
+            )
+        ]
+        assert evaluate(patterns, {"dummy": 9, "dummyx": "text"}) == {
+            "dummyx": INFORMED_BLANK
+        }
+        assert evaluate(patterns, {"dummy": 1, "dummyx": "text"}) == {"dummyx": "text"}
+
+    def test_normcog_gate(self):
+        """Test NORMCOG-gated variables."""
+        patterns = [
+            create_pattern(field="dysill", pattern="normcog_gate"),
+            create_pattern(field="meds", pattern="normcog_gate"),
+        ]
+        assert evaluate(patterns, {"normcog": 1}) == {"dysill": 8, "meds": 8}
+        assert evaluate(patterns, {"normcog": 0, "meds": 1}) == {
+            "dysill": 0,
+            "meds": 1,
+        }
+        assert evaluate(patterns, {}) == {
+            "dysill": INFORMED_MISSINGNESS,
+            "meds": INFORMED_MISSINGNESS,
+        }
+
+    def test_prev_visit(self):
+        """Test pulling from the previous visit."""
+        patterns = [
+            create_pattern(field="befrst", pattern="prev_visit"),
+            create_pattern(field="cogfrst", pattern="prev_visit", prev_code="0"),
+        ]
+        assert evaluate(
+            patterns, {"cogfrst": 0}, prev_form={"befrst": 2, "cogfrst": 3}
+        ) == {"befrst": 2, "cogfrst": 3}
+        assert evaluate(patterns, {"befrst": 1, "cogfrst": 0}, prev_form={}) == {
+            "befrst": 1,
+            "cogfrst": 0,
+        }
+        assert evaluate(patterns, {}, prev_form={"befrst": -4}) == {
+            "befrst": INFORMED_MISSINGNESS,
+            "cogfrst": INFORMED_MISSINGNESS,
+        }
+
+    def test_program_errors(self):
+        """Test a value that fails to read only fails its own patterns."""
+        patterns = [
+            create_pattern(field="dysill", pattern="normcog_gate"),
+            create_pattern(field="meds", pattern="normcog_gate", gate="other"),
+        ]
+        result = evaluate(patterns, {"normcog": "bad", "other": 1})
+        assert isinstance(result["dysill"], Exception)
+        assert result["meds"] == 8
+
+        with pytest.raises(AttributeDeriverError):
+            MissingnessPatternProgram(patterns + patterns)
+
+
+class TestMissingnessDeriverPatterns:
+    def test_curate(self, uds_table):
+        """Test the deriver curates pattern fields like their hand-written
+        missingness functions did."""
+        uds_table["file.info.forms.json"].update(
+            {"normcog": 1, "othcond": 0, "neop": 1}
+        )
+        deriver = MissingnessDeriver(missingness_level="file")
+        deriver.curate(uds_table, "uds")
+
+        resolved = uds_table["file.info.resolved"]
+        assert resolved["dysill"] == 8
+        assert resolved["neop"] == 1
+        assert resolved["othcondx"] is None
@@ -1,11 +1,14 @@
 """Tests Mixed Protocol attributes."""
 
 import copy
+from unittest.mock import patch
+
 import pytest
 from nacc_attribute_deriver.attributes.derived.imaging.mp import (
     MPAttributeCollection,
 )
 from nacc_attribute_deriver.symbol_table import SymbolTable
+from nacc_attribute_deriver.utils.date import DateIndex
 
 
 @pytest.fixture(scope="function")
@@ -111,6 +114,24 @@ class TestMPAttributeCollection:
         dicom_table["subject.info.working.cross-sectional.uds-visitdates"] = None
         assert attr.calculate_days_from_closest_uds_visit() == 8888
 
+    def test_uds_visitdates_index(self, dicom_table):
+        """Test the UDS visitdates are only indexed once per curation
+        pass."""
+        with patch(
+            "nacc_attribute_deriver.attributes.derived.imaging.mp.DateIndex",
+            wraps=DateIndex,
+        ) as index:
+            dicom_table.start_caching()
+            for _ in range(3):
+                attr = MPAttributeCollection(dicom_table)
+                assert attr.calculate_days_from_closest_uds_visit() == -5038
+            dicom_table.stop_caching()
+            assert index.call_count == 1
+
+            # not caching, so indexed for every lookup
+            MPAttributeCollection(dicom_table).calculate_days_from_closest_uds_visit()
+            assert index.call_count == 2
+
     def test_get_num_sessions(self, dicom_table):
         """Test getting number of sessions."""
         attr = MPAttributeCollection(dicom_table)
@@ -142,3 +163,23 @@ class TestMPAttributeCollection:
 
         # test when there is no existing filenames
         assert attr.get_filename("naccaptf") == "test_image2.dicom.zip"
+
+        # test a whole session at once
+        dicom_table["_filename"] = ["test_image2.dicom.zip", " test_image3.dicom.zip"]
+        attr = MPAttributeCollection(dicom_table)
+        assert (
+            attr.get_filename("naccmrfi")
+            == "test_image1.dicom.zip,test_image2.dicom.zip,test_image3.dicom.zip"
+        )
+
+    def test_get_filename_legacy_date(self, dicom_table):
+        """Test existing filenames are still found when the record's date is
+        not stored as an ISO string."""
+        dicom_table["subject.info.derived.longitudinal.naccmrfi"] = [
+            {"date": "2006-08-16T00:00:00", "value": "test_image1.dicom.zip"}
+        ]
+        attr = MPAttributeCollection(dicom_table)
+        assert (
+            attr.get_filename("naccmrfi")
+            == "test_image1.dicom.zip,test_image2.dicom.zip"
+        )
@@ -1,9 +1,12 @@
 """Tests cross-module attributes."""
 
 from typing import Any, Dict
+from unittest.mock import patch
 
+from nacc_attribute_deriver.attribute_deriver import AttributeDeriver
 from nacc_attribute_deriver.attributes.derived.modules.cross_module import (
     CrossModuleAttributeCollection,
+    cross_module,
 )
 from nacc_attribute_deriver.symbol_table import SymbolTable
 
@@ -177,3 +180,26 @@ class TestCrossModuleAttribute:
         assert attr._create_naccdsyr() == 9999
         assert attr._create_naccdsmo() == 99
         assert attr._create_naccdsdy() == 99
+
+    def test_shared_participant_status(self) -> None:
+        """Test the cross_module pass builds the participant status handler
+        once and shares it between all of its rules."""
+        table = create_working_table(
+            {
+                "np-death-date": {"value": "2025-11-10", "date": "2025-07-19"},
+                "np-death-age": 73,
+                "uds-visitdates": ["2025-01-01"],
+            }
+        )
+        with patch.object(
+            cross_module,
+            "ParticipantStatusHandler",
+            wraps=cross_module.ParticipantStatusHandler,
+        ) as handler:
+            AttributeDeriver().curate(table, "cross_module")
+
+        assert handler.call_count == 1
+        assert not table.caching
+        cross_sectional = table["subject.info.derived.cross-sectional"]
+        assert cross_sectional["naccdage"] == 73
+        assert cross_sectional["naccint"] == 10
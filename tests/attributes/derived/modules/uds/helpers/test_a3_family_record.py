@@ -1,5 +1,6 @@
 """Tests the A3 Family record."""
 
+import pytest
 from nacc_attribute_deriver.attributes.derived.modules.uds.helpers.a3_family_handler import (  # noqa: E501
     FamilyStatusRecord,
 )
@@ -57,3 +58,21 @@ class TestFamilyStatusRecord:
             mom_status=9, dad_status=9, sib_status=9, kid_status=9
         )
         assert record.family_status() == 9
+
+    def test_invalid_status(self) -> None:
+        """Test an unrecognized status is rejected."""
+        with pytest.raises(ValueError, match="sib_status: 2"):
+            FamilyStatusRecord(mom_status=0, dad_status=0, sib_status=2, kid_status=0)
+
+    def test_equality(self) -> None:
+        """Test records compare by their statuses."""
+        record = FamilyStatusRecord(
+            mom_status=0, dad_status=1, sib_status=9, kid_status=-4
+        )
+        assert record == FamilyStatusRecord(
+            mom_status=0, dad_status=1, sib_status=9, kid_status=-4
+        )
+        assert record != FamilyStatusRecord(
+            mom_status=1, dad_status=1, sib_status=9, kid_status=-4
+        )
+        assert record.statuses() == (0, 1, 9, -4)
@@ -1,6 +1,9 @@
 """Tests form A3."""
 
+from unittest.mock import patch
+
 import pytest
+from nacc_attribute_deriver.attributes.derived.modules.uds import form_a3
 from nacc_attribute_deriver.attributes.derived.modules.uds.form_a3 import (
     UDSFormA3Attribute,
 )
@@ -416,6 +419,24 @@ class TestNACCFAM:
         attr = UDSFormA3Attribute(uds_table)
         assert attr._create_naccfam() == 9
 
+    def test_shared_family_record(self, table):
+        """Test the A3 rules of a pass share one family record."""
+        table["file.info.forms.json"].update(
+            {"formver": 4, "dadetpr": "05", "mometpr": "00"}
+        )
+        table.start_caching()
+        try:
+            with patch.object(
+                form_a3, "A3FamilyHandlerV4", wraps=form_a3.A3FamilyHandlerV4
+            ) as handler:
+                assert UDSFormA3Attribute(table)._create_naccfam() == 1
+                assert UDSFormA3Attribute(table)._create_naccmom() == 0
+                assert UDSFormA3Attribute(table)._create_cognitive_status_dad() == 1
+        finally:
+            table.stop_caching()
+
+        assert handler.call_count == 1
+
 
 class TestUDSFormA3Attribute:
     """Other derived variables."""
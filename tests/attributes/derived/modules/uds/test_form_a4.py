@@ -229,3 +229,26 @@ class TestUDSFormA4Attribute:
         )
         attr = UDSFormA4Attribute(table1)
         assert attr._create_naccamd() == 39
+
+    def test_rxclass_v4(self, uds_table):
+        """Test V4 variables check the RXNORM IDs against the RxClasses."""
+        uds_table["file.info.forms.json"].update(
+            {"formver": 4.0, "anymeds": 1, "rxnormid1": " 1001 ", "rxnormid7": "2002"}
+        )
+        uds_table["_rxclass"] = {
+            "C02A": ["1001 ", "3003"],
+            "C02B": [],
+            "C09A": ["3003"],
+            "N06D": ["2002"],
+        }
+        attr = UDSFormA4Attribute(uds_table)
+        assert attr._create_naccaaas() == 1
+        assert attr._create_naccacei() == 0
+        assert attr._create_naccadmd() == 1
+        assert attr._create_naccamd() == 2
+
+        # missing mapping, so nothing matches
+        uds_table["_rxclass"] = None
+        attr = UDSFormA4Attribute(uds_table)
+        assert attr._create_naccaaas() == 0
+        assert attr._create_naccadmd() == 0
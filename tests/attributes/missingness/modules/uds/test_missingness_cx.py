@@ -2,6 +2,7 @@
 
 import random
 
+from nacc_attribute_deriver.attribute_deriver import MissingnessDeriver
 from nacc_attribute_deriver.attributes.missingness.modules.uds.missingness_cx import (
     UDSFormC1C2Missingness,
 )
@@ -11,6 +12,12 @@ from nacc_attribute_deriver.utils.constants import (
 )
 
 
+def evaluate_patterns(table):
+    """Evaluates the configured UDS missingness patterns over the form."""
+    program = MissingnessDeriver("file").get_patterns("uds")
+    return program.evaluate(UDSFormC1C2Missingness(table))  # type: ignore
+
+
 class TestUDSFormC1C2Missingness:
     def test_respval_gate(self, uds_table):
         """Test variables gated by RESPVAL."""
@@ -242,11 +249,12 @@ class TestUDSFormC1C2Missingness:
             }
         )
         attr = UDSFormC1C2Missingness(uds_table)
+        patterns = evaluate_patterns(uds_table)
 
         assert attr._missingness_npsylanx() == INFORMED_BLANK
-        assert attr._missingness_mocalanx() == INFORMED_BLANK
-        assert attr._missingness_respothx() == INFORMED_BLANK
-        assert attr._missingness_mmselanx() == INFORMED_BLANK
+        assert patterns["mocalanx"] == INFORMED_BLANK
+        assert patterns["respothx"] == INFORMED_BLANK
+        assert patterns["mmselanx"] == INFORMED_BLANK
 
         uds_table["file.info.forms.json"].update(
             {
@@ -256,14 +264,15 @@ class TestUDSFormC1C2Missingness:
                 "mmselan": 3,
             }
         )
+        patterns = evaluate_patterns(uds_table)
 
         assert (
             attr._missingness_npsylanx()
             == "should be set blank when not 3 except legacy"
         )
-        assert attr._missingness_mocalanx() == "should be set blank when not 3"
-        assert attr._missingness_respothx() == "should be set blank when not 1"
-        assert attr._missingness_mmselanx() == "should be set blank when not 3"
+        assert patterns["mocalanx"] == "should be set blank when not 3"
+        assert patterns["respothx"] == "should be set blank when not 1"
+        assert patterns["mmselanx"] == "should be set blank when not 3"
 
         # it seems legacy versions did not override in npsalanx case
         uds_table["file.info.forms.json"].update(
@@ -276,14 +285,15 @@ class TestUDSFormC1C2Missingness:
             }
         )
         attr = UDSFormC1C2Missingness(uds_table)
+        patterns = evaluate_patterns(uds_table)
 
         assert (
             attr._missingness_npsylanx()
             == "should be set blank when not 3 except legacy"
         )
-        assert attr._missingness_mocalanx() == INFORMED_BLANK
-        assert attr._missingness_respothx() == INFORMED_BLANK
-        assert attr._missingness_mmselanx() == INFORMED_BLANK
+        assert patterns["mocalanx"] == INFORMED_BLANK
+        assert patterns["respothx"] == INFORMED_BLANK
+        assert patterns["mmselanx"] == INFORMED_BLANK
 
     def test_mocacomp_gate(self, uds_table):
         """Tests MOCACOMP-gated variables - if MOCACOMP = 0,
@@ -0,0 +1,171 @@
+"""Tests the columnar UDS missingness evaluator against the row-wise
+collections."""
+
+import random
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pytest
+
+from nacc_attribute_deriver.attributes.collection.missingness_collection import (
+    FormMissingnessCollection,
+)
+from nacc_attribute_deriver.attributes.collection.missingness_pattern import (
+    MissingnessPattern,
+    MissingnessPatternProgram,
+)
+from nacc_attribute_deriver.attributes.missingness.uds_columnar import (
+    UDSMissingnessColumnarEvaluator,
+)
+from nacc_attribute_deriver.schema.schema import MissingnessPatternFileModel
+from nacc_attribute_deriver.symbol_table import SymbolTable
+from nacc_attribute_deriver.utils.constants import INFORMED_BLANK
+
+# raw values covering blanks, invalid text, casts, codes, and missingness
+VALUES = [None, "", " ", ".", "-", "abc", "0", 0, 1, " 1 ", "8", 9, 2.0, -4, "-4"]
+
+
+def create_pattern(attr_type=int, **kwargs) -> MissingnessPattern:
+    row = {"scope": "uds", "gate": "", "values": "", "default": "", "prev_code": ""}
+    row.update(kwargs)
+    return MissingnessPattern.create(
+        MissingnessPatternFileModel.model_validate(row), attr_type
+    )
+
+
+PATTERNS = [
+    create_pattern(
+        str, field="dummyx", pattern="gated_writein", gate="dummy", values="0;9"
+    ),
+    create_pattern(
+        str, field="dummyx", pattern="forbidden_gated_writein", gate="dummy", values="1"
+    ),
+    create_pattern(field="other", pattern="normcog_gate", gate="dummy"),
+    create_pattern(field="other", pattern="prev_visit"),
+    create_pattern(field="other", pattern="prev_visit", prev_code="0"),
+    create_pattern(str, field="dummyx", pattern="prev_visit", prev_code="abc"),
+]
+
+
+def generate_forms(seed: int, size: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {x: rng.choice(VALUES) for x in ["dummy", "dummyx", "other"]}
+        for _ in range(size)
+    ]
+
+
+def evaluate_rows(
+    pattern: MissingnessPattern,
+    forms: List[Dict[str, Any]],
+    first: List[bool],
+    applicable: List[bool],
+) -> List[Any]:
+    """Evaluates the pattern row by row, where each row's previous record is
+    the previous row of the subject with its resolved value (or the generic
+    value, where the pattern does not apply). Returns the value of each row,
+    the exception it failed with, or None for the rows of a subject after a
+    failed row, since curation stops there."""
+    program = MissingnessPatternProgram([pattern])
+    results: List[Any] = []
+    prev_record: Optional[Dict[str, Any]] = None
+    failed = False
+    for form, is_first, is_applicable in zip(forms, first, applicable, strict=True):
+        failed = failed and not is_first
+        if failed:
+            results.append(None)
+            continue
+
+        table = SymbolTable({"file": {"info": {"forms": {"json": form}}}})
+        if prev_record is not None and not is_first:
+            table["_prev_record.info"] = prev_record
+
+        collection = FormMissingnessCollection(table=table, date_attribute=None)
+        try:
+            if is_applicable:
+                value = program.evaluate(collection)[pattern.field]
+            else:
+                value = collection.generic_missingness(pattern.field, pattern.attr_type)
+        except Exception as e:
+            value = e
+
+        failed = isinstance(value, Exception)
+        results.append(value)
+        resolved = None if value == INFORMED_BLANK else value
+        prev_record = {
+            "forms": {"json": form},
+            "resolved": {pattern.field: resolved},
+        }
+
+    return results
+
+
+class TestUDSMissingnessColumnarEvaluator:
+    @pytest.mark.parametrize("pattern", PATTERNS, ids=lambda x: x.LABEL)
+    def test_pattern_parity(self, pattern):
+        """Test each pattern gives the same values as evaluating it row by
+        row, including carrying values across visits of a subject."""
+        forms = generate_forms(0, 300)
+        rng = random.Random(1)
+        first = [i == 0 or rng.random() < 0.2 for i in range(len(forms))]
+        applicable = [rng.random() < 0.9 for _ in forms]
+
+        expected = evaluate_rows(pattern, forms, first, applicable)
+        evaluator = UDSMissingnessColumnarEvaluator(forms, first)
+        result = evaluator.pattern(pattern, applicable=np.array(applicable))
+        generic = evaluator.generic(pattern.field, pattern.attr_type)
+
+        for i, value in enumerate(expected):
+            invalid = result.invalid[i] if applicable[i] else generic.invalid[i]
+            actual = result.values[i] if applicable[i] else generic.values[i]
+            if value is None:
+                continue
+            if isinstance(value, Exception):
+                assert invalid, (i, forms[i])
+                continue
+
+            assert not invalid, (i, forms[i])
+            assert actual == value, (i, forms[i])
+            assert type(actual) is type(value), (i, forms[i])
+
+    def test_generic(self):
+        """Test generic missingness, including FRMDATEX standardization."""
+        forms = [
+            {"dummy": "1", "frmdatea1": "2020/01/02"},
+            {"dummy": "", "frmdatea1": "NA"},
+            {"dummy": "abc"},
+        ]
+        evaluator = UDSMissingnessColumnarEvaluator(forms, [True, False, False])
+
+        result = evaluator.generic("dummy", int)
+        assert result.values.tolist()[:2] == [1, -4]
+        assert result.invalid.tolist() == [False, False, True]
+        assert evaluator.generic("dummy", float).values.tolist()[1] == -4.0
+
+        result = evaluator.generic("frmdatea1", str)
+        assert result.values.tolist() == ["2020-01-02", INFORMED_BLANK, INFORMED_BLANK]
+
+    def test_evaluate(self):
+        """Test evaluating fields by group, where a group applies either the
+        field's pattern, generic missingness, or neither."""
+        pattern = create_pattern(field="other", pattern="normcog_gate", gate="dummy")
+        forms = [{"dummy": 1}, {"dummy": 1}, {"dummy": 1, "other": "abc"}]
+        evaluator = UDSMissingnessColumnarEvaluator(forms, [True, False, False])
+
+        values, invalid = evaluator.evaluate(
+            [("other", int, pattern)],
+            groups=[0, 1, 2],
+            patterned=[[True], [False], [False]],
+            generic=[[False], [True], [False]],
+        )
+        assert values == [[8, -4, None]]
+        assert invalid == [False, False, False]
+
+    def test_supports(self):
+        """Test string previous-visit patterns with a default are not
+        supported, since a blank previous value falls back to the raw
+        value."""
+        assert UDSMissingnessColumnarEvaluator.supports(PATTERNS[-1])
+        assert not UDSMissingnessColumnarEvaluator.supports(
+            create_pattern(str, field="dummyx", pattern="prev_visit", default="x")
+        )
@@ -90,3 +90,20 @@ class TestCognitiveAttributeCollection:
         table["file.info.forms.json.cdrglob"] = None
         with pytest.raises(MissingRequiredError):
             CognitiveAttributeCollection(table)
+
+    def test_shared_snapshot(self, table):
+        """Tests the collections of a pass share one snapshot of the
+        diagnoses, read when the first one is created."""
+        table.start_caching()
+        attr = CognitiveAttributeCollection(table)
+        table["file.info.forms.json.amndem"] = 1
+
+        other = CognitiveAttributeCollection(table)
+        assert other._create_dementia() == attr._create_dementia()
+        assert other._create_dementia() == [
+            CognitiveAttributeCollection.DEMENTIA_MAPPINGS["nacclbds"]
+        ]
+
+        table.stop_caching()
+        attr = CognitiveAttributeCollection(table)
+        assert len(attr._create_dementia()) == 2
@@ -7,11 +7,13 @@ from nacc_attribute_deriver.attributes.namespace.scan_namespace import (
 from nacc_attribute_deriver.attributes.mqt.scan import (
     SCANMRIQCAttributeCollection,
     SCANMRISBMAttributeCollection,
+    SCANMRISessionsAttributeCollection,
     SCANPETAmyloidGAAINAttributeCollection,
     SCANPETAmyloidNPDKAAttributeCollection,
     SCANPETFTDNPDKAAttributeCollection,
     SCANPETTAUNPDKAAttributeCollection,
     SCANPETQCAttributeCollection,
+    SCANPETSessionsAttributeCollection,
     MRIAnalysisTypes,
     PETAnalysisTypes,
 )
@@ -61,23 +63,29 @@ class TestSCANMRIQCAttribute:
     def test_create_scan_mri_session_count(self, scan_mri_qc_table):
         """Tests _create_scan_mri_session_count, which should just count scan-
         mri-dates."""
-        attr = SCANMRIQCAttributeCollection(scan_mri_qc_table)
+        attr = SCANMRISessionsAttributeCollection(scan_mri_qc_table)
         assert attr._create_scan_mri_session_count() == 5
 
         # empty
         scan_mri_qc_table["subject.info.working.cross-sectional.scan-mri-dates"] = []
-        attr = SCANMRIQCAttributeCollection(scan_mri_qc_table)
+        attr = SCANMRISessionsAttributeCollection(scan_mri_qc_table)
         assert attr._create_scan_mri_session_count() == 0
 
+    def test_missing_scan_mri_dates(self, scan_mri_qc_table):
+        """Tests the session counts require the scan-mri-dates."""
+        scan_mri_qc_table["subject.info.working.cross-sectional.scan-mri-dates"] = None
+        with pytest.raises(MissingRequiredError):
+            SCANMRISessionsAttributeCollection(scan_mri_qc_table)
+
     def test_create_scan_mri_year_count(self, scan_mri_qc_table):
         """Tests _create_scan_mri_year_count, which should just count the
         unique years in scan-mri-dates."""
-        attr = SCANMRIQCAttributeCollection(scan_mri_qc_table)
+        attr = SCANMRISessionsAttributeCollection(scan_mri_qc_table)
         assert attr._create_scan_mri_year_count() == 3
 
         # empty
         scan_mri_qc_table["subject.info.working.cross-sectional.scan-mri-dates"] = []
-        attr = SCANMRIQCAttributeCollection(scan_mri_qc_table)
+        attr = SCANMRISessionsAttributeCollection(scan_mri_qc_table)
         assert attr._create_scan_mri_year_count() == 0
 
 
@@ -118,18 +126,18 @@ class TestSCANPETQCAttribute:
     def test_create_scan_pet_session_count(self, scan_pet_qc_table):
         """Tests _create_scan_pet_session_count, which should just count scan-
         pet-dates."""
-        attr = SCANPETQCAttributeCollection(scan_pet_qc_table)
+        attr = SCANPETSessionsAttributeCollection(scan_pet_qc_table)
         assert attr._create_scan_pet_session_count() == 1
 
         # empty
         scan_pet_qc_table["subject.info.working.cross-sectional.scan-pet-dates"] = []
-        attr = SCANPETQCAttributeCollection(scan_pet_qc_table)
+        attr = SCANPETSessionsAttributeCollection(scan_pet_qc_table)
         assert attr._create_scan_pet_session_count() == 0
 
     def test_create_scan_pet_year_count(self, scan_pet_qc_table):
         """Tests _create_scan_pet_year_count, which should just count the
         unique years in scan-pet-dates."""
-        attr = SCANPETQCAttributeCollection(scan_pet_qc_table)
+        attr = SCANPETSessionsAttributeCollection(scan_pet_qc_table)
         assert attr._create_scan_pet_year_count() == 1
 
         # empty
@@ -0,0 +1,130 @@
+"""Tests the columnar SCAN PET evaluator against the row-wise
+collections."""
+
+import math
+import random
+from typing import Any, Dict, List
+
+import pytest
+
+from nacc_attribute_deriver.attributes.collection.attribute_collection import (
+    AttributeCollectionRegistry,
+)
+from nacc_attribute_deriver.attributes.mqt.scan_columnar import (
+    SCOPE_FUNCTIONS,
+    SCANPETColumnarEvaluator,
+)
+from nacc_attribute_deriver.symbol_table import SymbolTable
+from nacc_attribute_deriver.utils.columnar import columnar_available
+
+FIELDS: Dict[str, List[str]] = {
+    "scan_pet_qc": ["scan_date", "radiotracer"],
+    "scan_amyloid_pet_gaain": [
+        "scandate",
+        "tracer",
+        "amyloid_status",
+        "centiloids",
+        "gaain_summary_suvr",
+    ],
+    "scan_amyloid_pet_npdka": ["scandate", "npdka_summary_suvr"],
+    "scan_fdg_pet_npdka": ["scandate", "fdg_metaroi_suvr"],
+    "scan_tau_pet_npdka": ["scandate", "meta_temporal_suvr"],
+}
+
+# raw values covering blanks, invalid text, casts, and tracer codes
+VALUES = [
+    None,
+    "",
+    " ",
+    ".",
+    "-",
+    "abc",
+    "nan",
+    "inf",
+    "0",
+    "0.0",
+    "1",
+    " 1 ",
+    "1.0",
+    "2",
+    "2.7",
+    "3",
+    "4",
+    "5",
+    "6",
+    "7",
+    "9",
+    "10",
+    "99",
+    "-0.5",
+    "-3",
+    "1e3",
+    "42.5",
+    2,
+    4.0,
+]
+
+
+def generate_columns(scope: str, num_rows: int, seed: int = 0) -> Dict[str, List]:
+    """Generates random raw values for each field the scope reads, with
+    some scan dates missing."""
+    rng = random.Random(seed)
+    dates = ["2024-01-01"] * 9 + [""]
+    return {
+        field: [
+            rng.choice(dates if field.endswith("date") else VALUES)
+            for _ in range(num_rows)
+        ]
+        for field in FIELDS[scope]
+    }
+
+
+def same(left: Any, right: Any) -> bool:
+    if isinstance(left, float) and isinstance(right, float):
+        return left == right or (math.isnan(left) and math.isnan(right))
+
+    return left == right and type(left) is type(right)
+
+
+class TestSCANPETColumnarEvaluator:
+    def test_available(self):
+        assert columnar_available()
+
+    @pytest.mark.parametrize("scope", list(FIELDS))
+    def test_parity(self, scope):
+        """Test every row derives the same values, and fails the same way,
+        as with the row-wise collections."""
+        columns = generate_columns(scope, 500)
+        result = SCANPETColumnarEvaluator(scope, columns).evaluate()
+        methods = AttributeCollectionRegistry.get_attribute_methods()
+
+        num_failed = 0
+        for i in range(500):
+            table = SymbolTable(
+                {"file": {"info": {"raw": {x: y[i] for x, y in columns.items()}}}}
+            )
+            expected = {}
+            try:
+                for function in SCOPE_FUNCTIONS[scope]:
+                    expected[function] = methods[function].apply(table)[0]
+            except Exception:
+                assert result.errors[i] is not None, i
+                num_failed += 1
+                continue
+
+            assert result.errors[i] is None, i
+            for function, value in expected.items():
+                assert same(result.values[function][i], value), (i, function)
+
+        # the corpus should exercise both outcomes
+        assert 0 < num_failed < 500
+
+    def test_functions(self):
+        """Test the evaluator covers every rule of the PET scopes but PET
+        QC's dates, which are derived row-wise."""
+        assert SCANPETColumnarEvaluator.functions("scan_pet_qc") == (
+            "create_scan_pet_scan_types",
+            "create_scan_pet_amyloid_tracers",
+            "create_scan_pet_tau_tracers",
+        )
+        assert SCANPETColumnarEvaluator.functions("scan_mri_qc") == ()
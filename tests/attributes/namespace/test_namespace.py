@@ -4,6 +4,7 @@ from datetime import date
 import pytest
 
 from nacc_attribute_deriver.attributes.namespace.namespace import (
+    AttributeGroup,
     BaseNamespace,
     INVALID_TEXT,
     SubjectDerivedNamespace,
@@ -34,6 +35,32 @@ class TestBaseNamespace:
         namespace = BaseNamespace(table=table, attribute_prefix="test.")
         assert namespace.group_attributes(["var1", "var2", "var3"], int) == [1, 2, 3]
 
+    def test_get_group(self):
+        """Test reading an attribute group matches reading each value."""
+        table = SymbolTable(
+            {"test": {"var1": "1", "var2": " ", "var3": 3.0, "nested": {"var": 4}}}
+        )
+        group = AttributeGroup(["var1", "var2", "var3", "missing", "nested.var"], int)
+
+        namespace = BaseNamespace(table=table, attribute_prefix="test.")
+        assert namespace.get_group(group) == (1, None, 3, None, 4)
+        assert namespace.get_group(group) == tuple(
+            namespace.get_value(x, int) for x in group.attributes
+        )
+        assert namespace.get_group_mapping(group) == {
+            "var1": 1,
+            "var2": None,
+            "var3": 3,
+            "missing": None,
+            "nested.var": 4,
+        }
+
+        # prefix missing or not a dict
+        namespace = BaseNamespace(table=table, attribute_prefix="other.")
+        assert namespace.get_group(group) == (None,) * len(group)
+        namespace = BaseNamespace(table=table, attribute_prefix="test.var1.")
+        assert namespace.get_group(group) == (None,) * len(group)
+
     def test_invalid_string(self):
         """Tests invalid string values return as None."""
         table = SymbolTable()
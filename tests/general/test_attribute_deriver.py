@@ -1,9 +1,15 @@
 """Tests the AttributeDeriver."""
 
+from datetime import date
 from typing import List, Set
 
+import pytest
+
 from nacc_attribute_deriver.attribute_deriver import AttributeDeriver
-from nacc_attribute_deriver.schema.schema import CurationRule
+from nacc_attribute_deriver.schema.schema import AttributeAssignment, CurationRule
+from nacc_attribute_deriver.symbol_table import SymbolTable
+from nacc_attribute_deriver.utils.constants import INFORMED_BLANK
+from nacc_attribute_deriver.utils.errors import OperationError
 
 
 class TestAttributeDeriver:
@@ -60,3 +66,40 @@ class TestAttributeDeriver:
             "subject.info.working.cross-sectional.historic-apoe",
             "subject.info.derived.cross-sectional.naccne4s",
         }
+
+    def test_assign(self):
+        """Test a rule's assignments each get the value in the form their
+        operation expects."""
+        rule = CurationRule(
+            name="dummy",
+            function="attribute_dummy",
+            assignments=[
+                AttributeAssignment(attribute=f"test.{x}", operation=x, dated=y)
+                for x, y in [
+                    ("initial", True),
+                    ("latest", True),
+                    ("list", True),
+                    ("update", False),
+                ]
+            ],
+        )
+        table = SymbolTable()
+        attr = AttributeDeriver()
+        attr.assign(table, rule, 5, date(2025, 1, 1))
+        attr.assign(table, rule, INFORMED_BLANK, date(2024, 1, 1))
+        attr.assign(table, rule, None, date(2023, 1, 1))
+
+        assert table.to_dict() == {
+            "test": {
+                "initial": {"date": "2024-01-01", "value": None},
+                "latest": {"date": "2025-01-01", "value": 5},
+                "list": [
+                    {"date": "2025-01-01", "value": 5},
+                    {"date": "2024-01-01", "value": ""},
+                ],
+                "update": None,
+            }
+        }
+
+        with pytest.raises(OperationError, match="Cannot compute date"):
+            attr.assign(table, rule, 5, None)
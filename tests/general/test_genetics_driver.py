@@ -0,0 +1,118 @@
+"""Tests the GeneticsDriver, mainly that curating genetics tables in bulk
+gives the same subject metadata as curating each row as a file."""
+
+import io
+
+import pytest
+
+from nacc_attribute_deriver.genetics_driver import GeneticsDriver, read_genetics_csv
+from nacc_attribute_deriver.subject_driver import CurationFile, SubjectDriver
+from nacc_attribute_deriver.utils.errors import AttributeDeriverError
+
+NIAGADS_CSV = (
+    "NACCID,NIAGADS_GWAS,NIAGADS_EXOMECHIP,NIAGADS_WGS,NIAGADS_WES,"
+    "ADGC_GWAS,ADGC_EXOMECHIP,GWAS_ROUND,EXOME_ROUND\n"
+    "NACC000001,NG00001,0,0,NG00002,1,0,3,\n"
+    "NACC000002,0,0,0,0,0,0,,\n"
+    "NACC000003,0,NG00003,0,0,0,1,,2\n"
+)
+
+APOE_CSV = "NACCID,A1,A2\nNACC000001,E3,E4\nNACC000002,E2,E2\nNACC000003,E4,E3\n"
+
+HISTORIC_APOE_CSV = "NACCID,APOE\nNACC000002,6\nNACC000003,1\n"
+
+
+def read_tables():
+    return [
+        read_genetics_csv(io.StringIO(NIAGADS_CSV), "niagads_availability"),
+        read_genetics_csv(io.StringIO(APOE_CSV), "ncrad_apoe"),
+        read_genetics_csv(io.StringIO(HISTORIC_APOE_CSV), "ncrad_historic_apoe"),
+    ]
+
+
+class TestGeneticsDriver:
+    def test_read_genetics_csv_errors(self):
+        """Test non-genetics scopes are rejected."""
+        with pytest.raises(AttributeDeriverError):
+            read_genetics_csv(io.StringIO("NACCID,SCANDATE\n"), "scan_pet_qc")
+        with pytest.raises(AttributeDeriverError):
+            read_genetics_csv(io.StringIO("PTID,A1,A2\n"), "ncrad_apoe")
+
+    def test_parity(self):
+        """Test curating the tables gives the same derived variables as
+        curating each row as a file with the SubjectDriver (which also runs
+        cross_module, so only the genetics variables are compared)."""
+        sources = read_tables()
+        result = GeneticsDriver().curate(sources)
+        assert not result.errors
+        assert result.num_rows == 8
+        assert list(result.subjects) == ["NACC000002", "NACC000003", "NACC000001"]
+
+        driver = SubjectDriver()
+        for subject, subject_info in result.subjects.items():
+            files = [
+                CurationFile(scope=rows.scope, info={"raw": record})
+                for rows in sources
+                for record in rows.records(subject)
+            ]
+            expected = driver.curate_subject(files)["derived"]["cross-sectional"]
+            derived = subject_info["derived"]["cross-sectional"]
+            assert {x: expected[x] for x in derived} == derived
+
+        assert (
+            result.subjects["NACC000001"]["derived"]["cross-sectional"]["naccapoe"] == 2
+        )
+        # historic and NCRAD APOE disagree
+        assert (
+            result.subjects["NACC000003"]["derived"]["cross-sectional"]["naccapoe"] == 9
+        )
+
+    def test_patches_and_files(self):
+        """Test each subject's patch only has what curation changed, and each
+        row's file-level values are reported."""
+        sources = [read_genetics_csv(io.StringIO(APOE_CSV), "ncrad_apoe")]
+        existing = {
+            "NACC000001": {
+                "derived": {"cross-sectional": {"naccapoe": 2, "naccne4s": 1}}
+            },
+            "NACC000002": {"derived": {"cross-sectional": {"naccapoe": 1}}},
+        }
+        result = GeneticsDriver().curate(sources, existing)
+
+        assert result.patches["NACC000001"] == []
+        assert result.patches["NACC000002"] == [
+            {
+                "op": "replace",
+                "path": "/derived/cross-sectional/naccapoe",
+                "value": 6,
+            },
+            {"op": "add", "path": "/derived/cross-sectional/naccne4s", "value": 0},
+        ]
+        assert [(x.subject, x.derived) for x in result.files] == [
+            ("NACC000001", {"naccapoe": 2, "naccne4s": 1}),
+            ("NACC000002", {"naccapoe": 6, "naccne4s": 0}),
+            ("NACC000003", {"naccapoe": 2, "naccne4s": 1}),
+        ]
+
+    def test_biomarker_provenance(self):
+        """Test biomarker rows read the table's provenance, and fail without
+        it."""
+        text = "NACCID,PTAU217\nNACC000001,0.5\nNACC000002,0.7\n"
+        sources = [
+            read_genetics_csv(
+                io.StringIO(text),
+                "ncrad_biomarker_ptau217",
+                provenance={"created_date": "2020-01-01T00:00:00+00:00"},
+            )
+        ]
+        result = GeneticsDriver().curate(sources)
+        assert not result.errors
+        assert [x.derived for x in result.files] == [
+            {"past_ncrad_embargo": 1},
+            {"past_ncrad_embargo": 1},
+        ]
+
+        sources = [read_genetics_csv(io.StringIO(text), "ncrad_biomarker_ptau217")]
+        result = GeneticsDriver().curate(sources)
+        assert [x.subject for x in result.errors] == ["NACC000001", "NACC000002"]
+        assert not result.files
@@ -0,0 +1,151 @@
+"""Tests the UDSMissingnessDriver, mainly that curating UDS missingness in
+columns gives the same resolved values as curating each visit as a file."""
+
+import copy
+import json
+import random
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from benchmarks.generator import SubjectGenerator, generate_rxclass
+from nacc_attribute_deriver.attribute_deriver import MissingnessDeriver
+from nacc_attribute_deriver.missingness_driver import UDSMissingnessDriver
+from nacc_attribute_deriver.subject_driver import CurationFile, SubjectDriver
+from nacc_attribute_deriver.symbol_table import OverlaySymbolTable
+from nacc_attribute_deriver.utils.form_record import compact_form
+
+
+def generate_visits(num_subjects: int, seed: int = 0):
+    """Generates subjects and their UDS visits, with some visits perturbed
+    into bad values, missing gates, and missing versions."""
+    driver = SubjectDriver(rxclass=generate_rxclass())
+    rng = random.Random(seed)
+    subjects: Dict[str, Dict[str, Any]] = {}
+    visits: Dict[str, List[CurationFile]] = {}
+    for subject in SubjectGenerator(seed=seed).generate_many(num_subjects):
+        subjects[subject.naccid] = driver.curate_subject(subject.files)
+        visits[subject.naccid] = list(subject.files)
+        for file in visits[subject.naccid]:
+            if file.scope != "uds":
+                continue
+
+            form = file.info["forms"]["json"]
+            r = rng.random()
+            if r < 0.02:
+                form["befrst"] = "abc"
+            elif r < 0.06:
+                form["normcog"] = ""
+            elif r < 0.10:
+                form["cogfrst"] = None
+                form["befrst"] = None
+            elif r < 0.11:
+                form.pop("formver")
+
+    return subjects, visits
+
+
+def curate_files(
+    subjects: Dict[str, Dict[str, Any]], visits: Dict[str, List[CurationFile]]
+) -> Dict[str, str]:
+    """Curates the missingness of each UDS visit as a file, as the gear
+    does; returns the error of each failed subject."""
+    deriver = MissingnessDeriver("file")
+    errors = {}
+    for subject, files in visits.items():
+        prev_record = None
+        for file in SubjectDriver.schedule(files):
+            if file.scope != "uds":
+                continue
+
+            table = OverlaySymbolTable(
+                SubjectDriver().build_table(subjects[subject], file, prev_record)
+            )
+            try:
+                deriver.curate(table, "uds")
+            except Exception as e:
+                table.discard()
+                errors[subject] = str(e)
+                break
+
+            table.commit()
+            prev_record = file.info
+
+    return errors
+
+
+class TestUDSMissingnessDriver:
+    def test_parity(self):
+        """Test the driver gives the same resolved values and errors as
+        curating each visit, including when regenerating over resolved
+        values."""
+        subjects, visits = generate_visits(10)
+        expected = copy.deepcopy(visits)
+        driver = UDSMissingnessDriver(batch_size=20)
+
+        for _ in range(2):
+            errors = curate_files(subjects, expected)
+            result = driver.curate(visits, subjects)
+            assert {x.subject: str(x.error) for x in result.errors} == errors
+            assert 0 < result.num_columnar < result.num_visits
+            for subject, files in visits.items():
+                for file, expected_file in zip(files, expected[subject], strict=True):
+                    assert file.info == expected_file.info
+
+    def test_failed_visit(self):
+        """Test a visit that fails is reported and not applied, and the
+        subject's later visits are not curated."""
+        _, visits = generate_visits(1, seed=3)
+        uds = [
+            x for x in SubjectDriver.schedule(visits["NACC000000"]) if x.scope == "uds"
+        ]
+        assert len(uds) > 1
+        uds[0].info["forms"]["json"]["befrst"] = "abc"
+
+        result = UDSMissingnessDriver().curate({"NACC000000": uds})
+        assert [(x.subject, x.file) for x in result.errors] == [("NACC000000", uds[0])]
+        assert all("resolved" not in x.info for x in uds)
+
+    def test_compact_forms(self):
+        """Test curating visits whose forms are compact records gives the
+        same resolved values."""
+        subjects, visits = generate_visits(5, seed=1)
+        compact = copy.deepcopy(visits)
+        for files in compact.values():
+            for file in files:
+                if file.scope == "uds":
+                    file.info["forms"]["json"] = compact_form(
+                        file.info["forms"]["json"]
+                    )
+
+        driver = UDSMissingnessDriver()
+        expected = driver.curate(visits, subjects)
+        result = driver.curate(compact, subjects)
+        assert [x.subject for x in result.errors] == [
+            x.subject for x in expected.errors
+        ]
+        assert result.num_columnar == expected.num_columnar
+        for subject, files in compact.items():
+            for file, expected_file in zip(files, visits[subject], strict=True):
+                assert file.info == expected_file.info
+
+    def test_compact_forms_option(self):
+        """Test compacting the forms while curating gives the same resolved
+        values, and leaves the forms as dicts."""
+        subjects, visits = generate_visits(5, seed=2)
+        expected = copy.deepcopy(visits)
+        UDSMissingnessDriver().curate(expected, subjects)
+
+        compacted = []
+        with patch(
+            "nacc_attribute_deriver.missingness_driver.compact_form",
+            side_effect=lambda x: compacted.append(x) or compact_form(x),
+        ):
+            UDSMissingnessDriver(compact_forms=True).curate(visits, subjects)
+
+        assert compacted
+        for subject, files in visits.items():
+            for file, expected_file in zip(files, expected[subject], strict=True):
+                assert file.info == expected_file.info
+                json.dumps(file.info)
+                if file.scope == "uds":
+                    assert type(file.info["forms"]["json"]) is dict
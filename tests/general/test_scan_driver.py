@@ -0,0 +1,183 @@
+"""Tests the SCANDriver, mainly that curating SCAN CSVs in bulk gives the
+same subject metadata as curating each row as a file."""
+
+import csv
+import io
+import random
+from typing import Dict, List
+
+import pytest
+
+from nacc_attribute_deriver.bulk_driver import SubjectRows
+from nacc_attribute_deriver.scan_driver import (
+    SCAN_DATE_COLUMNS,
+    SCANDriver,
+    read_scan_csv,
+)
+from nacc_attribute_deriver.subject_driver import CurationFile, SubjectDriver
+from nacc_attribute_deriver.utils.errors import AttributeDeriverError
+
+COLUMNS: Dict[str, List[str]] = {
+    "scan_mri_qc": ["NACCID", "STUDY_DATE", "SERIES_TYPE"],
+    "scan_mri_sbm": ["NACCID", "SCANDT", "CEREBRUMTCV", "WMH"],
+    "scan_pet_qc": ["NACCID", "SCAN_DATE", "RADIOTRACER"],
+    "scan_amyloid_pet_gaain": [
+        "NACCID",
+        "SCANDATE",
+        "TRACER",
+        "AMYLOID_STATUS",
+        "CENTILOIDS",
+        "GAAIN_SUMMARY_SUVR",
+    ],
+    "scan_amyloid_pet_npdka": ["NACCID", "SCANDATE", "NPDKA_SUMMARY_SUVR"],
+    "scan_fdg_pet_npdka": ["NACCID", "SCANDATE", "FDG_METAROI_SUVR"],
+    "scan_tau_pet_npdka": ["NACCID", "SCANDATE", "META_TEMPORAL_SUVR"],
+}
+
+
+def generate_csvs(num_subjects: int, seed: int = 0) -> Dict[str, str]:
+    """Generates the SCAN CSVs, with rows in random order."""
+    rng = random.Random(seed)
+    rows: Dict[str, List[List[str]]] = {x: [] for x in COLUMNS}
+    for i in range(num_subjects):
+        naccid = f"NACC{i:06d}"
+        for _ in range(rng.randint(1, 4)):
+            scandate = (
+                f"20{rng.randint(18, 24)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}"
+            )
+            tracer = str(rng.choice([2, 3, 4, 5, 6, 7]))
+            number = str(round(rng.uniform(-20, 120), 2))
+            rows["scan_mri_qc"].append(
+                [naccid, scandate, rng.choice(["T1", "T2", "FLAIR"])]
+            )
+            rows["scan_mri_sbm"].append(
+                [naccid, scandate, number, rng.choice(["", number])]
+            )
+            rows["scan_pet_qc"].append([naccid, scandate, tracer])
+            rows["scan_amyloid_pet_gaain"].append(
+                [naccid, scandate, tracer, rng.choice(["0", "1"]), number, "1.2"]
+            )
+            for scope in COLUMNS:
+                if scope.endswith("npdka"):
+                    rows[scope].append([naccid, scandate, rng.choice(["", "1.5"])])
+
+    result = {}
+    for scope, scope_rows in rows.items():
+        rng.shuffle(scope_rows)
+        stream = io.StringIO()
+        writer = csv.writer(stream)
+        writer.writerow(COLUMNS[scope])
+        writer.writerows(scope_rows)
+        result[scope] = stream.getvalue()
+
+    return result
+
+
+def read_csvs(csvs: Dict[str, str]) -> List[SubjectRows]:
+    return [read_scan_csv(io.StringIO(text), scope) for scope, text in csvs.items()]
+
+
+class TestSCANDriver:
+    def test_read_scan_csv(self):
+        """Test rows are grouped by subject and ordered by scan date."""
+        text = (
+            "NACCID,SCANDATE,TRACER\n"
+            "NACC000002,2020-02-01,2\n"
+            "NACC000001,2021-01-01,3\n"
+            "\n"
+            ",2021-01-01,3\n"
+            "NACC000001,2020-01-01,4\n"
+        )
+        rows = read_scan_csv(io.StringIO(text), "scan_amyloid_pet_gaain")
+        assert len(rows) == 3
+        assert rows.columns == ("naccid", "scandate", "tracer")
+        assert list(rows.subjects()) == ["NACC000002", "NACC000001"]
+        assert list(rows.records("NACC000001")) == [
+            {"naccid": "NACC000001", "scandate": "2020-01-01", "tracer": "4"},
+            {"naccid": "NACC000001", "scandate": "2021-01-01", "tracer": "3"},
+        ]
+        assert list(rows.records("NACC999999")) == []
+
+    def test_read_scan_csv_errors(self):
+        """Test unknown scopes, missing headers and subject columns."""
+        with pytest.raises(AttributeDeriverError):
+            read_scan_csv(io.StringIO("NACCID,VISITDATE\n"), "uds")
+        with pytest.raises(AttributeDeriverError):
+            read_scan_csv(io.StringIO(""), "scan_mri_qc")
+        with pytest.raises(AttributeDeriverError):
+            read_scan_csv(io.StringIO("PTID,STUDY_DATE\n"), "scan_mri_qc")
+
+    def test_parity(self):
+        """Test curating the CSVs gives the same subjects as curating each
+        row as a file with the SubjectDriver (which also runs cross_module,
+        so only the SCAN variables are compared)."""
+        sources = read_csvs(generate_csvs(30))
+        result = SCANDriver().curate(sources)
+        assert not result.errors
+        assert result.num_rows == sum(len(x) for x in sources)
+        assert len(result.subjects) == 30
+
+        driver = SubjectDriver()
+        for subject, subject_info in result.subjects.items():
+            files = [
+                CurationFile(
+                    scope=rows.scope,
+                    info={"raw": record},
+                    order_key=record[SCAN_DATE_COLUMNS[rows.scope]],
+                )
+                for rows in sources
+                for record in rows.records(subject)
+            ]
+            expected = driver.curate_subject(files)
+            assert set(subject_info) == {"imaging", "working"}
+            assert expected["imaging"] == subject_info["imaging"]
+            assert expected["working"] == subject_info["working"]
+
+    def test_columnar_parity(self):
+        """Test deriving the SCAN PET variables in columns gives the same
+        subjects and errors as deriving them row by row."""
+        csvs = generate_csvs(30)
+        csvs["scan_amyloid_pet_gaain"] += "NACC000001,2020-01-01,2,,10,1\n"
+
+        expected = SCANDriver().curate(read_csvs(csvs))
+        result = SCANDriver(columnar=True).curate(read_csvs(csvs))
+        assert result.subjects == expected.subjects
+        assert result.num_rows == expected.num_rows
+        assert [(x.subject, x.scope) for x in result.errors] == [
+            ("NACC000001", "scan_amyloid_pet_gaain")
+        ]
+        assert [(x.subject, x.scope) for x in expected.errors] == [
+            ("NACC000001", "scan_amyloid_pet_gaain")
+        ]
+
+    def test_failed_rows(self):
+        """Test a row that fails to curate is reported and not applied,
+        while the subject's other rows are."""
+        text = (
+            "NACCID,SCAN_DATE,RADIOTRACER\n"
+            "NACC000001,2020-01-01,2\n"
+            "NACC000001,,6\n"
+            "NACC000002,,6\n"
+        )
+        sources = [read_scan_csv(io.StringIO(text), "scan_pet_qc")]
+        existing = {"NACC000001": {"imaging": {"mri": {"scan": {"types": ["T1"]}}}}}
+        result = SCANDriver().curate(sources, existing)
+
+        assert result.num_rows == 3
+        assert [(x.subject, x.record["radiotracer"]) for x in result.errors] == [
+            ("NACC000001", "6"),
+            ("NACC000002", "6"),
+        ]
+        assert result.subjects["NACC000001"] is existing["NACC000001"]
+        assert existing["NACC000001"]["imaging"] == {
+            "mri": {"scan": {"types": ["T1"]}},
+            "pet": {
+                "scan": {
+                    "types": ["amyloid"],
+                    "tracers": ["pib"],
+                    "count": 1,
+                    "year-count": 1,
+                }
+            },
+        }
+        assert result.subjects["NACC000002"] == {}
@@ -0,0 +1,252 @@
+"""Tests the SubjectDriver against synthetic subjects.
+
+Mainly sanity checks that generated subjects curate end-to-end, which the
+benchmarks rely on.
+"""
+
+import copy
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+from typing import Any, Dict, FrozenSet, List
+
+from benchmarks.generator import SubjectGenerator, generate_rxclass
+from benchmarks.run_benchmarks import compare, run_benchmark
+from nacc_attribute_deriver.attribute_deriver import AttributeDeriver
+from nacc_attribute_deriver.subject_driver import (
+    DEFERRED_RULES,
+    SUBJECT_SCOPES,
+    CurationFile,
+    SubjectDriver,
+)
+from nacc_attribute_deriver.symbol_table import SymbolTable
+from nacc_attribute_deriver.utils.profiler import RuleProfiler
+
+
+def apply_patch(target: Dict[str, Any], patch: List[Dict[str, Any]]) -> None:
+    """Applies a patch from SymbolTable.patch to a dict."""
+    for operation in patch:
+        *parents, last = operation["path"].split("/")[1:]
+        node = target
+        for key in parents:
+            node = node.setdefault(key, {})
+
+        if operation["op"] == "remove":
+            node.pop(last)
+        elif last == "-":
+            node.append(operation["value"])
+        else:
+            node[last] = operation["value"]
+
+
+class TestSubjectDriver:
+    def test_schedule(self):
+        """Test files are ordered by scope, then order key, and unknown
+        scopes are dropped."""
+        files = [
+            CurationFile(scope="uds", info={}, order_key="2020-01-01"),
+            CurationFile(scope="np", info={}),
+            CurationFile(scope="unknown", info={}),
+            CurationFile(scope="uds", info={}, order_key="2019-01-01"),
+            CurationFile(scope="meds", info={}, order_key="2019-01-01"),
+        ]
+
+        result = SubjectDriver.schedule(files)
+        assert [(x.scope, x.order_key) for x in result] == [
+            ("np", ""),
+            ("meds", "2019-01-01"),
+            ("uds", "2019-01-01"),
+            ("uds", "2020-01-01"),
+        ]
+
+    def test_curate_subject(self):
+        """Test generated subjects curate without errors and back-propagate
+        cross-sectional values to the UDS files."""
+        driver = SubjectDriver(rxclass=generate_rxclass())
+        for subject in SubjectGenerator(seed=1).generate_many(5):
+            subject_info = driver.curate_subject(subject.files)
+
+            cross_sectional = subject_info["derived"]["cross-sectional"]
+            assert cross_sectional["naccid"] == subject.naccid
+            for file in subject.files:
+                if file.scope == "uds":
+                    assert file.info["derived"]["naccid"] == cross_sectional["naccid"]
+
+    def test_curate_subject_memory(self):
+        """Test subjects are recorded with their peak memory and subtree
+        sizes when the profiler tracks memory."""
+        profiler = RuleProfiler(track_memory=True)
+        driver = SubjectDriver(
+            deriver=AttributeDeriver(profiler=profiler), rxclass=generate_rxclass()
+        )
+        try:
+            for subject in SubjectGenerator(seed=1).generate_many(2):
+                driver.curate_subject(subject.files)
+        finally:
+            tracemalloc.stop()
+
+        assert profiler.subjects == 2
+        assert profiler.subject_memory.subjects == 2
+        assert profiler.subject_memory.max_size >= max(
+            x.peak_memory for x in profiler.scopes.values()
+        )
+        assert profiler.subtrees["derived.longitudinal"].max_size > 0
+
+    def test_write_back_patch(self):
+        """Test applying each table's subject.info patch to the previous
+        subject.info reproduces the curated subject.info."""
+        replica: Dict[str, Any] = {}
+        num_tables = 0
+
+        def on_curated(scope: str, table: SymbolTable) -> None:
+            nonlocal num_tables
+            num_tables += 1
+            apply_patch(replica, copy.deepcopy(table.patch("subject.info")))
+            assert replica == table["subject.info"]
+
+        driver = SubjectDriver(rxclass=generate_rxclass(), on_curated=on_curated)
+        subject = SubjectGenerator(seed=2).generate(0)
+        driver.curate_subject(subject.files)
+        assert num_tables == len(SubjectDriver.schedule(subject.files)) + len(
+            SUBJECT_SCOPES
+        )
+
+    def test_curate_file_failure(self):
+        """Test a file that fails to curate leaves the subject and file
+        metadata unchanged."""
+        driver = SubjectDriver(rxclass=generate_rxclass())
+        subject = SubjectGenerator(seed=1).generate(0)
+        file = next(x for x in subject.files if x.scope == "uds")
+        subject_info: Dict[str, Any] = {"derived": {"cross-sectional": {"a": 1}}}
+        expected_subject = copy.deepcopy(subject_info)
+        expected_file = copy.deepcopy(file.info)
+
+        def fail_after_writes(
+            table: SymbolTable, scope: str, skip: FrozenSet[str]
+        ) -> None:
+            table["subject.info.derived.cross-sectional.a"] = 2
+            table["file.info.derived.b"] = 3
+            raise ValueError("failed")
+
+        with (
+            patch.object(driver.deriver, "curate", side_effect=fail_after_writes),
+            pytest.raises(ValueError),
+        ):
+            driver.curate_file(subject_info, file)
+
+        assert subject_info == expected_subject
+        assert file.info == expected_file
+
+    def test_mp_sessions(self):
+        """Test curating MP acquisitions once per session gives the same
+        subject metadata as curating each file."""
+        per_file = SubjectDriver(rxclass=generate_rxclass())
+        per_session = SubjectDriver(rxclass=generate_rxclass(), mp_sessions=True)
+
+        num_sessions = 0
+        for subject in SubjectGenerator(seed=5).generate_many(20):
+            files = copy.deepcopy(subject.files)
+            expected = per_file.curate_subject(subject.files)
+            assert per_session.curate_subject(files) == expected
+
+            for session in SubjectDriver.group_sessions(SubjectDriver.schedule(files)):
+                if len(session) == 1:
+                    continue
+                num_sessions += 1
+                filenames = ",".join(x.extras["_filename"] for x in session)
+                for file in session:
+                    derived = file.info["derived"]
+                    assert filenames in (
+                        derived.get("naccmrfi"),
+                        derived.get("naccaptf"),
+                    )
+
+        assert num_sessions > 0
+
+    def test_session_files_not_shared(self):
+        """Test the session's other files get their own copy of the derived
+        values."""
+        driver = SubjectDriver(mp_sessions=True)
+        files = [
+            CurationFile(scope="mri_dicom", info={}, extras={"_filename": x})
+            for x in ["a.dicom.zip", "b.dicom.zip"]
+        ]
+
+        def derive(table: SymbolTable, scope: str, skip: FrozenSet[str]) -> None:
+            table["file.info.derived.filenames"] = table["_filename"]
+
+        with patch.object(driver.deriver, "curate", side_effect=derive):
+            driver.curate_session({}, files)
+
+        first, second = (x.info["derived"]["filenames"] for x in files)
+        assert first == second == ["a.dicom.zip", "b.dicom.zip"]
+        assert first is not second
+
+    def test_deferred_rules(self):
+        """Test only deriving the DEFERRED_RULES for a scope's last file
+        gives the same metadata as deriving them for every file."""
+        driver = SubjectDriver(rxclass=generate_rxclass())
+        for subject in SubjectGenerator(seed=6).generate_many(10):
+            files = copy.deepcopy(subject.files)
+            with patch.dict(DEFERRED_RULES, clear=True):
+                expected = driver.curate_subject(subject.files)
+
+            assert driver.curate_subject(files) == expected
+            assert [x.info for x in files] == [x.info for x in subject.files]
+            assert "year-count" in expected["longitudinal-data"]["uds"]
+
+
+class TestSubjectGenerator:
+    def test_deterministic(self):
+        """Test the same seed generates the same subjects."""
+        first = SubjectGenerator(seed=3).generate(7)
+        second = SubjectGenerator(seed=3).generate(7)
+        assert first == second
+        assert first != SubjectGenerator(seed=4).generate(7)
+
+    def test_uds_versions(self):
+        """Test the generator covers all UDS versions."""
+        formvers = {
+            file.info["forms"]["json"]["formver"]
+            for subject in SubjectGenerator(seed=0).generate_many(50)
+            for file in subject.files
+            if file.scope == "uds"
+        }
+        assert formvers == {"1.0", "2.0", "3.0", "3.2", "4.0"}
+
+
+class TestBenchmark:
+    def test_compare(self):
+        """Test regressions are detected against a baseline."""
+        results = run_benchmark(2)
+        assert compare(results, results, tolerance=0.2) == []
+
+        baseline = {
+            **results,
+            "subjects_per_second": results["subjects_per_second"] * 2,
+        }
+        regressions = compare(results, baseline, tolerance=0.2)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("subjects_per_second")
+
+        baseline = {**results, "config": {**results["config"], "seed": 1}}
+        assert "does not match" in compare(results, baseline, tolerance=0.2)[0]
+
+    def test_compare_memory(self):
+        """Test memory regressions are detected against a baseline."""
+        results = run_benchmark(2, memory=True)
+        assert not tracemalloc.is_tracing()
+        assert compare(results, results, tolerance=0.2) == []
+
+        memory = results["memory"]
+        baseline = {
+            **results,
+            "memory": {
+                **memory,
+                "subject_peak": {"mean": 1, "max": memory["subject_peak"]["max"]},
+            },
+        }
+        regressions = compare(results, baseline, tolerance=0.2)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("subject peak mean")
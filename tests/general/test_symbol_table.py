@@ -1,4 +1,4 @@
-from nacc_attribute_deriver.symbol_table import SymbolTable
+from nacc_attribute_deriver.symbol_table import OverlaySymbolTable, SymbolTable
 
 
 class TestSymbolTable:
@@ -96,3 +96,160 @@ class TestSymbolTable:
         table["subject.info.derived.dummy"] = 10
 
         assert subject_table.to_dict() == {"hello": "world", "derived": {"dummy": 10}}
+
+    def test_tracking(self):
+        table = SymbolTable(
+            {"subject": {"info": {"a": 1, "b": [1, 2], "c": {"d": 1}, "e": 5}}}
+        )
+        assert not table.tracking
+        assert table.dirty_paths() == []
+
+        table.start_tracking()
+        assert table.tracking
+
+        # unchanged writes are not dirty
+        table["subject.info.a"] = 1
+        table["subject.info.c"] = {"d": 1}
+        assert table.dirty_paths() == []
+
+        table["subject.info.a"] = 2
+        table["subject.info.b"] = [1, 2, 3]
+        table["subject.info.c.d"] = 2
+        table["subject.info.new.nested.value"] = "x"
+        table["file.info.derived.naccage"] = 80
+        table.pop("subject.info.e")
+
+        assert table.dirty_paths() == [
+            "file",
+            "subject.info.a",
+            "subject.info.b",
+            "subject.info.c",
+            "subject.info.e",
+            "subject.info.new",
+        ]
+        # c was replaced by an equal dict above, so all of it is reported
+        assert table.dirty_paths("subject.info.c") == ["subject.info.c"]
+        assert table.dirty_paths("file.info.derived") == ["file.info.derived"]
+
+        assert table.patch("subject.info") == [
+            {"op": "replace", "path": "/a", "value": 2},
+            {"op": "add", "path": "/b/-", "value": 3},
+            {"op": "replace", "path": "/c", "value": {"d": 2}},
+            {"op": "remove", "path": "/e"},
+            {"op": "add", "path": "/new", "value": {"nested": {"value": "x"}}},
+        ]
+        assert table.patch("file.info.derived") == [
+            {"op": "add", "path": "", "value": {"naccage": 80}}
+        ]
+
+        # reverting a change makes it clean again
+        table["subject.info.a"] = 1
+        assert "subject.info.a" not in table.dirty_paths()
+
+        table.stop_tracking()
+        assert not table.tracking
+        assert table.patch() == []
+
+    def test_tracking_replaced_subtree(self):
+        table = SymbolTable({"a": {"b": {"c": 1}}})
+        table.start_tracking()
+
+        # replacing a subtree, then writing within it, reports the subtree
+        table["a.b"] = {"c": 2}
+        table["a.b.d"] = 3
+        assert table.dirty_paths() == ["a.b"]
+        assert table.patch("a") == [
+            {"op": "replace", "path": "/b", "value": {"c": 2, "d": 3}}
+        ]
+
+    def test_memoize(self):
+        table = SymbolTable()
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return len(calls)
+
+        # only cached while caching
+        assert table.memoize("a", factory) == 1
+        assert table.memoize("a", factory) == 2
+
+        table.start_caching()
+        assert table.memoize("a", factory) == 3
+        assert table.memoize("a", factory) == 3
+        table.stop_caching()
+        assert not table.caching
+        assert table.memoize("a", factory) == 4
+
+
+class TestOverlaySymbolTable:
+    def test_overlay(self):
+        info = {"a": {"b": 1, "c": {"d": 2}}, "e": 3}
+        base = SymbolTable()
+        base["subject.info"] = info
+        table = OverlaySymbolTable(base)
+
+        # reads fall through, writes do not touch the base
+        assert table["subject.info.a.c.d"] == 2
+        table["subject.info.a.c.f"] = 4
+        table["subject.info.g.h"] = 5
+        assert table.pop("subject.info.e") == 3
+        assert table.pop("subject.info.missing", "default") == "default"
+        assert table["subject.info.a.c"] == {"d": 2, "f": 4}
+        assert table.get("subject.info.e") is None
+        assert table.modified
+        assert info == {"a": {"b": 1, "c": {"d": 2}}, "e": 3}
+
+        table.commit()
+        assert not table.modified
+        assert info == {"a": {"b": 1, "c": {"d": 2, "f": 4}}, "g": {"h": 5}}
+        assert table["subject.info"] == info
+
+    def test_discard(self):
+        info = {"a": {"b": 1}}
+        base = SymbolTable()
+        base["subject.info"] = info
+        table = OverlaySymbolTable(base)
+
+        table["subject.info.a.b"] = 2
+        table["subject.info.a.c"] = {"d": 3}
+        table["subject.info.a.c.e"] = 4
+        table.discard()
+        assert not table.modified
+        assert table["subject.info"] == {"a": {"b": 1}}
+        assert info == {"a": {"b": 1}}
+
+    def test_discard_written_base_dict(self):
+        """Test writing under a dict written from the base does not modify
+        the base, including where the dict replaces copied paths."""
+        info = {"a": {"b": {"x": 1}}, "c": {"d": {"e": 1}}}
+        base = SymbolTable()
+        base["subject.info"] = info
+        table = OverlaySymbolTable(base)
+
+        table["subject.info.c.d.f"] = 2
+        table["subject.info.c"] = table["subject.info.a"]
+        table["subject.info.c.b.y"] = 2
+        table["subject.info.e"] = table["subject.info.a.b"]
+        table["subject.info.e.z"] = 3
+        assert table["subject.info.c"] == {"b": {"x": 1, "y": 2}}
+        assert table["subject.info.e"] == {"x": 1, "z": 3}
+        assert info == {"a": {"b": {"x": 1}}, "c": {"d": {"e": 1}}}
+
+        table.discard()
+        assert info == {"a": {"b": {"x": 1}}, "c": {"d": {"e": 1}}}
+        assert table["subject.info"] == info
+
+    def test_overlay_tracking(self):
+        base = SymbolTable()
+        base["subject.info"] = {"a": {"b": 1}}
+        table = OverlaySymbolTable(base)
+        table.start_tracking()
+
+        table["subject.info.a.b"] = 2
+        table["subject.info.c"] = [1]
+        table.commit()
+        assert table.patch("subject.info") == [
+            {"op": "replace", "path": "/a/b", "value": 2},
+            {"op": "add", "path": "/c", "value": [1]},
+        ]
@@ -0,0 +1,182 @@
+"""Tests the static rule dependency analysis."""
+
+from collections import defaultdict
+from typing import Dict, Set, Tuple
+
+from benchmarks.generator import SubjectGenerator, generate_rxclass
+from nacc_attribute_deriver.attribute_deriver import (
+    AttributeDeriver,
+    MissingnessDeriver,
+)
+from nacc_attribute_deriver.subject_driver import SubjectDriver
+from nacc_attribute_deriver.symbol_table import SymbolTable
+from rule_reflection.rule_dependencies import (
+    PathIndex,
+    RuleAccess,
+    analyze_rules,
+    build_scope_graph,
+    find_issues,
+    overlaps,
+)
+
+
+def create_access(rule: str, reads=(), writes=(), scope: str = "a") -> RuleAccess:
+    return RuleAccess(
+        scope=scope,
+        rule=rule,
+        function=f"create_{rule}",
+        reads=frozenset(reads),
+        writes=frozenset(writes),
+    )
+
+
+class TestRuleDependencies:
+    def test_overlaps(self):
+        """Test paths overlap if equal, nested, or matched by a wildcard."""
+        assert overlaps("a.b", "a.b")
+        assert overlaps("a.b", "a.b.c")
+        assert overlaps("a.b.c", "a.b")
+        assert not overlaps("a.b", "a.bc")
+        assert overlaps("a.b*", "a.bc")
+        assert overlaps("a.*", "a.b*")
+        assert overlaps("a.b.c", "a.*")
+        assert not overlaps("a.b*", "a.c")
+        assert overlaps("*", "a.b")
+
+    def test_path_index(self):
+        """Test the index finds the same paths as comparing every pair."""
+        paths = ["a.b", "a.b.c", "a.bc", "a.c*", "b.a", "a", "*"]
+        index = PathIndex()
+        for i, path in enumerate(paths):
+            index.add(path, i)
+
+        for path in [*paths, "a.b*", "a.c.d", "c", "b.*", "a.b.c.d"]:
+            expected = {i for i, x in enumerate(paths) if overlaps(x, path)}
+            assert index.find(path) == expected, path
+
+    def test_scope_graph(self):
+        """Test rules are leveled after the rules they depend on, and
+        independent rules share a level."""
+        rules = [
+            create_access("first", reads=["file.x"], writes=["subject.a"]),
+            create_access("second", reads=["file.y"], writes=["subject.b"]),
+            create_access("read", reads=["subject.a.c"], writes=["subject.c"]),
+            create_access("anti", reads=["file.z"], writes=["file.y"]),
+            create_access("output", writes=["subject.c"]),
+        ]
+        graph = build_scope_graph("a", rules)
+        assert graph.levels == [["first", "second"], ["read", "anti"], ["output"]]
+        assert {(x.before, x.after, x.kind) for x in graph.dependencies} == {
+            ("first", "read", "read"),
+            ("second", "anti", "anti"),
+            ("read", "output", "output"),
+        }
+
+    def test_issues(self):
+        """Test reads of paths written only later are reported, but not
+        those the rule or an earlier rule writes."""
+        graphs = [
+            build_scope_graph(
+                "a",
+                [
+                    create_access(
+                        "early",
+                        reads=["subject.b", "subject.d"],
+                        writes=["subject.a"],
+                    ),
+                    create_access("self", reads=["subject.c"], writes=["subject.c"]),
+                    create_access(
+                        "late", reads=["subject.a", "*"], writes=["subject.b"]
+                    ),
+                ],
+            ),
+            build_scope_graph(
+                "b", [create_access("other", writes=["subject.d"], scope="b")]
+            ),
+            build_scope_graph(
+                "c", [create_access("last", reads=["subject.d"], scope="c")]
+            ),
+        ]
+        issues = {(x.rule, x.path, x.kind, x.writer) for x in find_issues(graphs)}
+        assert issues == {
+            ("early", "subject.b", "later-rule", "late"),
+            ("early", "subject.d", "later-scope", "other"),
+        }
+
+    def test_derived_reads(self):
+        """Test the analysis of the derived rules finds literal reads through
+        the namespaces, including across scopes."""
+        graphs = {x.scope: x for x in analyze_rules(AttributeDeriver())}
+        assert {"uds", "cross_module"} <= set(graphs)
+        uds = {x.rule: x for x in graphs["uds"].rules}
+        assert uds["naccage"].reads_path("file.info.forms.json.visitdate")
+        assert all(len(x.levels) >= 1 for x in graphs.values())
+
+        rules = [x.rule for x in graphs["uds"].rules]
+        position = {x: i for i, x in enumerate(rules)}
+        for level, names in enumerate(graphs["uds"].levels):
+            for dependency in graphs["uds"].dependencies:
+                if dependency.after in names:
+                    assert position[dependency.before] < position[dependency.after]
+                    assert dependency.before not in names, level
+
+    def test_missingness(self):
+        """Test missingness rules, including pattern rules, are analyzed
+        without falling back to reading every path."""
+        graphs = analyze_rules(MissingnessDeriver("file"), ["uds"])
+        assert len(graphs) == 1
+        assert graphs[0].rules
+        assert all("*" not in x.reads for x in graphs[0].rules)
+
+    def test_soundness(self, monkeypatch):
+        """Test every subject or derived path a rule reads while curating
+        generated subjects is covered by the rule's static reads."""
+        reads: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        current = []
+
+        def track(key):
+            if (
+                current
+                and isinstance(key, str)
+                and key.startswith(("subject.info", "file.info.derived"))
+            ):
+                reads[current[-1]].add(key)
+
+        get_item = SymbolTable.__getitem__
+        contains = SymbolTable.__contains__
+        get_curated_value = AttributeDeriver.get_curated_value
+
+        def traced_get_item(self, key):
+            track(key)
+            return get_item(self, key)
+
+        def traced_contains(self, key):
+            track(key)
+            return contains(self, key)
+
+        def traced_get_curated_value(self, table, rule, scope):
+            current.append((str(getattr(scope, "value", scope)), rule.name))
+            try:
+                return get_curated_value(self, table, rule, scope)
+            finally:
+                current.pop()
+
+        monkeypatch.setattr(SymbolTable, "__getitem__", traced_get_item)
+        monkeypatch.setattr(SymbolTable, "__contains__", traced_contains)
+        monkeypatch.setattr(
+            AttributeDeriver, "get_curated_value", traced_get_curated_value
+        )
+        driver = SubjectDriver(rxclass=generate_rxclass())
+        for subject in SubjectGenerator(seed=0).generate_many(5):
+            driver.curate_subject(subject.files)
+        monkeypatch.undo()
+
+        assert reads
+        static = {
+            (x.scope, x.rule): x.reads
+            for graph in analyze_rules(AttributeDeriver())
+            for x in graph.rules
+        }
+        for key, paths in reads.items():
+            missed = [x for x in paths if not any(overlaps(y, x) for y in static[key])]
+            assert not missed, key
@@ -4,6 +4,7 @@ import pytest
 from datetime import date
 
 from nacc_attribute_deriver.schema.operation import (
+    AssignedValue,
     DatedSetOperation,
     InitialOperation,
     LatestOperation,
@@ -405,3 +406,71 @@ class TestOperation:
         assert table.to_dict() == {
             "test": {"location": {"date": "2024-12-31", "value": 20}}
         }
+
+
+class TestAssignedValue:
+    def test_dated(self):
+        """Test the dated and serialized values are built once, and that
+        each serialized copy is new."""
+        value = AssignedValue(5, date(2025, 1, 1))
+        assert value.raw == 5
+        assert value.dated() is value.dated()
+        assert value.dated() == DateTaggedValue(value=5, date=date(2025, 1, 1))
+        assert value.dumped() == {"date": "2025-01-01", "value": 5}
+        assert value.dumped() is not value.dumped()
+
+        blank = AssignedValue(INFORMED_BLANK, date(2025, 1, 1))
+        assert blank.dumped() == {"date": "2025-01-01", "value": None}
+        assert blank.dated().value == INFORMED_BLANK
+
+        nested = AssignedValue([{"a": 1}], date(2025, 1, 1))
+        first, second = nested.dumped(), nested.dumped()
+        first["value"][0]["a"] = 2
+        assert second["value"] == [{"a": 1}]
+        assert nested.dumped()["value"] == [{"a": 1}]
+
+    @pytest.mark.parametrize(
+        "label", list(OperationRegistry.operations), ids=lambda x: x
+    )
+    @pytest.mark.parametrize("raw", [5, INFORMED_BLANK, date(2024, 6, 1)])
+    def test_assign(self, label, raw):
+        """Test assigning a shared value gives the same tables as evaluating
+        a new value for each assignment, for every operation and for both
+        dated and undated assignments."""
+        operation = OperationRegistry.operations[label]()
+        dates = [date(2025, 1, 1), date(2023, 1, 1), date(2024, 1, 1)]
+        for dated in [True, False]:
+            expected = SymbolTable()
+            result = SymbolTable()
+            for value_date in dates:
+                value = AssignedValue(raw, value_date)
+                for attribute in ["test.first", "test.second"]:
+                    errors = []
+                    try:
+                        operation.evaluate(
+                            table=expected,
+                            value=DateTaggedValue(value=raw, date=value_date)
+                            if dated
+                            else raw,
+                            attribute=attribute,
+                        )
+                    except OperationError as e:
+                        errors.append(str(e))
+                    try:
+                        operation.assign(
+                            table=result,
+                            value=value,
+                            attribute=attribute,
+                            dated=dated,
+                        )
+                    except OperationError as e:
+                        errors.append(str(e))
+
+                    assert len(errors) in (0, 2)
+                    assert len(set(errors)) <= 1
+
+                # the shared value is not modified by the assignments
+                assert value.raw == raw
+                assert value.dated().value == raw
+
+            assert result == expected.to_dict()
@@ -0,0 +1,129 @@
+"""Tests the compact form records."""
+
+import copy
+import pickle
+
+import pytest
+
+from benchmarks.generator import SubjectGenerator, generate_rxclass
+from nacc_attribute_deriver.attributes.namespace.keyed_namespace import (
+    PreviousRecordNamespace,
+)
+from nacc_attribute_deriver.attributes.namespace.uds_namespace import UDSNamespace
+from nacc_attribute_deriver.subject_driver import SubjectDriver
+from nacc_attribute_deriver.utils.form_record import (
+    FormKeys,
+    FormRecord,
+    compact_form,
+    get_form_keys,
+    load_form_keys,
+)
+
+
+class TestFormRecord:
+    def test_mapping(self):
+        """Test records read like the dicts they are built from, including
+        keys not in the key table."""
+        keys = FormKeys(["a", "b", "c", "b", "d"])
+        assert keys.keys == ("a", "b", "c", "d")
+        assert keys.index("c") == 2
+        assert keys.index("x") == -1
+
+        form = {"b": "1", "a": None, "x": 2}
+        record = FormRecord(keys, form)
+        assert record == form
+        assert form == record
+        assert len(record) == 3
+        assert list(record) == ["a", "b", "x"]
+        assert record["b"] == "1"
+        assert record["a"] is None
+        assert record.get("a", "default") is None
+        assert record.get("c", "default") == "default"
+        assert record.get("d") is None
+        assert record.get("y") is None
+        assert "a" in record
+        assert "x" in record
+        assert "c" not in record
+        assert 1 not in record
+        assert record.to_dict() == form
+        with pytest.raises(KeyError):
+            record["c"]
+
+        empty = FormRecord(keys, {})
+        assert len(empty) == 0
+        assert empty == {}
+
+    def test_shared(self):
+        """Test records share their key table and short values, including
+        after copying or pickling."""
+        keys = FormKeys(["a", "b"])
+        first = FormRecord(keys, {"a": "".join(["1", "0"])})
+        second = FormRecord(keys, {"a": "".join(["1", "0"])})
+        assert first["a"] is second["a"]
+        assert first.keys_table is second.keys_table
+
+        copies = pickle.loads(pickle.dumps([first, second]))
+        assert copies == [first, second]
+        assert copies[0].keys_table is copies[1].keys_table
+        assert copy.deepcopy(first) == first
+
+    def test_compact_form(self):
+        """Test forms are keyed by their UDS form version and packet."""
+        tables = load_form_keys()
+        assert get_form_keys("3", "i") is tables["v3.0_I"]
+        assert get_form_keys(4.0, "F") is tables["v4.0_F"]
+        assert get_form_keys("3.0", None) is tables[None]
+        assert get_form_keys("bad", "I") is tables[None]
+        assert get_form_keys("9", "I") is tables[None]
+        assert "frmdatea1" in tables["v4.0_I"]
+        assert "frmdatea1" not in tables["v3.0_I"]
+        assert "frmdatea1" in tables[None]
+
+        form = {"formver": "3.0", "packet": "I", "frmdatea1": "2020-01-01"}
+        record = compact_form(form)
+        assert record.keys_table is tables["v3.0_I"]
+        assert record == form
+        assert compact_form(record) is record
+
+    def test_symbol_table(self, uds_table):
+        """Test the table and namespaces read records like dicts, and that
+        records cannot be written into."""
+        form = uds_table["file.info.forms.json"]
+        uds_table["file.info.forms.json"] = compact_form(form)
+        uds_table["_prev_record.info.forms.json"] = compact_form(
+            {"visitdate": "02-02-2020", "befrst": "1"}
+        )
+
+        assert uds_table["file.info.forms.json.packet"] == "I"
+        assert "file.info.forms.json.packet" in uds_table
+        assert "file.info.forms.json.befrst" not in uds_table
+        assert uds_table.get("file.info.forms.json.befrst") is None
+
+        namespace = UDSNamespace(table=uds_table)
+        assert namespace.normalized_formver() == 3
+        assert namespace.get_value("birthyr", int) == 1990
+        assert namespace.map_attributes(["birthmo", "befrst"], int) == {
+            "birthmo": 3,
+            "befrst": None,
+        }
+        prev_record = PreviousRecordNamespace(table=uds_table)
+        assert prev_record.get_resolved_value("befrst", int) == 1
+
+        with pytest.raises(TypeError, match="read-only mapping"):
+            uds_table["file.info.forms.json.befrst"] = 1
+
+    def test_curate_subject(self):
+        """Test curating subjects with compact UDS forms gives the same
+        results as with dicts."""
+        driver = SubjectDriver(rxclass=generate_rxclass())
+        for subject in SubjectGenerator(seed=1).generate_many(3):
+            files = copy.deepcopy(subject.files)
+            for file in files:
+                if file.scope == "uds":
+                    file.info["forms"]["json"] = compact_form(
+                        file.info["forms"]["json"]
+                    )
+
+            assert driver.curate_subject(files) == driver.curate_subject(subject.files)
+            for file, expected in zip(files, subject.files, strict=True):
+                assert file.info == expected.info
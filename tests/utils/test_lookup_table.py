@@ -0,0 +1,81 @@
+"""Tests the lookup tables."""
+
+import csv
+import random
+import string
+from importlib import resources
+
+from nacc_attribute_deriver import config
+from nacc_attribute_deriver.attributes.derived.modules.meds.form_meds import (
+    load_v1_drugs,
+)
+from nacc_attribute_deriver.attributes.missingness.modules.uds.missingness_a4 import (
+    load_udsmeds,
+)
+from nacc_attribute_deriver.utils.lookup_table import LookupTable
+
+
+def load_dict(filename: str, key_column: str, value_column: str, normalize: bool):
+    """Loads a CSV into a dict the way the tables used to be loaded."""
+    result = {}
+    with resources.files(config).joinpath(filename).open("r") as fh:
+        for row in csv.DictReader(fh):
+            key, value = row[key_column], row[value_column]
+            if normalize:
+                key, value = key.strip().lower(), value.strip().lower()
+            result[key] = value
+
+    return result
+
+
+class TestLookupTable:
+    def test_get(self):
+        """Test lookups, including repeated keys and missing keys."""
+        table = LookupTable([("b", "2"), ("a", "1"), ("c", ""), ("b", "3")])
+        assert len(table) == 3
+        assert list(table) == ["a", "b", "c"]
+        assert table.get("a") == "1"
+        assert table.get("b") == "3"
+        assert table.get("c") == ""
+        assert table.get("d") is None
+        assert table.get("d", "x") == "x"
+        assert table.get("") is None
+        assert "a" in table
+        assert "d" not in table
+        assert 1 not in table
+
+        empty = LookupTable([])
+        assert len(empty) == 0
+        assert empty.get("a", "x") == "x"
+
+    def test_random(self):
+        """Test the table matches a dict on random keys."""
+        rng = random.Random(0)
+        items = [
+            ("".join(rng.choices(string.ascii_lowercase, k=rng.randint(0, 4))), str(i))
+            for i in range(500)
+        ]
+        expected = dict(items)
+        table = LookupTable(items)
+        assert len(table) == len(expected)
+        for key in [*expected, "zzzzz", "aa b"]:
+            assert table.get(key) == expected.get(key)
+
+    def test_drug_tables(self):
+        """Test the drug tables match the CSVs they are loaded from."""
+        for table, expected in [
+            (
+                load_v1_drugs(),
+                load_dict("drug_ids_v1.csv", "raw_drug", "drug_id", True),
+            ),
+            (
+                load_udsmeds(),
+                load_dict("UDSMEDS.csv", "DRUG_ID", "DRUG_NAME_UCASE", False),
+            ),
+        ]:
+            assert len(table) == len(expected)
+            assert all(table.get(key) == value for key, value in expected.items())
+            assert table.get("not a drug") is None
+
+        # only loaded once
+        assert load_v1_drugs() is load_v1_drugs()
@@ -0,0 +1,209 @@
+"""Tests the RuleProfiler."""
+
+import json
+import tracemalloc
+
+import pytest
+
+from nacc_attribute_deriver.attribute_deriver import AttributeDeriver
+from nacc_attribute_deriver.symbol_table import SymbolTable
+from nacc_attribute_deriver.utils.errors import AttributeDeriverError
+from nacc_attribute_deriver.utils.profiler import (
+    MemoryTracker,
+    RuleProfiler,
+    subtree_sizes,
+)
+
+
+class TestRuleProfiler:
+    def test_record_and_merge(self):
+        """Test recording and merging statistics."""
+        profiler = RuleProfiler()
+        profiler.record_rule("uds", "create_naccage", 0.5, 80)
+        profiler.record_rule("uds", "create_naccage", 1.5, None)
+        profiler.record_rule("uds", "create_naccage", 0.25, failed=True)
+        profiler.record_scope("uds", 3.0)
+        profiler.record_subject()
+
+        other = RuleProfiler()
+        other.record_rule("uds", "create_naccage", 2.0, 81)
+        other.record_rule("np", "create_naccbraa", 0.1, 9)
+        other.record_scope("uds", 2.5, failed=True)
+        other.record_subject()
+
+        profiler.merge(other)
+
+        naccage = profiler.rules[("uds", "create_naccage")]
+        assert naccage.calls == 4
+        assert naccage.errors == 1
+        assert naccage.total_time == 4.25
+        assert naccage.max_time == 2.0
+        assert naccage.value_types == {"int": 2, "NoneType": 1}
+
+        assert profiler.scopes["uds"].files == 2
+        assert profiler.scopes["uds"].errors == 1
+        assert profiler.subjects == 2
+
+        top = profiler.top_rules(1)
+        assert [(x[0], x[1]) for x in top] == [("uds", "create_naccage")]
+        assert [x[1] for x in profiler.top_rules(sort_by="mean_time")] == [
+            "create_naccage",
+            "create_naccbraa",
+        ]
+
+        result = json.loads(profiler.to_json())
+        assert result["subjects"] == 2
+        assert result["scopes"]["uds"] == {
+            "files": 2,
+            "errors": 1,
+            "total_time": 5.5,
+        }
+        assert result["rules"]["np"]["create_naccbraa"]["calls"] == 1
+
+        report = profiler.report(top_n=1)
+        assert "create_naccage" in report
+        assert "create_naccbraa" not in report
+
+        profiler.reset()
+        assert profiler.to_dict() == {"subjects": 0, "scopes": {}, "rules": {}}
+
+    def test_curate_with_profiler(self):
+        """Test the profiler is populated by curate."""
+        profiler = RuleProfiler()
+        deriver = AttributeDeriver(profiler=profiler)
+
+        table = SymbolTable()
+        table["file.info.forms.json"] = {
+            "visitdate": "2025-01-01",
+            "module": "np",
+            "npdage": 80,
+            "npdodyr": "2024",
+            "npdodmo": "12",
+            "npdoddy": "19",
+            "formver": 11.0,
+        }
+        deriver.curate(table, "np")
+
+        rules = deriver.get_curation_rules("np")
+        assert rules
+        assert profiler.scopes["np"].files == 1
+        assert len(profiler.rules) == len(rules)
+        assert all(x[0] == "np" for x in profiler.rules)
+        assert profiler.rules[("np", "create_naccbraa")].value_types == {"int": 1}
+
+        # errors are counted and re-raised
+        with pytest.raises(AttributeDeriverError):
+            deriver.curate(SymbolTable(), "np")
+
+        assert profiler.scopes["np"].files == 2
+        assert profiler.scopes["np"].errors == 1
+        assert sum(x.errors for x in profiler.rules.values()) == 1
+
+        # detaching the profiler stops collection
+        deriver.profiler = None
+        deriver.curate(table, "np")
+        assert profiler.scopes["np"].files == 2
+
+
+class TestMemoryProfiling:
+    def test_memory_tracker(self):
+        """Test nested regions keep their own peaks, and tracing stops once
+        the outermost region closes."""
+        tracker = MemoryTracker()
+        try:
+            tracker.begin()
+            tracker.begin()
+            data = bytearray(1024 * 1024)
+            del data
+            inner_peak, inner_net = tracker.end()
+
+            tracker.begin()
+            last_peak, _ = tracker.end()
+            outer_peak, _ = tracker.end()
+        finally:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+        assert inner_peak >= 1024 * 1024
+        assert inner_net < 1024 * 1024
+        assert last_peak < 1024 * 1024
+        assert outer_peak >= inner_peak
+        assert not tracemalloc.is_tracing()
+
+    def test_interleaved_trackers(self):
+        """Test trackers close their own regions when they interleave, and
+        tracing only stops once both are closed."""
+        first = MemoryTracker()
+        second = MemoryTracker()
+        try:
+            first.begin()
+            second.begin()
+            data = bytearray(1024 * 1024)
+            first_peak, _ = first.end()
+            assert tracemalloc.is_tracing()
+            del data
+            second.begin()
+            inner_peak, _ = second.end()
+            second_peak, _ = second.end()
+        finally:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+        assert first_peak >= 1024 * 1024
+        assert second_peak >= 1024 * 1024
+        assert inner_peak < 1024 * 1024
+        assert not tracemalloc.is_tracing()
+
+        # tracing started outside the trackers is left running
+        tracemalloc.start()
+        try:
+            first.begin()
+            first.end()
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+    def test_subtree_sizes(self):
+        """Test subtree sizes are reported to the given depth."""
+        info = {"derived": {"cross-sectional": {"naccage": 80}, "x": 1}, "y": "ab"}
+        assert subtree_sizes(info) == {
+            "derived": len(json.dumps(info["derived"])),
+            "derived.cross-sectional": len('{"naccage": 80}'),
+            "derived.x": 1,
+            "y": 4,
+        }
+        assert list(subtree_sizes(info, depth=1)) == ["derived", "y"]
+
+    def test_curate_with_memory(self):
+        """Test memory statistics are recorded by curate and reported."""
+        profiler = RuleProfiler(track_memory=True)
+        deriver = AttributeDeriver(profiler=profiler)
+
+        table = SymbolTable()
+        table["file.info.forms.json"] = {
+            "visitdate": "2025-01-01",
+            "module": "np",
+            "npdage": 80,
+            "npdodyr": "2024",
+            "npdodmo": "12",
+            "npdoddy": "19",
+            "formver": 11.0,
+        }
+        try:
+            deriver.curate(table, "np")
+        finally:
+            tracemalloc.stop()
+
+        profiler.record_subject(peak_memory=2048, subject_info=table["subject.info"])
+
+        assert profiler.scopes["np"].peak_memory > 0
+        assert profiler.scopes["np"].peak_memory >= max(
+            x.peak_memory for x in profiler.rules.values()
+        )
+        assert profiler.subject_memory.max_size == 2048
+
+        result = profiler.to_dict()
+        assert "peak_memory" in result["scopes"]["np"]
+        assert result["subject_memory"]["max_size"] == 2048
+        assert "derived.cross-sectional" in result["subtrees"]
+        assert "Top 5 rules by peak_memory" in profiler.report(top_n=5)
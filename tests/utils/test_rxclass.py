@@ -0,0 +1,56 @@
+"""Tests the RxClass index."""
+
+import copy
+
+from nacc_attribute_deriver.utils.rxclass import (
+    RxClassIndex,
+    RxClassIndexCache,
+    get_rxclass_index,
+)
+
+RXCLASSES = {
+    "C02A": ["1001", " 2002 "],
+    "C09A": ["2002", "3003"],
+    "N06D": [],
+    "N04": None,
+}
+
+
+class TestRxClassIndex:
+    def test_index(self):
+        """Test members and the reverse mapping."""
+        index = RxClassIndex(RXCLASSES)
+        assert index.members("C02A") == {"1001", "2002"}
+        assert index.members("N06D") == frozenset()
+        assert index.members("N04") == frozenset()
+        assert index.members("missing") == frozenset()
+
+        assert index.classes("2002") == {"C02A", "C09A"}
+        assert index.classes("4004") == frozenset()
+        assert index.classes_of(["1001", "3003", "4004"]) == {"C02A", "C09A"}
+        assert index.classes_of([]) == frozenset()
+
+    def test_cache(self):
+        """Test indices are cached by content, and by identity for the last
+        mapping."""
+        cache = RxClassIndexCache(maxsize=2)
+        index = cache.get(RXCLASSES)
+        assert cache.get(RXCLASSES) is index
+        assert cache.get(copy.deepcopy(RXCLASSES)) is index
+        assert cache.misses == 1
+
+        other = {"C02A": ["1001"]}
+        assert cache.get(other) is not index
+        assert cache.get(RXCLASSES) is index
+        assert cache.misses == 2
+
+        # evicts the least recently used
+        cache.get({"C02A": ["2002"]})
+        cache.get(copy.deepcopy(other))
+        assert cache.misses == 4
+
+    def test_get_rxclass_index(self):
+        """Test a missing mapping gives an empty index."""
+        assert get_rxclass_index(None).members("C02A") == frozenset()
+        assert get_rxclass_index({}).classes("1001") == frozenset()
+        assert get_rxclass_index(RXCLASSES).classes("1001") == {"C02A"}
@@ -1,11 +1,17 @@
 """Test utility methods."""
 
+import random
+from datetime import date, datetime, timedelta
+
 import pytest
 
 from nacc_attribute_deriver.utils.date import (
+    DateIndex,
     approximate_date,
+    date_from_form_date,
     datetime_from_form_date,
     find_closest_date,
+    parse_date_parts,
     standardize_date,
 )
 from nacc_attribute_deriver.utils.errors import AttributeDeriverError
@@ -34,6 +40,36 @@ class TestDateUtils:
             + "unconverted data remains: -extrastuff"
         )
 
+    def test_datetime_from_form_date_fast_path(self):
+        """Test the ISO fast path matches strptime, and invalid dates still
+        raise the strptime error every time (errors are not cached)."""
+        for date_string in ["2025-01-01", "1999-12-31", "2024-02-29"]:
+            assert datetime_from_form_date(date_string) == datetime.strptime(
+                date_string, "%Y-%m-%d"
+            )
+
+        for _ in range(2):
+            with pytest.raises(AttributeDeriverError) as e:
+                datetime_from_form_date("2025-02-30")
+
+            assert (
+                str(e.value)
+                == "Failed to parse date 2025-02-30: day is out of range for month"
+            )
+
+    def test_parse_date_parts(self):
+        """Test parsing date parts in all formats, including unknown parts."""
+        assert parse_date_parts("2025-01-99") == (2025, 1, 99)
+        assert parse_date_parts("9999/88/02") == (9999, 88, 2)
+        assert parse_date_parts("01-99-2025") == (2025, 1, 99)
+        assert parse_date_parts("01/02/2025") == (2025, 1, 2)
+        assert parse_date_parts(None) == (None, None, None)
+
+        with pytest.raises(AttributeDeriverError) as e:
+            parse_date_parts("20250101")
+
+        assert str(e.value) == "Unparsable date string: 20250101"
+
     def test_standardize_date(self):
         """Test standardizing date."""
         assert standardize_date("2025-12-01") == "2025-12-01"
@@ -60,6 +96,55 @@ class TestDateUtils:
             ["2025/01/01", "01/01/2026", "2027-01-01"], "01-01-2025"
         ) == ("2025-01-01", 0)
 
+    def test_find_closest_date_ties(self):
+        """Test ties are broken the same as a linear min over the list."""
+        # equidistant dates before and after; the first in the list wins
+        assert find_closest_date(["2025-01-03", "2025-01-01"], "2025-01-02") == (
+            "2025-01-03",
+            0,
+        )
+        assert find_closest_date(["2025-01-01", "2025-01-03"], "2025-01-02") == (
+            "2025-01-01",
+            0,
+        )
+
+        # duplicate dates resolve to the first occurrence
+        assert find_closest_date(
+            ["2025-01-05", "2025/01/01", "2025-01-01"], "2024-12-01"
+        ) == ("2025-01-01", 1)
+
+        rng = random.Random(0)
+        start = date(2020, 1, 1)
+        for _ in range(200):
+            raw_dates = [
+                str(start + timedelta(days=rng.randint(0, 30)))
+                for _ in range(rng.randint(1, 8))
+            ]
+            target = start + timedelta(days=rng.randint(-5, 35))
+            dates = [date_from_form_date(x) for x in raw_dates]
+            expected = min(
+                range(len(dates)),
+                key=lambda i: abs(dates[i] - target),
+            )
+            assert find_closest_date(raw_dates, str(target), as_date=True) == (
+                dates[expected],
+                expected,
+            )
+
+    def test_date_index(self):
+        """Test the date index keeps the first index of each unique date."""
+        index = DateIndex(["2025-03-01", "2025/01/01", "2025-03-01"])
+        assert len(index) == 2
+        assert index.dates == (date(2025, 1, 1), date(2025, 3, 1))
+        assert index.closest(date(2025, 3, 5)) == (date(2025, 3, 1), 0)
+        assert index.closest(date(2024, 12, 1)) == (date(2025, 1, 1), 1)
+        assert find_closest_date(
+            ["2025-01-01"], "2025-03-01", index=index, as_date=True
+        ) == (date(2025, 3, 1), 0)
+
+        with pytest.raises(AttributeDeriverError):
+            DateIndex(["2025-01-01", ""])
+
     def test_approximate_date(self):
         """Test date is approximated when only the day is unknown."""
         assert approximate_date("2025-01-99") == "2025-01-15"